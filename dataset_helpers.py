@@ -0,0 +1,178 @@
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from pyarrow import Table, fs
+
+from tardis_msg_normalization import dictionary_cols
+from tardis_metrics import ret_metrics
+
+### Partitioned Trade Datasets
+# <root>/exchange=<exch>/date=<YYYY-MM-DD>/symbol=<symbol>/part-<n>-<i>.<parquet | arrow>
+# -> readers filtering on exchange / date / symbol only open the matching directories
+# -> Parquet row groups (rows_per_group rows, in time order) carry min / max statistics,
+#    so trd_time / px range filters skip the row groups outside the range
+# -> low cardinality string columns (symbol, sides, ...) are dictionary encoded (dictionary_cols)
+# Arrow IPC files have no statistics: partition pruning only, but they can be memory mapped
+
+partition_schema = pa.schema([('exchange', pa.string()), ('date', pa.string()), ('symbol', pa.string())])
+# directory of the null partition values (pyarrow's hive partitioning default)
+null_partition_name = '__HIVE_DEFAULT_PARTITION__'
+dataset_formats = {'parquet': 'parquet', 'arrow': 'ipc'}
+rows_per_group = 65536
+
+
+@dataclass
+class DatasetInfo:
+    root : str
+    format : str = 'parquet'
+    compression : str = 'lz4'
+
+
+def ret_file_format(info : DatasetInfo):
+    return ds.ParquetFileFormat() if info.format == 'parquet' else ds.IpcFileFormat()
+
+
+def ret_write_options(info : DatasetInfo):
+    compression = None if info.compression == 'uncompressed' else info.compression
+    file_format = ret_file_format(info)
+    if info.format == 'parquet':
+        return file_format.make_write_options(compression=compression, write_statistics=True)
+    return file_format.make_write_options(compression=compression)
+
+
+def ret_partition_dir(info : DatasetInfo, exch, date):
+    return os.path.join(info.root, 'exchange='+exch, 'date='+pd.Timestamp(date).strftime('%Y-%m-%d'))
+
+
+def ret_symbol_partition_name(symbol):
+    """
+    symbol=<symbol> directory name, URI-encoded as pyarrow's hive partitioning writes it (XBT/USD -> XBT%2FUSD)
+    """
+    return 'symbol='+(quote(str(symbol), safe='') if symbol is not None else null_partition_name)
+
+
+def dictionary_encode_cols(table : Table, col_names=dictionary_cols):
+    """
+    Dictionary encode the string columns of table named in col_names
+    (one dictionary per column, so record batches can be written to IPC files)
+    """
+    for i, field in enumerate(table.schema):
+        if field.name in col_names and pa.types.is_string(field.type):
+            table = table.set_column(i, field.name, pc.dictionary_encode(table[field.name]))
+    return table.unify_dictionaries()
+
+
+class DatasetStreamWriter:
+    """
+    Write the trades of one (exchange, date) into a partitioned dataset, one table at a time.
+    Symbol partitions written by an earlier run for the same exchange / date are replaced
+    (other symbols of that exchange / date are left alone), or added to with append
+    path = the exchange / date partition directory,
+    parts = the symbol partitions (relative to path) this writer wrote files into
+    """
+    def __init__(self, info : DatasetInfo, exch, date, append=False):
+        self.info = info
+        self.exch = exch
+        self.date = pd.Timestamp(date).strftime('%Y-%m-%d')
+        self.path = ret_partition_dir(info, exch, date)
+        self.num_rows = 0
+        self.num_parts = 0
+        self.symbols = set()
+        self.written_files = []
+        self.append = append
+        # appended files must not overwrite the part-<n>-<i> files of earlier runs
+        self.part_prefix = 'part-'+str(time.time_ns())+'-' if append else 'part-'
+        os.makedirs(self.path, exist_ok=True)
+
+    def _replace_old_symbol_partitions(self, table : Table):
+        symbols = pc.unique(table['symbol']).to_pylist()
+        for symbol in symbols:
+            if symbol not in self.symbols:
+                symbol_dir = os.path.join(self.path, ret_symbol_partition_name(symbol))
+                if os.path.isdir(symbol_dir):
+                    shutil.rmtree(symbol_dir)
+                self.symbols.add(symbol)
+
+    def write(self, table : Table):
+        if len(table) == 0:
+            return
+        with ret_metrics().timed('write', rows=len(table), bytes_in=table.nbytes):
+            if not self.append:
+                self._replace_old_symbol_partitions(table)
+            table = table.append_column('exchange', pa.array([self.exch]*len(table), pa.string()))
+            table = table.append_column('date', pa.array([self.date]*len(table), pa.string()))
+            ds.write_dataset(dictionary_encode_cols(table), self.info.root,
+                             format=ret_file_format(self.info),
+                             file_options=ret_write_options(self.info),
+                             partitioning=ds.partitioning(partition_schema, flavor='hive'),
+                             basename_template=self.part_prefix+str(self.num_parts)+'-{i}.'+self.info.format,
+                             existing_data_behavior='overwrite_or_ignore',
+                             file_visitor=lambda written_file: self.written_files.append(written_file.path),
+                             max_rows_per_group=rows_per_group,
+                             min_rows_per_group=min(rows_per_group, len(table)))
+        self.num_parts += 1
+        self.num_rows += len(table)
+
+    @property
+    def parts(self):
+        return sorted(set(os.path.relpath(os.path.dirname(path), self.path) for path in self.written_files))
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_trades_dataset(root, format='parquet', memory_map=True):
+    """
+    Lazy dataset over all partitions under root (nothing is read until it is scanned)
+    """
+    return ds.dataset(root, format=dataset_formats[format],
+                      partitioning=ds.HivePartitioning.discover(infer_dictionary=True),
+                      filesystem=fs.LocalFileSystem(use_mmap=memory_map))
+
+
+def ret_trades_filter(exchanges=None, symbols=None, start=None, end=None):
+    """
+    Dataset filter expression: exchanges / symbols lists, trd_time in [start, end)
+    (start / end also prune the date partitions)
+    """
+    conditions = []
+    if exchanges is not None:
+        conditions.append(ds.field('exchange').isin(exchanges))
+    if symbols is not None:
+        conditions.append(ds.field('symbol').isin(symbols))
+    if start is not None:
+        start = pd.Timestamp(start, tz='UTC') if pd.Timestamp(start).tzinfo is None else pd.Timestamp(start)
+        conditions.append(ds.field('date') >= start.strftime('%Y-%m-%d'))
+        conditions.append(ds.field('trd_time') >= pa.scalar(start.value, pa.timestamp('ns', tz='UTC')))
+    if end is not None:
+        end = pd.Timestamp(end, tz='UTC') if pd.Timestamp(end).tzinfo is None else pd.Timestamp(end)
+        conditions.append(ds.field('date') <= end.strftime('%Y-%m-%d'))
+        conditions.append(ds.field('trd_time') < pa.scalar(end.value, pa.timestamp('ns', tz='UTC')))
+    if len(conditions) == 0:
+        return None
+    expr = conditions[0]
+    for condition in conditions[1:]:
+        expr = expr & condition
+    return expr
+
+
+def read_trades_dataset(root, format='parquet', exchanges=None, symbols=None, start=None, end=None, columns=None):
+    """
+    Read the trades matching the filters (see ret_trades_filter) into one table:
+    only the matching partitions (and Parquet row groups) are read
+    """
+    dataset = open_trades_dataset(root, format)
+    return dataset.to_table(columns=columns, filter=ret_trades_filter(exchanges, symbols, start, end))
@@ -1,12 +1,147 @@
+import os
 from dataclasses import dataclass
+from typing import Union
 
-from pyarrow.feather import write_feather
-from pandas import DataFrame
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import Table, ipc
+from pyarrow.feather import write_feather, read_table
+from pandas import DataFrame, Int64Dtype, BooleanDtype
+
+from tardis_metrics import ret_metrics
 
 @dataclass
 class FeatherInfo:
     path : str
     compression : str
 
-def write_feather_frame(info : FeatherInfo, df : DataFrame):
-    write_feather(df, info.path, info.compression)
\ No newline at end of file
+# int64 / bool columns may hold nulls: keep them exact in pandas (no float64 / object fallback)
+pandas_types = {pa.int64(): Int64Dtype(), pa.bool_(): BooleanDtype()}
+
+def table_to_frame(table : Table):
+    """
+    Arrow table -> DataFrame: int64 -> Int64, bool -> boolean (nullable), dictionary -> category
+    """
+    return table.to_pandas(types_mapper=pandas_types.get)
+
+# windows appended to a Feather output go to their own files next to it: <path>.part1, <path>.part2 ...
+part_suffix = '.part'
+
+def ret_part_nums(path):
+    """
+    Sorted numbers of the <path>.part<n> files next to path
+    """
+    dir_path, name = os.path.split(str(path))
+    prefix = name + part_suffix
+    return sorted(int(f[len(prefix):]) for f in os.listdir(dir_path or '.')
+                  if f.startswith(prefix) and f[len(prefix):].isdigit())
+
+def ret_feather_part_paths(path):
+    """
+    The files of a Feather output, in order: path, then the windows appended to it ([] if path does not exist)
+    """
+    path = str(path)
+    if not os.path.isfile(path):
+        return []
+    return [path] + [path+part_suffix+str(n) for n in ret_part_nums(path)]
+
+def read_feather_table(path, columns=None):
+    """
+    A Feather output with its appended parts as one table (one dictionary per column)
+    """
+    return pa.concat_tables([read_table(part_path, columns=columns)
+                             for part_path in ret_feather_part_paths(path)]).unify_dictionaries()
+
+def read_feather_frame(path, columns=None):
+    return table_to_frame(read_feather_table(path, columns=columns))
+
+def write_feather_frame(info : FeatherInfo, df : Union[DataFrame, Table]):
+    with ret_metrics().timed('feather_write', rows=len(df)) as stage:
+        if isinstance(df, Table):
+            # Feather files hold one dictionary per column
+            df = df.unify_dictionaries()
+        write_feather(df, info.path, info.compression)
+        stage.bytes_out += os.path.getsize(str(info.path))
+
+class FeatherStreamWriter:
+    """
+    Write a Feather (v2 = Arrow IPC file) one table / record batch at a time,
+    so the full data set never has to be held in memory.
+    The schema is taken from the first table written.
+    Dictionary columns are re-coded against one growing dictionary per column
+    (tables parsed separately have their own dictionaries), written as dictionary deltas
+    With append, an existing file is left as it is: the tables go to the next <path>.part<n> file
+    (see ret_feather_part_paths), written as .tmp and renamed on close (never if aborted)
+    Without append, the part files of an earlier output are removed
+    path = the file written, num_rows = # of rows written by this writer
+    """
+    def __init__(self, info : FeatherInfo, append=False):
+        self.info = info
+        self.path = str(info.path)
+        self.writer = None
+        self.num_rows = 0
+        self.dictionaries = {}
+        self.append = append
+        if append and os.path.isfile(self.path):
+            self.path += part_suffix+str((ret_part_nums(self.path) or [0])[-1] + 1)
+        # one file per window: no partitions (see DatasetStreamWriter.parts)
+        self.parts = None
+
+    def _open(self, schema):
+        compression = None if self.info.compression == 'uncompressed' else self.info.compression
+        options = ipc.IpcWriteOptions(compression=compression, emit_dictionary_deltas=True)
+        if not self.append:
+            for n in ret_part_nums(self.path):
+                os.remove(self.path+part_suffix+str(n))
+        self.writer = ipc.new_file(self.path+'.tmp' if self.append else self.path, schema, options=options)
+
+    def _recode_dictionaries(self, table : Table):
+        table = table.unify_dictionaries()
+        for i, field in enumerate(table.schema):
+            if not pa.types.is_dictionary(field.type) or table.column(i).num_chunks == 0:
+                continue
+            values, lookup = self.dictionaries.setdefault(field.name, ([], {}))
+            chunks = table.column(i).chunks
+            codes = []
+            for value in chunks[0].dictionary.to_pylist():
+                if value not in lookup:
+                    lookup[value] = len(values)
+                    values.append(value)
+                codes.append(lookup[value])
+            codes = pa.array(codes, type=field.type.index_type)
+            dictionary = pa.array(values, type=field.type.value_type)
+            chunks = [pa.DictionaryArray.from_arrays(pc.take(codes, chunk.indices), dictionary) for chunk in chunks]
+            table = table.set_column(i, field, pa.chunked_array(chunks, type=field.type))
+        return table
+
+    def write(self, table : Table):
+        with ret_metrics().timed('write', rows=len(table), bytes_in=table.nbytes):
+            if self.writer is None:
+                self._open(table.schema)
+            self.writer.write_table(self._recode_dictionaries(table))
+        self.num_rows += len(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+            if self.append:
+                os.replace(self.path+'.tmp', self.path)
+            ret_metrics().add('write', calls=0, bytes_out=os.path.getsize(self.path))
+
+    def abort(self):
+        """
+        Close without keeping the window being appended
+        """
+        if self.writer is not None and self.append:
+            self.writer.close()
+            self.writer = None
+            os.remove(self.path+'.tmp')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is not None:
+            self.abort()
+        self.close()
\ No newline at end of file
@@ -0,0 +1,133 @@
+import gzip
+import os
+import queue
+import threading
+import time
+from itertools import chain
+
+from tardis_metrics import ret_metrics
+
+### Streaming Gzip Line Reader
+# Cached Tardis files are decompressed chunk_size bytes at a time and split
+# into bytes lines, so memory per file is bounded by the chunk size (instead
+# of the whole decompressed file + its str copy + the list of lines).
+# With prefetch, a background thread decompresses the next chunks while the
+# current one is parsed (zlib / isal release the GIL while inflating);
+# files that fit in one chunk (most 1-minute Tardis slices) skip the thread.
+# isal or zlib-ng are used for (de)compressing when installed.
+# Decompression time / bytes go to the run metrics ('gunzip' stage).
+
+default_chunk_size = 1 << 20
+
+try:
+    from isal import igzip as gzip_impl
+    gzip_backend = 'isal'
+except ImportError:
+    try:
+        from zlib_ng import gzip_ng as gzip_impl
+        gzip_backend = 'zlib-ng'
+    except ImportError:
+        gzip_impl = gzip
+        gzip_backend = 'zlib'
+
+
+def open_gzip(file_path):
+    return gzip_impl.open(str(file_path), 'rb')
+
+
+def compress_gzip_member(data):
+    """
+    data as one complete gzip member: members can be concatenated into a valid
+    gzip file and each one decompressed on its own (see tardis_raw_index)
+    """
+    return gzip_impl.compress(data)
+
+
+def read_gzip_member(file_path, offset, size):
+    """
+    Decompress the gzip member stored at [offset, offset+size) of a file
+    """
+    with open(str(file_path), 'rb') as f:
+        f.seek(offset)
+        return gzip_impl.decompress(f.read(size))
+
+
+def iter_gzip_chunks(file_path, chunk_size=default_chunk_size):
+    """
+    Yield the decompressed content of a gzip file in chunks of (at most) chunk_size bytes
+    """
+    stage = ret_metrics().ret_stage('gunzip')
+    stage.bytes_in += os.path.getsize(str(file_path))
+    with open_gzip(file_path) as z:
+        while True:
+            t1 = time.perf_counter()
+            chunk = z.read(chunk_size)
+            stage.add(time.perf_counter() - t1, calls=0, bytes_out=len(chunk))
+            if len(chunk) == 0:
+                stage.calls += 1
+                return
+            yield chunk
+
+
+def iter_prefetched(iterable, depth=2):
+    """
+    Yield the items of iterable, produced by a background thread up to depth items ahead
+    """
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    end = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((end, None))
+        except BaseException as e:
+            put((end, e))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if error is not None:
+                raise error
+            if item is end:
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def iter_gzip_lines(file_path, chunk_size=default_chunk_size, prefetch=True):
+    """
+    Yield the non-empty lines (bytes, without b'\\n') of a gzip file,
+    decompressing chunk_size bytes at a time
+    """
+    chunks = iter_gzip_chunks(file_path, chunk_size)
+    first_chunk = next(chunks, b'')
+    if prefetch and len(first_chunk) == chunk_size:
+        chunks = iter_prefetched(chunks)
+    chunks = chain([first_chunk], chunks)
+
+    tail = b''
+    for chunk in chunks:
+        lines = chunk.split(b'\n')
+        if len(tail) > 0:
+            lines[0] = tail + lines[0]
+        tail = lines.pop()
+        for l in lines:
+            if len(l) > 0:
+                yield l
+    if len(tail) > 0:
+        yield tail
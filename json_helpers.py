@@ -0,0 +1,73 @@
+import json
+import os
+
+### Pluggable JSON Decoding
+# One decoder shared by the message counter and the column filler.
+# Lines are decoded straight from bytes (no str copy of the file): orjson and
+# simdjson also take a memoryview of the line, so the message part of
+# "<local_timestamp> <json>" is not copied either.
+# Default backend = fastest installed one (see `python tardis_bench.py json`),
+# override with set_json_backend(name) or the TARDIS_JSON_BACKEND env variable
+
+json_backend_preference = ['orjson', 'simdjson', 'ujson', 'json']
+memoryview_backends = ['orjson', 'simdjson']
+
+
+def import_json_loads(name):
+    """
+    Return the loads function of a JSON backend (ImportError if not installed)
+    """
+    if name == 'orjson':
+        import orjson
+        return orjson.loads
+    if name == 'simdjson':
+        import simdjson
+        return simdjson.loads
+    if name == 'ujson':
+        import ujson
+        return ujson.loads
+    if name == 'json':
+        return json.loads
+    raise ValueError('Unknown JSON backend: '+name+' ['+' | '.join(json_backend_preference)+' ]')
+
+
+def available_json_backends():
+    backends = []
+    for name in json_backend_preference:
+        try:
+            import_json_loads(name)
+            backends.append(name)
+        except ImportError:
+            pass
+    return backends
+
+
+def set_json_backend(name):
+    global json_backend, json_loads, json_loads_memoryview
+    json_loads = import_json_loads(name)
+    json_backend = name
+    json_loads_memoryview = name in memoryview_backends
+
+
+set_json_backend(os.environ.get('TARDIS_JSON_BACKEND', available_json_backends()[0]))
+
+
+def loads(buf):
+    """
+    Decode a JSON message from bytes (or a memoryview for orjson / simdjson)
+    Falls back to the standard library on anything the fast backend rejects
+    """
+    try:
+        return json_loads(buf)
+    except ValueError:
+        return json.loads(bytes(buf))
+
+
+def parse_msg_line(line):
+    """
+    Decode the JSON part of a cached Tardis line: b'<local_timestamp> <json>'
+    """
+    msg_start = line.find(b' ')+1
+    if json_loads_memoryview:
+        return loads(memoryview(line)[msg_start:])
+    return loads(line[msg_start:])
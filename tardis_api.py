@@ -0,0 +1,121 @@
+import os
+
+### In-Process Library API
+# Normalized trades straight from Tardis, as Arrow data, without an output file:
+# -> iter_trade_batches(exchange, date, symbols) yields pyarrow RecordBatches of up to batch_rows
+#    trades as TardisClient.replay decodes the messages (raw slices are still cached by TardisClient,
+#    in the request's cache dir, so a second call does not download again)
+# -> load_trades(...) collects them into one pyarrow Table
+# -> aiter_trades(...) is the async form (normalized tables), for code already running an event loop
+# Settings are read when a request is made, never on import: api_key / cache_dir arguments,
+# else the TARDIS_KEY / CACHE_DIR settings (environment or .env, see decouple)
+# asyncio, numpy, pandas, pyarrow, tardis_client ... are imported by the functions using them,
+# so importing this module takes milliseconds
+
+default_batch_rows = 100000
+
+
+def ret_config(name, value=None):
+    """
+    value if given, else the name setting (environment variable, or .env / settings.ini, see decouple)
+    """
+    if value is not None:
+        return value
+    if name in os.environ:
+        return os.environ[name]
+    from decouple import config
+    return config(name)
+
+
+def ret_trade_request(exchange, date, symbols, api_key=None, cache_dir=None):
+    """
+    DownloadRequest of a day of trades of an exchange (symbols: list, or comma separated str)
+    """
+    from tardis_request import DownloadRequest
+    from tardis_msg_normalization import examples_dict
+
+    if isinstance(symbols, str):
+        symbols = symbols.split(',')
+    return DownloadRequest(date, exchange, examples_dict[exchange]['dl_dtype'], list(symbols),
+                           ret_config('CACHE_DIR', cache_dir), ret_config('TARDIS_KEY', api_key))
+
+
+async def aiter_trade_tables(msg_gen, exch, batch_rows=default_batch_rows, keep_extras=False):
+    """
+    Normalize the (local_timestamp, message) items of a Tardis async generator as they come
+    Yields normalized trade tables of up to batch_rows trades
+    (always at least one table, empty if no trades, so the schema is known)
+    """
+    from tardis_trade_columns import TradeColumnBuffers
+    from tardis_msg_normalization import normalize_table_timestamps, local_timestamp_bytes
+    from tardis_metrics import ret_metrics
+
+    col_buffers = TradeColumnBuffers(exch, keep_extras)
+    metrics = ret_metrics()
+    num_tables = 0
+
+    def flush():
+        with metrics.timed('timestamps', rows=len(col_buffers)):
+            return normalize_table_timestamps(col_buffers.flush(), exch)
+
+    async for local_timestamp, message in msg_gen:
+        if col_buffers.append_msg(message, local_timestamp_bytes(local_timestamp)) == 0:
+            col_buffers.extractor.count_skipped(message)
+        if len(col_buffers) >= batch_rows:
+            num_tables += 1
+            yield flush()
+    if len(col_buffers) > 0 or num_tables == 0:
+        yield flush()
+
+
+async def aiter_trades(exchange, date, symbols, api_key=None, cache_dir=None, batch_rows=default_batch_rows,
+                       keep_extras=False):
+    """
+    Download (or reuse the cached slices of) a day of trades
+    Yields normalized trade tables of up to batch_rows trades, in Tardis order
+    """
+    from tardis_request import TardisGenerator
+
+    request = ret_trade_request(exchange, date, symbols, api_key, cache_dir)
+    async for tbl in aiter_trade_tables(TardisGenerator(request).messages, exchange, batch_rows, keep_extras):
+        yield tbl
+
+
+def iter_async_gen(async_gen):
+    """
+    Iterate through an async generator from synchronous code, in a new event loop
+    (not from inside a running event loop: use the async generator there)
+    """
+    import asyncio
+
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                item = loop.run_until_complete(async_gen.__anext__())
+            except StopAsyncIteration:
+                break
+            yield item
+    finally:
+        loop.run_until_complete(async_gen.aclose())
+        loop.close()
+
+
+def iter_trade_batches(exchange, date, symbols, api_key=None, cache_dir=None, batch_rows=default_batch_rows,
+                       keep_extras=False):
+    """
+    Yields pyarrow RecordBatches of a day of normalized trades (see aiter_trades)
+    """
+    for tbl in iter_async_gen(aiter_trades(exchange, date, symbols, api_key, cache_dir, batch_rows, keep_extras)):
+        for batch in tbl.combine_chunks().to_batches():
+            yield batch
+
+
+def load_trades(exchange, date, symbols, api_key=None, cache_dir=None, keep_extras=False):
+    """
+    A day of normalized trades as one pyarrow Table (see aiter_trades)
+    """
+    import pyarrow as pa
+
+    return pa.concat_tables(list(iter_async_gen(aiter_trades(exchange, date, symbols, api_key, cache_dir,
+                                                             keep_extras=keep_extras))))
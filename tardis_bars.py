@@ -0,0 +1,168 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from feather_helpers import FeatherInfo
+from dataset_helpers import DatasetInfo
+from tardis_msg_normalization import aggressor_buy_dict, dictionary_type, timestamp_ns_utc
+from tardis_trade_order import ret_symbol_codes
+
+### OHLCV / VWAP Bars
+# Optional stage over the normalized trade tables (px, qty, trd_time, symbol, aggressor side):
+# -> every trade is a one-trade bar of its (symbol, trd_time floored to the interval)
+# -> bars with the same (symbol, bar_time) are merged with numpy segment reductions
+#    (lexsort, then maximum / minimum / add .reduceat over the runs of equal keys):
+#    open = open of the earliest, close = close of the latest, high / low / sums combined
+# -> each table is reduced as soon as it is parsed, and the (small) partial bars of all
+#    tables are merged the same way at the end, so bars spanning tables come out whole
+# Bars are written next to the tick output: bars_<interval>_YYYYMMDD Feather file,
+# or a <dataset root>_bars_<interval> dataset
+# Rows without a px / qty / trd_time are left out; buy / sell volume = taker buys / sells
+# (aggressor_buy_dict), trades with an unknown side only count in volume
+
+default_bar_intervals = ['1s', '1m']
+bar_sum_cols = ['volume', 'notional', 'num_trades', 'buy_volume', 'sell_volume']
+bar_cols = ['symbol', 'bar_time', 'open', 'high', 'low', 'close', 'volume', 'vwap', 'num_trades',
+            'buy_volume', 'sell_volume']
+
+
+def ret_bar_interval_ns(interval):
+    """
+    '1s', '1m', '5min', '1h' ... -> interval length in ns
+    """
+    interval_ns = pd.Timedelta(interval).value
+    if interval_ns <= 0:
+        raise ValueError('Bar interval must be positive: '+str(interval))
+    return interval_ns
+
+
+def ret_bars_output_info(output_info, interval):
+    """
+    Where the bars of an output go: bars_<interval>_YYYYMMDD next to the trd_YYYYMMDD Feather file,
+    or the <root>_bars_<interval> dataset next to a trades dataset
+    """
+    if isinstance(output_info, DatasetInfo):
+        return DatasetInfo(str(output_info.root).rstrip(os.sep)+'_bars_'+interval, output_info.format,
+                           output_info.compression)
+    path = str(output_info.path)
+    name = os.path.basename(path)
+    name = name[len('trd_'):] if name.startswith('trd_') else name
+    return FeatherInfo(os.path.join(os.path.dirname(path), 'bars_'+interval+'_'+name), output_info.compression)
+
+
+def to_numpy_filled(arr, fill_value):
+    return pc.fill_null(arr, fill_value).to_numpy(zero_copy_only=False)
+
+
+def ret_aggressor_buys(table, exch):
+    """
+    (is taker buy, side known) boolean arrays of a trade table
+    """
+    side_col, buy_values = aggressor_buy_dict.get(exch, (None, None))
+    if side_col is None or side_col not in table.column_names:
+        unknown = np.zeros(len(table), dtype=bool)
+        return unknown, unknown
+    side = table[side_col]
+    is_buy = pc.is_in(side, value_set=pa.array(buy_values, side.type.value_type
+                                               if pa.types.is_dictionary(side.type) else side.type))
+    return to_numpy_filled(is_buy, False), to_numpy_filled(pc.is_valid(side), False)
+
+
+def ret_trade_bars(table, exch, interval_ns):
+    """
+    One single-trade bar per valid trade of a normalized trade table (see bar_cols, plus the
+    notional and the open / close trade times used to merge bars)
+    """
+    table = table.unify_dictionaries().combine_chunks()
+    times = to_numpy_filled(pc.cast(table['trd_time'], pa.int64()), 0)
+    px = to_numpy_filled(pc.cast(table['px'], pa.float64()), np.nan)
+    qty = to_numpy_filled(pc.cast(table['qty'], pa.float64()), np.nan)
+    is_buy, side_known = ret_aggressor_buys(table, exch)
+
+    valid = to_numpy_filled(pc.is_valid(table['trd_time']), False) & ~np.isnan(px) & ~np.isnan(qty)
+    times, px, qty, is_buy, side_known = times[valid], px[valid], qty[valid], is_buy[valid], side_known[valid]
+
+    bars = {}
+    if 'symbol' in table.column_names:
+        bars['symbol'] = table['symbol'].filter(pa.array(valid))
+    bars.update({'bar_time': times - times % interval_ns, 'open_time': times, 'close_time': times,
+                 'open': px, 'high': px, 'low': px, 'close': px,
+                 'volume': qty, 'notional': px*qty, 'num_trades': np.ones(len(px), dtype=np.int64),
+                 'buy_volume': np.where(is_buy, qty, 0.0), 'sell_volume': np.where(side_known & ~is_buy, qty, 0.0)})
+    return pa.table(bars)
+
+
+def merge_bars(bars):
+    """
+    Merge the bars sharing (symbol, bar_time) into one, with segment reductions
+    Returns the merged bars sorted by (symbol, bar_time)
+    """
+    bars = bars.unify_dictionaries().combine_chunks()
+    if len(bars) == 0:
+        return bars
+    codes = ret_symbol_codes(bars).to_numpy(zero_copy_only=False)
+    bar_time = bars['bar_time'].to_numpy()
+    open_time = bars['open_time'].to_numpy()
+    close_time = bars['close_time'].to_numpy()
+
+    # same runs of keys in both orders: earliest bar first (open) / latest bar last (close)
+    by_open = np.lexsort((open_time, bar_time, codes))
+    by_close = np.lexsort((close_time, bar_time, codes))
+    keys_changed = (np.diff(codes[by_open]) != 0) | (np.diff(bar_time[by_open]) != 0)
+    starts = np.concatenate([[0], np.nonzero(keys_changed)[0] + 1])
+    ends = np.concatenate([starts[1:], [len(bars)]]) - 1
+
+    def col(name, order=by_open):
+        return bars[name].to_numpy()[order]
+
+    merged = {}
+    if 'symbol' in bars.column_names:
+        merged['symbol'] = bars['symbol'].take(pa.array(by_open[starts]))
+    merged.update({'bar_time': col('bar_time')[starts],
+                   'open_time': col('open_time')[starts], 'close_time': col('close_time', by_close)[ends],
+                   'open': col('open')[starts], 'high': np.maximum.reduceat(col('high'), starts),
+                   'low': np.minimum.reduceat(col('low'), starts), 'close': col('close', by_close)[ends]})
+    for name in bar_sum_cols:
+        merged[name] = np.add.reduceat(col(name), starts)
+    return pa.table(merged)
+
+
+class BarAggregator:
+    """
+    OHLCV / VWAP bars of one exchange at one interval, fed one normalized trade table at a time:
+    add(table) for every table, then to_table()
+    """
+
+    def __init__(self, exch, interval='1m'):
+        self.exch = exch
+        self.interval = interval
+        self.interval_ns = ret_bar_interval_ns(interval)
+        self.partial_bars = []
+
+    def add(self, table):
+        if len(table) > 0:
+            self.partial_bars.append(merge_bars(ret_trade_bars(table, self.exch, self.interval_ns)))
+
+    def to_table(self):
+        """
+        The bars (bar_cols) in (symbol, bar_time) order, bar_time = start of the interval
+        """
+        if len(self.partial_bars) == 0:
+            bars = ret_trade_bars(pa.table({'symbol': pa.array([], dictionary_type),
+                                            'trd_time': pa.array([], timestamp_ns_utc),
+                                            'px': pa.array([], pa.float64()), 'qty': pa.array([], pa.float64())}),
+                                  self.exch, self.interval_ns)
+        else:
+            bars = merge_bars(pa.concat_tables(self.partial_bars))
+        self.partial_bars = [bars]
+
+        volume = bars['volume'].to_numpy()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            vwap = np.where(volume != 0, bars['notional'].to_numpy() / volume, np.nan)
+        bars = bars.set_column(bars.column_names.index('bar_time'), 'bar_time',
+                               pc.cast(bars['bar_time'], pa.int64()).cast(timestamp_ns_utc))
+        bars = bars.append_column('vwap', pa.array(vwap))
+        return bars.select([name for name in bar_cols if name in bars.column_names])
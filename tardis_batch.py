@@ -0,0 +1,238 @@
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from tardis_request import DownloadRequest, TardisGenerator, ret_request_cache_path
+from tardis_cache import CacheManifest
+from dataset_helpers import DatasetInfo, ret_partition_dir
+from tardis_msg_normalization import trades_norm_dict, examples_dict
+from tardis_api import ret_config
+
+### Batch Backfill
+# Many (exchange, date, symbols) jobs in one process:
+# -> up to `concurrency` TardisClient.replay downloads run together on one event loop
+# -> as soon as a job's download finishes, its cache dir is parsed in a process pool
+#    (so downloading the next days overlaps with parsing the previous ones)
+# -> progress is printed as each job's download reaches a new hour of the day, as each job
+#    finishes ([finished/total]) and as all the jobs of a date are finished
+
+@dataclass
+class BatchJob:
+    request : DownloadRequest
+    status : str = 'pending'
+    num_lines : int = 0
+    num_rows : int = 0
+    download_sec : float = 0.
+    parse_sec : float = 0.
+    output_path : str = ''
+    error : str = ''
+
+    def label(self):
+        return self.request.exchange+' '+self.request.date+' '+','.join(self.request.symbols)
+
+    def report(self):
+        msg = self.label()+' -> '+self.status
+        if self.download_sec > 0:
+            msg += ' | download: '+str(self.num_lines)+' msgs in '+str(np.round(self.download_sec,1))+' sec'
+            msg += ' ('+str(int(self.num_lines/self.download_sec))+' msgs/sec)'
+        if self.parse_sec > 0:
+            msg += ' | parse: '+str(self.num_rows)+' trades in '+str(np.round(self.parse_sec,1))+' sec'
+            msg += ' ('+str(int(self.num_rows/self.parse_sec))+' trades/sec)'
+        if len(self.error) > 0:
+            msg += ' | error: '+self.error
+        return msg
+
+
+class BatchProgress:
+    """
+    Finished jobs of the batch, overall and per date
+    """
+
+    def __init__(self, jobs : List[BatchJob]):
+        self.num_jobs = len(jobs)
+        self.num_finished = 0
+        self.date_jobs = {}
+        for job in jobs:
+            self.date_jobs.setdefault(job.request.date, []).append(job)
+        self.t1 = time.time()
+
+    def job_finished(self, job : BatchJob):
+        self.num_finished += 1
+        print('['+str(self.num_finished)+'/'+str(self.num_jobs)+'] '+job.report())
+        date_jobs = self.date_jobs[job.request.date]
+        if all(date_job.status in ['done', 'cached', 'failed'] for date_job in date_jobs):
+            statuses = [date_job.status for date_job in date_jobs]
+            print('*** '+job.request.date+' finished: '+str(sum(date_job.num_rows for date_job in date_jobs))+' trades | '
+                  +', '.join(status+': '+str(statuses.count(status)) for status in ['done', 'cached', 'failed'])
+                  +' | '+str(np.round(time.time() - self.t1, 1))+' sec elapsed')
+
+
+def ret_msg_hour(local_timestamp):
+    """
+    Hour (HH) of a message local timestamp: raw ISO bytes (decode_response=False) or datetime
+    """
+    if isinstance(local_timestamp, bytes):
+        return local_timestamp[11:13].decode()
+    return local_timestamp.strftime('%H')
+
+
+def ret_exch_symbols(exch_args):
+    """
+    {exchange: [symbols]} of exchange[:symbol1,symbol2] arguments (default symbols from examples_dict)
+    The symbols of an exchange given more than once are merged (in order, without duplicates)
+    """
+    exch_symbols = {}
+    for exch_arg in exch_args:
+        exch, _, symbols = exch_arg.partition(':')
+        symbols = symbols.split(',') if len(symbols) > 0 else examples_dict[exch]['dl_symbols']
+        merged = exch_symbols.setdefault(exch, [])
+        merged.extend(symbol for symbol in symbols if symbol not in merged)
+    return exch_symbols
+
+
+def ret_batch_requests(exch_symbols, start_date, end_date, cache_root_path, api_key):
+    """
+    One DownloadRequest per (exchange, date) for all dates in [start_date, end_date]
+    exch_symbols: {exchange: [symbols]}
+    """
+    requests = []
+    for date in pd.date_range(start_date, end_date, freq='D'):
+        for exch, symbols in exch_symbols.items():
+            requests.append(DownloadRequest(date.strftime('%Y-%m-%d'), exch, examples_dict[exch]['dl_dtype'],
+                                            symbols, cache_root_path, api_key))
+    return requests
+
+
+def ret_job_output_path(request : DownloadRequest, output_info=None):
+    """
+    trd_YYYYMMDD Feather file in the request cache dir, or its dataset partition (output_info)
+    """
+    if output_info is None:
+        return os.path.join(ret_request_cache_path(request), 'trd_'+pd.Timestamp(request.date).strftime('%Y%m%d'))
+    return ret_partition_dir(output_info, request.exchange, request.date)
+
+
+def parse_request_cache_dir(request : DownloadRequest, output_info=None):
+    """
+    Process pool task: parse the cached files of one downloaded request
+    (into a partitioned dataset if output_info is a DatasetInfo)
+    Returns (output path, # of rows)
+    """
+    from tardis_get_trades import tardis_parse_root_cache_dir
+
+    cache_dir = ret_request_cache_path(request)
+    manifest = CacheManifest(cache_dir, request)
+    tardis_parse_root_cache_dir(cache_dir, request.exchange, request.date, manifest=manifest, output_info=output_info)
+    return str(manifest.output_path()), manifest.data['output'][1]
+
+
+async def download_job(job : BatchJob, semaphore):
+    """
+    Force the Tardis download of one job into its cache dir
+    (raw lines only: messages are not decoded here, parsing happens in the pool)
+    Prints the progress as the messages reach a new hour of the day
+    """
+    async with semaphore:
+        job.status = 'downloading'
+        t1 = time.time()
+        hour = None
+        generator = TardisGenerator(job.request, decode_response=False)
+        async for local_timestamp, message in generator.messages:
+            job.num_lines += 1
+            msg_hour = ret_msg_hour(local_timestamp)
+            if msg_hour != hour:
+                hour = msg_hour
+                print(job.label()+' -> downloading '+hour+':00 UTC | '+str(job.num_lines)+' msgs in '
+                      +str(np.round(time.time() - t1, 1))+' sec')
+        job.download_sec = time.time() - t1
+
+
+async def run_job(job : BatchJob, semaphore, executor, progress : BatchProgress, output_info=None):
+    loop = asyncio.get_running_loop()
+    try:
+        manifest = CacheManifest(ret_request_cache_path(job.request), job.request)
+        if manifest.is_complete(ret_job_output_path(job.request, output_info)):
+            job.status = 'cached'
+            job.output_path = str(manifest.output_path())
+            job.num_rows = manifest.data['output'][1]
+        else:
+            await download_job(job, semaphore)
+            job.status = 'parsing'
+            t1 = time.time()
+            job.output_path, job.num_rows = await loop.run_in_executor(executor, parse_request_cache_dir,
+                                                                        job.request, output_info)
+            job.parse_sec = time.time() - t1
+            job.status = 'done'
+    except Exception as e:
+        job.status = 'failed'
+        job.error = repr(e)
+    progress.job_finished(job)
+    return job
+
+
+async def run_batch(jobs : List[BatchJob], concurrency=4, workers=4, output_info=None):
+    """
+    Run all jobs: at most `concurrency` downloads at a time, parsing in `workers` processes
+    output_info: DatasetInfo to write all jobs into one partitioned dataset (default: one Feather file per job)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    progress = BatchProgress(jobs)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return await asyncio.gather(*[run_job(job, semaphore, executor, progress, output_info) for job in jobs])
+
+
+def print_batch_summary(jobs : List[BatchJob], total_sec):
+    num_rows = sum(job.num_rows for job in jobs)
+    print('\nBatch Summary:\n***')
+    for status in ['done', 'cached', 'failed']:
+        print(status+': '+str(sum(job.status == status for job in jobs)))
+    print('total trades: '+str(num_rows))
+    print('total time: '+str(np.round(total_sec,1))+' sec ('+str(int(num_rows/max(total_sec,1e-9)))+' trades/sec)')
+    print('***')
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("start_date", help="first date at YYYY-MM-DD")
+    parser.add_argument("end_date", help="last date at YYYY-MM-DD (inclusive)")
+    parser.add_argument("exchanges", nargs='+',
+                        help='exchange[:symbol1,symbol2] (default symbols from examples_dict), exchanges: ['+' | '.join(trades_norm_dict.keys())+' ]')
+    parser.add_argument("--cache_dir", help="Cache Source", default=None)
+    parser.add_argument("--api_key", help="Api Key", default=None)
+    parser.add_argument("--concurrency", help="# of concurrent downloads", type=int, default=4)
+    parser.add_argument("--workers", help="# of parsing processes", type=int, default=4)
+    parser.add_argument("--output", help="trd_YYYYMMDD Feather file per job, or one partitioned dataset",
+                        choices=['feather', 'parquet', 'arrow'], default='feather')
+    parser.add_argument("--dataset_dir", help="root of the partitioned dataset (default: <cache_dir>/dataset)", default=None)
+
+    args = parser.parse_args()
+
+    cache_dir_root = ret_config('CACHE_DIR', args.cache_dir)
+    tardis_key = ret_config('TARDIS_KEY', args.api_key)
+
+    exch_symbols = ret_exch_symbols(args.exchanges)
+
+    output_info = None
+    if args.output != 'feather':
+        dataset_dir = args.dataset_dir if args.dataset_dir is not None else os.path.join(cache_dir_root, 'dataset')
+        output_info = DatasetInfo(os.path.abspath(dataset_dir), args.output, "lz4")
+
+    jobs = [BatchJob(request) for request in
+            ret_batch_requests(exch_symbols, args.start_date, args.end_date, cache_dir_root, tardis_key)]
+    print('\n'+str(len(jobs))+' jobs: '+str(args.concurrency)+' concurrent downloads, '+str(args.workers)+' parsing processes\n')
+
+    t1 = time.time()
+    asyncio.run(run_batch(jobs, args.concurrency, args.workers, output_info))
+    print_batch_summary(jobs, time.time() - t1)
+
+if __name__ == '__main__':
+    main()
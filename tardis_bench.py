@@ -0,0 +1,301 @@
+import argparse
+import os
+import resource
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import json_helpers
+from gzip_helpers import iter_gzip_lines
+from tardis_msg_normalization import trades_norm_dict, examples_dict
+
+### Benchmarks
+# Timings of the parsing pipeline over an existing Tardis cache directory
+# (nothing is downloaded and nothing is written), or over synthetic caches
+# generated on the fly (stages: see tardis_synthetic, no network needed)
+
+def bench_workers(cache_dir, exch, worker_counts, repeats=1):
+    """
+    Time tardis_parse_root_cache_dir_into_table for each worker count
+    Returns list of dicts: workers, sec, rows, rows/sec and speedup vs the first count
+    """
+    from tardis_get_trades import tardis_parse_root_cache_dir_into_table
+
+    results = []
+    for workers in worker_counts:
+        timings = []
+        for _ in range(repeats):
+            t1 = time.time()
+            tbl = tardis_parse_root_cache_dir_into_table(cache_dir, exch, workers=workers)
+            timings.append(time.time() - t1)
+        sec = min(timings)
+        results.append({'workers': workers, 'sec': sec, 'rows': len(tbl), 'rows/sec': len(tbl) / sec})
+
+    for r in results:
+        r['speedup'] = results[0]['sec'] / r['sec']
+    return results
+
+
+def read_sample_lines(cache_dir, max_lines):
+    """
+    First max_lines (non-empty) lines of the cached .json.gz files under cache_dir
+    """
+    from tardis_msg_counter import ret_all_subdir_file_paths
+
+    lines = []
+    for file_path in sorted(f for f in ret_all_subdir_file_paths(cache_dir) if f.endswith('.json.gz')):
+        lines.extend(iter_gzip_lines(file_path))
+        if len(lines) >= max_lines:
+            break
+    return lines[:max_lines]
+
+
+def bench_json(exch_cache_dirs, max_lines=100000, repeats=3):
+    """
+    Time json_helpers.parse_msg_line with every installed JSON backend
+    on sample lines of each exchange format
+    exch_cache_dirs: {exchange: cache dir}
+    Returns list of dicts: exchange, backend, msgs/sec and speedup vs stdlib json
+    """
+    default_backend = json_helpers.json_backend
+    results = []
+    try:
+        for exch, cache_dir in exch_cache_dirs.items():
+            lines = read_sample_lines(cache_dir, max_lines)
+            exch_results = []
+            for backend in json_helpers.available_json_backends():
+                json_helpers.set_json_backend(backend)
+                timings = []
+                for _ in range(repeats):
+                    t1 = time.time()
+                    for l in lines:
+                        json_helpers.parse_msg_line(l)
+                    timings.append(time.time() - t1)
+                exch_results.append({'exchange': exch, 'backend': backend, 'msgs': len(lines),
+                                     'msgs/sec': len(lines) / max(min(timings), 1e-9)})
+            json_speed = [r['msgs/sec'] for r in exch_results if r['backend'] == 'json'][0]
+            for r in exch_results:
+                r['speedup'] = r['msgs/sec'] / json_speed
+            results.extend(exch_results)
+    finally:
+        json_helpers.set_json_backend(default_backend)
+    return results
+
+
+def bench_extract(exch_cache_dirs, max_lines=100000, repeats=3):
+    """
+    Time the per-exchange trade extractors on sample lines of each exchange
+    -> extract: decoded messages -> column buffers
+    -> parse: raw lines -> JSON -> column buffers -> normalized Arrow table
+    exch_cache_dirs: {exchange: cache dir}
+    Returns list of dicts: exchange, msgs, rows, extract rows/sec and parse rows/sec
+    """
+    from tardis_trade_columns import TradeColumnBuffers
+    from tardis_msg_normalization import normalize_table_timestamps
+
+    results = []
+    for exch, cache_dir in exch_cache_dirs.items():
+        lines = read_sample_lines(cache_dir, max_lines)
+        messages = [json_helpers.parse_msg_line(l) for l in lines]
+
+        extract_timings = []
+        parse_timings = []
+        for _ in range(repeats):
+            col_buffers = TradeColumnBuffers(exch)
+            t1 = time.time()
+            for message in messages:
+                col_buffers.append_msg(message)
+            extract_timings.append(time.time() - t1)
+
+            col_buffers = TradeColumnBuffers(exch)
+            t1 = time.time()
+            for l in lines:
+                col_buffers.append_msg(json_helpers.parse_msg_line(l), l[:l.find(b' ')])
+            normalize_table_timestamps(col_buffers.to_table(), exch)
+            parse_timings.append(time.time() - t1)
+
+        rows = len(col_buffers)
+        results.append({'exchange': exch, 'msgs': len(lines), 'rows': rows,
+                        'extract rows/sec': rows / max(min(extract_timings), 1e-9),
+                        'parse rows/sec': rows / max(min(parse_timings), 1e-9)})
+    return results
+
+
+def ret_process_peak_rss_mb():
+    """
+    Peak resident memory of the whole process so far (MB): ru_maxrss, a high-water mark
+    that never goes down, so it is not the memory used by one stage
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def ret_traced_peak_mb(func):
+    """
+    (result, peak MB) of one func() run, peak of the memory allocated during the run
+    (tracemalloc: Python objects and numpy arrays, not Arrow buffers)
+    """
+    tracemalloc.start()
+    try:
+        result = func()
+        return result, tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def time_stage(func, repeats):
+    """
+    (result of the last run, best time in sec, allocation peak MB) of func() over repeats runs
+    The allocation peak is measured on one more run, traced (tracing slows the timed runs down)
+    """
+    timings = []
+    for _ in range(repeats):
+        t1 = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - t1)
+    del result
+    result, peak_mb = ret_traced_peak_mb(func)
+    return result, max(min(timings), 1e-9), peak_mb
+
+
+def bench_stages(exchanges, num_msgs=100000, hours=1, repeats=3, out_dir=None):
+    """
+    Time each stage of the parsing pipeline separately on a synthetic cache of num_msgs lines per exchange:
+    -> decompress: .json.gz files -> lines
+    -> json: lines -> decoded messages
+    -> extract: messages -> trade rows (TradeExtractor)
+    -> columns: rows -> column buffers -> Arrow table
+    -> timestamps: time columns -> timestamp[ns, UTC]
+    -> write: table -> lz4 Feather file
+    Each stage's input is fully built beforehand: stage peak MB is what the stage itself allocates
+    (tracemalloc peak of a separate run: Python objects and numpy arrays, not Arrow buffers),
+    process peak rss MB the high-water mark of the whole process when the stage is done
+    Caches are written under out_dir (a temporary directory, removed after, by default)
+    Returns list of dicts: exchange, stage, sec, rows/sec, MB/sec (of stage input), stage peak MB,
+    process peak rss MB
+    """
+    from feather_helpers import FeatherInfo, FeatherStreamWriter
+    from tardis_synthetic import write_synthetic_cache, default_date
+    from tardis_trade_columns import TradeColumnBuffers
+    from tardis_trade_extractors import ret_trade_extractor
+    from tardis_msg_normalization import normalize_table_timestamps
+
+    tmp_dir = tempfile.mkdtemp(prefix='tardis_bench_') if out_dir is None else None
+    root_dir = out_dir if out_dir is not None else tmp_dir
+    results = []
+    try:
+        for exch in exchanges:
+            exch_dir = os.path.join(root_dir, exch)
+            shutil.rmtree(exch_dir, ignore_errors=True)
+            file_paths = write_synthetic_cache(exch_dir, exch, default_date, num_msgs, hours)
+            gz_bytes = sum(os.path.getsize(f) for f in file_paths)
+            extractor = ret_trade_extractor(exch)
+
+            def read_lines():
+                return [l for f in file_paths for l in iter_gzip_lines(f)]
+
+            def build_table():
+                col_buffers = TradeColumnBuffers(exch)
+                for l, rows in zip(lines, row_lists):
+                    col_buffers.append_rows(rows, l[:l.find(b' ')])
+                return col_buffers.to_table()
+
+            def write_table():
+                with FeatherStreamWriter(FeatherInfo(os.path.join(exch_dir, 'trd_bench'), 'lz4')) as writer:
+                    writer.write(tbl)
+                return os.path.getsize(writer.path)
+
+            stages = []
+
+            def run_stage(stage, func, stage_bytes=None):
+                result, sec, peak_mb = time_stage(func, repeats)
+                stages.append((stage, sec, stage_bytes, peak_mb, ret_process_peak_rss_mb()))
+                return result
+
+            lines = run_stage('decompress', read_lines, gz_bytes)
+            raw_bytes = sum(len(l) + 1 for l in lines)
+            messages = run_stage('json', lambda: [json_helpers.parse_msg_line(l) for l in lines], raw_bytes)
+            row_lists = run_stage('extract', lambda: [extractor(message) for message in messages])
+            raw_tbl = run_stage('columns', build_table)
+            tbl = run_stage('timestamps', lambda: normalize_table_timestamps(raw_tbl, exch), raw_tbl.nbytes)
+            feather_bytes = run_stage('write', write_table, tbl.nbytes)
+
+            rows = len(tbl)
+            for stage, sec, stage_bytes, peak_mb, rss_mb in stages:
+                results.append({'exchange': exch, 'stage': stage, 'sec': sec, 'rows/sec': rows / sec,
+                                'MB/sec': stage_bytes / sec / 1e6 if stage_bytes is not None else None,
+                                'stage peak MB': peak_mb, 'process peak rss MB': rss_mb})
+            total_sec = sum(stage[1] for stage in stages)
+            results.append({'exchange': exch, 'stage': 'total', 'sec': total_sec, 'rows/sec': rows / total_sec,
+                            'MB/sec': gz_bytes / total_sec / 1e6, 'stage peak MB': max(stage[3] for stage in stages),
+                            'process peak rss MB': ret_process_peak_rss_mb()})
+            print(exch+': '+str(len(lines))+' msgs, '+str(rows)+' trades, '+str(np.round(gz_bytes/1e6, 3))+' MB gz, '
+                  +str(np.round(raw_bytes/1e6, 3))+' MB raw, '+str(np.round(feather_bytes/1e6, 3))+' MB feather')
+            del lines, messages, row_lists, raw_tbl, tbl
+    finally:
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return results
+
+
+def print_results(results):
+    if len(results) == 0:
+        return
+    cols = list(results[0].keys())
+    print(' | '.join(cols))
+    for r in results:
+        print(' | '.join(str(np.round(r[c], 3)) if type(r[c]) is float else str(r[c]) for c in cols))
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest='bench', required=True)
+
+    workers_parser = subparsers.add_parser('workers', help="parse time vs # of worker processes")
+    workers_parser.add_argument("exchange", help='['+' | '.join(trades_norm_dict.keys())+' ]')
+    workers_parser.add_argument("cache_dir", help="Tardis cache directory holding .json.gz files")
+    workers_parser.add_argument("--workers", help="worker counts to compare (comma separated)",
+                                default=','.join(str(w) for w in [1, 2, 4, 8, os.cpu_count()]))
+    workers_parser.add_argument("--repeats", help="best of N runs", type=int, default=1)
+
+    json_parser = subparsers.add_parser('json', help="JSON backends per exchange message format")
+    json_parser.add_argument("exch_cache_dirs", nargs='+', help="exchange:cache_dir (one per exchange format)")
+    json_parser.add_argument("--max_lines", help="# of sample lines per exchange", type=int, default=100000)
+    json_parser.add_argument("--repeats", help="best of N runs", type=int, default=3)
+
+    extract_parser = subparsers.add_parser('extract', help="trade extraction rows/sec per exchange")
+    extract_parser.add_argument("exch_cache_dirs", nargs='+', help="exchange:cache_dir (one per exchange)")
+    extract_parser.add_argument("--max_lines", help="# of sample lines per exchange", type=int, default=100000)
+    extract_parser.add_argument("--repeats", help="best of N runs", type=int, default=3)
+
+    stages_parser = subparsers.add_parser('stages', help="per-stage timing & allocation peaks on synthetic caches (offline)")
+    stages_parser.add_argument("--exchanges", help="exchanges to generate caches for (comma separated)",
+                               default=','.join(examples_dict.keys()))
+    stages_parser.add_argument("--msgs", help="# of cached messages per exchange", type=int, default=100000)
+    stages_parser.add_argument("--hours", help="# of hourly sub-directories the messages are spread over", type=int, default=1)
+    stages_parser.add_argument("--repeats", help="best of N runs", type=int, default=3)
+    stages_parser.add_argument("--out_dir", help="keep the synthetic caches here (default: temporary directory)", default=None)
+
+    args = parser.parse_args()
+
+    if args.bench == 'workers':
+        worker_counts = sorted(set(int(w) for w in args.workers.split(',')))
+        print_results(bench_workers(args.cache_dir, args.exchange, worker_counts, args.repeats))
+
+    elif args.bench == 'json':
+        exch_cache_dirs = dict(a.split(':', 1) for a in args.exch_cache_dirs)
+        print_results(bench_json(exch_cache_dirs, args.max_lines, args.repeats))
+        print('\ndefault backend: '+json_helpers.json_backend)
+
+    elif args.bench == 'extract':
+        exch_cache_dirs = dict(a.split(':', 1) for a in args.exch_cache_dirs)
+        print_results(bench_extract(exch_cache_dirs, args.max_lines, args.repeats))
+
+    elif args.bench == 'stages':
+        print_results(bench_stages(args.exchanges.split(','), args.msgs, args.hours, args.repeats, args.out_dir))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,458 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from gzip_helpers import iter_gzip_lines
+from json_helpers import parse_msg_line
+from tardis_msg_normalization import parse_tardis_local_timestamps, local_timestamp_width, timestamp_ns_utc, \
+    dictionary_type
+from tardis_metrics import ret_metrics
+
+### L2 Order Book Reconstruction
+# Book channels (book_examples_dict) -> fixed-depth top-N samples as typed columns:
+# -> each exchange's messages are parsed into book updates
+#    (symbol, is snapshot, bid levels, ask levels, sequence #, max depth), levels = [price, size]
+#    with size 0 = level removed (sizes are absolute, never increments)
+# -> each symbol's book is 2 sorted numpy (price, size) arrays per side: snapshots replace them,
+#    deltas are queued and merged in when the book is sampled (in place when they only change
+#    existing levels, else one stable sort + dedupe of old & new levels), so the numpy work is
+#    per sample, not per message (top max_depth feeds, e.g. Kraken, are merged every message)
+# -> every interval of Tardis local time, the top depth levels of every initialized book are
+#    sampled (as of the interval start: before the first message past it), interval None
+#    samples the books touched by every message instead
+# Output columns: sample_time, symbol, bid_px_1..N, bid_qty_1..N, ask_px_1..N, ask_qty_1..N
+# (level 1 = best, NaN past the book's depth)
+
+default_book_depth = 10
+default_book_interval = '1s'
+min_row_capacity = 1024
+
+
+def to_level_arrays(levels):
+    """
+    [[price, size], ...] (numbers or strings) -> (prices, sizes) float64 arrays
+    """
+    if len(levels) == 0:
+        return np.empty(0), np.empty(0)
+    levels = np.asarray(levels, dtype=np.float64).reshape(-1, 2)
+    return levels[:, 0], levels[:, 1]
+
+
+def concat_levels(pending):
+    """
+    Pending levels: [price, size] lists, or (n, 2) float arrays of levels -> (prices, sizes)
+    """
+    if isinstance(pending[0], np.ndarray) and pending[0].ndim == 2:
+        levels = np.concatenate(pending)
+        return levels[:, 0], levels[:, 1]
+    return to_level_arrays(pending)
+
+
+def ret_last_levels(px, qty):
+    """
+    (prices, sizes) sorted by price, keeping the last size of each price
+    """
+    order = np.argsort(px, kind='stable')
+    px = px[order]
+    qty = qty[order]
+    last = np.ones(len(px), dtype=bool)
+    last[:-1] = px[1:] != px[:-1]
+    return px[last], qty[last]
+
+
+def ret_snapshot_levels(px, qty):
+    """
+    Sorted (prices, sizes) of a full side: last size of each price, empty levels dropped
+    """
+    px, qty = ret_last_levels(px, qty)
+    keep = qty > 0
+    return px[keep], qty[keep]
+
+
+def apply_levels(px, qty, new_px, new_qty):
+    """
+    Sorted (prices, sizes) of a side after setting the new_px levels to new_qty, in order
+    (0 = remove, the last one wins when a price repeats):
+    in place when only existing levels change, else one stable sort + dedupe of old & new levels
+    """
+    if len(new_px) == 0:
+        return px, qty
+    if len(px) > 0:
+        idx = np.minimum(np.searchsorted(px, new_px), len(px) - 1)
+        if (new_qty > 0).all() and (px[idx] == new_px).all():
+            qty[idx] = new_qty
+            return px, qty
+    return ret_snapshot_levels(np.concatenate((px, new_px)), np.concatenate((qty, new_qty)))
+
+
+class SymbolBook:
+    """
+    Price level book of one symbol: bids & asks as sorted (ascending) price / size arrays
+    Deltas added are kept as chunks of levels until apply_pending(), so the arrays are
+    only merged once per sample instead of once per message
+    """
+
+    def __init__(self):
+        self.bid_px, self.bid_qty = np.empty(0), np.empty(0)
+        self.ask_px, self.ask_qty = np.empty(0), np.empty(0)
+        self.initialized = False
+        self.seq = None
+        self.snapshot = None
+        self.pending_bids = []
+        self.pending_asks = []
+
+    def add(self, snapshot, bids, asks):
+        """
+        Queue one update (a snapshot drops the updates queued before it)
+        """
+        if snapshot:
+            self.snapshot = (bids, asks)
+            self.pending_bids = []
+            self.pending_asks = []
+            self.initialized = True
+        else:
+            # level lists are extended, level arrays (BitmexBookParser) queued whole
+            if isinstance(bids, np.ndarray):
+                if len(bids) > 0:
+                    self.pending_bids.append(bids)
+                if len(asks) > 0:
+                    self.pending_asks.append(asks)
+            else:
+                self.pending_bids.extend(bids)
+                self.pending_asks.extend(asks)
+
+    def apply_pending(self, max_depth=None):
+        if self.snapshot is not None:
+            self.bid_px, self.bid_qty = ret_snapshot_levels(*to_level_arrays(self.snapshot[0]))
+            self.ask_px, self.ask_qty = ret_snapshot_levels(*to_level_arrays(self.snapshot[1]))
+            self.snapshot = None
+        if len(self.pending_bids) > 0:
+            self.bid_px, self.bid_qty = apply_levels(self.bid_px, self.bid_qty, *concat_levels(self.pending_bids))
+            self.pending_bids = []
+        if len(self.pending_asks) > 0:
+            self.ask_px, self.ask_qty = apply_levels(self.ask_px, self.ask_qty, *concat_levels(self.pending_asks))
+            self.pending_asks = []
+        if max_depth is not None:
+            # feeds of the top max_depth levels do not remove the levels falling out of it
+            self.bid_px, self.bid_qty = self.bid_px[-max_depth:], self.bid_qty[-max_depth:]
+            self.ask_px, self.ask_qty = self.ask_px[:max_depth], self.ask_qty[:max_depth]
+
+    def apply(self, snapshot, bids, asks, max_depth=None):
+        self.add(snapshot, bids, asks)
+        self.apply_pending(max_depth)
+
+    def fill_top_levels(self, row, depth):
+        """
+        Write the top depth levels into row (4*depth floats: bid px, bid qty, ask px, ask qty)
+        """
+        self.apply_pending()
+        row.fill(np.nan)
+        n = min(depth, len(self.bid_px))
+        row[:n] = self.bid_px[::-1][:n]
+        row[depth:depth+n] = self.bid_qty[::-1][:n]
+        n = min(depth, len(self.ask_px))
+        row[2*depth:2*depth+n] = self.ask_px[:n]
+        row[3*depth:3*depth+n] = self.ask_qty[:n]
+
+
+### Book Message Parsers
+# Callable per exchange: decoded message -> list of book updates
+# (symbol, snapshot, bids, asks, seq, max_depth); seq: updates with a seq <= the book's are stale
+
+def parse_binance_book_msg(message):
+    stream = message.get('stream', '')
+    data = message.get('data')
+    if type(data) is not dict:
+        return []
+    if stream.endswith('@depthSnapshot'):
+        return [(stream.split('@')[0].upper(), True, data['bids'], data['asks'], data.get('lastUpdateId'), None)]
+    if data.get('e') == 'depthUpdate':
+        return [(data['s'], False, data['b'], data['a'], data.get('u'), None)]
+    return []
+
+
+def parse_okex_book_msg(message):
+    if 'depth' not in str(message.get('table', '')):
+        return []
+    snapshot = message.get('action') == 'partial'
+    return [(book['instrument_id'], snapshot, [level[:2] for level in book.get('bids', [])],
+             [level[:2] for level in book.get('asks', [])], None, None) for book in message.get('data', [])]
+
+
+def parse_huobi_book_msg(message):
+    ch = str(message.get('ch', ''))
+    tick = message.get('tick')
+    if '.depth.' not in ch or type(tick) is not dict:
+        return []
+    # depth.size_150.high_freq (Huobi DM) sends a snapshot then updates of the changed levels only
+    # (tick.event, size 0 = removed); depth.step<n> channels send full books (no event)
+    return [(ch.split('.')[1], tick.get('event', 'snapshot') == 'snapshot', tick.get('bids') or [],
+             tick.get('asks') or [], tick.get('version'), None)]
+
+
+def parse_ftx_book_msg(message):
+    data = message.get('data')
+    if message.get('channel') != 'orderbook' or type(data) is not dict:
+        return []
+    return [(message['market'], data.get('action') == 'partial', data.get('bids', []), data.get('asks', []),
+             None, None)]
+
+
+def parse_coinbase_book_msg(message):
+    msg_type = message.get('type')
+    if msg_type == 'snapshot':
+        return [(message['product_id'], True, message['bids'], message['asks'], None, None)]
+    if msg_type == 'l2update':
+        changes = message['changes']
+        return [(message['product_id'], False, [change[1:] for change in changes if change[0] == 'buy'],
+                 [change[1:] for change in changes if change[0] != 'buy'], None, None)]
+    return []
+
+
+def parse_deribit_book_msg(message):
+    try:
+        data = message['params']['data']
+        if not message['params']['channel'].startswith('book.'):
+            return []
+    except (KeyError, TypeError):
+        return []
+
+    def levels(side):
+        return [[level[1], 0 if level[0] == 'delete' else level[2]] for level in data.get(side, [])]
+
+    return [(data['instrument_name'], data.get('type') == 'snapshot', levels('bids'), levels('asks'),
+             data.get('change_id'), None)]
+
+
+def parse_kraken_book_msg(message):
+    # [channel id, {as / bs: snapshot levels} or {a / b: updates} (x 1 or 2), 'book-<depth>', pair]
+    if type(message) is not list or len(message) < 4 or not str(message[-2]).startswith('book'):
+        return []
+    max_depth = int(message[-2].split('-')[1]) if '-' in message[-2] else None
+    updates = []
+    for data in message[1:-2]:
+        snapshot = 'as' in data or 'bs' in data
+        bids = [level[:2] for level in data.get('bs' if snapshot else 'b', [])]
+        asks = [level[:2] for level in data.get('as' if snapshot else 'a', [])]
+        updates.append((message[-1], snapshot, bids, asks, None, max_depth))
+    return updates
+
+
+class BitmexBookParser:
+    """
+    orderBookL2: levels are keyed by id (one id per price), update / delete messages
+    may carry the id only: the prices of the ids seen are kept in sorted numpy arrays
+    (new ids inserted at their searchsorted positions, no re-sort)
+    Levels are returned as (n, 2) float arrays
+    """
+
+    def __init__(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.id_prices = np.empty(0)
+
+    def _find(self, ids):
+        """
+        (searchsorted positions of ids, found mask)
+        """
+        idx = np.searchsorted(self.ids, ids)
+        found = np.zeros(len(ids), dtype=bool)
+        in_range = idx < len(self.ids)
+        found[in_range] = self.ids[idx[in_range]] == ids[in_range]
+        return idx, found
+
+    def _remember(self, ids, prices):
+        order = np.argsort(ids, kind='stable')
+        ids, prices = ids[order], prices[order]
+        last = np.ones(len(ids), dtype=bool)
+        last[:-1] = ids[1:] != ids[:-1]
+        ids, prices = ids[last], prices[last]
+        idx, found = self._find(ids)
+        self.id_prices[idx[found]] = prices[found]
+        if not found.all():
+            self.ids = np.insert(self.ids, idx[~found], ids[~found])
+            self.id_prices = np.insert(self.id_prices, idx[~found], prices[~found])
+
+    def _prices(self, ids):
+        idx, found = self._find(ids)
+        prices = np.full(len(ids), np.nan)
+        prices[found] = self.id_prices[idx[found]]
+        return prices
+
+    def __call__(self, message):
+        if message.get('table') != 'orderBookL2' or len(message.get('data', [])) == 0:
+            return []
+        action = message.get('action')
+        data = message['data']
+        ids = np.array([level['id'] for level in data], dtype=np.int64)
+        prices = np.array([level.get('price', np.nan) for level in data], dtype=np.float64)
+        if action in ('partial', 'insert'):
+            self._remember(ids, prices)
+        missing = np.isnan(prices)
+        if missing.any():
+            prices[missing] = self._prices(ids[missing])
+        sizes = np.zeros(len(data)) if action == 'delete' else \
+            np.array([level.get('size', 0) for level in data], dtype=np.float64)
+
+        updates = []
+        symbols = np.array([level['symbol'] for level in data])
+        is_bid = np.array([level['side'] == 'Buy' for level in data])
+        levels = np.column_stack((prices, sizes))
+        for symbol in dict.fromkeys(symbols.tolist()):
+            rows = (symbols == symbol) & ~np.isnan(prices)
+            updates.append((symbol, action == 'partial', levels[rows & is_bid], levels[rows & ~is_bid], None, None))
+        return updates
+
+
+book_msg_parsers = {
+    'bitmex': BitmexBookParser,
+    'binance': lambda: parse_binance_book_msg,
+    'binance-futures': lambda: parse_binance_book_msg,
+    'binance-delivery': lambda: parse_binance_book_msg,
+    'okex-swap': lambda: parse_okex_book_msg,
+    'okex-futures': lambda: parse_okex_book_msg,
+    'huobi': lambda: parse_huobi_book_msg,
+    'huobi-dm': lambda: parse_huobi_book_msg,
+    'huobi-dm-swap': lambda: parse_huobi_book_msg,
+    'ftx': lambda: parse_ftx_book_msg,
+    'coinbase': lambda: parse_coinbase_book_msg,
+    'kraken': lambda: parse_kraken_book_msg,
+    'deribit': lambda: parse_deribit_book_msg
+}
+
+
+def ret_book_msg_parser(exch):
+    """
+    A fresh book message parser of an exchange (some keep state across messages)
+    """
+    if exch not in book_msg_parsers:
+        raise ValueError('No book parser for exchange: '+exch)
+    return book_msg_parsers[exch]()
+
+
+def ret_book_cols(depth):
+    return ['bid_px_'+str(i) for i in range(1, depth+1)] + ['bid_qty_'+str(i) for i in range(1, depth+1)] \
+        + ['ask_px_'+str(i) for i in range(1, depth+1)] + ['ask_qty_'+str(i) for i in range(1, depth+1)]
+
+
+class BookSampler:
+    """
+    Rebuild the books of one exchange from its cached book channel lines (in time order)
+    and sample their top depth levels every interval of Tardis local time
+    (interval None: after every message, for the symbols it updated)
+    add_file(path) / add_lines(lines) as many times as needed, flush() -> Arrow table of the new samples
+    """
+
+    def __init__(self, exch, depth=default_book_depth, interval=default_book_interval):
+        self.exch = exch
+        self.depth = depth
+        self.interval_ns = pd.Timedelta(interval).value if interval is not None else None
+        self.parser = ret_book_msg_parser(exch)
+        self.books = {}
+        self.next_sample = None
+        self.cols = ret_book_cols(depth)
+        self.row = np.empty(4*depth)
+        self.reset()
+
+    def reset(self):
+        self.values = np.empty((min_row_capacity, 4*self.depth))
+        self.times = np.empty(min_row_capacity, dtype=np.int64)
+        self.symbols = []
+        self.num_rows = 0
+
+    def __len__(self):
+        return self.num_rows
+
+    def _reserve(self, num_rows):
+        if self.num_rows + num_rows <= len(self.times):
+            return
+        capacity = max(2*len(self.times), self.num_rows + num_rows)
+        values = np.empty((capacity, 4*self.depth))
+        values[:self.num_rows] = self.values[:self.num_rows]
+        times = np.empty(capacity, dtype=np.int64)
+        times[:self.num_rows] = self.times[:self.num_rows]
+        self.values, self.times = values, times
+
+    def _sample(self, symbol, times):
+        """
+        Append the top levels of a symbol's book as of each of times
+        """
+        book = self.books[symbol]
+        self._reserve(len(times))
+        book.fill_top_levels(self.row, self.depth)
+        self.values[self.num_rows:self.num_rows+len(times)] = self.row
+        self.times[self.num_rows:self.num_rows+len(times)] = times
+        self.symbols.extend([symbol]*len(times))
+        self.num_rows += len(times)
+
+    def _sample_until(self, t):
+        """
+        Sample all initialized books at every interval start <= t not sampled yet
+        """
+        if self.next_sample is None:
+            self.next_sample = t - t % self.interval_ns + self.interval_ns
+            return
+        if t < self.next_sample:
+            return
+        times = np.arange(self.next_sample, t + 1, self.interval_ns, dtype=np.int64)
+        for symbol, book in self.books.items():
+            if book.initialized:
+                self._sample(symbol, times)
+        self.next_sample = int(times[-1]) + self.interval_ns
+
+    def add_message(self, message, t):
+        """
+        Apply one decoded book message received at t (Tardis local time, ns)
+        Returns # of book updates applied
+        """
+        if self.interval_ns is not None:
+            self._sample_until(t)
+        num_updates = 0
+        for symbol, snapshot, bids, asks, seq, max_depth in self.parser(message):
+            book = self.books.get(symbol)
+            if book is None:
+                book = self.books[symbol] = SymbolBook()
+            if not snapshot and (not book.initialized or (seq is not None and book.seq is not None and seq <= book.seq)):
+                continue
+            if max_depth is None:
+                book.add(snapshot, bids, asks)
+            else:
+                book.apply(snapshot, bids, asks, max_depth)
+            book.seq = seq
+            num_updates += 1
+            if self.interval_ns is None:
+                self._sample(symbol, [t])
+        return num_updates
+
+    def add_lines(self, lines):
+        """
+        Apply cached lines (bytes, '<local timestamp> <json>') in order
+        Returns # of book updates applied
+        """
+        if len(lines) == 0:
+            return 0
+        times = parse_tardis_local_timestamps(b''.join(l[:local_timestamp_width] for l in lines), len(lines))
+        num_updates = 0
+        for l, t in zip(lines, times.tolist()):
+            num_updates += self.add_message(parse_msg_line(l), t)
+        return num_updates
+
+    def add_file(self, file_path):
+        with ret_metrics().timed('book_file') as stage:
+            lines = list(iter_gzip_lines(file_path))
+            stage.msgs += len(lines)
+            num_updates = self.add_lines(lines)
+            stage.rows += num_updates
+        return num_updates
+
+    def flush(self):
+        """
+        Arrow table of the samples taken since the last flush (sample_time, symbol, top level columns)
+        """
+        columns = {'sample_time': pa.array(self.times[:self.num_rows], pa.int64()).cast(timestamp_ns_utc),
+                   'symbol': pa.array(self.symbols, pa.string()).cast(dictionary_type)}
+        values = self.values[:self.num_rows]
+        for i, col in enumerate(self.cols):
+            columns[col] = pa.array(np.ascontiguousarray(values[:, i]))
+        tbl = pa.table(columns)
+        self.reset()
+        return tbl
@@ -0,0 +1,309 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+
+import pandas as pd
+from pyarrow.feather import read_table
+
+from feather_helpers import FeatherInfo, write_feather_frame, ret_feather_part_paths
+
+### Deterministic Cache Layout
+# <cache_root>/<exchange>_<YYYYMMDD>_<channel>_<symbols hash>/
+#     feeds/...                 raw Tardis .json.gz files (written by TardisClient)
+#     parsed/<hour key>.arrow   parsed trades of one cached (hourly) sub-directory
+#     manifest.json             checksums of the above + the final output
+#
+# Re-running the same request reuses the raw files (TardisClient skips cached
+# slices), the parsed hours whose raw files are unchanged, and the final output
+
+manifest_file_name = 'manifest.json'
+parsed_dir_name = 'parsed'
+# bump whenever the layout of parsed tables changes: older parsed hours / outputs are then re-parsed
+parsed_format_version = 3
+
+
+def request_cache_key(request):
+    """
+    Directory name for a DownloadRequest: the same (exchange, date, channel, symbols)
+    always map to the same directory (the api key is not part of it)
+    """
+    date_str = pd.Timestamp(request.date).strftime('%Y%m%d')
+    channel = re.sub(r'[^0-9A-Za-z-]+', '-', request.msg_type)
+    symbols_hash = hashlib.sha256(json.dumps(sorted(request.symbols)).encode('utf-8')).hexdigest()[:16]
+    return '_'.join([request.exchange, date_str, channel, symbols_hash])
+
+
+def file_sha256(path, chunk_size=1<<20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def path_sha256(path):
+    """
+    sha256 of a file, or of the (relative path, sha256) of every file under a directory
+    """
+    if not os.path.isdir(path):
+        return file_sha256(path)
+    digest = hashlib.sha256()
+    for subdir, dirs, files in sorted(os.walk(path)):
+        for f in sorted(files):
+            file_path = os.path.join(subdir, f)
+            digest.update((os.path.relpath(file_path, path)+':'+file_sha256(file_path)+'\n').encode('utf-8'))
+    return digest.hexdigest()
+
+
+def dir_size(dir_path):
+    return sum(os.path.getsize(os.path.join(subdir, f)) for subdir, dirs, files in os.walk(dir_path) for f in files)
+
+
+class CacheManifest:
+    """
+    manifest.json of one request cache directory:
+    {
+     'request': exchange / date / channel / symbols,
+     'hours': {hour key: {'raw': {file: [size, sha256]}, 'parsed': [file, rows, sha256]}},
+     'output': [file or dataset partition dir, rows, sha256, parts] of the final output (None until done),
+               parts: the symbol partitions of the dataset partition dir written by this request
+               (only those are hashed: other requests write other symbols of the same exchange / date)
+     'output_parts': [dataset partition dir, parts] last written, removed before writing it again
+                     (kept when the output is invalidated, so partitions of symbols without new data go too)
+     'last_used': unix time (for LRU eviction),
+     'format': parsed_format_version the parsed files were written with,
+     'options': non-default parsing options the parsed files were written with (e.g. keep_extras),
+     'output_options': non-default options the output was written with (e.g. order),
+     'append': {'until': end of the last window appended, 'output': [file or dir, rows, size]}
+               of an output built incrementally (None otherwise)
+    }
+    Parsed hours and output written with another format or other options are parsed again,
+    an output written with other output options is written again
+    Hour keys are the sub-directory paths relative to the cache directory
+    """
+
+    def __init__(self, cache_dir, request, options=None, output_options=None):
+        options = {key: value for key, value in (options or {}).items() if value}
+        output_options = {key: value for key, value in (output_options or {}).items() if value}
+        self.cache_dir = Path(cache_dir)
+        self.path = self.cache_dir / manifest_file_name
+        self.data = {'request': {'exchange': request.exchange, 'date': str(request.date),
+                                 'channel': request.msg_type, 'symbols': sorted(request.symbols)},
+                     'hours': {}, 'output': None, 'output_parts': None, 'append': None, 'last_used': None,
+                     'format': parsed_format_version, 'options': options, 'output_options': output_options}
+        if self.path.is_file():
+            with open(self.path, 'r') as f:
+                self.data.update(json.load(f))
+        if self.data.get('format') != parsed_format_version or self.data.get('options', {}) != options:
+            self.data.update({'hours': {}, 'output': None, 'append': None, 'format': parsed_format_version,
+                              'options': options})
+        if self.data.get('output_options', {}) != output_options:
+            self.data.update({'output': None, 'append': None, 'output_options': output_options})
+        self.touch()
+
+    def save(self):
+        tmp_path = str(self.path) + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.data, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def touch(self):
+        self.data['last_used'] = time.time()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.save()
+
+    def hour_key(self, dir_path):
+        return Path(os.path.relpath(dir_path, self.cache_dir)).as_posix()
+
+    def _check_file(self, rel_path, sha256):
+        path = self.cache_dir / rel_path
+        return path.exists() and path_sha256(path) == sha256
+
+    ## Parsed hours
+
+    def _raw_files(self, dir_path):
+        return sorted(f for f in os.listdir(dir_path) if f.endswith('.json.gz'))
+
+    def has_parsed(self, dir_path):
+        """
+        True if the sub-directory was parsed before and neither its raw files
+        nor the parsed output changed since
+        """
+        entry = self.data['hours'].get(self.hour_key(dir_path))
+        if entry is None or entry.get('parsed') is None:
+            return False
+        raw_files = self._raw_files(dir_path)
+        if raw_files != sorted(entry['raw'].keys()):
+            return False
+        for f in raw_files:
+            size, sha256 = entry['raw'][f]
+            path = os.path.join(dir_path, f)
+            if os.path.getsize(path) != size or file_sha256(path) != sha256:
+                return False
+        parsed_file, rows, sha256 = entry['parsed']
+        return self._check_file(parsed_file, sha256)
+
+    def load_parsed(self, dir_path):
+        parsed_file = self.data['hours'][self.hour_key(dir_path)]['parsed'][0]
+        return read_table(str(self.cache_dir / parsed_file))
+
+    def save_parsed(self, dir_path, table):
+        hour_key = self.hour_key(dir_path)
+        parsed_file = Path(parsed_dir_name, hour_key.replace('/', '_') + '.arrow').as_posix()
+        os.makedirs(self.cache_dir / parsed_dir_name, exist_ok=True)
+        write_feather_frame(FeatherInfo(str(self.cache_dir / parsed_file), "lz4"), table)
+
+        raw = {}
+        for f in self._raw_files(dir_path):
+            path = os.path.join(dir_path, f)
+            raw[f] = [os.path.getsize(path), file_sha256(path)]
+        self.data['hours'][hour_key] = {'raw': raw,
+                                        'parsed': [parsed_file, len(table), file_sha256(self.cache_dir / parsed_file)]}
+        self.save()
+
+    ## Final output
+
+    def _output_file(self, output_path):
+        return Path(os.path.relpath(output_path, self.cache_dir)).as_posix()
+
+    def is_complete(self, output_path=None):
+        """
+        True if the final output of this request exists and is unchanged
+        (and, if given, was written to output_path)
+        """
+        if self.data['output'] is None:
+            return False
+        output_file, rows, sha256 = self.data['output'][:3]
+        parts = self.data['output'][3] if len(self.data['output']) > 3 else None
+        if output_path is not None and output_file != self._output_file(output_path):
+            return False
+        path = self.cache_dir / output_file
+        if not path.exists() or (parts is not None and not all((path / part).is_dir() for part in parts)):
+            return False
+        return self._output_sha256(path, parts) == sha256
+
+    def output_path(self):
+        return self.cache_dir / self.data['output'][0]
+
+    def _output_sha256(self, output_path, parts=None):
+        if parts is None:
+            # a file and the windows appended to it (<file>.part<n>) are hashed as its parts
+            file_paths = ret_feather_part_paths(output_path)
+            if len(file_paths) < 2:
+                return path_sha256(output_path)
+            parts = [os.path.basename(file_path) for file_path in file_paths]
+            output_path = os.path.dirname(str(output_path))
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update((part+':'+path_sha256(os.path.join(output_path, part))+'\n').encode('utf-8'))
+        return digest.hexdigest()
+
+    def save_output(self, output_path, rows, parts=None):
+        """
+        Record the final output (parts: the dataset partitions of output_path it is made of,
+        None = all of output_path)
+        """
+        self.data['output'] = [self._output_file(output_path), int(rows), self._output_sha256(output_path, parts), parts]
+        if parts is not None:
+            self.data['output_parts'] = [self._output_file(output_path), parts]
+        self.save()
+
+    def output_parts(self, output_path):
+        """
+        The dataset partitions of output_path written for this request so far ([] if none)
+        """
+        entry = self.data.get('output_parts')
+        if entry is None or entry[0] != self._output_file(output_path):
+            return []
+        return entry[1]
+
+    def remove_output_parts(self, output_path):
+        """
+        Delete the dataset partitions last written for this request, before it is written again
+        Returns list of the directories removed
+        """
+        removed = []
+        for part in self.output_parts(output_path):
+            path = Path(output_path) / part
+            if path.is_dir():
+                shutil.rmtree(path)
+                removed.append(path)
+        self.data['output_parts'] = None
+        self.save()
+        return removed
+
+    ## Incremental output (appended window by window)
+
+    def _output_size(self, output_path):
+        # files are checked by the total size of the file and its window parts (hashing them every
+        # window would cost O(day)), dataset partition dirs (shared with other requests) by existence only
+        file_paths = ret_feather_part_paths(output_path)
+        return sum(os.path.getsize(file_path) for file_path in file_paths) if file_paths else None
+
+    def appended_until(self, output_path):
+        """
+        (end of the last window appended to output_path, rows appended so far),
+        (None, 0) if nothing was appended or the output changed since (e.g. rewritten by a full run)
+        """
+        entry = self.data.get('append')
+        if entry is None:
+            return None, 0
+        output_file, rows, size = entry['output']
+        path = self.cache_dir / output_file
+        if output_file != self._output_file(output_path) or not path.exists() or self._output_size(path) != size:
+            return None, 0
+        return entry['until'], rows
+
+    def save_append(self, output_path, rows, until, parts=None):
+        """
+        Record a window appended (until = its end, parts: dataset partitions it was written to):
+        the output is not complete until the end of the day
+        """
+        self.data['append'] = {'until': until,
+                               'output': [self._output_file(output_path), int(rows), self._output_size(output_path)]}
+        self.data['output'] = None
+        if parts is not None:
+            parts = sorted(set(self.output_parts(output_path)) | set(parts))
+            self.data['output_parts'] = [self._output_file(output_path), parts]
+        self.save()
+
+
+### LRU Eviction
+
+def evict_lru_cache_dirs(cache_root, max_bytes, keep=()):
+    """
+    Delete the least recently used request cache directories under cache_root
+    until their total size is at most max_bytes.
+    Directories in keep (e.g. the one in use) are never deleted.
+    Returns list of deleted directories
+    """
+
+    keep = set(Path(k).resolve() for k in keep)
+    entries = []
+    for name in os.listdir(cache_root):
+        cache_dir = Path(cache_root) / name
+        manifest_path = cache_dir / manifest_file_name
+        if not manifest_path.is_file():
+            continue
+        try:
+            with open(manifest_path, 'r') as f:
+                last_used = json.load(f).get('last_used') or 0
+        except ValueError:
+            last_used = 0
+        entries.append([last_used, cache_dir, dir_size(cache_dir)])
+
+    total_bytes = sum(e[2] for e in entries)
+    deleted = []
+    for last_used, cache_dir, size in sorted(entries, key=lambda e: e[0]):
+        if total_bytes <= max_bytes:
+            break
+        if cache_dir.resolve() in keep:
+            continue
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        total_bytes -= size
+        deleted.append(cache_dir)
+    return deleted
@@ -0,0 +1,123 @@
+import argparse
+import asyncio
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from feather_helpers import FeatherInfo, FeatherStreamWriter
+from tardis_request import DownloadRequest, TardisGenerator
+from tardis_msg_normalization import book_examples_dict
+from tardis_book import BookSampler, default_book_depth, default_book_interval
+from tardis_metrics import reset_metrics, save_metrics
+from tardis_get_trades import ret_sorted_cache_sub_dirs, ret_sorted_cache_file_paths
+from tardis_api import ret_config
+
+### Order Book Samples
+# Download (or reuse) a day of an exchange's book channel(s) (book_examples_dict) and save
+# top-N book samples every interval: book<depth>_<interval>_YYYYMMDD Feather file in the cache dir
+# (see tardis_book)
+
+
+async def cache_async_gen_msgs(msg_gen):
+    """
+    Iterate through the Tardis messages (so they are cached to disk)
+    Returns number of messages
+    """
+    num_msgs = 0
+    async for local_timestamp, message in msg_gen:
+        num_msgs += 1
+    return num_msgs
+
+
+def ret_book_output_info(root_cache_dir, dl_date, depth, interval):
+    name = 'book'+str(depth)+'_'+(interval if interval is not None else 'all')+'_'+pd.Timestamp(dl_date).strftime('%Y%m%d')
+    return FeatherInfo(os.path.join(root_cache_dir, name), "lz4")
+
+
+def tardis_parse_book_cache_dir(root_cache_dir, exch, dl_date, depth=default_book_depth, interval=default_book_interval,
+                                output_info=None):
+    """
+    For all Tardis sub-directories of a book channel cache (in time order):
+    -> apply the messages of their files to the books (see BookSampler)
+    -> append the samples taken to the output Feather file
+       (root_cache_dir/book<depth>_<interval>_YYYYMMDD by default)
+
+    Books are carried from one sub-directory to the next, only the samples of one are held in memory
+    Returns number of samples written
+    """
+    if output_info is None:
+        output_info = ret_book_output_info(root_cache_dir, dl_date, depth, interval)
+    sampler = BookSampler(exch, depth, interval)
+
+    with FeatherStreamWriter(output_info) as writer:
+        for dir_path in ret_sorted_cache_sub_dirs(root_cache_dir):
+            for file_path in ret_sorted_cache_file_paths(dir_path):
+                sampler.add_file(file_path)
+            writer.write(sampler.flush())
+            print(dir_path)
+        if writer.writer is None:
+            writer.write(sampler.flush())
+
+    print('Done Saving Book Samples: ')
+    print('-> output path: '+str(writer.path))
+    print('-> # of rows: '+str(writer.num_rows))
+    print('-> symbols: '+str(sorted(sampler.books.keys())))
+    print('---')
+    return writer.num_rows
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("exchange", help='['+' | '.join(book_examples_dict.keys())+' ]')
+    parser.add_argument("date", help="date at YYYY-MM-DD")
+    parser.add_argument("symbols", help="remote exchange symbols (comma separated)")
+    parser.add_argument("--cache_dir", help="Cache Source (default: CACHE_DIR setting)", default=None)
+    parser.add_argument("--api_key", help="Api Key (default: TARDIS_KEY setting)", default=None)
+    parser.add_argument("--channels", help="Tardis book channel(s), comma separated (default: book_examples_dict)", default=None)
+    parser.add_argument("--depth", help="# of levels sampled per side", type=int, default=default_book_depth)
+    parser.add_argument("--interval", help="sampling interval of Tardis local time, or 'none' to sample every update",
+                        default=default_book_interval)
+    parser.add_argument("--metrics", help="write per-stage timings to this JSON file", default=None)
+
+    args = parser.parse_args()
+    args.cache_dir = ret_config('CACHE_DIR', args.cache_dir)
+    args.api_key = ret_config('TARDIS_KEY', args.api_key)
+
+    exch = args.exchange
+    dl_date = args.date
+    dl_dtype = args.channels if args.channels is not None else book_examples_dict[exch]['dl_dtype']
+    dl_symbols = args.symbols.split(',')
+    interval = None if args.interval.lower() == 'none' else args.interval
+    reset_metrics()
+
+    print('\nParsed Arguments:\n***')
+    print('exch: '+exch)
+    print('dl_date: '+str(dl_date))
+    print('dl_dtype: '+dl_dtype)
+    print('dl_symbols: '+str(dl_symbols))
+    print('depth: '+str(args.depth)+' | interval: '+str(interval))
+    print('***\n')
+
+    request = DownloadRequest(dl_date, exch, dl_dtype, dl_symbols, args.cache_dir, args.api_key)
+    generator = TardisGenerator(request, decode_response=False)
+
+    t1 = time.time()
+    num_messages = asyncio.run(cache_async_gen_msgs(generator.messages))
+    t2 = time.time()
+    print('-> total messages = '+str(num_messages)+' (download & cache took '+str(np.round(t2-t1,3))+' sec)')
+    if num_messages == 0:
+        print('Query Failed and Returned Empty Data Set. Exiting.')
+        return 0
+
+    tardis_parse_book_cache_dir(generator.path, exch, dl_date, args.depth, interval)
+    print('\nProcessing Data Took '+str(np.round(time.time()-t2,3))+' sec')
+
+    if args.metrics is not None:
+        save_metrics(args.metrics, exchange=exch, date=dl_date, symbols=args.symbols, channels=dl_dtype)
+
+if __name__ == '__main__':
+    main()
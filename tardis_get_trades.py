@@ -2,258 +2,358 @@ import argparse
 from feather_helpers import FeatherInfo
 
 from tardis_request import DownloadRequest, TardisGenerator
-from feather_helpers import write_feather_frame
+from tardis_cache import CacheManifest, evict_lru_cache_dirs
+from feather_helpers import FeatherStreamWriter
+from dataset_helpers import DatasetInfo, DatasetStreamWriter, ret_partition_dir
+from tardis_bars import BarAggregator, ret_bars_output_info
+from tardis_metrics import ret_metrics, reset_metrics, collect_metrics, save_metrics, profiled
+from tardis_api import ret_config, aiter_trade_tables
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 import time
 from dateutil import tz
 
 # process tardis messages
 import asyncio
 
+# parallel parsing of cache sub-directories
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+
 # i/o
 import os
-import ujson
-import json
-import gzip
+from gzip_helpers import iter_gzip_lines
+from json_helpers import parse_msg_line
+from tardis_raw_index import RawIndexWriter, read_raw_index, has_raw_index, ret_row_symbols, build_raw_index_dir
 
 # normalization dictionary in separate file to keep code cleaner
 from tardis_msg_normalization import *
+# single pass column buffers
+from tardis_trade_columns import TradeColumnBuffers
+# post-parse sorting / dedupe / gap checks
+from tardis_trade_order import TradeOrderReport, iter_ordered_tables
 # cythonized file
 import tardis_msg_counter
 from tardis_msg_counter import ret_all_subdir_file_paths
 
 ### Default Global Settings
-from decouple import config  
-api_key = config('TARDIS_KEY')
-default_cache_dir = config('CACHE_DIR')
+# (TARDIS_KEY / CACHE_DIR settings are read by main, see ret_config)
 msg_thrsh_process_file_by_file = 1000000
+stream_flush_rows = 100000
+# minutes more recent than this may not be published by Tardis yet: --append windows end before them
+append_safe_lag = pd.Timedelta(minutes=15)
 
 ### Helper Functions
 
-def format_houbi_ch_field(ch_field_str):
-    if ch_field_str.startswith('market.') & ch_field_str.endswith('.trade.detail'):
-        ch_field_str = ch_field_str.replace('market.','')
-        ch_field_str = ch_field_str.replace('.trade.detail','')
-    return ch_field_str
+def ret_output_writer(output_info, exch, dl_date, append=False):
+    """
+    Stream writer of the output: one Feather file (FeatherInfo)
+    or the exchange / date partitions of a dataset (DatasetInfo)
+    (append: add to the existing output instead of replacing it)
+    """
+    if isinstance(output_info, DatasetInfo):
+        return DatasetStreamWriter(output_info, exch, dl_date, append)
+    return FeatherStreamWriter(output_info, append)
+
+
+def ret_append_window(dl_date, appended_until=None, until=None):
+    """
+    [from_date, to_date) of the next window to append (ISO, UTC, minute precision):
+    from the end of the last window appended (or midnight) to until (default now), within dl_date
+    and at most now - append_safe_lag (minutes not published yet would never be fetched again)
+    Returns None if there is no new full minute yet
+    """
+    day_start = pd.Timestamp(pd.Timestamp(dl_date).strftime('%Y-%m-%d'))
+    start = pd.Timestamp(appended_until) if appended_until is not None else day_start
+    safe_end = pd.Timestamp.now(tz='UTC').tz_localize(None) - append_safe_lag
+    end = pd.Timestamp(until) if until is not None else safe_end
+    end = end.tz_convert('UTC').tz_localize(None) if end.tzinfo is not None else end
+    end = min(end, safe_end).floor('min')
+    end = min(end, day_start + pd.Timedelta(days=1))
+    if end <= start:
+        return None
+    return start.isoformat(), end.isoformat()
+
+
+def write_trade_bars(bar_aggregators, output_info, exch, dl_date):
+    """
+    Write the bars of every BarAggregator next to the tick output (see tardis_bars)
+    """
+    for bar_aggregator in bar_aggregators:
+        with ret_output_writer(ret_bars_output_info(output_info, bar_aggregator.interval), exch, dl_date) as writer:
+            writer.write(bar_aggregator.to_table())
+        print('-> '+bar_aggregator.interval+' bars: '+str(writer.path)+' ('+str(writer.num_rows)+' bars)')
+
+
+def ret_timed_line_func(func, stage, ret_amounts):
+    """
+    func timed call by call into a metrics stage (ret_amounts(arg, result) -> amounts to add)
+    """
+    def timed_func(arg):
+        t = time.perf_counter()
+        result = func(arg)
+        stage.add(time.perf_counter() - t, calls=0, **ret_amounts(arg, result))
+        return result
+    return timed_func
+
 
-def tardis_cache_trade_zip_file_into_arr(file_path, arr_save_into, start_idx, exch):
+def tardis_cache_trade_zip_file_into_arr(file_path, col_buffers, exch, build_index=False):
     """
     For one Tardis gzip file:    
     -> Iterate through messages
-    -> Load each one into pre-created 2D numpy array starting at row start_idx
+    -> Append each trade straight into the growable column buffers
+       (single pass: no need to count the messages first)
+    -> With build_index (and no up to date index yet): write a copy of the file as
+       seekable blocks with a sidecar index in the same pass (see tardis_raw_index)
+    -> Record the file in the run metrics ('parse_file' stage, messages without trades,
+       JSON / extract stages with line_timing, see tardis_metrics)
     
-    Returns dictionary:
-    {
-     'start_idx': updated value start_idx (latest numpy array row inserted into),
-     'col_headings': data column headings
-    }
+    Returns number of trade messages appended
     """
     
-    line_data = None
-    sub_data = None
-    
-    # read the gzip file
-    with gzip.open(file_path, "r") as z:
-        json_bytes = z.read()
+    num_file_msgs = 0
+    num_lines = 0
+    extractor = col_buffers.extractor
+    metrics = ret_metrics()
+    t1 = time.perf_counter()
+
+    # optional per-line hooks: JSON decode / extraction timed line by line, raw index lines
+    parse, extract = parse_msg_line, extractor
+    if metrics.line_timing:
+        parse = ret_timed_line_func(parse_msg_line, metrics.ret_stage('json'), lambda l, out: {'bytes_in': len(l) + 1, 'msgs': 1})
+        extract = ret_timed_line_func(extractor, metrics.ret_stage('extract'), lambda line, rows: {'rows': len(rows)})
+    index_writer = RawIndexWriter(file_path) if build_index and read_raw_index(file_path) is None else None
+
+    try:
+        # stream the gzip file line by line (lines stay bytes: decoded by the JSON backend directly)
+        for l in iter_gzip_lines(file_path):
+            loaded_line = parse(l)
+            rows = extract(loaded_line)
+            num_file_msgs += col_buffers.append_rows(rows, l[:l.find(b' ')])
+            if len(rows) == 0:
+                extractor.count_skipped(loaded_line)
+            if index_writer is not None:
+                index_writer.add_line(l, ret_row_symbols(rows, extractor))
+            num_lines += 1
+    except BaseException:
+        if index_writer is not None:
+            index_writer.abort()
+        raise
+    if index_writer is not None:
+        index_writer.close()
+
+    metrics.add('parse_file', time.perf_counter() - t1, bytes_in=os.path.getsize(file_path),
+                rows=num_file_msgs, msgs=num_lines)
+    return num_file_msgs
+
+
+def ret_sorted_cache_file_paths(dir_path):
+    """
+    Return sorted full paths of all cached Tardis .json.gz files under dir_path
+    """
+    return sorted(f for f in ret_all_subdir_file_paths(str(dir_path)) if str(f).endswith('.json.gz'))
 
-    json_str = json_bytes.decode('utf-8')
-    lines = json_str.split('\n')
-    col_headings = []
-    
-    for l in lines:
-        
-        if len(l)==0:
-            continue
-        
-        line_data = {}
-        try:
-            loaded_line = ujson.loads(l[l.find(' ')+1:])
-        except ValueError:
-            loaded_line = json.loads(l[l.find(' ')+1:])
-
-        # extra fields sometimes found in deribit messages
-        # when this happens, for now they are ignored
-        is_deribit = False 
-      
-        # Generic
-        if 'data' in loaded_line:
-            line_data = loaded_line['data']
-            # For FTX, look up symbol separately b/c it's not included in data dictionary
-            if exch == 'ftx':
-                if type(line_data) is list:
-                    for sub_data in line_data:
-                        if 'market' in loaded_line:
-                            sub_data['symbol'] = loaded_line['market']
-                        else:
-                            sub_data['symbol'] = ''
-        # For Houbi Data
-        elif 'tick' in loaded_line:
-            if 'data' in loaded_line['tick']:
-                line_data = loaded_line['tick']['data']
-                # look up symbol separately b/c it's not included in data dictionary
-                if  type(line_data) is dict:
-                    if 'ch' in loaded_line:
-                        line_data['ch'] = format_houbi_ch_field(loaded_line['ch'])
-                elif type(line_data) is list:
-                    for sub_data in line_data:
-                        if 'ch' in loaded_line:
-                            sub_data['ch'] = format_houbi_ch_field(loaded_line['ch'])
-                        else:
-                            sub_data['ch'] = ''
-        # For Deribit Data
-        elif 'params' in loaded_line:
-            if 'data' in loaded_line['params']:
-                line_data = loaded_line['params']['data']
-                is_deribit = True
-        # For Coinbase & Bitstamp data
-        elif type(loaded_line) is dict:
-            if 'type' in loaded_line:
-                if loaded_line['type']=='match':
-                    line_data = loaded_line
-        # For Kraken data
-        elif type(loaded_line) is list:
-            if len(loaded_line)>=3:
-                if loaded_line[2]=='trade':
-                    line_data = [{'price': sub_line[0],
-                                  'volume': sub_line[1],
-                                  'time': sub_line[2],
-                                  'side': sub_line[3],
-                                  'orderType': sub_line[4],
-                                  'misc': sub_line[5],
-                                  'symbol': loaded_line[3]}
-                                 for sub_line in loaded_line[1]]
-
-        if len(line_data)==0:
-            continue
-
-        if type(line_data) is dict:
-            # Unfortunately need hack to drop extra fields which 
-            # occur in deribit messages sometimes
-            if is_deribit: 
-                if 'liquidation' in line_data:
-                    line_data.pop('liquidation')
-                if 'block_trade_id' in line_data:
-                    line_data.pop('block_trade_id')
-            arr_save_into[start_idx] = np.array(list(line_data.items()))[:,1]
-            start_idx += 1
-            if len(col_headings)==0:
-                col_headings = list(line_data.keys())
-                
-        elif type(line_data) is list:
-            for sub_data in line_data:
-                if is_deribit:
-                    if 'liquidation' in sub_data:
-                        sub_data.pop('liquidation')
-                    if 'block_trade_id' in sub_data:
-                        sub_data.pop('block_trade_id')
-                arr_save_into[start_idx] = np.array(list(sub_data.items()))[:,1]
-                start_idx += 1
-                if len(col_headings)==0:
-                    col_headings = list(sub_data.keys())
-   
-    return {
-        'start_idx': start_idx, 
-        'col_headings': col_headings
-    }
-
-
-def tardis_parse_zip_dir_and_cache_into_arr(dir_path, exch, dl_date):
-    """
-    For one Tardis (sub)directory:    
-    Iterate through message files and cache into Feather File
-    """
-
-    # Count number of messages in all tardis gz files in directory
-    num_messages = tardis_msg_counter.c_tardis_count_trade_msgs_cache_dir(dir_path)
-    num_fields = len(trades_norm_dict[exch].keys())
-    # Set up numpy array to hold them
-    np_cache_array = np.ndarray(shape=(num_messages, num_fields),dtype='O')
-
-    glbl_msg_id = 0
-    dir_files = ret_all_subdir_file_paths(dir_path)
-    
-    for file_path in dir_files:
-        if not(str(file_path).endswith('.json.gz')):
-            continue                  
-        run_out = tardis_cache_trade_zip_file_into_arr(file_path, np_cache_array, glbl_msg_id, exch)
-        glbl_msg_id = run_out['start_idx']
-    
-    # convert numpy array to DataFrame
-    col_headings = run_out['col_headings']
-    if exch == 'kraken':
-        col_headings = trades_norm_dict[exch].keys()
-    if len(col_headings)==0:
-        col_headings_norm = [trades_norm_dict[exch][k][0] for k in trades_norm_dict[exch].keys()]
-    else:
-        col_headings_norm = [trades_norm_dict[exch][c][0] for c in col_headings]
-    type_dict = {t[0]:t[1] for t in trades_norm_dict[exch].values()}
 
-    df_result = pd.DataFrame(np_cache_array,columns=col_headings_norm)
-    df_result.index.name = 'msg_num'
+def ret_sorted_cache_sub_dirs(root_cache_dir):
+    """
+    Return sorted list of (hourly) sub-directories holding cached Tardis .json.gz files
+    """
+    return sorted(set(os.path.dirname(f) for f in ret_sorted_cache_file_paths(root_cache_dir)))
+
 
-    # Clean up DataFrame
-    for k in type_dict.keys():
-        type_to_convert_to = type_dict[k]
-        if type_to_convert_to == int:
-            type_to_convert_to = float
-        df_result[k] = df_result[k].astype(type_to_convert_to)
+async def tardis_stream_async_gen_msgs_into_feather(msg_gen, exch, feather_info, flush_rows=stream_flush_rows, log=True,
+                                                    keep_extras=False, dl_date=None, bar_intervals=(), append=False):
+    """
+    Streaming alternative to caching all messages first and parsing the files afterwards:
+    -> normalize each message as the Tardis async_generator yields it
+    -> every flush_rows trades, append the buffered rows as a record batch 
+       to the output Feather (Arrow IPC) file
+       (or to the dl_date partitions of a dataset, if feather_info is a DatasetInfo)
+    -> with bar_intervals: aggregate each batch into OHLCV / VWAP bars too (see tardis_bars)
+    -> with append: add the batches to the existing output (see ret_output_writer)
+
+    Download and parsing overlap, and memory is bounded by flush_rows
+    Returns the (closed) output writer: num_rows = # of trades written, parts = dataset partitions written
+    """
 
-    normalize_df_timestamps(df_result, exch)
+    t1 = time.time()
 
-    # Save as (intermediate) Feather file
-    feather_save_path = dir_path + 'trd_tmp_'+pd.Timestamp(dl_date).strftime('%Y%m%d')
-    feather_info = FeatherInfo(feather_save_path, "lz4")
-    write_feather_frame(feather_info, df_result)
-        
-def tardis_parse_root_cache_dir(root_cache_dir, exch, dl_date):   
+    bar_aggregators = [BarAggregator(exch, interval) for interval in bar_intervals]
+
+    # batches of flush_rows trades, the last partial one (or an empty table, so the output always exists)
+    with ret_output_writer(feather_info, exch, dl_date, append) as writer:
+        async for tbl in aiter_trade_tables(msg_gen, exch, flush_rows, keep_extras):
+            writer.write(tbl)
+            for bar_aggregator in bar_aggregators:
+                bar_aggregator.add(tbl)
+    write_trade_bars(bar_aggregators, feather_info, exch, dl_date)
+
+    t2 = time.time()
+
+    if log:
+        print('\nStreaming All Tardis Trade Msgs Took: '+str(np.round(t2-t1,3))+' sec')
+
+    return writer
+
+
+def tardis_parse_zip_files_into_table(file_paths, exch, keep_extras=False, build_index=False):
+    """
+    Parse Tardis gzip files (in order) into one normalized trades Arrow table
+    (keep_extras: add the extras column, see TradeColumnBuffers,
+     build_index: index the raw files while parsing, see tardis_raw_index)
+    """
+
+    col_buffers = TradeColumnBuffers(exch, keep_extras)
+    for file_path in file_paths:
+        tardis_cache_trade_zip_file_into_arr(file_path, col_buffers, exch, build_index)
+
+    metrics = ret_metrics()
+    with metrics.timed('to_table', rows=len(col_buffers)):
+        tbl = col_buffers.to_table()
+    with metrics.timed('timestamps', rows=len(tbl)):
+        return normalize_table_timestamps(tbl, exch)
+
+
+def tardis_parse_zip_dir_into_table(dir_path, exch, keep_extras=False, build_index=False):
+    """
+    Parse all Tardis gzip files of one (sub)directory into a normalized trades Arrow table
+    """
+    return tardis_parse_zip_files_into_table(ret_sorted_cache_file_paths(dir_path), exch, keep_extras, build_index)
+
+
+def tardis_parse_zip_dir_with_metrics(dir_path, exch, keep_extras=False, build_index=False, line_timing=False):
+    """
+    tardis_parse_zip_dir_into_table measured in its own Metrics (worker processes send them back)
+    Returns (table, metrics)
+    """
+    with collect_metrics(line_timing) as dir_metrics:
+        tbl = tardis_parse_zip_dir_into_table(dir_path, exch, keep_extras, build_index)
+    return tbl, dir_metrics
+
+
+def imap_cache_sub_dirs(func, sub_dirs, *args, workers=1):
+    """
+    Yield func(dir_path, *args) for every sub-directory, in sub_dirs order.
+    With workers > 1 the sub-directories are processed in a process pool
+    (each one is independent), results still come back in order and
+    at most 2 * workers results are pending at any time
+    """
+    if workers <= 1 or len(sub_dirs) <= 1:
+        for dir_path in sub_dirs:
+            yield func(dir_path, *args)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for dir_path in sub_dirs:
+            pending.append(executor.submit(func, dir_path, *args))
+            if len(pending) >= 2*workers:
+                yield pending.popleft().result()
+        while len(pending) > 0:
+            yield pending.popleft().result()
+
+
+def imap_sub_dir_tables(sub_dirs, exch, workers=1, manifest=None, keep_extras=False, build_index=False):
+    """
+    Yield (dir_path, table) for every sub-directory, in sub_dirs order.
+    With a CacheManifest, sub-directories parsed by an earlier run (and unchanged since)
+    are read back instead of parsed again, and newly parsed ones are saved to it
+    (with build_index, sub-directories missing raw indexes are parsed again to build them)
+    """
+    if manifest is None:
+        to_parse = list(sub_dirs)
+    else:
+        to_parse = [dir_path for dir_path in sub_dirs if not manifest.has_parsed(dir_path)
+                    or (build_index and not has_raw_index(dir_path))]
+    metrics = ret_metrics()
+    parsed_tables = imap_cache_sub_dirs(tardis_parse_zip_dir_with_metrics, to_parse, exch, keep_extras, build_index,
+                                        metrics.line_timing, workers=workers)
+
+    to_parse = set(to_parse)
+    for dir_path in sub_dirs:
+        if dir_path in to_parse:
+            tbl, dir_metrics = next(parsed_tables)
+            metrics.merge(dir_metrics)
+            if manifest is not None:
+                with metrics.timed('save_parsed', rows=len(tbl)):
+                    manifest.save_parsed(dir_path, tbl)
+        else:
+            with metrics.timed('load_parsed') as stage:
+                tbl = manifest.load_parsed(dir_path)
+                stage.rows += len(tbl)
+        yield dir_path, tbl
+
+
+def tardis_parse_root_cache_dir_into_table(root_cache_dir, exch, workers=1, manifest=None, keep_extras=False,
+                                           build_index=False, order=False):
+    """
+    Parse all cached Tardis gzip files under root_cache_dir into one table:
+    one (hourly) sub-directory per task, concatenated in time order
+    (order: sorted, deduped and gap-checked, see tardis_trade_order)
+    """
+    sub_dirs = ret_sorted_cache_sub_dirs(root_cache_dir)
+    sub_dir_tables = imap_sub_dir_tables(sub_dirs, exch, workers, manifest, keep_extras, build_index)
+    if order:
+        report = TradeOrderReport()
+        sub_dir_tables = iter_ordered_tables(sub_dir_tables, exch, report)
+    tbl_list = [tbl for dir_path, tbl in sub_dir_tables]
+    if order:
+        print(report.report())
+    if len(tbl_list) == 0:
+        return normalize_table_timestamps(TradeColumnBuffers(exch, keep_extras).to_table(), exch)
+    return pa.concat_tables(tbl_list)
+
+
+def tardis_parse_root_cache_dir(root_cache_dir, exch, dl_date, workers=1, manifest=None, keep_extras=False,
+                                output_info=None, build_index=False, order=False, bar_intervals=()):
     """
     For all Tardis sub-directories (one level up from cached gzip files):    
     -> aggregate messages from sub-directory files
-    -> combine and save to intermediate Feather file
+       (with workers > 1, sub-directories are parsed in a process pool)
+    -> with order: sort, dedupe and gap-check them (streaming, see tardis_trade_order)
+    -> append them, in time order, to the output Feather file
+       (root_cache_dir/trd_YYYYMMDD, or the dataset of output_info if given)
+    -> with bar_intervals: aggregate them into OHLCV / VWAP bars as they are written,
+       saved next to the output (see tardis_bars)
     
-    Then iterate through all intermediate cached Feather files:
-    -> combine data and save to final output file    
+    Only one sub-directory's table is held in memory at a time (per worker)
     """
 
-    all_file_paths = ret_all_subdir_file_paths(root_cache_dir)
-    all_file_paths_onelvlup = [path_str[:(path_str[::-1].find('\\'))*-1] for path_str in all_file_paths]
-    all_file_paths_onelvlup = list(pd.value_counts(all_file_paths_onelvlup).sort_index().index)
+    sub_dirs = ret_sorted_cache_sub_dirs(root_cache_dir)
+    if output_info is None:
+        output_info = FeatherInfo(os.path.join(root_cache_dir, 'trd_'+pd.Timestamp(dl_date).strftime('%Y%m%d')), "lz4")
+
+    sub_dir_tables = imap_sub_dir_tables(sub_dirs, exch, workers, manifest, keep_extras, build_index)
+    if order:
+        report = TradeOrderReport()
+        sub_dir_tables = iter_ordered_tables(sub_dir_tables, exch, report)
+    bar_aggregators = [BarAggregator(exch, interval) for interval in bar_intervals]
+
+    with ret_output_writer(output_info, exch, dl_date) as writer:
+        for dir_path, tbl in sub_dir_tables:
+            writer.write(tbl)
+            for bar_aggregator in bar_aggregators:
+                bar_aggregator.add(tbl)
+            print(dir_path)
+        if len(sub_dirs) == 0:
+            writer.write(normalize_table_timestamps(TradeColumnBuffers(exch, keep_extras).to_table(), exch))
+
+    if manifest is not None:
+        manifest.save_output(writer.path, writer.num_rows, writer.parts)
     
-    for dir_path in all_file_paths_onelvlup:
-        tardis_parse_zip_dir_and_cache_into_arr(dir_path, exch, dl_date)
-        print(dir_path)
-    
-    print('**** Recombining DataFrames ****\n')
-    feather_files_list = [f for f in ret_all_subdir_file_paths(root_cache_dir) if not(f.endswith('.json.gz'))]
-    df_list = []
-    for ff in feather_files_list:
-        temp_df = pd.read_feather(ff)
-        df_list.append(temp_df)
-    
-    df_result = pd.concat(df_list)
-    feather_save_path = root_cache_dir + 'trd_'+pd.Timestamp(dl_date).strftime('%Y%m%d')    
-    feather_info = FeatherInfo(feather_save_path, "lz4")
-    write_feather_frame(feather_info, df_result)
-    
-    print('Done Saving Aggregated DataFrame As Feather File: ')
-    print('-> output path: '+feather_save_path)
-    print('-> # of rows: '+str(len(df_result)))
+    if order:
+        print(report.report())
+    print('Done Saving Aggregated Table: ')
+    print('-> output path: '+str(writer.path))
+    print('-> # of rows: '+str(writer.num_rows))
+    write_trade_bars(bar_aggregators, output_info, exch, dl_date)
     print('---')
 
-def main():
-
-    # Process Arguments
-    parser = argparse.ArgumentParser()
-
-    parser.add_argument("exchange", help='['+' | '.join(trades_norm_dict.keys())+' ]')
-    parser.add_argument("date", help="date at YYYY-MM-DD")    
-    parser.add_argument("symbols", help="remote exchange symbols (comma separated)")
-    parser.add_argument("--cache_dir", help="Cache Source", default=default_cache_dir)
-    parser.add_argument("--api_key", help="Api Key", default=api_key)
-
-    args = parser.parse_args()
+def process_request(args):
+    """
+    Download (or reuse), parse and save the trades of one request (parsed command line arguments)
+    """
 
     exch = args.exchange
     dl_date = args.date
@@ -262,6 +362,7 @@ def main():
     if type(dl_symbols) is not list:
         dl_symbols = [dl_symbols]
     cache_dir_root = args.cache_dir
+    bar_intervals = args.bars.split(',') if args.bars else []
     tardis_key = args.api_key
 
     print('\nParsed Arguments:\n***')
@@ -274,14 +375,84 @@ def main():
 
     # Create Tardis Trade Request
 
-    request = DownloadRequest(dl_date, exch, dl_dtype, dl_symbols, cache_dir_root, api_key)
+    request = DownloadRequest(dl_date, exch, dl_dtype, dl_symbols, cache_dir_root, tardis_key)
     generator = TardisGenerator(request)
     messages = generator.messages
     cache_dir_full_path = generator.path
 
+    # Same request done before => nothing to download or parse
+
+    if args.output == 'feather':
+        output_info = FeatherInfo(cache_dir_full_path / ('trd_'+pd.Timestamp(dl_date).strftime('%Y%m%d')), args.compression)
+        output_path = output_info.path
+    else:
+        dataset_dir = args.dataset_dir if args.dataset_dir is not None else os.path.join(cache_dir_root, 'dataset')
+        output_info = DatasetInfo(os.path.abspath(dataset_dir), args.output, args.compression)
+        output_path = ret_partition_dir(output_info, exch, dl_date)
+
+    output_options = {'order': args.order, 'bars': args.bars, 'compression': args.compression if args.compression != 'lz4' else None}
+    manifest = CacheManifest(cache_dir_full_path, request, {'keep_extras': args.keep_extras}, output_options)
+    if args.cache_max_gb is not None:
+        for evicted_dir in evict_lru_cache_dirs(cache_dir_root, args.cache_max_gb*1e9, keep=[cache_dir_full_path]):
+            print('Evicted cache dir: '+str(evicted_dir))
+    if manifest.is_complete(output_path):
+        print('Request already processed: ')
+        print('-> output path: '+str(manifest.output_path()))
+        print('-> # of rows: '+str(manifest.data['output'][1]))
+        if args.index:
+            print('-> # of raw files indexed: '+str(build_raw_index_dir(cache_dir_full_path, exch)))
+        return 0
+
+    # Dataset partitions of this request written before (unless appending to them) are replaced as a whole
+
+    appended_until, appended_rows = manifest.appended_until(output_path) if args.append else (None, 0)
+    if appended_until is None:
+        for removed_dir in manifest.remove_output_parts(output_path):
+            print('Removed old partition: '+str(removed_dir))
+
+    # Append: Only The Window Since The Last Run, Parsed While Downloading
+
+    if args.append:
+        window = ret_append_window(dl_date, appended_until, args.until)
+        if window is None:
+            print('Nothing new to append: appended until '+str(appended_until))
+            return 0
+        from_date, to_date = window
+        print('Appending window: '+from_date+' -> '+to_date)
+        messages = TardisGenerator(request, from_date=from_date, to_date=to_date).messages
+        writer = asyncio.run(tardis_stream_async_gen_msgs_into_feather(messages, exch, output_info, args.flush_rows,
+                                                                       keep_extras=args.keep_extras, dl_date=dl_date,
+                                                                       append=appended_until is not None))
+        num_messages = writer.num_rows
+        manifest.save_append(output_path, appended_rows + num_messages, to_date, writer.parts)
+        if pd.Timestamp(to_date) >= pd.Timestamp(dl_date) + pd.Timedelta(days=1):
+            parts = manifest.output_parts(output_path) if writer.parts is not None else None
+            manifest.save_output(output_path, appended_rows + num_messages, parts)
+        print('Done Appending Trades: ')
+        print('-> output path: '+ str(output_path))
+        print('-> # of rows appended: '+str(num_messages)+' | total: '+str(appended_rows + num_messages))
+        print('---')
+        return 0
+
+    # Stream: Cache & Parse Messages Together
+
+    if args.stream:
+        writer = asyncio.run(tardis_stream_async_gen_msgs_into_feather(messages, exch, output_info, args.flush_rows,
+                                                                       keep_extras=args.keep_extras, dl_date=dl_date,
+                                                                       bar_intervals=bar_intervals))
+        num_messages = writer.num_rows
+        manifest.save_output(output_path, num_messages, writer.parts)
+        print('Done Streaming Trades: ')
+        print('-> output path: '+ str(output_path))
+        print('-> # of rows: '+str(num_messages))
+        if args.index:
+            print('-> # of raw files indexed: '+str(build_raw_index_dir(cache_dir_full_path, exch)))
+        print('---')
+        return 0
+
     # Cache & Count Messages
 
-    num_messages = asyncio.run(tardis_msg_counter.c_tardis_count_and_save_async_gen_msgs(messages))
+    num_messages = asyncio.run(tardis_msg_counter.c_tardis_count_and_save_async_gen_msgs(messages, exch))
     print('-> total messages = '+str(num_messages))
     if num_messages==0:
         print('Query Failed and Returned Empty Data Set. Exiting.')
@@ -299,11 +470,9 @@ def main():
 
         t1 = time.time()
 
-        all_file_paths = ret_all_subdir_file_paths(cache_dir_full_path)
-        all_file_paths_onelvlup = [path_str[:(path_str[::-1].find('\\'))*-1] for path_str in all_file_paths]
-        all_file_paths_onelvlup = list(pd.value_counts(all_file_paths_onelvlup).sort_index().index)
-
-        tardis_parse_root_cache_dir(cache_dir_full_path, exch, dl_date)
+        tardis_parse_root_cache_dir(cache_dir_full_path, exch, dl_date, workers=args.workers, manifest=manifest,
+                                    keep_extras=args.keep_extras, output_info=output_info, build_index=args.index,
+                                    order=args.order, bar_intervals=bar_intervals)
 
         t2 = time.time()
         
@@ -315,55 +484,74 @@ def main():
         
         t1 = time.time()
 
-        all_file_paths = ret_all_subdir_file_paths(cache_dir_full_path)
-        all_file_paths_onelvlup = [path_str[:(path_str[::-1].find('\\'))*-1] for path_str in all_file_paths]
-        all_file_paths_onelvlup = list(pd.value_counts(all_file_paths_onelvlup).sort_index().index)
+        # Parse all cached messages in a single pass
 
-        # Set up numpy array to messages
-
-        num_fields = len(trades_norm_dict[exch].keys())
-        np_cache_array = np.ndarray(shape=(num_messages, num_fields),dtype='O')
-        
-        glbl_msg_id = 0
-
-        for file_path in all_file_paths:
-            run_out = tardis_cache_trade_zip_file_into_arr(file_path, np_cache_array, glbl_msg_id, exch)
-            glbl_msg_id = run_out['start_idx']
-
-        # Convert numpy array (that messages were cached into) to DataFrame
-
-        col_headings = run_out['col_headings']
-        if exch == 'kraken':
-            col_headings = trades_norm_dict[exch].keys()
-        if len(col_headings)==0:
-            col_headings_norm = [trades_norm_dict[exch][k][0] for k in trades_norm_dict[exch].keys()]
-        else:
-            col_headings_norm = [trades_norm_dict[exch][c][0] for c in col_headings]
-        type_dict = {t[0]:t[1] for t in trades_norm_dict[exch].values()}
+        tbl_result = tardis_parse_root_cache_dir_into_table(cache_dir_full_path, exch, workers=args.workers, manifest=manifest,
+                                                            keep_extras=args.keep_extras, build_index=args.index,
+                                                            order=args.order)
 
-        df_result = pd.DataFrame(np_cache_array,columns=col_headings_norm)
-        df_result.index.name = 'msg_num'
+        t2 = time.time() 
 
-        # Clean up DataFrame
+        with ret_output_writer(output_info, exch, dl_date) as writer:
+            writer.write(tbl_result)
+        manifest.save_output(writer.path, len(tbl_result), writer.parts)
+        print('Done Saving Aggregated Table: ')
+        print('-> output path: '+ str(writer.path))
+        print('-> # of rows: '+str(len(tbl_result)))
+        bar_aggregators = [BarAggregator(exch, interval) for interval in bar_intervals]
+        for bar_aggregator in bar_aggregators:
+            bar_aggregator.add(tbl_result)
+        write_trade_bars(bar_aggregators, output_info, exch, dl_date)
+        print('---')
+        print('\nProcessing Data Took: '+str(np.round(t2-t1,3))+' sec')
 
-        for k in type_dict.keys():
-            type_to_convert_to = type_dict[k]
-            if type_to_convert_to == int:
-                type_to_convert_to = float
-            df_result[k] = df_result[k].astype(type_to_convert_to)
+def main():
 
-        normalize_df_timestamps(df_result, exch)
+    # Process Arguments
+    parser = argparse.ArgumentParser()
 
-        t2 = time.time() 
+    parser.add_argument("exchange", help='['+' | '.join(trades_norm_dict.keys())+' ]')
+    parser.add_argument("date", help="date at YYYY-MM-DD")    
+    parser.add_argument("symbols", help="remote exchange symbols (comma separated)")
+    parser.add_argument("--cache_dir", help="Cache Source (default: CACHE_DIR setting)", default=None)
+    parser.add_argument("--api_key", help="Api Key (default: TARDIS_KEY setting)", default=None)
+    parser.add_argument("--workers", help="# of processes parsing cache sub-directories", type=int, default=1)
+    parser.add_argument("--stream", help="parse messages while downloading (bounded memory)", action='store_true')
+    parser.add_argument("--flush_rows", help="# of trades per record batch when streaming", type=int, default=stream_flush_rows)
+    parser.add_argument("--keep_extras", help="keep trade fields missing from trades_norm_dict as JSON in an extras column", action='store_true')
+    parser.add_argument("--index", help="index the cached raw files for random access while parsing (see tardis_raw_index)", action='store_true')
+    parser.add_argument("--order", help="sort & dedupe trades, report trade id gaps (not with --stream)", action='store_true')
+    parser.add_argument("--output", help="trd_YYYYMMDD Feather file in the cache dir, or a partitioned dataset",
+                        choices=['feather', 'parquet', 'arrow'], default='feather')
+    parser.add_argument("--compression", help="output compression (uncompressed: memory-mappable, read zero-copy by tardis_reader)",
+                        choices=['lz4', 'zstd', 'uncompressed'], default='lz4')
+    parser.add_argument("--dataset_dir", help="root of the partitioned dataset (default: <cache_dir>/dataset)", default=None)
+    parser.add_argument("--bars", help="also write OHLCV / VWAP bars at these intervals next to the output (comma separated, e.g. 1s,1m)", default=None)
+    parser.add_argument("--append", help="only download & parse the window since the last --append run (up to --until), appended to the day's output", action='store_true')
+    parser.add_argument("--until", help="end of the --append window (ISO, UTC, default: now, at most now - 15 min)", default=None)
+    parser.add_argument("--cache_max_gb", help="evict least recently used request caches above this size", type=float, default=None)
+    parser.add_argument("--metrics", help="write per-stage timings, bytes, rows and skipped messages to this JSON file", default=None)
+    parser.add_argument("--line_timing", help="time JSON decode and trade extraction line by line in the metrics", action='store_true')
+    parser.add_argument("--profile", help="run under cProfile and dump the stats to this file", default=None)
 
-        feather_save_path = cache_dir_full_path / ('trd_'+pd.Timestamp(dl_date).strftime('%Y%m%d'))
-        feather_info = FeatherInfo(feather_save_path, "lz4")
-        write_feather_frame(feather_info, df_result)
-        print('Done Saving Aggregated DataFrame As Feather File: ')
-        print('-> output path: '+ str(feather_save_path))
-        print('-> # of rows: '+str(len(df_result)))
-        print('---')
-        print('\nProcessing Data Took: '+str(np.round(t2-t1,3))+' sec')
+    args = parser.parse_args()
+    if args.append and (args.order or args.bars):
+        parser.error('--append does not support --order / --bars (they need the whole day)')
+    if args.append and (args.stream or args.index):
+        parser.error('--append does not support --stream (it always streams) / --index (raw files of a window are not indexed)')
+    if args.stream and args.order:
+        parser.error('--stream does not support --order (batches are written as they are parsed)')
+    args.cache_dir = ret_config('CACHE_DIR', args.cache_dir)
+    args.api_key = ret_config('TARDIS_KEY', args.api_key)
+
+    reset_metrics(args.line_timing)
+    with profiled(args.profile):
+        status = process_request(args)
+    if args.metrics is not None:
+        save_metrics(args.metrics, exchange=args.exchange, date=args.date, symbols=args.symbols,
+                     workers=args.workers, stream=args.stream, output=args.output)
+        print('Metrics saved: '+str(args.metrics))
+    return status
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,166 @@
+import cProfile
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+
+### Run Metrics
+# Per-stage measures of a run, instead of print timing:
+# -> download, gunzip, parse_file (gunzip + JSON + extract + append), to_table, timestamps, write ...
+#    each with wall sec, # of calls, bytes in / out, trade rows and messages
+# -> counters, e.g. messages without trades per extractor branch (skipped_msgs/<exch>/<reason>)
+# One Metrics object per process (ret_metrics); sub-directories parsed in worker processes
+# are measured in a fresh one (collect_metrics) sent back with the table and merged.
+# With line_timing, JSON decode and extraction are timed line by line (small overhead)
+# save_metrics writes the JSON metrics file, profiled runs a block under cProfile
+# (stages are separate named functions, so py-spy / cProfile output maps onto them)
+
+
+@dataclass
+class StageMetrics:
+    sec : float = 0.0
+    calls : int = 0
+    bytes_in : int = 0
+    bytes_out : int = 0
+    rows : int = 0
+    msgs : int = 0
+
+    def add(self, sec=0.0, calls=1, **amounts):
+        self.sec += sec
+        self.calls += calls
+        for name, amount in amounts.items():
+            setattr(self, name, getattr(self, name) + amount)
+
+
+class Metrics:
+    """
+    Stage measures (stages: {name: StageMetrics}) and counters ({name: int}) of a run
+    """
+
+    def __init__(self, line_timing=False):
+        self.stages = {}
+        self.counters = {}
+        self.line_timing = line_timing
+        self.start_time = time.time()
+
+    def ret_stage(self, name):
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = StageMetrics()
+        return stage
+
+    def add(self, name, sec=0.0, **amounts):
+        self.ret_stage(name).add(sec, **amounts)
+
+    @contextmanager
+    def timed(self, name, **amounts):
+        """
+        Time a block as one call of stage name (amounts can be added to the yielded stage)
+        """
+        stage = self.ret_stage(name)
+        t1 = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            stage.add(time.perf_counter() - t1, **amounts)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, other):
+        for name, stage in other.stages.items():
+            self.ret_stage(name).add(**asdict(stage))
+        for name, n in other.counters.items():
+            self.count(name, n)
+
+    def to_dict(self):
+        stages = {}
+        for name, stage in self.stages.items():
+            stages[name] = asdict(stage)
+            if stage.sec > 0:
+                stages[name].update({'rows/sec': stage.rows / stage.sec, 'msgs/sec': stage.msgs / stage.sec,
+                                     'MB/sec in': stage.bytes_in / stage.sec / 1e6})
+        return {'start_time': self.start_time, 'wall_sec': time.time() - self.start_time,
+                'stages': stages, 'counters': dict(sorted(self.counters.items()))}
+
+
+metrics = Metrics()
+
+
+def ret_metrics():
+    """
+    The Metrics of the current process (or of the collect_metrics block running)
+    """
+    return metrics
+
+
+def reset_metrics(line_timing=False):
+    global metrics
+    metrics = Metrics(line_timing)
+    return metrics
+
+
+@contextmanager
+def collect_metrics(line_timing=None):
+    """
+    Measure a block in a fresh Metrics (yielded), e.g. in a worker process,
+    to be merged into the outer one afterwards (line_timing: the outer one's by default)
+    """
+    global metrics
+    outer = metrics
+    metrics = Metrics(outer.line_timing if line_timing is None else line_timing)
+    try:
+        yield metrics
+    finally:
+        metrics = outer
+
+
+async def iter_timed_async_msgs(msg_gen, name='download'):
+    """
+    Yield the (local_timestamp, message) items of an async generator, timing the waits
+    for each one as stage name (bytes counted when messages are not decoded)
+    """
+    msgs = msg_gen.__aiter__()
+    while True:
+        t1 = time.perf_counter()
+        try:
+            item = await msgs.__anext__()
+        except StopAsyncIteration:
+            break
+        stage = metrics.ret_stage(name)
+        stage.sec += time.perf_counter() - t1
+        stage.msgs += 1
+        if isinstance(item[1], (bytes, str)):
+            stage.bytes_in += len(item[1])
+        yield item
+    metrics.ret_stage(name).calls += 1
+
+
+def save_metrics(path, **info):
+    """
+    Write the metrics of this process as JSON (info: extra top level fields, e.g. the request)
+    """
+    data = dict(info)
+    data.update(metrics.to_dict())
+    with open(str(path) + '.tmp', 'w') as f:
+        json.dump(data, f, indent=1, default=str)
+    os.replace(str(path) + '.tmp', str(path))
+
+
+@contextmanager
+def profiled(path=None):
+    """
+    Run a block under cProfile and dump the stats to path (no-op if path is None)
+    e.g. python -m pstats <path>, or snakeviz <path>
+    """
+    if path is None:
+        yield
+        return
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(str(path))
@@ -841,22 +841,25 @@ static const char *__pyx_f[] = {
 /*--- Type declarations ---*/
 struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs;
 
-/* "tardis_msg_counter.pyx":31
+/* "tardis_msg_counter.pyx":26
  *     return all_paths
  * 
- * async def c_tardis_count_and_save_async_gen_msgs(msg_gen, log=True):             # <<<<<<<<<<<<<<
+ * async def c_tardis_count_and_save_async_gen_msgs(msg_gen, exch, log=True):             # <<<<<<<<<<<<<<
  *     """
  *     Tardis Python API returns an async_generator.
  */
 struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs {
   PyObject_HEAD
+  PyObject *__pyx_v_count;
+  PyObject *__pyx_v_exch;
+  PyObject *__pyx_v_extractor;
   PyObject *__pyx_v_local_timestamp;
   PyObject *__pyx_v_log;
   PyObject *__pyx_v_message;
-  PyObject *__pyx_v_msg_data;
   PyObject *__pyx_v_msg_gen;
+  int __pyx_v_num_line_msgs;
+  int __pyx_v_num_lines;
   int __pyx_v_num_msgs;
-  PyObject *__pyx_v_sub_dict;
   PyObject *__pyx_v_t1;
   PyObject *__pyx_v_t2;
   PyObject *__pyx_t_0;
@@ -984,6 +987,13 @@ static PyObject *__Pyx__GetModuleGlobalName(PyObject *name, PY_UINT64_T *dict_ve
 static CYTHON_INLINE PyObject *__Pyx__GetModuleGlobalName(PyObject *name);
 #endif
 
+/* PyCFunctionFastCall.proto */
+#if CYTHON_FAST_PYCCALL
+static CYTHON_INLINE PyObject *__Pyx_PyCFunction_FastCall(PyObject *func, PyObject **args, Py_ssize_t nargs);
+#else
+#define __Pyx_PyCFunction_FastCall(func, args, nargs)  (assert(0), NULL)
+#endif
+
 /* PyFunctionFastCall.proto */
 #if CYTHON_FAST_PYCALL
 #define __Pyx_PyFunction_FastCall(func, args, nargs)\
@@ -1007,13 +1017,6 @@ static PyObject *__Pyx_PyFunction_FastCallDict(PyObject *func, PyObject **args,
     (assert(__pyx_pyframe_localsplus_offset), (PyObject **)(((char *)(frame)) + __pyx_pyframe_localsplus_offset))
 #endif
 
-/* PyCFunctionFastCall.proto */
-#if CYTHON_FAST_PYCCALL
-static CYTHON_INLINE PyObject *__Pyx_PyCFunction_FastCall(PyObject *func, PyObject **args, Py_ssize_t nargs);
-#else
-#define __Pyx_PyCFunction_FastCall(func, args, nargs)  (assert(0), NULL)
-#endif
-
 /* PyObjectCall.proto */
 #if CYTHON_COMPILING_IN_CPYTHON
 static CYTHON_INLINE PyObject* __Pyx_PyObject_Call(PyObject *func, PyObject *arg, PyObject *kw);
@@ -1021,135 +1024,17 @@ static CYTHON_INLINE PyObject* __Pyx_PyObject_Call(PyObject *func, PyObject *arg
 #define __Pyx_PyObject_Call(func, arg, kw) PyObject_Call(func, arg, kw)
 #endif
 
-/* PyObjectLookupSpecial.proto */
-#if CYTHON_USE_PYTYPE_LOOKUP && CYTHON_USE_TYPE_SLOTS
-static CYTHON_INLINE PyObject* __Pyx_PyObject_LookupSpecial(PyObject* obj, PyObject* attr_name) {
-    PyObject *res;
-    PyTypeObject *tp = Py_TYPE(obj);
-#if PY_MAJOR_VERSION < 3
-    if (unlikely(PyInstance_Check(obj)))
-        return __Pyx_PyObject_GetAttrStr(obj, attr_name);
-#endif
-    res = _PyType_Lookup(tp, attr_name);
-    if (likely(res)) {
-        descrgetfunc f = Py_TYPE(res)->tp_descr_get;
-        if (!f) {
-            Py_INCREF(res);
-        } else {
-            res = f(res, obj, (PyObject *)tp);
-        }
-    } else {
-        PyErr_SetObject(PyExc_AttributeError, attr_name);
-    }
-    return res;
-}
-#else
-#define __Pyx_PyObject_LookupSpecial(o,n) __Pyx_PyObject_GetAttrStr(o,n)
-#endif
+/* PyObjectCall2Args.proto */
+static CYTHON_UNUSED PyObject* __Pyx_PyObject_Call2Args(PyObject* function, PyObject* arg1, PyObject* arg2);
 
 /* PyObjectCallMethO.proto */
 #if CYTHON_COMPILING_IN_CPYTHON
 static CYTHON_INLINE PyObject* __Pyx_PyObject_CallMethO(PyObject *func, PyObject *arg);
 #endif
 
-/* PyObjectCallNoArg.proto */
-#if CYTHON_COMPILING_IN_CPYTHON
-static CYTHON_INLINE PyObject* __Pyx_PyObject_CallNoArg(PyObject *func);
-#else
-#define __Pyx_PyObject_CallNoArg(func) __Pyx_PyObject_Call(func, __pyx_empty_tuple, NULL)
-#endif
-
 /* PyObjectCallOneArg.proto */
 static CYTHON_INLINE PyObject* __Pyx_PyObject_CallOneArg(PyObject *func, PyObject *arg);
 
-/* GetTopmostException.proto */
-#if CYTHON_USE_EXC_INFO_STACK
-static _PyErr_StackItem * __Pyx_PyErr_GetTopmostException(PyThreadState *tstate);
-#endif
-
-/* PyThreadStateGet.proto */
-#if CYTHON_FAST_THREAD_STATE
-#define __Pyx_PyThreadState_declare  PyThreadState *__pyx_tstate;
-#define __Pyx_PyThreadState_assign  __pyx_tstate = __Pyx_PyThreadState_Current;
-#define __Pyx_PyErr_Occurred()  __pyx_tstate->curexc_type
-#else
-#define __Pyx_PyThreadState_declare
-#define __Pyx_PyThreadState_assign
-#define __Pyx_PyErr_Occurred()  PyErr_Occurred()
-#endif
-
-/* SaveResetException.proto */
-#if CYTHON_FAST_THREAD_STATE
-#define __Pyx_ExceptionSave(type, value, tb)  __Pyx__ExceptionSave(__pyx_tstate, type, value, tb)
-static CYTHON_INLINE void __Pyx__ExceptionSave(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb);
-#define __Pyx_ExceptionReset(type, value, tb)  __Pyx__ExceptionReset(__pyx_tstate, type, value, tb)
-static CYTHON_INLINE void __Pyx__ExceptionReset(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb);
-#else
-#define __Pyx_ExceptionSave(type, value, tb)   PyErr_GetExcInfo(type, value, tb)
-#define __Pyx_ExceptionReset(type, value, tb)  PyErr_SetExcInfo(type, value, tb)
-#endif
-
-/* GetException.proto */
-#if CYTHON_FAST_THREAD_STATE
-#define __Pyx_GetException(type, value, tb)  __Pyx__GetException(__pyx_tstate, type, value, tb)
-static int __Pyx__GetException(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb);
-#else
-static int __Pyx_GetException(PyObject **type, PyObject **value, PyObject **tb);
-#endif
-
-/* PyErrFetchRestore.proto */
-#if CYTHON_FAST_THREAD_STATE
-#define __Pyx_PyErr_Clear() __Pyx_ErrRestore(NULL, NULL, NULL)
-#define __Pyx_ErrRestoreWithState(type, value, tb)  __Pyx_ErrRestoreInState(PyThreadState_GET(), type, value, tb)
-#define __Pyx_ErrFetchWithState(type, value, tb)    __Pyx_ErrFetchInState(PyThreadState_GET(), type, value, tb)
-#define __Pyx_ErrRestore(type, value, tb)  __Pyx_ErrRestoreInState(__pyx_tstate, type, value, tb)
-#define __Pyx_ErrFetch(type, value, tb)    __Pyx_ErrFetchInState(__pyx_tstate, type, value, tb)
-static CYTHON_INLINE void __Pyx_ErrRestoreInState(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb);
-static CYTHON_INLINE void __Pyx_ErrFetchInState(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb);
-#if CYTHON_COMPILING_IN_CPYTHON
-#define __Pyx_PyErr_SetNone(exc) (Py_INCREF(exc), __Pyx_ErrRestore((exc), NULL, NULL))
-#else
-#define __Pyx_PyErr_SetNone(exc) PyErr_SetNone(exc)
-#endif
-#else
-#define __Pyx_PyErr_Clear() PyErr_Clear()
-#define __Pyx_PyErr_SetNone(exc) PyErr_SetNone(exc)
-#define __Pyx_ErrRestoreWithState(type, value, tb)  PyErr_Restore(type, value, tb)
-#define __Pyx_ErrFetchWithState(type, value, tb)  PyErr_Fetch(type, value, tb)
-#define __Pyx_ErrRestoreInState(tstate, type, value, tb)  PyErr_Restore(type, value, tb)
-#define __Pyx_ErrFetchInState(tstate, type, value, tb)  PyErr_Fetch(type, value, tb)
-#define __Pyx_ErrRestore(type, value, tb)  PyErr_Restore(type, value, tb)
-#define __Pyx_ErrFetch(type, value, tb)  PyErr_Fetch(type, value, tb)
-#endif
-
-/* None.proto */
-static CYTHON_INLINE void __Pyx_RaiseUnboundLocalError(const char *varname);
-
-/* PyIntBinop.proto */
-#if !CYTHON_COMPILING_IN_PYPY
-static PyObject* __Pyx_PyInt_AddObjC(PyObject *op1, PyObject *op2, long intval, int inplace, int zerodivision_check);
-#else
-#define __Pyx_PyInt_AddObjC(op1, op2, intval, inplace, zerodivision_check)\
-    (inplace ? PyNumber_InPlaceAdd(op1, op2) : PyNumber_Add(op1, op2))
-#endif
-
-/* PyObjectCall2Args.proto */
-static CYTHON_UNUSED PyObject* __Pyx_PyObject_Call2Args(PyObject* function, PyObject* arg1, PyObject* arg2);
-
-/* SliceObject.proto */
-static CYTHON_INLINE PyObject* __Pyx_PyObject_GetSlice(
-        PyObject* obj, Py_ssize_t cstart, Py_ssize_t cstop,
-        PyObject** py_start, PyObject** py_stop, PyObject** py_slice,
-        int has_cstart, int has_cstop, int wraparound);
-
-/* PyErrExceptionMatches.proto */
-#if CYTHON_FAST_THREAD_STATE
-#define __Pyx_PyErr_ExceptionMatches(err) __Pyx_PyErr_ExceptionMatchesInState(__pyx_tstate, err)
-static CYTHON_INLINE int __Pyx_PyErr_ExceptionMatchesInState(PyThreadState* tstate, PyObject* err);
-#else
-#define __Pyx_PyErr_ExceptionMatches(err)  PyErr_ExceptionMatches(err)
-#endif
-
 /* RaiseTooManyValuesToUnpack.proto */
 static CYTHON_INLINE void __Pyx_RaiseTooManyValuesError(Py_ssize_t expected);
 
@@ -1179,6 +1064,10 @@ static CYTHON_INLINE int __Pyx_PyList_Append(PyObject* list, PyObject* x) {
 #define __Pyx_PyList_Append(L,x) PyList_Append(L,x)
 #endif
 
+/* RaiseArgTupleInvalid.proto */
+static void __Pyx_RaiseArgtupleInvalid(const char* func_name, int exact,
+    Py_ssize_t num_min, Py_ssize_t num_max, Py_ssize_t num_found);
+
 /* RaiseDoubleKeywords.proto */
 static void __Pyx_RaiseDoubleKeywordsError(const char* func_name, PyObject* kw_name);
 
@@ -1187,9 +1076,12 @@ static int __Pyx_ParseOptionalKeywords(PyObject *kwds, PyObject **argnames[],\
     PyObject *kwds2, PyObject *values[], Py_ssize_t num_pos_args,\
     const char* function_name);
 
-/* RaiseArgTupleInvalid.proto */
-static void __Pyx_RaiseArgtupleInvalid(const char* func_name, int exact,
-    Py_ssize_t num_min, Py_ssize_t num_max, Py_ssize_t num_found);
+/* PyObjectCallNoArg.proto */
+#if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallNoArg(PyObject *func);
+#else
+#define __Pyx_PyObject_CallNoArg(func) __Pyx_PyObject_Call(func, __pyx_empty_tuple, NULL)
+#endif
 
 /* PyObjectGetMethod.proto */
 static int __Pyx_PyObject_GetMethod(PyObject *obj, PyObject *name, PyObject **method);
@@ -1208,9 +1100,61 @@ static CYTHON_INLINE PyObject *__Pyx_Coroutine_AsyncIterNext(PyObject *o);
 /* FetchCommonType.proto */
 static PyTypeObject* __Pyx_FetchCommonType(PyTypeObject* type);
 
+/* PyThreadStateGet.proto */
+#if CYTHON_FAST_THREAD_STATE
+#define __Pyx_PyThreadState_declare  PyThreadState *__pyx_tstate;
+#define __Pyx_PyThreadState_assign  __pyx_tstate = __Pyx_PyThreadState_Current;
+#define __Pyx_PyErr_Occurred()  __pyx_tstate->curexc_type
+#else
+#define __Pyx_PyThreadState_declare
+#define __Pyx_PyThreadState_assign
+#define __Pyx_PyErr_Occurred()  PyErr_Occurred()
+#endif
+
+/* PyErrFetchRestore.proto */
+#if CYTHON_FAST_THREAD_STATE
+#define __Pyx_PyErr_Clear() __Pyx_ErrRestore(NULL, NULL, NULL)
+#define __Pyx_ErrRestoreWithState(type, value, tb)  __Pyx_ErrRestoreInState(PyThreadState_GET(), type, value, tb)
+#define __Pyx_ErrFetchWithState(type, value, tb)    __Pyx_ErrFetchInState(PyThreadState_GET(), type, value, tb)
+#define __Pyx_ErrRestore(type, value, tb)  __Pyx_ErrRestoreInState(__pyx_tstate, type, value, tb)
+#define __Pyx_ErrFetch(type, value, tb)    __Pyx_ErrFetchInState(__pyx_tstate, type, value, tb)
+static CYTHON_INLINE void __Pyx_ErrRestoreInState(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb);
+static CYTHON_INLINE void __Pyx_ErrFetchInState(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb);
+#if CYTHON_COMPILING_IN_CPYTHON
+#define __Pyx_PyErr_SetNone(exc) (Py_INCREF(exc), __Pyx_ErrRestore((exc), NULL, NULL))
+#else
+#define __Pyx_PyErr_SetNone(exc) PyErr_SetNone(exc)
+#endif
+#else
+#define __Pyx_PyErr_Clear() PyErr_Clear()
+#define __Pyx_PyErr_SetNone(exc) PyErr_SetNone(exc)
+#define __Pyx_ErrRestoreWithState(type, value, tb)  PyErr_Restore(type, value, tb)
+#define __Pyx_ErrFetchWithState(type, value, tb)  PyErr_Fetch(type, value, tb)
+#define __Pyx_ErrRestoreInState(tstate, type, value, tb)  PyErr_Restore(type, value, tb)
+#define __Pyx_ErrFetchInState(tstate, type, value, tb)  PyErr_Fetch(type, value, tb)
+#define __Pyx_ErrRestore(type, value, tb)  PyErr_Restore(type, value, tb)
+#define __Pyx_ErrFetch(type, value, tb)  PyErr_Fetch(type, value, tb)
+#endif
+
 /* RaiseException.proto */
 static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject *cause);
 
+/* GetTopmostException.proto */
+#if CYTHON_USE_EXC_INFO_STACK
+static _PyErr_StackItem * __Pyx_PyErr_GetTopmostException(PyThreadState *tstate);
+#endif
+
+/* SaveResetException.proto */
+#if CYTHON_FAST_THREAD_STATE
+#define __Pyx_ExceptionSave(type, value, tb)  __Pyx__ExceptionSave(__pyx_tstate, type, value, tb)
+static CYTHON_INLINE void __Pyx__ExceptionSave(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb);
+#define __Pyx_ExceptionReset(type, value, tb)  __Pyx__ExceptionReset(__pyx_tstate, type, value, tb)
+static CYTHON_INLINE void __Pyx__ExceptionReset(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb);
+#else
+#define __Pyx_ExceptionSave(type, value, tb)   PyErr_GetExcInfo(type, value, tb)
+#define __Pyx_ExceptionReset(type, value, tb)  PyErr_SetExcInfo(type, value, tb)
+#endif
+
 /* SwapException.proto */
 #if CYTHON_FAST_THREAD_STATE
 #define __Pyx_ExceptionSwap(type, value, tb)  __Pyx__ExceptionSwap(__pyx_tstate, type, value, tb)
@@ -1322,99 +1266,13 @@ static CYTHON_INLINE PyObject* __Pyx_Coroutine_Yield_From(__pyx_CoroutineObject
 static PyObject *__Pyx_PyExc_StopAsyncIteration;
 static int __pyx_StopAsyncIteration_init(void);
 
-/* PySequenceContains.proto */
-static CYTHON_INLINE int __Pyx_PySequence_ContainsTF(PyObject* item, PyObject* seq, int eq) {
-    int result = PySequence_Contains(seq, item);
-    return unlikely(result < 0) ? result : (result == (eq == Py_EQ));
-}
-
-/* DictGetItem.proto */
-#if PY_MAJOR_VERSION >= 3 && !CYTHON_COMPILING_IN_PYPY
-static PyObject *__Pyx_PyDict_GetItem(PyObject *d, PyObject* key);
-#define __Pyx_PyObject_Dict_GetItem(obj, name)\
-    (likely(PyDict_CheckExact(obj)) ?\
-     __Pyx_PyDict_GetItem(obj, name) : PyObject_GetItem(obj, name))
-#else
-#define __Pyx_PyDict_GetItem(d, key) PyObject_GetItem(d, key)
-#define __Pyx_PyObject_Dict_GetItem(obj, name)  PyObject_GetItem(obj, name)
-#endif
-
-/* IncludeStringH.proto */
-#include <string.h>
-
-/* BytesEquals.proto */
-static CYTHON_INLINE int __Pyx_PyBytes_Equals(PyObject* s1, PyObject* s2, int equals);
-
-/* UnicodeEquals.proto */
-static CYTHON_INLINE int __Pyx_PyUnicode_Equals(PyObject* s1, PyObject* s2, int equals);
-
-/* StrEquals.proto */
-#if PY_MAJOR_VERSION >= 3
-#define __Pyx_PyString_Equals __Pyx_PyUnicode_Equals
-#else
-#define __Pyx_PyString_Equals __Pyx_PyBytes_Equals
-#endif
-
-/* GetItemInt.proto */
-#define __Pyx_GetItemInt(o, i, type, is_signed, to_py_func, is_list, wraparound, boundscheck)\
-    (__Pyx_fits_Py_ssize_t(i, type, is_signed) ?\
-    __Pyx_GetItemInt_Fast(o, (Py_ssize_t)i, is_list, wraparound, boundscheck) :\
-    (is_list ? (PyErr_SetString(PyExc_IndexError, "list index out of range"), (PyObject*)NULL) :\
-               __Pyx_GetItemInt_Generic(o, to_py_func(i))))
-#define __Pyx_GetItemInt_List(o, i, type, is_signed, to_py_func, is_list, wraparound, boundscheck)\
-    (__Pyx_fits_Py_ssize_t(i, type, is_signed) ?\
-    __Pyx_GetItemInt_List_Fast(o, (Py_ssize_t)i, wraparound, boundscheck) :\
-    (PyErr_SetString(PyExc_IndexError, "list index out of range"), (PyObject*)NULL))
-static CYTHON_INLINE PyObject *__Pyx_GetItemInt_List_Fast(PyObject *o, Py_ssize_t i,
-                                                              int wraparound, int boundscheck);
-#define __Pyx_GetItemInt_Tuple(o, i, type, is_signed, to_py_func, is_list, wraparound, boundscheck)\
-    (__Pyx_fits_Py_ssize_t(i, type, is_signed) ?\
-    __Pyx_GetItemInt_Tuple_Fast(o, (Py_ssize_t)i, wraparound, boundscheck) :\
-    (PyErr_SetString(PyExc_IndexError, "tuple index out of range"), (PyObject*)NULL))
-static CYTHON_INLINE PyObject *__Pyx_GetItemInt_Tuple_Fast(PyObject *o, Py_ssize_t i,
-                                                              int wraparound, int boundscheck);
-static PyObject *__Pyx_GetItemInt_Generic(PyObject *o, PyObject* j);
-static CYTHON_INLINE PyObject *__Pyx_GetItemInt_Fast(PyObject *o, Py_ssize_t i,
-                                                     int is_list, int wraparound, int boundscheck);
-
 /* ReturnWithStopIteration.proto */
 #define __Pyx_ReturnWithStopIteration(value)\
     if (value == Py_None) PyErr_SetNone(PyExc_StopIteration); else __Pyx__ReturnWithStopIteration(value)
 static void __Pyx__ReturnWithStopIteration(PyObject* value);
 
-/* UnpackUnboundCMethod.proto */
-typedef struct {
-    PyObject *type;
-    PyObject **method_name;
-    PyCFunction func;
-    PyObject *method;
-    int flag;
-} __Pyx_CachedCFunction;
-
-/* CallUnboundCMethod1.proto */
-static PyObject* __Pyx__CallUnboundCMethod1(__Pyx_CachedCFunction* cfunc, PyObject* self, PyObject* arg);
-#if CYTHON_COMPILING_IN_CPYTHON
-static CYTHON_INLINE PyObject* __Pyx_CallUnboundCMethod1(__Pyx_CachedCFunction* cfunc, PyObject* self, PyObject* arg);
-#else
-#define __Pyx_CallUnboundCMethod1(cfunc, self, arg)  __Pyx__CallUnboundCMethod1(cfunc, self, arg)
-#endif
-
-/* ListCompAppend.proto */
-#if CYTHON_USE_PYLIST_INTERNALS && CYTHON_ASSUME_SAFE_MACROS
-static CYTHON_INLINE int __Pyx_ListComp_Append(PyObject* list, PyObject* x) {
-    PyListObject* L = (PyListObject*) list;
-    Py_ssize_t len = Py_SIZE(list);
-    if (likely(L->allocated > len)) {
-        Py_INCREF(x);
-        PyList_SET_ITEM(list, len, x);
-        __Pyx_SET_SIZE(list, len + 1);
-        return 0;
-    }
-    return PyList_Append(list, x);
-}
-#else
-#define __Pyx_ListComp_Append(L,x) PyList_Append(L,x)
-#endif
+/* IncludeStringH.proto */
+#include <string.h>
 
 /* Import.proto */
 static PyObject *__Pyx_Import(PyObject *name, PyObject *from_list, int level);
@@ -1425,6 +1283,9 @@ static PyObject* __Pyx_patch_inspect(PyObject* module);
 /* PatchAsyncIO.proto */
 static PyObject* __Pyx_patch_asyncio(PyObject* module);
 
+/* ImportFrom.proto */
+static PyObject* __Pyx_ImportFrom(PyObject* module, PyObject* name);
+
 /* CLineInTraceback.proto */
 #ifdef CYTHON_CLINE_IN_TRACEBACK
 #define __Pyx_CLineForTraceback(tstate, c_line)  (((CYTHON_CLINE_IN_TRACEBACK)) ? c_line : 0)
@@ -1463,17 +1324,17 @@ static PyObject* __pyx_print = 0;
 static PyObject* __pyx_print_kwargs = 0;
 #endif
 
+/* CIntFromPy.proto */
+static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *);
+
 /* CIntToPy.proto */
-static CYTHON_INLINE PyObject* __Pyx_PyInt_From_long(long value);
+static CYTHON_INLINE PyObject* __Pyx_PyInt_From_int(int value);
 
 /* PrintOne.proto */
 static int __Pyx_PrintOne(PyObject* stream, PyObject *o);
 
 /* CIntToPy.proto */
-static CYTHON_INLINE PyObject* __Pyx_PyInt_From_int(int value);
-
-/* CIntFromPy.proto */
-static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *);
+static CYTHON_INLINE PyObject* __Pyx_PyInt_From_long(long value);
 
 /* CIntFromPy.proto */
 static CYTHON_INLINE long __Pyx_PyInt_As_long(PyObject *);
@@ -1505,108 +1366,70 @@ extern int __pyx_module_is_main_tardis_msg_counter;
 int __pyx_module_is_main_tardis_msg_counter = 0;
 
 /* Implementation of 'tardis_msg_counter' */
-static PyObject *__pyx_builtin_ValueError;
-static const char __pyx_k_l[] = "l";
-static const char __pyx_k_r[] = "r";
-static const char __pyx_k_z[] = "z";
-static const char __pyx_k__2[] = " ";
-static const char __pyx_k__4[] = "\n";
 static const char __pyx_k_np[] = "np";
 static const char __pyx_k_os[] = "os";
 static const char __pyx_k_t1[] = "t1";
 static const char __pyx_k_t2[] = "t2";
+static const char __pyx_k_add[] = "add";
 static const char __pyx_k_end[] = "end";
 static const char __pyx_k_log[] = "log";
 static const char __pyx_k_sec[] = " sec";
 static const char __pyx_k_args[] = "args";
-static const char __pyx_k_data[] = "data";
 static const char __pyx_k_dirs[] = "dirs";
-static const char __pyx_k_exit[] = "__exit__";
+static const char __pyx_k_exch[] = "exch";
 static const char __pyx_k_file[] = "file";
-static const char __pyx_k_find[] = "find";
-static const char __pyx_k_gzip[] = "gzip";
 static const char __pyx_k_join[] = "join";
-static const char __pyx_k_json[] = "json";
 static const char __pyx_k_line[] = "line";
 static const char __pyx_k_main[] = "__main__";
-static const char __pyx_k_misc[] = "misc";
+static const char __pyx_k_msgs[] = "msgs";
 static const char __pyx_k_name[] = "__name__";
-static const char __pyx_k_open[] = "open";
 static const char __pyx_k_path[] = "path";
-static const char __pyx_k_read[] = "read";
+static const char __pyx_k_rows[] = "rows";
 static const char __pyx_k_send[] = "send";
-static const char __pyx_k_side[] = "side";
 static const char __pyx_k_test[] = "__test__";
-static const char __pyx_k_tick[] = "tick";
 static const char __pyx_k_time[] = "time";
-static const char __pyx_k_type[] = "type";
 static const char __pyx_k_walk[] = "walk";
 static const char __pyx_k_aiter[] = "__aiter__";
 static const char __pyx_k_anext[] = "__anext__";
 static const char __pyx_k_await[] = "__await__";
 static const char __pyx_k_close[] = "close";
-static const char __pyx_k_enter[] = "__enter__";
+static const char __pyx_k_count[] = "count";
 static const char __pyx_k_files[] = "files";
-static const char __pyx_k_lines[] = "lines";
-static const char __pyx_k_loads[] = "loads";
-static const char __pyx_k_match[] = "match";
 static const char __pyx_k_numpy[] = "numpy";
-static const char __pyx_k_price[] = "price";
 static const char __pyx_k_print[] = "print";
 static const char __pyx_k_round[] = "round";
-static const char __pyx_k_split[] = "split";
 static const char __pyx_k_throw[] = "throw";
-static const char __pyx_k_trade[] = "trade";
-static const char __pyx_k_ujson[] = "ujson";
-static const char __pyx_k_utf_8[] = "utf-8";
-static const char __pyx_k_decode[] = "decode";
 static const char __pyx_k_import[] = "__import__";
-static const char __pyx_k_params[] = "params";
 static const char __pyx_k_subdir[] = "subdir";
-static const char __pyx_k_symbol[] = "symbol";
-static const char __pyx_k_volume[] = "volume";
 static const char __pyx_k_asyncio[] = "asyncio";
 static const char __pyx_k_inspect[] = "inspect";
-static const char __pyx_k_json_gz[] = ".json.gz";
 static const char __pyx_k_message[] = "message";
 static const char __pyx_k_msg_gen[] = "msg_gen";
-static const char __pyx_k_dir_path[] = "dir_path";
-static const char __pyx_k_endswith[] = "endswith";
-static const char __pyx_k_json_str[] = "json_str";
-static const char __pyx_k_msg_data[] = "msg_data";
 static const char __pyx_k_num_msgs[] = "num_msgs";
 static const char __pyx_k_root_dir[] = "root_dir";
-static const char __pyx_k_sub_data[] = "sub_data";
-static const char __pyx_k_sub_dict[] = "sub_dict";
-static const char __pyx_k_sub_line[] = "sub_line";
 static const char __pyx_k_all_paths[] = "all_paths";
-static const char __pyx_k_file_path[] = "file_path";
-static const char __pyx_k_line_data[] = "line_data";
-static const char __pyx_k_orderType[] = "orderType";
-static const char __pyx_k_ValueError[] = "ValueError";
-static const char __pyx_k_file_paths[] = "file_paths";
-static const char __pyx_k_json_bytes[] = "json_bytes";
-static const char __pyx_k_loaded_line[] = "loaded_line";
-static const char __pyx_k_parsed_line[] = "parsed_line";
-static const char __pyx_k_num_dir_msgs[] = "num_dir_msgs";
+static const char __pyx_k_extractor[] = "extractor";
+static const char __pyx_k_num_lines[] = "num_lines";
+static const char __pyx_k_ret_metrics[] = "ret_metrics";
+static const char __pyx_k_json_helpers[] = "json_helpers";
 static const char __pyx_k_asyncio_tasks[] = "asyncio.tasks";
-static const char __pyx_k_num_file_msgs[] = "num_file_msgs";
+static const char __pyx_k_count_skipped[] = "count_skipped";
+static const char __pyx_k_num_line_msgs[] = "num_line_msgs";
 static const char __pyx_k_parse_msg_line[] = "parse_msg_line";
-static const char __pyx_k_read_gzip_file[] = "read_gzip_file";
+static const char __pyx_k_tardis_metrics[] = "tardis_metrics";
+static const char __pyx_k_cache_and_count[] = "cache_and_count";
 static const char __pyx_k_local_timestamp[] = "local_timestamp";
 static const char __pyx_k_asyncio_coroutines[] = "asyncio.coroutines";
 static const char __pyx_k_cline_in_traceback[] = "cline_in_traceback";
 static const char __pyx_k_tardis_msg_counter[] = "tardis_msg_counter";
+static const char __pyx_k_ret_trade_extractor[] = "ret_trade_extractor";
 static const char __pyx_k_tardis_msg_counter_pyx[] = "tardis_msg_counter.pyx";
+static const char __pyx_k_tardis_trade_extractors[] = "tardis_trade_extractors";
 static const char __pyx_k_ret_all_subdir_file_paths[] = "ret_all_subdir_file_paths";
 static const char __pyx_k_Counting_and_Caching_All_Tardis[] = "\nCounting and Caching All Tardis Trade Msgs Took: ";
-static const char __pyx_k_c_tardis_count_trade_msgs_cache[] = "c_tardis_count_trade_msgs_cache_file";
 static const char __pyx_k_c_tardis_count_and_save_async_ge[] = "c_tardis_count_and_save_async_gen_msgs";
-static const char __pyx_k_c_tardis_count_trade_msgs_cache_2[] = "c_tardis_count_trade_msgs_cache_dir";
 static PyObject *__pyx_kp_s_Counting_and_Caching_All_Tardis;
-static PyObject *__pyx_n_s_ValueError;
-static PyObject *__pyx_kp_s__2;
-static PyObject *__pyx_kp_s__4;
+static PyObject *__pyx_n_s_add;
 static PyObject *__pyx_n_s_aiter;
 static PyObject *__pyx_n_s_all_paths;
 static PyObject *__pyx_n_s_anext;
@@ -1616,378 +1439,141 @@ static PyObject *__pyx_n_s_asyncio_coroutines;
 static PyObject *__pyx_n_s_asyncio_tasks;
 static PyObject *__pyx_n_s_await;
 static PyObject *__pyx_n_s_c_tardis_count_and_save_async_ge;
-static PyObject *__pyx_n_s_c_tardis_count_trade_msgs_cache;
-static PyObject *__pyx_n_s_c_tardis_count_trade_msgs_cache_2;
+static PyObject *__pyx_n_s_cache_and_count;
 static PyObject *__pyx_n_s_cline_in_traceback;
 static PyObject *__pyx_n_s_close;
-static PyObject *__pyx_n_s_data;
-static PyObject *__pyx_n_s_decode;
-static PyObject *__pyx_n_s_dir_path;
+static PyObject *__pyx_n_s_count;
+static PyObject *__pyx_n_s_count_skipped;
 static PyObject *__pyx_n_s_dirs;
 static PyObject *__pyx_n_s_end;
-static PyObject *__pyx_n_s_endswith;
-static PyObject *__pyx_n_s_enter;
-static PyObject *__pyx_n_s_exit;
+static PyObject *__pyx_n_s_exch;
+static PyObject *__pyx_n_s_extractor;
 static PyObject *__pyx_n_s_file;
-static PyObject *__pyx_n_s_file_path;
-static PyObject *__pyx_n_s_file_paths;
 static PyObject *__pyx_n_s_files;
-static PyObject *__pyx_n_s_find;
-static PyObject *__pyx_n_s_gzip;
 static PyObject *__pyx_n_s_import;
 static PyObject *__pyx_n_s_inspect;
 static PyObject *__pyx_n_s_join;
-static PyObject *__pyx_n_s_json;
-static PyObject *__pyx_n_s_json_bytes;
-static PyObject *__pyx_kp_s_json_gz;
-static PyObject *__pyx_n_s_json_str;
-static PyObject *__pyx_n_s_l;
+static PyObject *__pyx_n_s_json_helpers;
 static PyObject *__pyx_n_s_line;
-static PyObject *__pyx_n_s_line_data;
-static PyObject *__pyx_n_s_lines;
-static PyObject *__pyx_n_s_loaded_line;
-static PyObject *__pyx_n_s_loads;
 static PyObject *__pyx_n_s_local_timestamp;
 static PyObject *__pyx_n_s_log;
 static PyObject *__pyx_n_s_main;
-static PyObject *__pyx_n_s_match;
 static PyObject *__pyx_n_s_message;
-static PyObject *__pyx_n_s_misc;
-static PyObject *__pyx_n_s_msg_data;
 static PyObject *__pyx_n_s_msg_gen;
+static PyObject *__pyx_n_s_msgs;
 static PyObject *__pyx_n_s_name;
 static PyObject *__pyx_n_s_np;
-static PyObject *__pyx_n_s_num_dir_msgs;
-static PyObject *__pyx_n_s_num_file_msgs;
+static PyObject *__pyx_n_s_num_line_msgs;
+static PyObject *__pyx_n_s_num_lines;
 static PyObject *__pyx_n_s_num_msgs;
 static PyObject *__pyx_n_s_numpy;
-static PyObject *__pyx_n_s_open;
-static PyObject *__pyx_n_s_orderType;
 static PyObject *__pyx_n_s_os;
-static PyObject *__pyx_n_s_params;
 static PyObject *__pyx_n_s_parse_msg_line;
-static PyObject *__pyx_n_s_parsed_line;
 static PyObject *__pyx_n_s_path;
-static PyObject *__pyx_n_s_price;
 static PyObject *__pyx_n_s_print;
-static PyObject *__pyx_n_s_r;
-static PyObject *__pyx_n_s_read;
-static PyObject *__pyx_n_s_read_gzip_file;
 static PyObject *__pyx_n_s_ret_all_subdir_file_paths;
+static PyObject *__pyx_n_s_ret_metrics;
+static PyObject *__pyx_n_s_ret_trade_extractor;
 static PyObject *__pyx_n_s_root_dir;
 static PyObject *__pyx_n_s_round;
+static PyObject *__pyx_n_s_rows;
 static PyObject *__pyx_kp_s_sec;
 static PyObject *__pyx_n_s_send;
-static PyObject *__pyx_n_s_side;
-static PyObject *__pyx_n_s_split;
-static PyObject *__pyx_n_s_sub_data;
-static PyObject *__pyx_n_s_sub_dict;
-static PyObject *__pyx_n_s_sub_line;
 static PyObject *__pyx_n_s_subdir;
-static PyObject *__pyx_n_s_symbol;
 static PyObject *__pyx_n_s_t1;
 static PyObject *__pyx_n_s_t2;
+static PyObject *__pyx_n_s_tardis_metrics;
 static PyObject *__pyx_n_s_tardis_msg_counter;
 static PyObject *__pyx_kp_s_tardis_msg_counter_pyx;
+static PyObject *__pyx_n_s_tardis_trade_extractors;
 static PyObject *__pyx_n_s_test;
 static PyObject *__pyx_n_s_throw;
-static PyObject *__pyx_n_s_tick;
 static PyObject *__pyx_n_s_time;
-static PyObject *__pyx_n_s_trade;
-static PyObject *__pyx_n_s_type;
-static PyObject *__pyx_n_s_ujson;
-static PyObject *__pyx_kp_s_utf_8;
-static PyObject *__pyx_n_s_volume;
 static PyObject *__pyx_n_s_walk;
-static PyObject *__pyx_n_s_z;
-static PyObject *__pyx_pf_18tardis_msg_counter_read_gzip_file(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_file_path); /* proto */
-static PyObject *__pyx_pf_18tardis_msg_counter_2parse_msg_line(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_line); /* proto */
-static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_root_dir); /* proto */
-static PyObject *__pyx_pf_18tardis_msg_counter_6c_tardis_count_and_save_async_gen_msgs(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_msg_gen, PyObject *__pyx_v_log); /* proto */
-static PyObject *__pyx_pf_18tardis_msg_counter_9c_tardis_count_trade_msgs_cache_file(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_file_path); /* proto */
-static PyObject *__pyx_pf_18tardis_msg_counter_11c_tardis_count_trade_msgs_cache_dir(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_dir_path); /* proto */
+static PyObject *__pyx_pf_18tardis_msg_counter_parse_msg_line(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_line); /* proto */
+static PyObject *__pyx_pf_18tardis_msg_counter_2ret_all_subdir_file_paths(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_root_dir); /* proto */
+static PyObject *__pyx_pf_18tardis_msg_counter_4c_tardis_count_and_save_async_gen_msgs(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_msg_gen, PyObject *__pyx_v_exch, PyObject *__pyx_v_log); /* proto */
 static PyObject *__pyx_tp_new_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs(PyTypeObject *t, PyObject *a, PyObject *k); /*proto*/
-static __Pyx_CachedCFunction __pyx_umethod_PyString_Type_split = {0, &__pyx_n_s_split, 0, 0, 0};
-static PyObject *__pyx_int_1;
 static PyObject *__pyx_int_3;
-static PyObject *__pyx_tuple_;
-static PyObject *__pyx_tuple__5;
-static PyObject *__pyx_tuple__7;
-static PyObject *__pyx_tuple__9;
-static PyObject *__pyx_tuple__11;
-static PyObject *__pyx_tuple__12;
-static PyObject *__pyx_tuple__14;
+static PyObject *__pyx_codeobj_;
+static PyObject *__pyx_tuple__2;
+static PyObject *__pyx_tuple__4;
+static PyObject *__pyx_tuple__6;
 static PyObject *__pyx_codeobj__3;
-static PyObject *__pyx_codeobj__6;
-static PyObject *__pyx_codeobj__8;
-static PyObject *__pyx_codeobj__10;
-static PyObject *__pyx_codeobj__13;
-static PyObject *__pyx_codeobj__15;
+static PyObject *__pyx_codeobj__5;
 /* Late includes */
 
-/* "tardis_msg_counter.pyx":9
- * import time
+/* "tardis_msg_counter.pyx":13
+ * from tardis_metrics import ret_metrics
+ * 
+ * def parse_msg_line(line):             # <<<<<<<<<<<<<<
+ *     return json_helpers.parse_msg_line(line)
  * 
- * def read_gzip_file(file_path):             # <<<<<<<<<<<<<<
- *     with gzip.open(file_path, "r") as z:
- *         json_bytes = z.read()
  */
 
 /* Python wrapper */
-static PyObject *__pyx_pw_18tardis_msg_counter_1read_gzip_file(PyObject *__pyx_self, PyObject *__pyx_v_file_path); /*proto*/
-static PyMethodDef __pyx_mdef_18tardis_msg_counter_1read_gzip_file = {"read_gzip_file", (PyCFunction)__pyx_pw_18tardis_msg_counter_1read_gzip_file, METH_O, 0};
-static PyObject *__pyx_pw_18tardis_msg_counter_1read_gzip_file(PyObject *__pyx_self, PyObject *__pyx_v_file_path) {
+static PyObject *__pyx_pw_18tardis_msg_counter_1parse_msg_line(PyObject *__pyx_self, PyObject *__pyx_v_line); /*proto*/
+static PyMethodDef __pyx_mdef_18tardis_msg_counter_1parse_msg_line = {"parse_msg_line", (PyCFunction)__pyx_pw_18tardis_msg_counter_1parse_msg_line, METH_O, 0};
+static PyObject *__pyx_pw_18tardis_msg_counter_1parse_msg_line(PyObject *__pyx_self, PyObject *__pyx_v_line) {
   PyObject *__pyx_r = 0;
   __Pyx_RefNannyDeclarations
-  __Pyx_RefNannySetupContext("read_gzip_file (wrapper)", 0);
-  __pyx_r = __pyx_pf_18tardis_msg_counter_read_gzip_file(__pyx_self, ((PyObject *)__pyx_v_file_path));
+  __Pyx_RefNannySetupContext("parse_msg_line (wrapper)", 0);
+  __pyx_r = __pyx_pf_18tardis_msg_counter_parse_msg_line(__pyx_self, ((PyObject *)__pyx_v_line));
 
   /* function exit code */
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
 
-static PyObject *__pyx_pf_18tardis_msg_counter_read_gzip_file(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_file_path) {
-  PyObject *__pyx_v_z = NULL;
-  PyObject *__pyx_v_json_bytes = NULL;
+static PyObject *__pyx_pf_18tardis_msg_counter_parse_msg_line(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_line) {
   PyObject *__pyx_r = NULL;
   __Pyx_RefNannyDeclarations
   PyObject *__pyx_t_1 = NULL;
   PyObject *__pyx_t_2 = NULL;
   PyObject *__pyx_t_3 = NULL;
-  int __pyx_t_4;
-  PyObject *__pyx_t_5 = NULL;
-  PyObject *__pyx_t_6 = NULL;
-  PyObject *__pyx_t_7 = NULL;
-  PyObject *__pyx_t_8 = NULL;
-  PyObject *__pyx_t_9 = NULL;
-  PyObject *__pyx_t_10 = NULL;
-  int __pyx_t_11;
-  int __pyx_t_12;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
-  __Pyx_RefNannySetupContext("read_gzip_file", 0);
+  __Pyx_RefNannySetupContext("parse_msg_line", 0);
 
-  /* "tardis_msg_counter.pyx":10
+  /* "tardis_msg_counter.pyx":14
+ * 
+ * def parse_msg_line(line):
+ *     return json_helpers.parse_msg_line(line)             # <<<<<<<<<<<<<<
  * 
- * def read_gzip_file(file_path):
- *     with gzip.open(file_path, "r") as z:             # <<<<<<<<<<<<<<
- *         json_bytes = z.read()
- *     return json_bytes
+ * def ret_all_subdir_file_paths(root_dir):
  */
-  /*with:*/ {
-    __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_gzip); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 10, __pyx_L1_error)
-    __Pyx_GOTREF(__pyx_t_2);
-    __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_t_2, __pyx_n_s_open); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 10, __pyx_L1_error)
-    __Pyx_GOTREF(__pyx_t_3);
-    __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-    __pyx_t_2 = NULL;
-    __pyx_t_4 = 0;
-    if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_3))) {
-      __pyx_t_2 = PyMethod_GET_SELF(__pyx_t_3);
-      if (likely(__pyx_t_2)) {
-        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_3);
-        __Pyx_INCREF(__pyx_t_2);
-        __Pyx_INCREF(function);
-        __Pyx_DECREF_SET(__pyx_t_3, function);
-        __pyx_t_4 = 1;
-      }
+  __Pyx_XDECREF(__pyx_r);
+  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_json_helpers); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 14, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_t_2, __pyx_n_s_parse_msg_line); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 14, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_t_2 = NULL;
+  if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_3))) {
+    __pyx_t_2 = PyMethod_GET_SELF(__pyx_t_3);
+    if (likely(__pyx_t_2)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_3);
+      __Pyx_INCREF(__pyx_t_2);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_3, function);
     }
-    #if CYTHON_FAST_PYCALL
-    if (PyFunction_Check(__pyx_t_3)) {
-      PyObject *__pyx_temp[3] = {__pyx_t_2, __pyx_v_file_path, __pyx_n_s_r};
-      __pyx_t_1 = __Pyx_PyFunction_FastCall(__pyx_t_3, __pyx_temp+1-__pyx_t_4, 2+__pyx_t_4); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 10, __pyx_L1_error)
-      __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
-      __Pyx_GOTREF(__pyx_t_1);
-    } else
-    #endif
-    #if CYTHON_FAST_PYCCALL
-    if (__Pyx_PyFastCFunction_Check(__pyx_t_3)) {
-      PyObject *__pyx_temp[3] = {__pyx_t_2, __pyx_v_file_path, __pyx_n_s_r};
-      __pyx_t_1 = __Pyx_PyCFunction_FastCall(__pyx_t_3, __pyx_temp+1-__pyx_t_4, 2+__pyx_t_4); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 10, __pyx_L1_error)
-      __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
-      __Pyx_GOTREF(__pyx_t_1);
-    } else
-    #endif
-    {
-      __pyx_t_5 = PyTuple_New(2+__pyx_t_4); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 10, __pyx_L1_error)
-      __Pyx_GOTREF(__pyx_t_5);
-      if (__pyx_t_2) {
-        __Pyx_GIVEREF(__pyx_t_2); PyTuple_SET_ITEM(__pyx_t_5, 0, __pyx_t_2); __pyx_t_2 = NULL;
-      }
-      __Pyx_INCREF(__pyx_v_file_path);
-      __Pyx_GIVEREF(__pyx_v_file_path);
-      PyTuple_SET_ITEM(__pyx_t_5, 0+__pyx_t_4, __pyx_v_file_path);
-      __Pyx_INCREF(__pyx_n_s_r);
-      __Pyx_GIVEREF(__pyx_n_s_r);
-      PyTuple_SET_ITEM(__pyx_t_5, 1+__pyx_t_4, __pyx_n_s_r);
-      __pyx_t_1 = __Pyx_PyObject_Call(__pyx_t_3, __pyx_t_5, NULL); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 10, __pyx_L1_error)
-      __Pyx_GOTREF(__pyx_t_1);
-      __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
-    }
-    __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-    __pyx_t_6 = __Pyx_PyObject_LookupSpecial(__pyx_t_1, __pyx_n_s_exit); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 10, __pyx_L1_error)
-    __Pyx_GOTREF(__pyx_t_6);
-    __pyx_t_5 = __Pyx_PyObject_LookupSpecial(__pyx_t_1, __pyx_n_s_enter); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 10, __pyx_L3_error)
-    __Pyx_GOTREF(__pyx_t_5);
-    __pyx_t_2 = NULL;
-    if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_5))) {
-      __pyx_t_2 = PyMethod_GET_SELF(__pyx_t_5);
-      if (likely(__pyx_t_2)) {
-        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_5);
-        __Pyx_INCREF(__pyx_t_2);
-        __Pyx_INCREF(function);
-        __Pyx_DECREF_SET(__pyx_t_5, function);
-      }
-    }
-    __pyx_t_3 = (__pyx_t_2) ? __Pyx_PyObject_CallOneArg(__pyx_t_5, __pyx_t_2) : __Pyx_PyObject_CallNoArg(__pyx_t_5);
-    __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
-    if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 10, __pyx_L3_error)
-    __Pyx_GOTREF(__pyx_t_3);
-    __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
-    __pyx_t_5 = __pyx_t_3;
-    __pyx_t_3 = 0;
-    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-    /*try:*/ {
-      {
-        __Pyx_PyThreadState_declare
-        __Pyx_PyThreadState_assign
-        __Pyx_ExceptionSave(&__pyx_t_7, &__pyx_t_8, &__pyx_t_9);
-        __Pyx_XGOTREF(__pyx_t_7);
-        __Pyx_XGOTREF(__pyx_t_8);
-        __Pyx_XGOTREF(__pyx_t_9);
-        /*try:*/ {
-          __pyx_v_z = __pyx_t_5;
-          __pyx_t_5 = 0;
-
-          /* "tardis_msg_counter.pyx":11
- * def read_gzip_file(file_path):
- *     with gzip.open(file_path, "r") as z:
- *         json_bytes = z.read()             # <<<<<<<<<<<<<<
- *     return json_bytes
- * 
- */
-          __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_v_z, __pyx_n_s_read); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 11, __pyx_L7_error)
-          __Pyx_GOTREF(__pyx_t_1);
-          __pyx_t_3 = NULL;
-          if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_1))) {
-            __pyx_t_3 = PyMethod_GET_SELF(__pyx_t_1);
-            if (likely(__pyx_t_3)) {
-              PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_1);
-              __Pyx_INCREF(__pyx_t_3);
-              __Pyx_INCREF(function);
-              __Pyx_DECREF_SET(__pyx_t_1, function);
-            }
-          }
-          __pyx_t_5 = (__pyx_t_3) ? __Pyx_PyObject_CallOneArg(__pyx_t_1, __pyx_t_3) : __Pyx_PyObject_CallNoArg(__pyx_t_1);
-          __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
-          if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 11, __pyx_L7_error)
-          __Pyx_GOTREF(__pyx_t_5);
-          __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-          __pyx_v_json_bytes = __pyx_t_5;
-          __pyx_t_5 = 0;
-
-          /* "tardis_msg_counter.pyx":10
- * 
- * def read_gzip_file(file_path):
- *     with gzip.open(file_path, "r") as z:             # <<<<<<<<<<<<<<
- *         json_bytes = z.read()
- *     return json_bytes
- */
-        }
-        __Pyx_XDECREF(__pyx_t_7); __pyx_t_7 = 0;
-        __Pyx_XDECREF(__pyx_t_8); __pyx_t_8 = 0;
-        __Pyx_XDECREF(__pyx_t_9); __pyx_t_9 = 0;
-        goto __pyx_L12_try_end;
-        __pyx_L7_error:;
-        __Pyx_XDECREF(__pyx_t_1); __pyx_t_1 = 0;
-        __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
-        __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
-        __Pyx_XDECREF(__pyx_t_5); __pyx_t_5 = 0;
-        /*except:*/ {
-          __Pyx_AddTraceback("tardis_msg_counter.read_gzip_file", __pyx_clineno, __pyx_lineno, __pyx_filename);
-          if (__Pyx_GetException(&__pyx_t_5, &__pyx_t_1, &__pyx_t_3) < 0) __PYX_ERR(0, 10, __pyx_L9_except_error)
-          __Pyx_GOTREF(__pyx_t_5);
-          __Pyx_GOTREF(__pyx_t_1);
-          __Pyx_GOTREF(__pyx_t_3);
-          __pyx_t_2 = PyTuple_Pack(3, __pyx_t_5, __pyx_t_1, __pyx_t_3); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 10, __pyx_L9_except_error)
-          __Pyx_GOTREF(__pyx_t_2);
-          __pyx_t_10 = __Pyx_PyObject_Call(__pyx_t_6, __pyx_t_2, NULL);
-          __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-          __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-          if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 10, __pyx_L9_except_error)
-          __Pyx_GOTREF(__pyx_t_10);
-          __pyx_t_11 = __Pyx_PyObject_IsTrue(__pyx_t_10);
-          __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
-          if (__pyx_t_11 < 0) __PYX_ERR(0, 10, __pyx_L9_except_error)
-          __pyx_t_12 = ((!(__pyx_t_11 != 0)) != 0);
-          if (__pyx_t_12) {
-            __Pyx_GIVEREF(__pyx_t_5);
-            __Pyx_GIVEREF(__pyx_t_1);
-            __Pyx_XGIVEREF(__pyx_t_3);
-            __Pyx_ErrRestoreWithState(__pyx_t_5, __pyx_t_1, __pyx_t_3);
-            __pyx_t_5 = 0; __pyx_t_1 = 0; __pyx_t_3 = 0; 
-            __PYX_ERR(0, 10, __pyx_L9_except_error)
-          }
-          __Pyx_XDECREF(__pyx_t_5); __pyx_t_5 = 0;
-          __Pyx_XDECREF(__pyx_t_1); __pyx_t_1 = 0;
-          __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
-          goto __pyx_L8_exception_handled;
-        }
-        __pyx_L9_except_error:;
-        __Pyx_XGIVEREF(__pyx_t_7);
-        __Pyx_XGIVEREF(__pyx_t_8);
-        __Pyx_XGIVEREF(__pyx_t_9);
-        __Pyx_ExceptionReset(__pyx_t_7, __pyx_t_8, __pyx_t_9);
-        goto __pyx_L1_error;
-        __pyx_L8_exception_handled:;
-        __Pyx_XGIVEREF(__pyx_t_7);
-        __Pyx_XGIVEREF(__pyx_t_8);
-        __Pyx_XGIVEREF(__pyx_t_9);
-        __Pyx_ExceptionReset(__pyx_t_7, __pyx_t_8, __pyx_t_9);
-        __pyx_L12_try_end:;
-      }
-    }
-    /*finally:*/ {
-      /*normal exit:*/{
-        if (__pyx_t_6) {
-          __pyx_t_9 = __Pyx_PyObject_Call(__pyx_t_6, __pyx_tuple_, NULL);
-          __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-          if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 10, __pyx_L1_error)
-          __Pyx_GOTREF(__pyx_t_9);
-          __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
-        }
-        goto __pyx_L6;
-      }
-      __pyx_L6:;
-    }
-    goto __pyx_L16;
-    __pyx_L3_error:;
-    __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-    goto __pyx_L1_error;
-    __pyx_L16:;
   }
-
-  /* "tardis_msg_counter.pyx":12
- *     with gzip.open(file_path, "r") as z:
- *         json_bytes = z.read()
- *     return json_bytes             # <<<<<<<<<<<<<<
- * 
- * def parse_msg_line(line):
- */
-  __Pyx_XDECREF(__pyx_r);
-  if (unlikely(!__pyx_v_json_bytes)) { __Pyx_RaiseUnboundLocalError("json_bytes"); __PYX_ERR(0, 12, __pyx_L1_error) }
-  __Pyx_INCREF(__pyx_v_json_bytes);
-  __pyx_r = __pyx_v_json_bytes;
+  __pyx_t_1 = (__pyx_t_2) ? __Pyx_PyObject_Call2Args(__pyx_t_3, __pyx_t_2, __pyx_v_line) : __Pyx_PyObject_CallOneArg(__pyx_t_3, __pyx_v_line);
+  __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 14, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  __pyx_r = __pyx_t_1;
+  __pyx_t_1 = 0;
   goto __pyx_L0;
 
-  /* "tardis_msg_counter.pyx":9
- * import time
+  /* "tardis_msg_counter.pyx":13
+ * from tardis_metrics import ret_metrics
+ * 
+ * def parse_msg_line(line):             # <<<<<<<<<<<<<<
+ *     return json_helpers.parse_msg_line(line)
  * 
- * def read_gzip_file(file_path):             # <<<<<<<<<<<<<<
- *     with gzip.open(file_path, "r") as z:
- *         json_bytes = z.read()
  */
 
   /* function exit code */
@@ -1995,286 +1581,16 @@ static PyObject *__pyx_pf_18tardis_msg_counter_read_gzip_file(CYTHON_UNUSED PyOb
   __Pyx_XDECREF(__pyx_t_1);
   __Pyx_XDECREF(__pyx_t_2);
   __Pyx_XDECREF(__pyx_t_3);
-  __Pyx_XDECREF(__pyx_t_5);
-  __Pyx_AddTraceback("tardis_msg_counter.read_gzip_file", __pyx_clineno, __pyx_lineno, __pyx_filename);
-  __pyx_r = NULL;
-  __pyx_L0:;
-  __Pyx_XDECREF(__pyx_v_z);
-  __Pyx_XDECREF(__pyx_v_json_bytes);
-  __Pyx_XGIVEREF(__pyx_r);
-  __Pyx_RefNannyFinishContext();
-  return __pyx_r;
-}
-
-/* "tardis_msg_counter.pyx":14
- *     return json_bytes
- * 
- * def parse_msg_line(line):             # <<<<<<<<<<<<<<
- *     try:
- *         parsed_line = ujson.loads(line[line.find(' ')+1:])
- */
-
-/* Python wrapper */
-static PyObject *__pyx_pw_18tardis_msg_counter_3parse_msg_line(PyObject *__pyx_self, PyObject *__pyx_v_line); /*proto*/
-static PyMethodDef __pyx_mdef_18tardis_msg_counter_3parse_msg_line = {"parse_msg_line", (PyCFunction)__pyx_pw_18tardis_msg_counter_3parse_msg_line, METH_O, 0};
-static PyObject *__pyx_pw_18tardis_msg_counter_3parse_msg_line(PyObject *__pyx_self, PyObject *__pyx_v_line) {
-  PyObject *__pyx_r = 0;
-  __Pyx_RefNannyDeclarations
-  __Pyx_RefNannySetupContext("parse_msg_line (wrapper)", 0);
-  __pyx_r = __pyx_pf_18tardis_msg_counter_2parse_msg_line(__pyx_self, ((PyObject *)__pyx_v_line));
-
-  /* function exit code */
-  __Pyx_RefNannyFinishContext();
-  return __pyx_r;
-}
-
-static PyObject *__pyx_pf_18tardis_msg_counter_2parse_msg_line(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_line) {
-  PyObject *__pyx_v_parsed_line = NULL;
-  PyObject *__pyx_r = NULL;
-  __Pyx_RefNannyDeclarations
-  PyObject *__pyx_t_1 = NULL;
-  PyObject *__pyx_t_2 = NULL;
-  PyObject *__pyx_t_3 = NULL;
-  PyObject *__pyx_t_4 = NULL;
-  PyObject *__pyx_t_5 = NULL;
-  PyObject *__pyx_t_6 = NULL;
-  PyObject *__pyx_t_7 = NULL;
-  PyObject *__pyx_t_8 = NULL;
-  int __pyx_t_9;
-  PyObject *__pyx_t_10 = NULL;
-  PyObject *__pyx_t_11 = NULL;
-  PyObject *__pyx_t_12 = NULL;
-  int __pyx_lineno = 0;
-  const char *__pyx_filename = NULL;
-  int __pyx_clineno = 0;
-  __Pyx_RefNannySetupContext("parse_msg_line", 0);
-
-  /* "tardis_msg_counter.pyx":15
- * 
- * def parse_msg_line(line):
- *     try:             # <<<<<<<<<<<<<<
- *         parsed_line = ujson.loads(line[line.find(' ')+1:])
- *     except ValueError:
- */
-  {
-    __Pyx_PyThreadState_declare
-    __Pyx_PyThreadState_assign
-    __Pyx_ExceptionSave(&__pyx_t_1, &__pyx_t_2, &__pyx_t_3);
-    __Pyx_XGOTREF(__pyx_t_1);
-    __Pyx_XGOTREF(__pyx_t_2);
-    __Pyx_XGOTREF(__pyx_t_3);
-    /*try:*/ {
-
-      /* "tardis_msg_counter.pyx":16
- * def parse_msg_line(line):
- *     try:
- *         parsed_line = ujson.loads(line[line.find(' ')+1:])             # <<<<<<<<<<<<<<
- *     except ValueError:
- *         parsed_line = json.loads(line[line.find(' ')+1:])
- */
-      __Pyx_GetModuleGlobalName(__pyx_t_5, __pyx_n_s_ujson); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 16, __pyx_L3_error)
-      __Pyx_GOTREF(__pyx_t_5);
-      __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_t_5, __pyx_n_s_loads); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 16, __pyx_L3_error)
-      __Pyx_GOTREF(__pyx_t_6);
-      __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
-      __pyx_t_7 = __Pyx_PyObject_GetAttrStr(__pyx_v_line, __pyx_n_s_find); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 16, __pyx_L3_error)
-      __Pyx_GOTREF(__pyx_t_7);
-      __pyx_t_8 = NULL;
-      if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_7))) {
-        __pyx_t_8 = PyMethod_GET_SELF(__pyx_t_7);
-        if (likely(__pyx_t_8)) {
-          PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_7);
-          __Pyx_INCREF(__pyx_t_8);
-          __Pyx_INCREF(function);
-          __Pyx_DECREF_SET(__pyx_t_7, function);
-        }
-      }
-      __pyx_t_5 = (__pyx_t_8) ? __Pyx_PyObject_Call2Args(__pyx_t_7, __pyx_t_8, __pyx_kp_s__2) : __Pyx_PyObject_CallOneArg(__pyx_t_7, __pyx_kp_s__2);
-      __Pyx_XDECREF(__pyx_t_8); __pyx_t_8 = 0;
-      if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 16, __pyx_L3_error)
-      __Pyx_GOTREF(__pyx_t_5);
-      __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
-      __pyx_t_7 = __Pyx_PyInt_AddObjC(__pyx_t_5, __pyx_int_1, 1, 0, 0); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 16, __pyx_L3_error)
-      __Pyx_GOTREF(__pyx_t_7);
-      __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
-      __pyx_t_5 = __Pyx_PyObject_GetSlice(__pyx_v_line, 0, 0, &__pyx_t_7, NULL, NULL, 0, 0, 1); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 16, __pyx_L3_error)
-      __Pyx_GOTREF(__pyx_t_5);
-      __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
-      __pyx_t_7 = NULL;
-      if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_6))) {
-        __pyx_t_7 = PyMethod_GET_SELF(__pyx_t_6);
-        if (likely(__pyx_t_7)) {
-          PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_6);
-          __Pyx_INCREF(__pyx_t_7);
-          __Pyx_INCREF(function);
-          __Pyx_DECREF_SET(__pyx_t_6, function);
-        }
-      }
-      __pyx_t_4 = (__pyx_t_7) ? __Pyx_PyObject_Call2Args(__pyx_t_6, __pyx_t_7, __pyx_t_5) : __Pyx_PyObject_CallOneArg(__pyx_t_6, __pyx_t_5);
-      __Pyx_XDECREF(__pyx_t_7); __pyx_t_7 = 0;
-      __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
-      if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 16, __pyx_L3_error)
-      __Pyx_GOTREF(__pyx_t_4);
-      __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-      __pyx_v_parsed_line = __pyx_t_4;
-      __pyx_t_4 = 0;
-
-      /* "tardis_msg_counter.pyx":15
- * 
- * def parse_msg_line(line):
- *     try:             # <<<<<<<<<<<<<<
- *         parsed_line = ujson.loads(line[line.find(' ')+1:])
- *     except ValueError:
- */
-    }
-    __Pyx_XDECREF(__pyx_t_1); __pyx_t_1 = 0;
-    __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
-    __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
-    goto __pyx_L8_try_end;
-    __pyx_L3_error:;
-    __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
-    __Pyx_XDECREF(__pyx_t_5); __pyx_t_5 = 0;
-    __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
-    __Pyx_XDECREF(__pyx_t_7); __pyx_t_7 = 0;
-    __Pyx_XDECREF(__pyx_t_8); __pyx_t_8 = 0;
-
-    /* "tardis_msg_counter.pyx":17
- *     try:
- *         parsed_line = ujson.loads(line[line.find(' ')+1:])
- *     except ValueError:             # <<<<<<<<<<<<<<
- *         parsed_line = json.loads(line[line.find(' ')+1:])
- *     return parsed_line
- */
-    __pyx_t_9 = __Pyx_PyErr_ExceptionMatches(__pyx_builtin_ValueError);
-    if (__pyx_t_9) {
-      __Pyx_AddTraceback("tardis_msg_counter.parse_msg_line", __pyx_clineno, __pyx_lineno, __pyx_filename);
-      if (__Pyx_GetException(&__pyx_t_4, &__pyx_t_6, &__pyx_t_5) < 0) __PYX_ERR(0, 17, __pyx_L5_except_error)
-      __Pyx_GOTREF(__pyx_t_4);
-      __Pyx_GOTREF(__pyx_t_6);
-      __Pyx_GOTREF(__pyx_t_5);
-
-      /* "tardis_msg_counter.pyx":18
- *         parsed_line = ujson.loads(line[line.find(' ')+1:])
- *     except ValueError:
- *         parsed_line = json.loads(line[line.find(' ')+1:])             # <<<<<<<<<<<<<<
- *     return parsed_line
- * 
- */
-      __Pyx_GetModuleGlobalName(__pyx_t_8, __pyx_n_s_json); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 18, __pyx_L5_except_error)
-      __Pyx_GOTREF(__pyx_t_8);
-      __pyx_t_10 = __Pyx_PyObject_GetAttrStr(__pyx_t_8, __pyx_n_s_loads); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 18, __pyx_L5_except_error)
-      __Pyx_GOTREF(__pyx_t_10);
-      __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
-      __pyx_t_11 = __Pyx_PyObject_GetAttrStr(__pyx_v_line, __pyx_n_s_find); if (unlikely(!__pyx_t_11)) __PYX_ERR(0, 18, __pyx_L5_except_error)
-      __Pyx_GOTREF(__pyx_t_11);
-      __pyx_t_12 = NULL;
-      if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_11))) {
-        __pyx_t_12 = PyMethod_GET_SELF(__pyx_t_11);
-        if (likely(__pyx_t_12)) {
-          PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_11);
-          __Pyx_INCREF(__pyx_t_12);
-          __Pyx_INCREF(function);
-          __Pyx_DECREF_SET(__pyx_t_11, function);
-        }
-      }
-      __pyx_t_8 = (__pyx_t_12) ? __Pyx_PyObject_Call2Args(__pyx_t_11, __pyx_t_12, __pyx_kp_s__2) : __Pyx_PyObject_CallOneArg(__pyx_t_11, __pyx_kp_s__2);
-      __Pyx_XDECREF(__pyx_t_12); __pyx_t_12 = 0;
-      if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 18, __pyx_L5_except_error)
-      __Pyx_GOTREF(__pyx_t_8);
-      __Pyx_DECREF(__pyx_t_11); __pyx_t_11 = 0;
-      __pyx_t_11 = __Pyx_PyInt_AddObjC(__pyx_t_8, __pyx_int_1, 1, 0, 0); if (unlikely(!__pyx_t_11)) __PYX_ERR(0, 18, __pyx_L5_except_error)
-      __Pyx_GOTREF(__pyx_t_11);
-      __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
-      __pyx_t_8 = __Pyx_PyObject_GetSlice(__pyx_v_line, 0, 0, &__pyx_t_11, NULL, NULL, 0, 0, 1); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 18, __pyx_L5_except_error)
-      __Pyx_GOTREF(__pyx_t_8);
-      __Pyx_DECREF(__pyx_t_11); __pyx_t_11 = 0;
-      __pyx_t_11 = NULL;
-      if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_10))) {
-        __pyx_t_11 = PyMethod_GET_SELF(__pyx_t_10);
-        if (likely(__pyx_t_11)) {
-          PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_10);
-          __Pyx_INCREF(__pyx_t_11);
-          __Pyx_INCREF(function);
-          __Pyx_DECREF_SET(__pyx_t_10, function);
-        }
-      }
-      __pyx_t_7 = (__pyx_t_11) ? __Pyx_PyObject_Call2Args(__pyx_t_10, __pyx_t_11, __pyx_t_8) : __Pyx_PyObject_CallOneArg(__pyx_t_10, __pyx_t_8);
-      __Pyx_XDECREF(__pyx_t_11); __pyx_t_11 = 0;
-      __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
-      if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 18, __pyx_L5_except_error)
-      __Pyx_GOTREF(__pyx_t_7);
-      __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
-      __Pyx_XDECREF_SET(__pyx_v_parsed_line, __pyx_t_7);
-      __pyx_t_7 = 0;
-      __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
-      __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
-      __Pyx_XDECREF(__pyx_t_5); __pyx_t_5 = 0;
-      goto __pyx_L4_exception_handled;
-    }
-    goto __pyx_L5_except_error;
-    __pyx_L5_except_error:;
-
-    /* "tardis_msg_counter.pyx":15
- * 
- * def parse_msg_line(line):
- *     try:             # <<<<<<<<<<<<<<
- *         parsed_line = ujson.loads(line[line.find(' ')+1:])
- *     except ValueError:
- */
-    __Pyx_XGIVEREF(__pyx_t_1);
-    __Pyx_XGIVEREF(__pyx_t_2);
-    __Pyx_XGIVEREF(__pyx_t_3);
-    __Pyx_ExceptionReset(__pyx_t_1, __pyx_t_2, __pyx_t_3);
-    goto __pyx_L1_error;
-    __pyx_L4_exception_handled:;
-    __Pyx_XGIVEREF(__pyx_t_1);
-    __Pyx_XGIVEREF(__pyx_t_2);
-    __Pyx_XGIVEREF(__pyx_t_3);
-    __Pyx_ExceptionReset(__pyx_t_1, __pyx_t_2, __pyx_t_3);
-    __pyx_L8_try_end:;
-  }
-
-  /* "tardis_msg_counter.pyx":19
- *     except ValueError:
- *         parsed_line = json.loads(line[line.find(' ')+1:])
- *     return parsed_line             # <<<<<<<<<<<<<<
- * 
- * def ret_all_subdir_file_paths(root_dir):
- */
-  __Pyx_XDECREF(__pyx_r);
-  __Pyx_INCREF(__pyx_v_parsed_line);
-  __pyx_r = __pyx_v_parsed_line;
-  goto __pyx_L0;
-
-  /* "tardis_msg_counter.pyx":14
- *     return json_bytes
- * 
- * def parse_msg_line(line):             # <<<<<<<<<<<<<<
- *     try:
- *         parsed_line = ujson.loads(line[line.find(' ')+1:])
- */
-
-  /* function exit code */
-  __pyx_L1_error:;
-  __Pyx_XDECREF(__pyx_t_4);
-  __Pyx_XDECREF(__pyx_t_5);
-  __Pyx_XDECREF(__pyx_t_6);
-  __Pyx_XDECREF(__pyx_t_7);
-  __Pyx_XDECREF(__pyx_t_8);
-  __Pyx_XDECREF(__pyx_t_10);
-  __Pyx_XDECREF(__pyx_t_11);
-  __Pyx_XDECREF(__pyx_t_12);
   __Pyx_AddTraceback("tardis_msg_counter.parse_msg_line", __pyx_clineno, __pyx_lineno, __pyx_filename);
   __pyx_r = NULL;
   __pyx_L0:;
-  __Pyx_XDECREF(__pyx_v_parsed_line);
   __Pyx_XGIVEREF(__pyx_r);
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
 
-/* "tardis_msg_counter.pyx":21
- *     return parsed_line
+/* "tardis_msg_counter.pyx":16
+ *     return json_helpers.parse_msg_line(line)
  * 
  * def ret_all_subdir_file_paths(root_dir):             # <<<<<<<<<<<<<<
  *     """
@@ -2282,21 +1598,21 @@ static PyObject *__pyx_pf_18tardis_msg_counter_2parse_msg_line(CYTHON_UNUSED PyO
  */
 
 /* Python wrapper */
-static PyObject *__pyx_pw_18tardis_msg_counter_5ret_all_subdir_file_paths(PyObject *__pyx_self, PyObject *__pyx_v_root_dir); /*proto*/
-static char __pyx_doc_18tardis_msg_counter_4ret_all_subdir_file_paths[] = "\n    Return list of full paths of all files in all sub dirs of a root dir\n    ";
-static PyMethodDef __pyx_mdef_18tardis_msg_counter_5ret_all_subdir_file_paths = {"ret_all_subdir_file_paths", (PyCFunction)__pyx_pw_18tardis_msg_counter_5ret_all_subdir_file_paths, METH_O, __pyx_doc_18tardis_msg_counter_4ret_all_subdir_file_paths};
-static PyObject *__pyx_pw_18tardis_msg_counter_5ret_all_subdir_file_paths(PyObject *__pyx_self, PyObject *__pyx_v_root_dir) {
+static PyObject *__pyx_pw_18tardis_msg_counter_3ret_all_subdir_file_paths(PyObject *__pyx_self, PyObject *__pyx_v_root_dir); /*proto*/
+static char __pyx_doc_18tardis_msg_counter_2ret_all_subdir_file_paths[] = "\n    Return list of full paths of all files in all sub dirs of a root dir\n    ";
+static PyMethodDef __pyx_mdef_18tardis_msg_counter_3ret_all_subdir_file_paths = {"ret_all_subdir_file_paths", (PyCFunction)__pyx_pw_18tardis_msg_counter_3ret_all_subdir_file_paths, METH_O, __pyx_doc_18tardis_msg_counter_2ret_all_subdir_file_paths};
+static PyObject *__pyx_pw_18tardis_msg_counter_3ret_all_subdir_file_paths(PyObject *__pyx_self, PyObject *__pyx_v_root_dir) {
   PyObject *__pyx_r = 0;
   __Pyx_RefNannyDeclarations
   __Pyx_RefNannySetupContext("ret_all_subdir_file_paths (wrapper)", 0);
-  __pyx_r = __pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(__pyx_self, ((PyObject *)__pyx_v_root_dir));
+  __pyx_r = __pyx_pf_18tardis_msg_counter_2ret_all_subdir_file_paths(__pyx_self, ((PyObject *)__pyx_v_root_dir));
 
   /* function exit code */
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
 
-static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_root_dir) {
+static PyObject *__pyx_pf_18tardis_msg_counter_2ret_all_subdir_file_paths(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_root_dir) {
   PyObject *__pyx_v_all_paths = NULL;
   PyObject *__pyx_v_subdir = NULL;
   CYTHON_UNUSED PyObject *__pyx_v_dirs = NULL;
@@ -2322,28 +1638,28 @@ static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("ret_all_subdir_file_paths", 0);
 
-  /* "tardis_msg_counter.pyx":25
+  /* "tardis_msg_counter.pyx":20
  *     Return list of full paths of all files in all sub dirs of a root dir
  *     """
  *     all_paths = []             # <<<<<<<<<<<<<<
  *     for subdir, dirs, files in os.walk(root_dir):
  *         for file in files:
  */
-  __pyx_t_1 = PyList_New(0); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 25, __pyx_L1_error)
+  __pyx_t_1 = PyList_New(0); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 20, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_v_all_paths = ((PyObject*)__pyx_t_1);
   __pyx_t_1 = 0;
 
-  /* "tardis_msg_counter.pyx":26
+  /* "tardis_msg_counter.pyx":21
  *     """
  *     all_paths = []
  *     for subdir, dirs, files in os.walk(root_dir):             # <<<<<<<<<<<<<<
  *         for file in files:
  *             all_paths.append(os.path.join(subdir, file))
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_os); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 26, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_os); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 21, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_t_2, __pyx_n_s_walk); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 26, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_t_2, __pyx_n_s_walk); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 21, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_3);
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __pyx_t_2 = NULL;
@@ -2358,16 +1674,16 @@ static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON
   }
   __pyx_t_1 = (__pyx_t_2) ? __Pyx_PyObject_Call2Args(__pyx_t_3, __pyx_t_2, __pyx_v_root_dir) : __Pyx_PyObject_CallOneArg(__pyx_t_3, __pyx_v_root_dir);
   __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
-  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 26, __pyx_L1_error)
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 21, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
   if (likely(PyList_CheckExact(__pyx_t_1)) || PyTuple_CheckExact(__pyx_t_1)) {
     __pyx_t_3 = __pyx_t_1; __Pyx_INCREF(__pyx_t_3); __pyx_t_4 = 0;
     __pyx_t_5 = NULL;
   } else {
-    __pyx_t_4 = -1; __pyx_t_3 = PyObject_GetIter(__pyx_t_1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 26, __pyx_L1_error)
+    __pyx_t_4 = -1; __pyx_t_3 = PyObject_GetIter(__pyx_t_1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 21, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_3);
-    __pyx_t_5 = Py_TYPE(__pyx_t_3)->tp_iternext; if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 26, __pyx_L1_error)
+    __pyx_t_5 = Py_TYPE(__pyx_t_3)->tp_iternext; if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 21, __pyx_L1_error)
   }
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   for (;;) {
@@ -2375,17 +1691,17 @@ static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON
       if (likely(PyList_CheckExact(__pyx_t_3))) {
         if (__pyx_t_4 >= PyList_GET_SIZE(__pyx_t_3)) break;
         #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-        __pyx_t_1 = PyList_GET_ITEM(__pyx_t_3, __pyx_t_4); __Pyx_INCREF(__pyx_t_1); __pyx_t_4++; if (unlikely(0 < 0)) __PYX_ERR(0, 26, __pyx_L1_error)
+        __pyx_t_1 = PyList_GET_ITEM(__pyx_t_3, __pyx_t_4); __Pyx_INCREF(__pyx_t_1); __pyx_t_4++; if (unlikely(0 < 0)) __PYX_ERR(0, 21, __pyx_L1_error)
         #else
-        __pyx_t_1 = PySequence_ITEM(__pyx_t_3, __pyx_t_4); __pyx_t_4++; if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 26, __pyx_L1_error)
+        __pyx_t_1 = PySequence_ITEM(__pyx_t_3, __pyx_t_4); __pyx_t_4++; if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 21, __pyx_L1_error)
         __Pyx_GOTREF(__pyx_t_1);
         #endif
       } else {
         if (__pyx_t_4 >= PyTuple_GET_SIZE(__pyx_t_3)) break;
         #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-        __pyx_t_1 = PyTuple_GET_ITEM(__pyx_t_3, __pyx_t_4); __Pyx_INCREF(__pyx_t_1); __pyx_t_4++; if (unlikely(0 < 0)) __PYX_ERR(0, 26, __pyx_L1_error)
+        __pyx_t_1 = PyTuple_GET_ITEM(__pyx_t_3, __pyx_t_4); __Pyx_INCREF(__pyx_t_1); __pyx_t_4++; if (unlikely(0 < 0)) __PYX_ERR(0, 21, __pyx_L1_error)
         #else
-        __pyx_t_1 = PySequence_ITEM(__pyx_t_3, __pyx_t_4); __pyx_t_4++; if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 26, __pyx_L1_error)
+        __pyx_t_1 = PySequence_ITEM(__pyx_t_3, __pyx_t_4); __pyx_t_4++; if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 21, __pyx_L1_error)
         __Pyx_GOTREF(__pyx_t_1);
         #endif
       }
@@ -2395,7 +1711,7 @@ static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON
         PyObject* exc_type = PyErr_Occurred();
         if (exc_type) {
           if (likely(__Pyx_PyErr_GivenExceptionMatches(exc_type, PyExc_StopIteration))) PyErr_Clear();
-          else __PYX_ERR(0, 26, __pyx_L1_error)
+          else __PYX_ERR(0, 21, __pyx_L1_error)
         }
         break;
       }
@@ -2407,7 +1723,7 @@ static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON
       if (unlikely(size != 3)) {
         if (size > 3) __Pyx_RaiseTooManyValuesError(3);
         else if (size >= 0) __Pyx_RaiseNeedMoreValuesError(size);
-        __PYX_ERR(0, 26, __pyx_L1_error)
+        __PYX_ERR(0, 21, __pyx_L1_error)
       }
       #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
       if (likely(PyTuple_CheckExact(sequence))) {
@@ -2423,17 +1739,17 @@ static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON
       __Pyx_INCREF(__pyx_t_6);
       __Pyx_INCREF(__pyx_t_7);
       #else
-      __pyx_t_2 = PySequence_ITEM(sequence, 0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 26, __pyx_L1_error)
+      __pyx_t_2 = PySequence_ITEM(sequence, 0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 21, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_2);
-      __pyx_t_6 = PySequence_ITEM(sequence, 1); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 26, __pyx_L1_error)
+      __pyx_t_6 = PySequence_ITEM(sequence, 1); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 21, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_6);
-      __pyx_t_7 = PySequence_ITEM(sequence, 2); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 26, __pyx_L1_error)
+      __pyx_t_7 = PySequence_ITEM(sequence, 2); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 21, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_7);
       #endif
       __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
     } else {
       Py_ssize_t index = -1;
-      __pyx_t_8 = PyObject_GetIter(__pyx_t_1); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 26, __pyx_L1_error)
+      __pyx_t_8 = PyObject_GetIter(__pyx_t_1); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 21, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_8);
       __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
       __pyx_t_9 = Py_TYPE(__pyx_t_8)->tp_iternext;
@@ -2443,7 +1759,7 @@ static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON
       __Pyx_GOTREF(__pyx_t_6);
       index = 2; __pyx_t_7 = __pyx_t_9(__pyx_t_8); if (unlikely(!__pyx_t_7)) goto __pyx_L5_unpacking_failed;
       __Pyx_GOTREF(__pyx_t_7);
-      if (__Pyx_IternextUnpackEndCheck(__pyx_t_9(__pyx_t_8), 3) < 0) __PYX_ERR(0, 26, __pyx_L1_error)
+      if (__Pyx_IternextUnpackEndCheck(__pyx_t_9(__pyx_t_8), 3) < 0) __PYX_ERR(0, 21, __pyx_L1_error)
       __pyx_t_9 = NULL;
       __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
       goto __pyx_L6_unpacking_done;
@@ -2451,7 +1767,7 @@ static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON
       __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
       __pyx_t_9 = NULL;
       if (__Pyx_IterFinish() == 0) __Pyx_RaiseNeedMoreValuesError(index);
-      __PYX_ERR(0, 26, __pyx_L1_error)
+      __PYX_ERR(0, 21, __pyx_L1_error)
       __pyx_L6_unpacking_done:;
     }
     __Pyx_XDECREF_SET(__pyx_v_subdir, __pyx_t_2);
@@ -2461,7 +1777,7 @@ static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON
     __Pyx_XDECREF_SET(__pyx_v_files, __pyx_t_7);
     __pyx_t_7 = 0;
 
-    /* "tardis_msg_counter.pyx":27
+    /* "tardis_msg_counter.pyx":22
  *     all_paths = []
  *     for subdir, dirs, files in os.walk(root_dir):
  *         for file in files:             # <<<<<<<<<<<<<<
@@ -2472,26 +1788,26 @@ static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON
       __pyx_t_1 = __pyx_v_files; __Pyx_INCREF(__pyx_t_1); __pyx_t_10 = 0;
       __pyx_t_11 = NULL;
     } else {
-      __pyx_t_10 = -1; __pyx_t_1 = PyObject_GetIter(__pyx_v_files); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 27, __pyx_L1_error)
+      __pyx_t_10 = -1; __pyx_t_1 = PyObject_GetIter(__pyx_v_files); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 22, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_1);
-      __pyx_t_11 = Py_TYPE(__pyx_t_1)->tp_iternext; if (unlikely(!__pyx_t_11)) __PYX_ERR(0, 27, __pyx_L1_error)
+      __pyx_t_11 = Py_TYPE(__pyx_t_1)->tp_iternext; if (unlikely(!__pyx_t_11)) __PYX_ERR(0, 22, __pyx_L1_error)
     }
     for (;;) {
       if (likely(!__pyx_t_11)) {
         if (likely(PyList_CheckExact(__pyx_t_1))) {
           if (__pyx_t_10 >= PyList_GET_SIZE(__pyx_t_1)) break;
           #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-          __pyx_t_7 = PyList_GET_ITEM(__pyx_t_1, __pyx_t_10); __Pyx_INCREF(__pyx_t_7); __pyx_t_10++; if (unlikely(0 < 0)) __PYX_ERR(0, 27, __pyx_L1_error)
+          __pyx_t_7 = PyList_GET_ITEM(__pyx_t_1, __pyx_t_10); __Pyx_INCREF(__pyx_t_7); __pyx_t_10++; if (unlikely(0 < 0)) __PYX_ERR(0, 22, __pyx_L1_error)
           #else
-          __pyx_t_7 = PySequence_ITEM(__pyx_t_1, __pyx_t_10); __pyx_t_10++; if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 27, __pyx_L1_error)
+          __pyx_t_7 = PySequence_ITEM(__pyx_t_1, __pyx_t_10); __pyx_t_10++; if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 22, __pyx_L1_error)
           __Pyx_GOTREF(__pyx_t_7);
           #endif
         } else {
           if (__pyx_t_10 >= PyTuple_GET_SIZE(__pyx_t_1)) break;
           #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-          __pyx_t_7 = PyTuple_GET_ITEM(__pyx_t_1, __pyx_t_10); __Pyx_INCREF(__pyx_t_7); __pyx_t_10++; if (unlikely(0 < 0)) __PYX_ERR(0, 27, __pyx_L1_error)
+          __pyx_t_7 = PyTuple_GET_ITEM(__pyx_t_1, __pyx_t_10); __Pyx_INCREF(__pyx_t_7); __pyx_t_10++; if (unlikely(0 < 0)) __PYX_ERR(0, 22, __pyx_L1_error)
           #else
-          __pyx_t_7 = PySequence_ITEM(__pyx_t_1, __pyx_t_10); __pyx_t_10++; if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 27, __pyx_L1_error)
+          __pyx_t_7 = PySequence_ITEM(__pyx_t_1, __pyx_t_10); __pyx_t_10++; if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 22, __pyx_L1_error)
           __Pyx_GOTREF(__pyx_t_7);
           #endif
         }
@@ -2501,7 +1817,7 @@ static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON
           PyObject* exc_type = PyErr_Occurred();
           if (exc_type) {
             if (likely(__Pyx_PyErr_GivenExceptionMatches(exc_type, PyExc_StopIteration))) PyErr_Clear();
-            else __PYX_ERR(0, 27, __pyx_L1_error)
+            else __PYX_ERR(0, 22, __pyx_L1_error)
           }
           break;
         }
@@ -2510,19 +1826,19 @@ static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON
       __Pyx_XDECREF_SET(__pyx_v_file, __pyx_t_7);
       __pyx_t_7 = 0;
 
-      /* "tardis_msg_counter.pyx":28
+      /* "tardis_msg_counter.pyx":23
  *     for subdir, dirs, files in os.walk(root_dir):
  *         for file in files:
  *             all_paths.append(os.path.join(subdir, file))             # <<<<<<<<<<<<<<
  *     return all_paths
  * 
  */
-      __Pyx_GetModuleGlobalName(__pyx_t_6, __pyx_n_s_os); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 28, __pyx_L1_error)
+      __Pyx_GetModuleGlobalName(__pyx_t_6, __pyx_n_s_os); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 23, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_6);
-      __pyx_t_2 = __Pyx_PyObject_GetAttrStr(__pyx_t_6, __pyx_n_s_path); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 28, __pyx_L1_error)
+      __pyx_t_2 = __Pyx_PyObject_GetAttrStr(__pyx_t_6, __pyx_n_s_path); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 23, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_2);
       __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-      __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_t_2, __pyx_n_s_join); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 28, __pyx_L1_error)
+      __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_t_2, __pyx_n_s_join); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 23, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_6);
       __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
       __pyx_t_2 = NULL;
@@ -2540,7 +1856,7 @@ static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON
       #if CYTHON_FAST_PYCALL
       if (PyFunction_Check(__pyx_t_6)) {
         PyObject *__pyx_temp[3] = {__pyx_t_2, __pyx_v_subdir, __pyx_v_file};
-        __pyx_t_7 = __Pyx_PyFunction_FastCall(__pyx_t_6, __pyx_temp+1-__pyx_t_12, 2+__pyx_t_12); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 28, __pyx_L1_error)
+        __pyx_t_7 = __Pyx_PyFunction_FastCall(__pyx_t_6, __pyx_temp+1-__pyx_t_12, 2+__pyx_t_12); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 23, __pyx_L1_error)
         __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
         __Pyx_GOTREF(__pyx_t_7);
       } else
@@ -2548,13 +1864,13 @@ static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON
       #if CYTHON_FAST_PYCCALL
       if (__Pyx_PyFastCFunction_Check(__pyx_t_6)) {
         PyObject *__pyx_temp[3] = {__pyx_t_2, __pyx_v_subdir, __pyx_v_file};
-        __pyx_t_7 = __Pyx_PyCFunction_FastCall(__pyx_t_6, __pyx_temp+1-__pyx_t_12, 2+__pyx_t_12); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 28, __pyx_L1_error)
+        __pyx_t_7 = __Pyx_PyCFunction_FastCall(__pyx_t_6, __pyx_temp+1-__pyx_t_12, 2+__pyx_t_12); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 23, __pyx_L1_error)
         __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
         __Pyx_GOTREF(__pyx_t_7);
       } else
       #endif
       {
-        __pyx_t_8 = PyTuple_New(2+__pyx_t_12); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 28, __pyx_L1_error)
+        __pyx_t_8 = PyTuple_New(2+__pyx_t_12); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 23, __pyx_L1_error)
         __Pyx_GOTREF(__pyx_t_8);
         if (__pyx_t_2) {
           __Pyx_GIVEREF(__pyx_t_2); PyTuple_SET_ITEM(__pyx_t_8, 0, __pyx_t_2); __pyx_t_2 = NULL;
@@ -2565,15 +1881,15 @@ static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON
         __Pyx_INCREF(__pyx_v_file);
         __Pyx_GIVEREF(__pyx_v_file);
         PyTuple_SET_ITEM(__pyx_t_8, 1+__pyx_t_12, __pyx_v_file);
-        __pyx_t_7 = __Pyx_PyObject_Call(__pyx_t_6, __pyx_t_8, NULL); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 28, __pyx_L1_error)
+        __pyx_t_7 = __Pyx_PyObject_Call(__pyx_t_6, __pyx_t_8, NULL); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 23, __pyx_L1_error)
         __Pyx_GOTREF(__pyx_t_7);
         __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
       }
       __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-      __pyx_t_13 = __Pyx_PyList_Append(__pyx_v_all_paths, __pyx_t_7); if (unlikely(__pyx_t_13 == ((int)-1))) __PYX_ERR(0, 28, __pyx_L1_error)
+      __pyx_t_13 = __Pyx_PyList_Append(__pyx_v_all_paths, __pyx_t_7); if (unlikely(__pyx_t_13 == ((int)-1))) __PYX_ERR(0, 23, __pyx_L1_error)
       __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
 
-      /* "tardis_msg_counter.pyx":27
+      /* "tardis_msg_counter.pyx":22
  *     all_paths = []
  *     for subdir, dirs, files in os.walk(root_dir):
  *         for file in files:             # <<<<<<<<<<<<<<
@@ -2583,7 +1899,7 @@ static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON
     }
     __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
-    /* "tardis_msg_counter.pyx":26
+    /* "tardis_msg_counter.pyx":21
  *     """
  *     all_paths = []
  *     for subdir, dirs, files in os.walk(root_dir):             # <<<<<<<<<<<<<<
@@ -2593,20 +1909,20 @@ static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON
   }
   __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
 
-  /* "tardis_msg_counter.pyx":29
+  /* "tardis_msg_counter.pyx":24
  *         for file in files:
  *             all_paths.append(os.path.join(subdir, file))
  *     return all_paths             # <<<<<<<<<<<<<<
  * 
- * async def c_tardis_count_and_save_async_gen_msgs(msg_gen, log=True):
+ * async def c_tardis_count_and_save_async_gen_msgs(msg_gen, exch, log=True):
  */
   __Pyx_XDECREF(__pyx_r);
   __Pyx_INCREF(__pyx_v_all_paths);
   __pyx_r = __pyx_v_all_paths;
   goto __pyx_L0;
 
-  /* "tardis_msg_counter.pyx":21
- *     return parsed_line
+  /* "tardis_msg_counter.pyx":16
+ *     return json_helpers.parse_msg_line(line)
  * 
  * def ret_all_subdir_file_paths(root_dir):             # <<<<<<<<<<<<<<
  *     """
@@ -2633,22 +1949,23 @@ static PyObject *__pyx_pf_18tardis_msg_counter_4ret_all_subdir_file_paths(CYTHON
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
-static PyObject *__pyx_gb_18tardis_msg_counter_8generator(__pyx_CoroutineObject *__pyx_generator, CYTHON_UNUSED PyThreadState *__pyx_tstate, PyObject *__pyx_sent_value); /* proto */
+static PyObject *__pyx_gb_18tardis_msg_counter_6generator(__pyx_CoroutineObject *__pyx_generator, CYTHON_UNUSED PyThreadState *__pyx_tstate, PyObject *__pyx_sent_value); /* proto */
 
-/* "tardis_msg_counter.pyx":31
+/* "tardis_msg_counter.pyx":26
  *     return all_paths
  * 
- * async def c_tardis_count_and_save_async_gen_msgs(msg_gen, log=True):             # <<<<<<<<<<<<<<
+ * async def c_tardis_count_and_save_async_gen_msgs(msg_gen, exch, log=True):             # <<<<<<<<<<<<<<
  *     """
  *     Tardis Python API returns an async_generator.
  */
 
 /* Python wrapper */
-static PyObject *__pyx_pw_18tardis_msg_counter_7c_tardis_count_and_save_async_gen_msgs(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
-static char __pyx_doc_18tardis_msg_counter_6c_tardis_count_and_save_async_gen_msgs[] = "\n    Tardis Python API returns an async_generator.\n    When messages returned by this generator are iterated through, \n    they are saved to disk in .gz files\n    \n    This function:\n    (1) forces this caching to take place and \n    (2) also counts the total # of messages: So that a numpy array of the right size \n    can be created to hold these messages\n    \n    Using Cython helps speed up the code.\n    Further possible speedup to try is using \"uvloop\" library - need linux or MacOS however\n    ";
-static PyMethodDef __pyx_mdef_18tardis_msg_counter_7c_tardis_count_and_save_async_gen_msgs = {"c_tardis_count_and_save_async_gen_msgs", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_18tardis_msg_counter_7c_tardis_count_and_save_async_gen_msgs, METH_VARARGS|METH_KEYWORDS, __pyx_doc_18tardis_msg_counter_6c_tardis_count_and_save_async_gen_msgs};
-static PyObject *__pyx_pw_18tardis_msg_counter_7c_tardis_count_and_save_async_gen_msgs(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+static PyObject *__pyx_pw_18tardis_msg_counter_5c_tardis_count_and_save_async_gen_msgs(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static char __pyx_doc_18tardis_msg_counter_4c_tardis_count_and_save_async_gen_msgs[] = "\n    Tardis Python API returns an async_generator.\n    When messages returned by this generator are iterated through, \n    they are saved to disk in .gz files\n    \n    This function:\n    (1) forces this caching to take place and \n    (2) also counts the total # of trade messages (with the exchange's TradeExtractor)\n    \n    Using Cython helps speed up the code.\n    Further possible speedup to try is using \"uvloop\" library - need linux or MacOS however\n    ";
+static PyMethodDef __pyx_mdef_18tardis_msg_counter_5c_tardis_count_and_save_async_gen_msgs = {"c_tardis_count_and_save_async_gen_msgs", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_18tardis_msg_counter_5c_tardis_count_and_save_async_gen_msgs, METH_VARARGS|METH_KEYWORDS, __pyx_doc_18tardis_msg_counter_4c_tardis_count_and_save_async_gen_msgs};
+static PyObject *__pyx_pw_18tardis_msg_counter_5c_tardis_count_and_save_async_gen_msgs(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
   PyObject *__pyx_v_msg_gen = 0;
+  PyObject *__pyx_v_exch = 0;
   PyObject *__pyx_v_log = 0;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
@@ -2657,13 +1974,15 @@ static PyObject *__pyx_pw_18tardis_msg_counter_7c_tardis_count_and_save_async_ge
   __Pyx_RefNannyDeclarations
   __Pyx_RefNannySetupContext("c_tardis_count_and_save_async_gen_msgs (wrapper)", 0);
   {
-    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_msg_gen,&__pyx_n_s_log,0};
-    PyObject* values[2] = {0,0};
-    values[1] = ((PyObject *)Py_True);
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_msg_gen,&__pyx_n_s_exch,&__pyx_n_s_log,0};
+    PyObject* values[3] = {0,0,0};
+    values[2] = ((PyObject *)Py_True);
     if (unlikely(__pyx_kwds)) {
       Py_ssize_t kw_args;
       const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
       switch (pos_args) {
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
         case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
         CYTHON_FALLTHROUGH;
         case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
@@ -2678,42 +1997,50 @@ static PyObject *__pyx_pw_18tardis_msg_counter_7c_tardis_count_and_save_async_ge
         else goto __pyx_L5_argtuple_error;
         CYTHON_FALLTHROUGH;
         case  1:
+        if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_exch)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("c_tardis_count_and_save_async_gen_msgs", 0, 2, 3, 1); __PYX_ERR(0, 26, __pyx_L3_error)
+        }
+        CYTHON_FALLTHROUGH;
+        case  2:
         if (kw_args > 0) {
           PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_log);
-          if (value) { values[1] = value; kw_args--; }
+          if (value) { values[2] = value; kw_args--; }
         }
       }
       if (unlikely(kw_args > 0)) {
-        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "c_tardis_count_and_save_async_gen_msgs") < 0)) __PYX_ERR(0, 31, __pyx_L3_error)
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "c_tardis_count_and_save_async_gen_msgs") < 0)) __PYX_ERR(0, 26, __pyx_L3_error)
       }
     } else {
       switch (PyTuple_GET_SIZE(__pyx_args)) {
-        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
         CYTHON_FALLTHROUGH;
-        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
         break;
         default: goto __pyx_L5_argtuple_error;
       }
     }
     __pyx_v_msg_gen = values[0];
-    __pyx_v_log = values[1];
+    __pyx_v_exch = values[1];
+    __pyx_v_log = values[2];
   }
   goto __pyx_L4_argument_unpacking_done;
   __pyx_L5_argtuple_error:;
-  __Pyx_RaiseArgtupleInvalid("c_tardis_count_and_save_async_gen_msgs", 0, 1, 2, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 31, __pyx_L3_error)
+  __Pyx_RaiseArgtupleInvalid("c_tardis_count_and_save_async_gen_msgs", 0, 2, 3, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 26, __pyx_L3_error)
   __pyx_L3_error:;
   __Pyx_AddTraceback("tardis_msg_counter.c_tardis_count_and_save_async_gen_msgs", __pyx_clineno, __pyx_lineno, __pyx_filename);
   __Pyx_RefNannyFinishContext();
   return NULL;
   __pyx_L4_argument_unpacking_done:;
-  __pyx_r = __pyx_pf_18tardis_msg_counter_6c_tardis_count_and_save_async_gen_msgs(__pyx_self, __pyx_v_msg_gen, __pyx_v_log);
+  __pyx_r = __pyx_pf_18tardis_msg_counter_4c_tardis_count_and_save_async_gen_msgs(__pyx_self, __pyx_v_msg_gen, __pyx_v_exch, __pyx_v_log);
 
   /* function exit code */
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
 
-static PyObject *__pyx_pf_18tardis_msg_counter_6c_tardis_count_and_save_async_gen_msgs(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_msg_gen, PyObject *__pyx_v_log) {
+static PyObject *__pyx_pf_18tardis_msg_counter_4c_tardis_count_and_save_async_gen_msgs(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_msg_gen, PyObject *__pyx_v_exch, PyObject *__pyx_v_log) {
   struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs *__pyx_cur_scope;
   PyObject *__pyx_r = NULL;
   __Pyx_RefNannyDeclarations
@@ -2725,18 +2052,21 @@ static PyObject *__pyx_pf_18tardis_msg_counter_6c_tardis_count_and_save_async_ge
   if (unlikely(!__pyx_cur_scope)) {
     __pyx_cur_scope = ((struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs *)Py_None);
     __Pyx_INCREF(Py_None);
-    __PYX_ERR(0, 31, __pyx_L1_error)
+    __PYX_ERR(0, 26, __pyx_L1_error)
   } else {
     __Pyx_GOTREF(__pyx_cur_scope);
   }
   __pyx_cur_scope->__pyx_v_msg_gen = __pyx_v_msg_gen;
   __Pyx_INCREF(__pyx_cur_scope->__pyx_v_msg_gen);
   __Pyx_GIVEREF(__pyx_cur_scope->__pyx_v_msg_gen);
+  __pyx_cur_scope->__pyx_v_exch = __pyx_v_exch;
+  __Pyx_INCREF(__pyx_cur_scope->__pyx_v_exch);
+  __Pyx_GIVEREF(__pyx_cur_scope->__pyx_v_exch);
   __pyx_cur_scope->__pyx_v_log = __pyx_v_log;
   __Pyx_INCREF(__pyx_cur_scope->__pyx_v_log);
   __Pyx_GIVEREF(__pyx_cur_scope->__pyx_v_log);
   {
-    __pyx_CoroutineObject *gen = __Pyx_Coroutine_New((__pyx_coroutine_body_t) __pyx_gb_18tardis_msg_counter_8generator, __pyx_codeobj__3, (PyObject *) __pyx_cur_scope, __pyx_n_s_c_tardis_count_and_save_async_ge, __pyx_n_s_c_tardis_count_and_save_async_ge, __pyx_n_s_tardis_msg_counter); if (unlikely(!gen)) __PYX_ERR(0, 31, __pyx_L1_error)
+    __pyx_CoroutineObject *gen = __Pyx_Coroutine_New((__pyx_coroutine_body_t) __pyx_gb_18tardis_msg_counter_6generator, __pyx_codeobj_, (PyObject *) __pyx_cur_scope, __pyx_n_s_c_tardis_count_and_save_async_ge, __pyx_n_s_c_tardis_count_and_save_async_ge, __pyx_n_s_tardis_msg_counter); if (unlikely(!gen)) __PYX_ERR(0, 26, __pyx_L1_error)
     __Pyx_DECREF(__pyx_cur_scope);
     __Pyx_RefNannyFinishContext();
     return (PyObject *) gen;
@@ -2752,7 +2082,7 @@ static PyObject *__pyx_pf_18tardis_msg_counter_6c_tardis_count_and_save_async_ge
   return __pyx_r;
 }
 
-static PyObject *__pyx_gb_18tardis_msg_counter_8generator(__pyx_CoroutineObject *__pyx_generator, CYTHON_UNUSED PyThreadState *__pyx_tstate, PyObject *__pyx_sent_value) /* generator body */
+static PyObject *__pyx_gb_18tardis_msg_counter_6generator(__pyx_CoroutineObject *__pyx_generator, CYTHON_UNUSED PyThreadState *__pyx_tstate, PyObject *__pyx_sent_value) /* generator body */
 {
   struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs *__pyx_cur_scope = ((struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs *)__pyx_generator->closure);
   PyObject *__pyx_r = NULL;
@@ -2764,9 +2094,6 @@ static PyObject *__pyx_gb_18tardis_msg_counter_8generator(__pyx_CoroutineObject
   PyObject *(*__pyx_t_6)(PyObject *);
   int __pyx_t_7;
   int __pyx_t_8;
-  Py_ssize_t __pyx_t_9;
-  PyObject *(*__pyx_t_10)(PyObject *);
-  int __pyx_t_11;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
@@ -2780,18 +2107,18 @@ static PyObject *__pyx_gb_18tardis_msg_counter_8generator(__pyx_CoroutineObject
     return NULL;
   }
   __pyx_L3_first_run:;
-  if (unlikely(!__pyx_sent_value)) __PYX_ERR(0, 31, __pyx_L1_error)
+  if (unlikely(!__pyx_sent_value)) __PYX_ERR(0, 26, __pyx_L1_error)
 
-  /* "tardis_msg_counter.pyx":46
+  /* "tardis_msg_counter.pyx":40
  *     """
  * 
  *     t1 = time.time()             # <<<<<<<<<<<<<<
  * 
  *     cdef int num_msgs = 0
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_time); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 46, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_time); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 40, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_t_2, __pyx_n_s_time); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 46, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_t_2, __pyx_n_s_time); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 40, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_3);
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __pyx_t_2 = NULL;
@@ -2806,33 +2133,92 @@ static PyObject *__pyx_gb_18tardis_msg_counter_8generator(__pyx_CoroutineObject
   }
   __pyx_t_1 = (__pyx_t_2) ? __Pyx_PyObject_CallOneArg(__pyx_t_3, __pyx_t_2) : __Pyx_PyObject_CallNoArg(__pyx_t_3);
   __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
-  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 46, __pyx_L1_error)
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 40, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
   __Pyx_GIVEREF(__pyx_t_1);
   __pyx_cur_scope->__pyx_v_t1 = __pyx_t_1;
   __pyx_t_1 = 0;
 
-  /* "tardis_msg_counter.pyx":48
+  /* "tardis_msg_counter.pyx":42
  *     t1 = time.time()
  * 
  *     cdef int num_msgs = 0             # <<<<<<<<<<<<<<
- * 
- *     async for local_timestamp, message in msg_gen:
+ *     cdef int num_lines = 0
+ *     cdef int num_line_msgs = 0
  */
   __pyx_cur_scope->__pyx_v_num_msgs = 0;
 
-  /* "tardis_msg_counter.pyx":50
+  /* "tardis_msg_counter.pyx":43
+ * 
+ *     cdef int num_msgs = 0
+ *     cdef int num_lines = 0             # <<<<<<<<<<<<<<
+ *     cdef int num_line_msgs = 0
+ *     extractor = ret_trade_extractor(exch)
+ */
+  __pyx_cur_scope->__pyx_v_num_lines = 0;
+
+  /* "tardis_msg_counter.pyx":44
  *     cdef int num_msgs = 0
+ *     cdef int num_lines = 0
+ *     cdef int num_line_msgs = 0             # <<<<<<<<<<<<<<
+ *     extractor = ret_trade_extractor(exch)
+ *     count = extractor.count
+ */
+  __pyx_cur_scope->__pyx_v_num_line_msgs = 0;
+
+  /* "tardis_msg_counter.pyx":45
+ *     cdef int num_lines = 0
+ *     cdef int num_line_msgs = 0
+ *     extractor = ret_trade_extractor(exch)             # <<<<<<<<<<<<<<
+ *     count = extractor.count
+ * 
+ */
+  __Pyx_GetModuleGlobalName(__pyx_t_3, __pyx_n_s_ret_trade_extractor); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 45, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __pyx_t_2 = NULL;
+  if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_3))) {
+    __pyx_t_2 = PyMethod_GET_SELF(__pyx_t_3);
+    if (likely(__pyx_t_2)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_3);
+      __Pyx_INCREF(__pyx_t_2);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_3, function);
+    }
+  }
+  __pyx_t_1 = (__pyx_t_2) ? __Pyx_PyObject_Call2Args(__pyx_t_3, __pyx_t_2, __pyx_cur_scope->__pyx_v_exch) : __Pyx_PyObject_CallOneArg(__pyx_t_3, __pyx_cur_scope->__pyx_v_exch);
+  __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 45, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  __Pyx_GIVEREF(__pyx_t_1);
+  __pyx_cur_scope->__pyx_v_extractor = __pyx_t_1;
+  __pyx_t_1 = 0;
+
+  /* "tardis_msg_counter.pyx":46
+ *     cdef int num_line_msgs = 0
+ *     extractor = ret_trade_extractor(exch)
+ *     count = extractor.count             # <<<<<<<<<<<<<<
+ * 
+ *     async for local_timestamp, message in msg_gen:
+ */
+  __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_cur_scope->__pyx_v_extractor, __pyx_n_s_count); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 46, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_GIVEREF(__pyx_t_1);
+  __pyx_cur_scope->__pyx_v_count = __pyx_t_1;
+  __pyx_t_1 = 0;
+
+  /* "tardis_msg_counter.pyx":48
+ *     count = extractor.count
  * 
  *     async for local_timestamp, message in msg_gen:             # <<<<<<<<<<<<<<
- *         ## 'message' is a JSON object that has a 'data' key containing the trade info
- *         ## 'data' can be a dict, a list of dicts, sometimes 'data' is a sub_key in a dict
+ *         num_line_msgs = count(message)
+ *         if num_line_msgs == 0:
  */
-  __pyx_t_1 = __Pyx_Coroutine_GetAsyncIter(__pyx_cur_scope->__pyx_v_msg_gen); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 50, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_Coroutine_GetAsyncIter(__pyx_cur_scope->__pyx_v_msg_gen); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 48, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   for (;;) {
-    __pyx_t_3 = __Pyx_Coroutine_AsyncIterNext(__pyx_t_1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 50, __pyx_L1_error)
+    __pyx_t_3 = __Pyx_Coroutine_AsyncIterNext(__pyx_t_1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 48, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_3);
     __pyx_r = __Pyx_Coroutine_Yield_From(__pyx_generator, __pyx_t_3);
     __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
@@ -2856,7 +2242,7 @@ static PyObject *__pyx_gb_18tardis_msg_counter_8generator(__pyx_CoroutineObject
           PyErr_Clear();
           break;
         }
-        __PYX_ERR(0, 50, __pyx_L1_error)
+        __PYX_ERR(0, 48, __pyx_L1_error)
       }
       __pyx_t_3 = __pyx_sent_value; __Pyx_INCREF(__pyx_t_3);
     } else {
@@ -2866,7 +2252,7 @@ static PyObject *__pyx_gb_18tardis_msg_counter_8generator(__pyx_CoroutineObject
         break;
       }
       __pyx_t_3 = NULL;
-      if (__Pyx_PyGen_FetchStopIterationValue(&__pyx_t_3) < 0) __PYX_ERR(0, 50, __pyx_L1_error)
+      if (__Pyx_PyGen_FetchStopIterationValue(&__pyx_t_3) < 0) __PYX_ERR(0, 48, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_3);
     }
     if ((likely(PyTuple_CheckExact(__pyx_t_3))) || (PyList_CheckExact(__pyx_t_3))) {
@@ -2875,7 +2261,7 @@ static PyObject *__pyx_gb_18tardis_msg_counter_8generator(__pyx_CoroutineObject
       if (unlikely(size != 2)) {
         if (size > 2) __Pyx_RaiseTooManyValuesError(2);
         else if (size >= 0) __Pyx_RaiseNeedMoreValuesError(size);
-        __PYX_ERR(0, 50, __pyx_L1_error)
+        __PYX_ERR(0, 48, __pyx_L1_error)
       }
       #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
       if (likely(PyTuple_CheckExact(sequence))) {
@@ -2888,15 +2274,15 @@ static PyObject *__pyx_gb_18tardis_msg_counter_8generator(__pyx_CoroutineObject
       __Pyx_INCREF(__pyx_t_2);
       __Pyx_INCREF(__pyx_t_4);
       #else
-      __pyx_t_2 = PySequence_ITEM(sequence, 0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 50, __pyx_L1_error)
+      __pyx_t_2 = PySequence_ITEM(sequence, 0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 48, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_2);
-      __pyx_t_4 = PySequence_ITEM(sequence, 1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 50, __pyx_L1_error)
+      __pyx_t_4 = PySequence_ITEM(sequence, 1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 48, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_4);
       #endif
       __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
     } else {
       Py_ssize_t index = -1;
-      __pyx_t_5 = PyObject_GetIter(__pyx_t_3); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 50, __pyx_L1_error)
+      __pyx_t_5 = PyObject_GetIter(__pyx_t_3); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 48, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_5);
       __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
       __pyx_t_6 = Py_TYPE(__pyx_t_5)->tp_iternext;
@@ -2904,7 +2290,7 @@ static PyObject *__pyx_gb_18tardis_msg_counter_8generator(__pyx_CoroutineObject
       __Pyx_GOTREF(__pyx_t_2);
       index = 1; __pyx_t_4 = __pyx_t_6(__pyx_t_5); if (unlikely(!__pyx_t_4)) goto __pyx_L7_unpacking_failed;
       __Pyx_GOTREF(__pyx_t_4);
-      if (__Pyx_IternextUnpackEndCheck(__pyx_t_6(__pyx_t_5), 2) < 0) __PYX_ERR(0, 50, __pyx_L1_error)
+      if (__Pyx_IternextUnpackEndCheck(__pyx_t_6(__pyx_t_5), 2) < 0) __PYX_ERR(0, 48, __pyx_L1_error)
       __pyx_t_6 = NULL;
       __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
       goto __pyx_L8_unpacking_done;
@@ -2912,7 +2298,7 @@ static PyObject *__pyx_gb_18tardis_msg_counter_8generator(__pyx_CoroutineObject
       __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
       __pyx_t_6 = NULL;
       if (__Pyx_IterFinish() == 0) __Pyx_RaiseNeedMoreValuesError(index);
-      __PYX_ERR(0, 50, __pyx_L1_error)
+      __PYX_ERR(0, 48, __pyx_L1_error)
       __pyx_L8_unpacking_done:;
     }
     __Pyx_XGOTREF(__pyx_cur_scope->__pyx_v_local_timestamp);
@@ -2924,523 +2310,116 @@ static PyObject *__pyx_gb_18tardis_msg_counter_8generator(__pyx_CoroutineObject
     __Pyx_GIVEREF(__pyx_t_4);
     __pyx_t_4 = 0;
 
-    /* "tardis_msg_counter.pyx":54
- *         ## 'data' can be a dict, a list of dicts, sometimes 'data' is a sub_key in a dict
+    /* "tardis_msg_counter.pyx":49
  * 
- *         msg_data = {}             # <<<<<<<<<<<<<<
- *         # Generic
- *         if 'data' in message:
- */
-    __pyx_t_3 = __Pyx_PyDict_NewPresized(0); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 54, __pyx_L1_error)
+ *     async for local_timestamp, message in msg_gen:
+ *         num_line_msgs = count(message)             # <<<<<<<<<<<<<<
+ *         if num_line_msgs == 0:
+ *             extractor.count_skipped(message)
+ */
+    __Pyx_INCREF(__pyx_cur_scope->__pyx_v_count);
+    __pyx_t_4 = __pyx_cur_scope->__pyx_v_count; __pyx_t_2 = NULL;
+    if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_4))) {
+      __pyx_t_2 = PyMethod_GET_SELF(__pyx_t_4);
+      if (likely(__pyx_t_2)) {
+        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_4);
+        __Pyx_INCREF(__pyx_t_2);
+        __Pyx_INCREF(function);
+        __Pyx_DECREF_SET(__pyx_t_4, function);
+      }
+    }
+    __pyx_t_3 = (__pyx_t_2) ? __Pyx_PyObject_Call2Args(__pyx_t_4, __pyx_t_2, __pyx_cur_scope->__pyx_v_message) : __Pyx_PyObject_CallOneArg(__pyx_t_4, __pyx_cur_scope->__pyx_v_message);
+    __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
+    if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 49, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_3);
-    __Pyx_XGOTREF(__pyx_cur_scope->__pyx_v_msg_data);
-    __Pyx_XDECREF_SET(__pyx_cur_scope->__pyx_v_msg_data, __pyx_t_3);
-    __Pyx_GIVEREF(__pyx_t_3);
-    __pyx_t_3 = 0;
-
-    /* "tardis_msg_counter.pyx":56
- *         msg_data = {}
- *         # Generic
- *         if 'data' in message:             # <<<<<<<<<<<<<<
- *             msg_data = message['data']
- *         # For Houbi data
+    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+    __pyx_t_7 = __Pyx_PyInt_As_int(__pyx_t_3); if (unlikely((__pyx_t_7 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 49, __pyx_L1_error)
+    __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+    __pyx_cur_scope->__pyx_v_num_line_msgs = __pyx_t_7;
+
+    /* "tardis_msg_counter.pyx":50
+ *     async for local_timestamp, message in msg_gen:
+ *         num_line_msgs = count(message)
+ *         if num_line_msgs == 0:             # <<<<<<<<<<<<<<
+ *             extractor.count_skipped(message)
+ *         num_msgs += num_line_msgs
  */
-    __pyx_t_7 = (__Pyx_PySequence_ContainsTF(__pyx_n_s_data, __pyx_cur_scope->__pyx_v_message, Py_EQ)); if (unlikely(__pyx_t_7 < 0)) __PYX_ERR(0, 56, __pyx_L1_error)
-    __pyx_t_8 = (__pyx_t_7 != 0);
+    __pyx_t_8 = ((__pyx_cur_scope->__pyx_v_num_line_msgs == 0) != 0);
     if (__pyx_t_8) {
 
-      /* "tardis_msg_counter.pyx":57
- *         # Generic
- *         if 'data' in message:
- *             msg_data = message['data']             # <<<<<<<<<<<<<<
- *         # For Houbi data
- *         elif 'tick' in message:
+      /* "tardis_msg_counter.pyx":51
+ *         num_line_msgs = count(message)
+ *         if num_line_msgs == 0:
+ *             extractor.count_skipped(message)             # <<<<<<<<<<<<<<
+ *         num_msgs += num_line_msgs
+ *         num_lines += 1
  */
-      __pyx_t_3 = __Pyx_PyObject_Dict_GetItem(__pyx_cur_scope->__pyx_v_message, __pyx_n_s_data); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 57, __pyx_L1_error)
+      __pyx_t_4 = __Pyx_PyObject_GetAttrStr(__pyx_cur_scope->__pyx_v_extractor, __pyx_n_s_count_skipped); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 51, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_4);
+      __pyx_t_2 = NULL;
+      if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_4))) {
+        __pyx_t_2 = PyMethod_GET_SELF(__pyx_t_4);
+        if (likely(__pyx_t_2)) {
+          PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_4);
+          __Pyx_INCREF(__pyx_t_2);
+          __Pyx_INCREF(function);
+          __Pyx_DECREF_SET(__pyx_t_4, function);
+        }
+      }
+      __pyx_t_3 = (__pyx_t_2) ? __Pyx_PyObject_Call2Args(__pyx_t_4, __pyx_t_2, __pyx_cur_scope->__pyx_v_message) : __Pyx_PyObject_CallOneArg(__pyx_t_4, __pyx_cur_scope->__pyx_v_message);
+      __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
+      if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 51, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_3);
-      __Pyx_GOTREF(__pyx_cur_scope->__pyx_v_msg_data);
-      __Pyx_DECREF_SET(__pyx_cur_scope->__pyx_v_msg_data, __pyx_t_3);
-      __Pyx_GIVEREF(__pyx_t_3);
-      __pyx_t_3 = 0;
-
-      /* "tardis_msg_counter.pyx":56
- *         msg_data = {}
- *         # Generic
- *         if 'data' in message:             # <<<<<<<<<<<<<<
- *             msg_data = message['data']
- *         # For Houbi data
+      __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+      __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+
+      /* "tardis_msg_counter.pyx":50
+ *     async for local_timestamp, message in msg_gen:
+ *         num_line_msgs = count(message)
+ *         if num_line_msgs == 0:             # <<<<<<<<<<<<<<
+ *             extractor.count_skipped(message)
+ *         num_msgs += num_line_msgs
  */
-      goto __pyx_L9;
     }
 
-    /* "tardis_msg_counter.pyx":59
- *             msg_data = message['data']
- *         # For Houbi data
- *         elif 'tick' in message:             # <<<<<<<<<<<<<<
- *             if 'data' in message['tick']:
- *                 msg_data = message['tick']['data']
- */
-    __pyx_t_8 = (__Pyx_PySequence_ContainsTF(__pyx_n_s_tick, __pyx_cur_scope->__pyx_v_message, Py_EQ)); if (unlikely(__pyx_t_8 < 0)) __PYX_ERR(0, 59, __pyx_L1_error)
-    __pyx_t_7 = (__pyx_t_8 != 0);
-    if (__pyx_t_7) {
-
-      /* "tardis_msg_counter.pyx":60
- *         # For Houbi data
- *         elif 'tick' in message:
- *             if 'data' in message['tick']:             # <<<<<<<<<<<<<<
- *                 msg_data = message['tick']['data']
- *         # For Deribit data
- */
-      __pyx_t_3 = __Pyx_PyObject_Dict_GetItem(__pyx_cur_scope->__pyx_v_message, __pyx_n_s_tick); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 60, __pyx_L1_error)
-      __Pyx_GOTREF(__pyx_t_3);
-      __pyx_t_7 = (__Pyx_PySequence_ContainsTF(__pyx_n_s_data, __pyx_t_3, Py_EQ)); if (unlikely(__pyx_t_7 < 0)) __PYX_ERR(0, 60, __pyx_L1_error)
-      __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-      __pyx_t_8 = (__pyx_t_7 != 0);
-      if (__pyx_t_8) {
-
-        /* "tardis_msg_counter.pyx":61
- *         elif 'tick' in message:
- *             if 'data' in message['tick']:
- *                 msg_data = message['tick']['data']             # <<<<<<<<<<<<<<
- *         # For Deribit data
- *         elif 'params' in message:
- */
-        __pyx_t_3 = __Pyx_PyObject_Dict_GetItem(__pyx_cur_scope->__pyx_v_message, __pyx_n_s_tick); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 61, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_3);
-        __pyx_t_4 = __Pyx_PyObject_Dict_GetItem(__pyx_t_3, __pyx_n_s_data); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 61, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_4);
-        __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-        __Pyx_GOTREF(__pyx_cur_scope->__pyx_v_msg_data);
-        __Pyx_DECREF_SET(__pyx_cur_scope->__pyx_v_msg_data, __pyx_t_4);
-        __Pyx_GIVEREF(__pyx_t_4);
-        __pyx_t_4 = 0;
-
-        /* "tardis_msg_counter.pyx":60
- *         # For Houbi data
- *         elif 'tick' in message:
- *             if 'data' in message['tick']:             # <<<<<<<<<<<<<<
- *                 msg_data = message['tick']['data']
- *         # For Deribit data
+    /* "tardis_msg_counter.pyx":52
+ *         if num_line_msgs == 0:
+ *             extractor.count_skipped(message)
+ *         num_msgs += num_line_msgs             # <<<<<<<<<<<<<<
+ *         num_lines += 1
+ * 
  */
-      }
+    __pyx_cur_scope->__pyx_v_num_msgs = (__pyx_cur_scope->__pyx_v_num_msgs + __pyx_cur_scope->__pyx_v_num_line_msgs);
 
-      /* "tardis_msg_counter.pyx":59
- *             msg_data = message['data']
- *         # For Houbi data
- *         elif 'tick' in message:             # <<<<<<<<<<<<<<
- *             if 'data' in message['tick']:
- *                 msg_data = message['tick']['data']
+    /* "tardis_msg_counter.pyx":53
+ *             extractor.count_skipped(message)
+ *         num_msgs += num_line_msgs
+ *         num_lines += 1             # <<<<<<<<<<<<<<
+ * 
+ *     t2 = time.time()
  */
-      goto __pyx_L9;
-    }
+    __pyx_cur_scope->__pyx_v_num_lines = (__pyx_cur_scope->__pyx_v_num_lines + 1);
 
-    /* "tardis_msg_counter.pyx":63
- *                 msg_data = message['tick']['data']
- *         # For Deribit data
- *         elif 'params' in message:             # <<<<<<<<<<<<<<
- *             if 'data' in message['params']:
- *                 msg_data = message['params']['data']
- */
-    __pyx_t_8 = (__Pyx_PySequence_ContainsTF(__pyx_n_s_params, __pyx_cur_scope->__pyx_v_message, Py_EQ)); if (unlikely(__pyx_t_8 < 0)) __PYX_ERR(0, 63, __pyx_L1_error)
-    __pyx_t_7 = (__pyx_t_8 != 0);
-    if (__pyx_t_7) {
-
-      /* "tardis_msg_counter.pyx":64
- *         # For Deribit data
- *         elif 'params' in message:
- *             if 'data' in message['params']:             # <<<<<<<<<<<<<<
- *                 msg_data = message['params']['data']
- *         # For Coinbase & Bitstamp data
- */
-      __pyx_t_4 = __Pyx_PyObject_Dict_GetItem(__pyx_cur_scope->__pyx_v_message, __pyx_n_s_params); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 64, __pyx_L1_error)
-      __Pyx_GOTREF(__pyx_t_4);
-      __pyx_t_7 = (__Pyx_PySequence_ContainsTF(__pyx_n_s_data, __pyx_t_4, Py_EQ)); if (unlikely(__pyx_t_7 < 0)) __PYX_ERR(0, 64, __pyx_L1_error)
-      __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-      __pyx_t_8 = (__pyx_t_7 != 0);
-      if (__pyx_t_8) {
-
-        /* "tardis_msg_counter.pyx":65
- *         elif 'params' in message:
- *             if 'data' in message['params']:
- *                 msg_data = message['params']['data']             # <<<<<<<<<<<<<<
- *         # For Coinbase & Bitstamp data
- *         elif type(message) is dict:
- */
-        __pyx_t_4 = __Pyx_PyObject_Dict_GetItem(__pyx_cur_scope->__pyx_v_message, __pyx_n_s_params); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 65, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_4);
-        __pyx_t_3 = __Pyx_PyObject_Dict_GetItem(__pyx_t_4, __pyx_n_s_data); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 65, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_3);
-        __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-        __Pyx_GOTREF(__pyx_cur_scope->__pyx_v_msg_data);
-        __Pyx_DECREF_SET(__pyx_cur_scope->__pyx_v_msg_data, __pyx_t_3);
-        __Pyx_GIVEREF(__pyx_t_3);
-        __pyx_t_3 = 0;
-
-        /* "tardis_msg_counter.pyx":64
- *         # For Deribit data
- *         elif 'params' in message:
- *             if 'data' in message['params']:             # <<<<<<<<<<<<<<
- *                 msg_data = message['params']['data']
- *         # For Coinbase & Bitstamp data
- */
-      }
-
-      /* "tardis_msg_counter.pyx":63
- *                 msg_data = message['tick']['data']
- *         # For Deribit data
- *         elif 'params' in message:             # <<<<<<<<<<<<<<
- *             if 'data' in message['params']:
- *                 msg_data = message['params']['data']
- */
-      goto __pyx_L9;
-    }
-
-    /* "tardis_msg_counter.pyx":67
- *                 msg_data = message['params']['data']
- *         # For Coinbase & Bitstamp data
- *         elif type(message) is dict:             # <<<<<<<<<<<<<<
- *             if 'type' in message:
- *                 if message['type']=='match':
- */
-    __pyx_t_8 = (((PyObject *)Py_TYPE(__pyx_cur_scope->__pyx_v_message)) == ((PyObject *)(&PyDict_Type)));
-    __pyx_t_7 = (__pyx_t_8 != 0);
-    if (__pyx_t_7) {
-
-      /* "tardis_msg_counter.pyx":68
- *         # For Coinbase & Bitstamp data
- *         elif type(message) is dict:
- *             if 'type' in message:             # <<<<<<<<<<<<<<
- *                 if message['type']=='match':
- *                     msg_data = message
- */
-      __pyx_t_7 = (__Pyx_PySequence_ContainsTF(__pyx_n_s_type, __pyx_cur_scope->__pyx_v_message, Py_EQ)); if (unlikely(__pyx_t_7 < 0)) __PYX_ERR(0, 68, __pyx_L1_error)
-      __pyx_t_8 = (__pyx_t_7 != 0);
-      if (__pyx_t_8) {
-
-        /* "tardis_msg_counter.pyx":69
- *         elif type(message) is dict:
- *             if 'type' in message:
- *                 if message['type']=='match':             # <<<<<<<<<<<<<<
- *                     msg_data = message
- *         # For Kraken data
- */
-        __pyx_t_3 = __Pyx_PyObject_Dict_GetItem(__pyx_cur_scope->__pyx_v_message, __pyx_n_s_type); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 69, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_3);
-        __pyx_t_8 = (__Pyx_PyString_Equals(__pyx_t_3, __pyx_n_s_match, Py_EQ)); if (unlikely(__pyx_t_8 < 0)) __PYX_ERR(0, 69, __pyx_L1_error)
-        __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-        if (__pyx_t_8) {
-
-          /* "tardis_msg_counter.pyx":70
- *             if 'type' in message:
- *                 if message['type']=='match':
- *                     msg_data = message             # <<<<<<<<<<<<<<
- *         # For Kraken data
- *         elif type(message) is list:
- */
-          __Pyx_INCREF(__pyx_cur_scope->__pyx_v_message);
-          __Pyx_GOTREF(__pyx_cur_scope->__pyx_v_msg_data);
-          __Pyx_DECREF_SET(__pyx_cur_scope->__pyx_v_msg_data, __pyx_cur_scope->__pyx_v_message);
-          __Pyx_GIVEREF(__pyx_cur_scope->__pyx_v_message);
-
-          /* "tardis_msg_counter.pyx":69
- *         elif type(message) is dict:
- *             if 'type' in message:
- *                 if message['type']=='match':             # <<<<<<<<<<<<<<
- *                     msg_data = message
- *         # For Kraken data
- */
-        }
-
-        /* "tardis_msg_counter.pyx":68
- *         # For Coinbase & Bitstamp data
- *         elif type(message) is dict:
- *             if 'type' in message:             # <<<<<<<<<<<<<<
- *                 if message['type']=='match':
- *                     msg_data = message
- */
-      }
-
-      /* "tardis_msg_counter.pyx":67
- *                 msg_data = message['params']['data']
- *         # For Coinbase & Bitstamp data
- *         elif type(message) is dict:             # <<<<<<<<<<<<<<
- *             if 'type' in message:
- *                 if message['type']=='match':
- */
-      goto __pyx_L9;
-    }
-
-    /* "tardis_msg_counter.pyx":72
- *                     msg_data = message
- *         # For Kraken data
- *         elif type(message) is list:             # <<<<<<<<<<<<<<
- *             if len(message)>=3:
- *                 if message[2]=='trade':
- */
-    __pyx_t_8 = (((PyObject *)Py_TYPE(__pyx_cur_scope->__pyx_v_message)) == ((PyObject *)(&PyList_Type)));
-    __pyx_t_7 = (__pyx_t_8 != 0);
-    if (__pyx_t_7) {
-
-      /* "tardis_msg_counter.pyx":73
- *         # For Kraken data
- *         elif type(message) is list:
- *             if len(message)>=3:             # <<<<<<<<<<<<<<
- *                 if message[2]=='trade':
- *                     msg_data = message[1]
- */
-      __pyx_t_9 = PyObject_Length(__pyx_cur_scope->__pyx_v_message); if (unlikely(__pyx_t_9 == ((Py_ssize_t)-1))) __PYX_ERR(0, 73, __pyx_L1_error)
-      __pyx_t_7 = ((__pyx_t_9 >= 3) != 0);
-      if (__pyx_t_7) {
-
-        /* "tardis_msg_counter.pyx":74
- *         elif type(message) is list:
- *             if len(message)>=3:
- *                 if message[2]=='trade':             # <<<<<<<<<<<<<<
- *                     msg_data = message[1]
- * 
- */
-        __pyx_t_3 = __Pyx_GetItemInt(__pyx_cur_scope->__pyx_v_message, 2, long, 1, __Pyx_PyInt_From_long, 0, 0, 1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 74, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_3);
-        __pyx_t_7 = (__Pyx_PyString_Equals(__pyx_t_3, __pyx_n_s_trade, Py_EQ)); if (unlikely(__pyx_t_7 < 0)) __PYX_ERR(0, 74, __pyx_L1_error)
-        __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-        if (__pyx_t_7) {
-
-          /* "tardis_msg_counter.pyx":75
- *             if len(message)>=3:
- *                 if message[2]=='trade':
- *                     msg_data = message[1]             # <<<<<<<<<<<<<<
- * 
- *         if len(msg_data) > 0:
- */
-          __pyx_t_3 = __Pyx_GetItemInt(__pyx_cur_scope->__pyx_v_message, 1, long, 1, __Pyx_PyInt_From_long, 0, 0, 1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 75, __pyx_L1_error)
-          __Pyx_GOTREF(__pyx_t_3);
-          __Pyx_GOTREF(__pyx_cur_scope->__pyx_v_msg_data);
-          __Pyx_DECREF_SET(__pyx_cur_scope->__pyx_v_msg_data, __pyx_t_3);
-          __Pyx_GIVEREF(__pyx_t_3);
-          __pyx_t_3 = 0;
-
-          /* "tardis_msg_counter.pyx":74
- *         elif type(message) is list:
- *             if len(message)>=3:
- *                 if message[2]=='trade':             # <<<<<<<<<<<<<<
- *                     msg_data = message[1]
- * 
- */
-        }
-
-        /* "tardis_msg_counter.pyx":73
- *         # For Kraken data
- *         elif type(message) is list:
- *             if len(message)>=3:             # <<<<<<<<<<<<<<
- *                 if message[2]=='trade':
- *                     msg_data = message[1]
- */
-      }
-
-      /* "tardis_msg_counter.pyx":72
- *                     msg_data = message
- *         # For Kraken data
- *         elif type(message) is list:             # <<<<<<<<<<<<<<
- *             if len(message)>=3:
- *                 if message[2]=='trade':
- */
-    }
-    __pyx_L9:;
-
-    /* "tardis_msg_counter.pyx":77
- *                     msg_data = message[1]
- * 
- *         if len(msg_data) > 0:             # <<<<<<<<<<<<<<
- *             # Message data can be a dictionary, or a list (usually one item) of dicts
- *             if type(msg_data) is dict:
- */
-    __pyx_t_9 = PyObject_Length(__pyx_cur_scope->__pyx_v_msg_data); if (unlikely(__pyx_t_9 == ((Py_ssize_t)-1))) __PYX_ERR(0, 77, __pyx_L1_error)
-    __pyx_t_7 = ((__pyx_t_9 > 0) != 0);
-    if (__pyx_t_7) {
-
-      /* "tardis_msg_counter.pyx":79
- *         if len(msg_data) > 0:
- *             # Message data can be a dictionary, or a list (usually one item) of dicts
- *             if type(msg_data) is dict:             # <<<<<<<<<<<<<<
- *                 num_msgs += 1
- *             elif type(msg_data) is list:
- */
-      __pyx_t_7 = (((PyObject *)Py_TYPE(__pyx_cur_scope->__pyx_v_msg_data)) == ((PyObject *)(&PyDict_Type)));
-      __pyx_t_8 = (__pyx_t_7 != 0);
-      if (__pyx_t_8) {
-
-        /* "tardis_msg_counter.pyx":80
- *             # Message data can be a dictionary, or a list (usually one item) of dicts
- *             if type(msg_data) is dict:
- *                 num_msgs += 1             # <<<<<<<<<<<<<<
- *             elif type(msg_data) is list:
- *                 if len(msg_data)==1:
- */
-        __pyx_cur_scope->__pyx_v_num_msgs = (__pyx_cur_scope->__pyx_v_num_msgs + 1);
-
-        /* "tardis_msg_counter.pyx":79
- *         if len(msg_data) > 0:
- *             # Message data can be a dictionary, or a list (usually one item) of dicts
- *             if type(msg_data) is dict:             # <<<<<<<<<<<<<<
- *                 num_msgs += 1
- *             elif type(msg_data) is list:
- */
-        goto __pyx_L17;
-      }
-
-      /* "tardis_msg_counter.pyx":81
- *             if type(msg_data) is dict:
- *                 num_msgs += 1
- *             elif type(msg_data) is list:             # <<<<<<<<<<<<<<
- *                 if len(msg_data)==1:
- *                     num_msgs += 1
- */
-      __pyx_t_8 = (((PyObject *)Py_TYPE(__pyx_cur_scope->__pyx_v_msg_data)) == ((PyObject *)(&PyList_Type)));
-      __pyx_t_7 = (__pyx_t_8 != 0);
-      if (__pyx_t_7) {
-
-        /* "tardis_msg_counter.pyx":82
- *                 num_msgs += 1
- *             elif type(msg_data) is list:
- *                 if len(msg_data)==1:             # <<<<<<<<<<<<<<
- *                     num_msgs += 1
- *                 else:
- */
-        __pyx_t_9 = PyObject_Length(__pyx_cur_scope->__pyx_v_msg_data); if (unlikely(__pyx_t_9 == ((Py_ssize_t)-1))) __PYX_ERR(0, 82, __pyx_L1_error)
-        __pyx_t_7 = ((__pyx_t_9 == 1) != 0);
-        if (__pyx_t_7) {
-
-          /* "tardis_msg_counter.pyx":83
- *             elif type(msg_data) is list:
- *                 if len(msg_data)==1:
- *                     num_msgs += 1             # <<<<<<<<<<<<<<
- *                 else:
- *                     for sub_dict in msg_data:
- */
-          __pyx_cur_scope->__pyx_v_num_msgs = (__pyx_cur_scope->__pyx_v_num_msgs + 1);
-
-          /* "tardis_msg_counter.pyx":82
- *                 num_msgs += 1
- *             elif type(msg_data) is list:
- *                 if len(msg_data)==1:             # <<<<<<<<<<<<<<
- *                     num_msgs += 1
- *                 else:
- */
-          goto __pyx_L18;
-        }
-
-        /* "tardis_msg_counter.pyx":85
- *                     num_msgs += 1
- *                 else:
- *                     for sub_dict in msg_data:             # <<<<<<<<<<<<<<
- *                         num_msgs += 1
- * 
- */
-        /*else*/ {
-          if (likely(PyList_CheckExact(__pyx_cur_scope->__pyx_v_msg_data)) || PyTuple_CheckExact(__pyx_cur_scope->__pyx_v_msg_data)) {
-            __pyx_t_3 = __pyx_cur_scope->__pyx_v_msg_data; __Pyx_INCREF(__pyx_t_3); __pyx_t_9 = 0;
-            __pyx_t_10 = NULL;
-          } else {
-            __pyx_t_9 = -1; __pyx_t_3 = PyObject_GetIter(__pyx_cur_scope->__pyx_v_msg_data); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 85, __pyx_L1_error)
-            __Pyx_GOTREF(__pyx_t_3);
-            __pyx_t_10 = Py_TYPE(__pyx_t_3)->tp_iternext; if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 85, __pyx_L1_error)
-          }
-          for (;;) {
-            if (likely(!__pyx_t_10)) {
-              if (likely(PyList_CheckExact(__pyx_t_3))) {
-                if (__pyx_t_9 >= PyList_GET_SIZE(__pyx_t_3)) break;
-                #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-                __pyx_t_4 = PyList_GET_ITEM(__pyx_t_3, __pyx_t_9); __Pyx_INCREF(__pyx_t_4); __pyx_t_9++; if (unlikely(0 < 0)) __PYX_ERR(0, 85, __pyx_L1_error)
-                #else
-                __pyx_t_4 = PySequence_ITEM(__pyx_t_3, __pyx_t_9); __pyx_t_9++; if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 85, __pyx_L1_error)
-                __Pyx_GOTREF(__pyx_t_4);
-                #endif
-              } else {
-                if (__pyx_t_9 >= PyTuple_GET_SIZE(__pyx_t_3)) break;
-                #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-                __pyx_t_4 = PyTuple_GET_ITEM(__pyx_t_3, __pyx_t_9); __Pyx_INCREF(__pyx_t_4); __pyx_t_9++; if (unlikely(0 < 0)) __PYX_ERR(0, 85, __pyx_L1_error)
-                #else
-                __pyx_t_4 = PySequence_ITEM(__pyx_t_3, __pyx_t_9); __pyx_t_9++; if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 85, __pyx_L1_error)
-                __Pyx_GOTREF(__pyx_t_4);
-                #endif
-              }
-            } else {
-              __pyx_t_4 = __pyx_t_10(__pyx_t_3);
-              if (unlikely(!__pyx_t_4)) {
-                PyObject* exc_type = PyErr_Occurred();
-                if (exc_type) {
-                  if (likely(__Pyx_PyErr_GivenExceptionMatches(exc_type, PyExc_StopIteration))) PyErr_Clear();
-                  else __PYX_ERR(0, 85, __pyx_L1_error)
-                }
-                break;
-              }
-              __Pyx_GOTREF(__pyx_t_4);
-            }
-            __Pyx_XGOTREF(__pyx_cur_scope->__pyx_v_sub_dict);
-            __Pyx_XDECREF_SET(__pyx_cur_scope->__pyx_v_sub_dict, __pyx_t_4);
-            __Pyx_GIVEREF(__pyx_t_4);
-            __pyx_t_4 = 0;
-
-            /* "tardis_msg_counter.pyx":86
- *                 else:
- *                     for sub_dict in msg_data:
- *                         num_msgs += 1             # <<<<<<<<<<<<<<
- * 
- * 
- */
-            __pyx_cur_scope->__pyx_v_num_msgs = (__pyx_cur_scope->__pyx_v_num_msgs + 1);
-
-            /* "tardis_msg_counter.pyx":85
- *                     num_msgs += 1
- *                 else:
- *                     for sub_dict in msg_data:             # <<<<<<<<<<<<<<
- *                         num_msgs += 1
- * 
- */
-          }
-          __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-        }
-        __pyx_L18:;
-
-        /* "tardis_msg_counter.pyx":81
- *             if type(msg_data) is dict:
- *                 num_msgs += 1
- *             elif type(msg_data) is list:             # <<<<<<<<<<<<<<
- *                 if len(msg_data)==1:
- *                     num_msgs += 1
- */
-      }
-      __pyx_L17:;
-
-      /* "tardis_msg_counter.pyx":77
- *                     msg_data = message[1]
- * 
- *         if len(msg_data) > 0:             # <<<<<<<<<<<<<<
- *             # Message data can be a dictionary, or a list (usually one item) of dicts
- *             if type(msg_data) is dict:
- */
-    }
-
-    /* "tardis_msg_counter.pyx":50
- *     cdef int num_msgs = 0
+    /* "tardis_msg_counter.pyx":48
+ *     count = extractor.count
  * 
  *     async for local_timestamp, message in msg_gen:             # <<<<<<<<<<<<<<
- *         ## 'message' is a JSON object that has a 'data' key containing the trade info
- *         ## 'data' can be a dict, a list of dicts, sometimes 'data' is a sub_key in a dict
+ *         num_line_msgs = count(message)
+ *         if num_line_msgs == 0:
  */
   }
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
-  /* "tardis_msg_counter.pyx":89
- * 
+  /* "tardis_msg_counter.pyx":55
+ *         num_lines += 1
  * 
  *     t2 = time.time()             # <<<<<<<<<<<<<<
  * 
- *     if log:
+ *     ret_metrics().add('cache_and_count', t2-t1, rows=num_msgs, msgs=num_lines)
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_3, __pyx_n_s_time); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 89, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_3, __pyx_n_s_time); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 55, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_3);
-  __pyx_t_4 = __Pyx_PyObject_GetAttrStr(__pyx_t_3, __pyx_n_s_time); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 89, __pyx_L1_error)
+  __pyx_t_4 = __Pyx_PyObject_GetAttrStr(__pyx_t_3, __pyx_n_s_time); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 55, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_4);
   __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
   __pyx_t_3 = NULL;
@@ -3455,98 +2434,152 @@ static PyObject *__pyx_gb_18tardis_msg_counter_8generator(__pyx_CoroutineObject
   }
   __pyx_t_1 = (__pyx_t_3) ? __Pyx_PyObject_CallOneArg(__pyx_t_4, __pyx_t_3) : __Pyx_PyObject_CallNoArg(__pyx_t_4);
   __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
-  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 89, __pyx_L1_error)
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 55, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
   __Pyx_GIVEREF(__pyx_t_1);
   __pyx_cur_scope->__pyx_v_t2 = __pyx_t_1;
   __pyx_t_1 = 0;
 
-  /* "tardis_msg_counter.pyx":91
+  /* "tardis_msg_counter.pyx":57
  *     t2 = time.time()
  * 
+ *     ret_metrics().add('cache_and_count', t2-t1, rows=num_msgs, msgs=num_lines)             # <<<<<<<<<<<<<<
+ * 
+ *     if log:
+ */
+  __Pyx_GetModuleGlobalName(__pyx_t_4, __pyx_n_s_ret_metrics); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 57, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __pyx_t_3 = NULL;
+  if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_4))) {
+    __pyx_t_3 = PyMethod_GET_SELF(__pyx_t_4);
+    if (likely(__pyx_t_3)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_4);
+      __Pyx_INCREF(__pyx_t_3);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_4, function);
+    }
+  }
+  __pyx_t_1 = (__pyx_t_3) ? __Pyx_PyObject_CallOneArg(__pyx_t_4, __pyx_t_3) : __Pyx_PyObject_CallNoArg(__pyx_t_4);
+  __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 57, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __pyx_t_4 = __Pyx_PyObject_GetAttrStr(__pyx_t_1, __pyx_n_s_add); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 57, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __pyx_t_1 = PyNumber_Subtract(__pyx_cur_scope->__pyx_v_t2, __pyx_cur_scope->__pyx_v_t1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 57, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_t_3 = PyTuple_New(2); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 57, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __Pyx_INCREF(__pyx_n_s_cache_and_count);
+  __Pyx_GIVEREF(__pyx_n_s_cache_and_count);
+  PyTuple_SET_ITEM(__pyx_t_3, 0, __pyx_n_s_cache_and_count);
+  __Pyx_GIVEREF(__pyx_t_1);
+  PyTuple_SET_ITEM(__pyx_t_3, 1, __pyx_t_1);
+  __pyx_t_1 = 0;
+  __pyx_t_1 = __Pyx_PyDict_NewPresized(2); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 57, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_t_2 = __Pyx_PyInt_From_int(__pyx_cur_scope->__pyx_v_num_msgs); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 57, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_t_1, __pyx_n_s_rows, __pyx_t_2) < 0) __PYX_ERR(0, 57, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_t_2 = __Pyx_PyInt_From_int(__pyx_cur_scope->__pyx_v_num_lines); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 57, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_t_1, __pyx_n_s_msgs, __pyx_t_2) < 0) __PYX_ERR(0, 57, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_t_2 = __Pyx_PyObject_Call(__pyx_t_4, __pyx_t_3, __pyx_t_1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 57, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "tardis_msg_counter.pyx":59
+ *     ret_metrics().add('cache_and_count', t2-t1, rows=num_msgs, msgs=num_lines)
+ * 
  *     if log:             # <<<<<<<<<<<<<<
  *         print('\nCounting and Caching All Tardis Trade Msgs Took: '+str(np.round(t2-t1,3))+' sec')
  * 
  */
-  __pyx_t_7 = __Pyx_PyObject_IsTrue(__pyx_cur_scope->__pyx_v_log); if (unlikely(__pyx_t_7 < 0)) __PYX_ERR(0, 91, __pyx_L1_error)
-  if (__pyx_t_7) {
+  __pyx_t_8 = __Pyx_PyObject_IsTrue(__pyx_cur_scope->__pyx_v_log); if (unlikely(__pyx_t_8 < 0)) __PYX_ERR(0, 59, __pyx_L1_error)
+  if (__pyx_t_8) {
 
-    /* "tardis_msg_counter.pyx":92
+    /* "tardis_msg_counter.pyx":60
  * 
  *     if log:
  *         print('\nCounting and Caching All Tardis Trade Msgs Took: '+str(np.round(t2-t1,3))+' sec')             # <<<<<<<<<<<<<<
  * 
  *     return num_msgs
  */
-    __Pyx_GetModuleGlobalName(__pyx_t_4, __pyx_n_s_np); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 92, __pyx_L1_error)
-    __Pyx_GOTREF(__pyx_t_4);
-    __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_t_4, __pyx_n_s_round); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 92, __pyx_L1_error)
+    __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_np); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 60, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_t_1, __pyx_n_s_round); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 60, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_3);
-    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-    __pyx_t_4 = PyNumber_Subtract(__pyx_cur_scope->__pyx_v_t2, __pyx_cur_scope->__pyx_v_t1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 92, __pyx_L1_error)
-    __Pyx_GOTREF(__pyx_t_4);
-    __pyx_t_2 = NULL;
-    __pyx_t_11 = 0;
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+    __pyx_t_1 = PyNumber_Subtract(__pyx_cur_scope->__pyx_v_t2, __pyx_cur_scope->__pyx_v_t1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 60, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __pyx_t_4 = NULL;
+    __pyx_t_7 = 0;
     if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_3))) {
-      __pyx_t_2 = PyMethod_GET_SELF(__pyx_t_3);
-      if (likely(__pyx_t_2)) {
+      __pyx_t_4 = PyMethod_GET_SELF(__pyx_t_3);
+      if (likely(__pyx_t_4)) {
         PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_3);
-        __Pyx_INCREF(__pyx_t_2);
+        __Pyx_INCREF(__pyx_t_4);
         __Pyx_INCREF(function);
         __Pyx_DECREF_SET(__pyx_t_3, function);
-        __pyx_t_11 = 1;
+        __pyx_t_7 = 1;
       }
     }
     #if CYTHON_FAST_PYCALL
     if (PyFunction_Check(__pyx_t_3)) {
-      PyObject *__pyx_temp[3] = {__pyx_t_2, __pyx_t_4, __pyx_int_3};
-      __pyx_t_1 = __Pyx_PyFunction_FastCall(__pyx_t_3, __pyx_temp+1-__pyx_t_11, 2+__pyx_t_11); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 92, __pyx_L1_error)
-      __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
-      __Pyx_GOTREF(__pyx_t_1);
-      __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+      PyObject *__pyx_temp[3] = {__pyx_t_4, __pyx_t_1, __pyx_int_3};
+      __pyx_t_2 = __Pyx_PyFunction_FastCall(__pyx_t_3, __pyx_temp+1-__pyx_t_7, 2+__pyx_t_7); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 60, __pyx_L1_error)
+      __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
+      __Pyx_GOTREF(__pyx_t_2);
+      __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
     } else
     #endif
     #if CYTHON_FAST_PYCCALL
     if (__Pyx_PyFastCFunction_Check(__pyx_t_3)) {
-      PyObject *__pyx_temp[3] = {__pyx_t_2, __pyx_t_4, __pyx_int_3};
-      __pyx_t_1 = __Pyx_PyCFunction_FastCall(__pyx_t_3, __pyx_temp+1-__pyx_t_11, 2+__pyx_t_11); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 92, __pyx_L1_error)
-      __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
-      __Pyx_GOTREF(__pyx_t_1);
-      __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+      PyObject *__pyx_temp[3] = {__pyx_t_4, __pyx_t_1, __pyx_int_3};
+      __pyx_t_2 = __Pyx_PyCFunction_FastCall(__pyx_t_3, __pyx_temp+1-__pyx_t_7, 2+__pyx_t_7); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 60, __pyx_L1_error)
+      __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
+      __Pyx_GOTREF(__pyx_t_2);
+      __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
     } else
     #endif
     {
-      __pyx_t_5 = PyTuple_New(2+__pyx_t_11); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 92, __pyx_L1_error)
+      __pyx_t_5 = PyTuple_New(2+__pyx_t_7); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 60, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_5);
-      if (__pyx_t_2) {
-        __Pyx_GIVEREF(__pyx_t_2); PyTuple_SET_ITEM(__pyx_t_5, 0, __pyx_t_2); __pyx_t_2 = NULL;
+      if (__pyx_t_4) {
+        __Pyx_GIVEREF(__pyx_t_4); PyTuple_SET_ITEM(__pyx_t_5, 0, __pyx_t_4); __pyx_t_4 = NULL;
       }
-      __Pyx_GIVEREF(__pyx_t_4);
-      PyTuple_SET_ITEM(__pyx_t_5, 0+__pyx_t_11, __pyx_t_4);
+      __Pyx_GIVEREF(__pyx_t_1);
+      PyTuple_SET_ITEM(__pyx_t_5, 0+__pyx_t_7, __pyx_t_1);
       __Pyx_INCREF(__pyx_int_3);
       __Pyx_GIVEREF(__pyx_int_3);
-      PyTuple_SET_ITEM(__pyx_t_5, 1+__pyx_t_11, __pyx_int_3);
-      __pyx_t_4 = 0;
-      __pyx_t_1 = __Pyx_PyObject_Call(__pyx_t_3, __pyx_t_5, NULL); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 92, __pyx_L1_error)
-      __Pyx_GOTREF(__pyx_t_1);
+      PyTuple_SET_ITEM(__pyx_t_5, 1+__pyx_t_7, __pyx_int_3);
+      __pyx_t_1 = 0;
+      __pyx_t_2 = __Pyx_PyObject_Call(__pyx_t_3, __pyx_t_5, NULL); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 60, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_2);
       __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
     }
     __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-    __pyx_t_3 = __Pyx_PyObject_CallOneArg(((PyObject *)(&PyString_Type)), __pyx_t_1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 92, __pyx_L1_error)
+    __pyx_t_3 = __Pyx_PyObject_CallOneArg(((PyObject *)(&PyString_Type)), __pyx_t_2); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 60, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_3);
-    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-    __pyx_t_1 = PyNumber_Add(__pyx_kp_s_Counting_and_Caching_All_Tardis, __pyx_t_3); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 92, __pyx_L1_error)
-    __Pyx_GOTREF(__pyx_t_1);
+    __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+    __pyx_t_2 = PyNumber_Add(__pyx_kp_s_Counting_and_Caching_All_Tardis, __pyx_t_3); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 60, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_2);
     __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-    __pyx_t_3 = PyNumber_Add(__pyx_t_1, __pyx_kp_s_sec); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 92, __pyx_L1_error)
+    __pyx_t_3 = PyNumber_Add(__pyx_t_2, __pyx_kp_s_sec); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 60, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_3);
-    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-    if (__Pyx_PrintOne(0, __pyx_t_3) < 0) __PYX_ERR(0, 92, __pyx_L1_error)
+    __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+    if (__Pyx_PrintOne(0, __pyx_t_3) < 0) __PYX_ERR(0, 60, __pyx_L1_error)
     __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
 
-    /* "tardis_msg_counter.pyx":91
- *     t2 = time.time()
+    /* "tardis_msg_counter.pyx":59
+ *     ret_metrics().add('cache_and_count', t2-t1, rows=num_msgs, msgs=num_lines)
  * 
  *     if log:             # <<<<<<<<<<<<<<
  *         print('\nCounting and Caching All Tardis Trade Msgs Took: '+str(np.round(t2-t1,3))+' sec')
@@ -3554,25 +2587,23 @@ static PyObject *__pyx_gb_18tardis_msg_counter_8generator(__pyx_CoroutineObject
  */
   }
 
-  /* "tardis_msg_counter.pyx":94
+  /* "tardis_msg_counter.pyx":62
  *         print('\nCounting and Caching All Tardis Trade Msgs Took: '+str(np.round(t2-t1,3))+' sec')
  * 
  *     return num_msgs             # <<<<<<<<<<<<<<
- * 
- * 
  */
   __Pyx_XDECREF(__pyx_r);
-  __pyx_t_3 = __Pyx_PyInt_From_int(__pyx_cur_scope->__pyx_v_num_msgs); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 94, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyInt_From_int(__pyx_cur_scope->__pyx_v_num_msgs); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 62, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_3);
   __pyx_r = NULL; __Pyx_ReturnWithStopIteration(__pyx_t_3);
   __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
   goto __pyx_L0;
   CYTHON_MAYBE_UNUSED_VAR(__pyx_cur_scope);
 
-  /* "tardis_msg_counter.pyx":31
+  /* "tardis_msg_counter.pyx":26
  *     return all_paths
  * 
- * async def c_tardis_count_and_save_async_gen_msgs(msg_gen, log=True):             # <<<<<<<<<<<<<<
+ * async def c_tardis_count_and_save_async_gen_msgs(msg_gen, exch, log=True):             # <<<<<<<<<<<<<<
  *     """
  *     Tardis Python API returns an async_generator.
  */
@@ -3596,1189 +2627,55 @@ static PyObject *__pyx_gb_18tardis_msg_counter_8generator(__pyx_CoroutineObject
   return __pyx_r;
 }
 
-/* "tardis_msg_counter.pyx":97
- * 
- * 
- * def c_tardis_count_trade_msgs_cache_file(file_path):             # <<<<<<<<<<<<<<
- *     """
- *     Return number of Tardis trade messages in a .gz file
- */
-
-/* Python wrapper */
-static PyObject *__pyx_pw_18tardis_msg_counter_10c_tardis_count_trade_msgs_cache_file(PyObject *__pyx_self, PyObject *__pyx_v_file_path); /*proto*/
-static char __pyx_doc_18tardis_msg_counter_9c_tardis_count_trade_msgs_cache_file[] = "\n    Return number of Tardis trade messages in a .gz file\n    ";
-static PyMethodDef __pyx_mdef_18tardis_msg_counter_10c_tardis_count_trade_msgs_cache_file = {"c_tardis_count_trade_msgs_cache_file", (PyCFunction)__pyx_pw_18tardis_msg_counter_10c_tardis_count_trade_msgs_cache_file, METH_O, __pyx_doc_18tardis_msg_counter_9c_tardis_count_trade_msgs_cache_file};
-static PyObject *__pyx_pw_18tardis_msg_counter_10c_tardis_count_trade_msgs_cache_file(PyObject *__pyx_self, PyObject *__pyx_v_file_path) {
-  PyObject *__pyx_r = 0;
-  __Pyx_RefNannyDeclarations
-  __Pyx_RefNannySetupContext("c_tardis_count_trade_msgs_cache_file (wrapper)", 0);
-  __pyx_r = __pyx_pf_18tardis_msg_counter_9c_tardis_count_trade_msgs_cache_file(__pyx_self, ((PyObject *)__pyx_v_file_path));
+static struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs *__pyx_freelist_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs[8];
+static int __pyx_freecount_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs = 0;
 
-  /* function exit code */
-  __Pyx_RefNannyFinishContext();
-  return __pyx_r;
+static PyObject *__pyx_tp_new_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs(PyTypeObject *t, CYTHON_UNUSED PyObject *a, CYTHON_UNUSED PyObject *k) {
+  PyObject *o;
+  if (CYTHON_COMPILING_IN_CPYTHON && likely((__pyx_freecount_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs > 0) & (t->tp_basicsize == sizeof(struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs)))) {
+    o = (PyObject*)__pyx_freelist_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs[--__pyx_freecount_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs];
+    memset(o, 0, sizeof(struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs));
+    (void) PyObject_INIT(o, t);
+    PyObject_GC_Track(o);
+  } else {
+    o = (*t->tp_alloc)(t, 0);
+    if (unlikely(!o)) return 0;
+  }
+  return o;
 }
 
-static PyObject *__pyx_pf_18tardis_msg_counter_9c_tardis_count_trade_msgs_cache_file(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_file_path) {
-  PyObject *__pyx_v_lines = 0;
-  PyObject *__pyx_v_json_str = 0;
-  int __pyx_v_num_file_msgs;
-  PyObject *__pyx_v_json_bytes = NULL;
-  PyObject *__pyx_v_l = NULL;
-  PyObject *__pyx_v_line_data = NULL;
-  PyObject *__pyx_v_loaded_line = NULL;
-  CYTHON_UNUSED PyObject *__pyx_v_sub_data = NULL;
-  PyObject *__pyx_v_sub_line = NULL;
-  PyObject *__pyx_r = NULL;
-  __Pyx_RefNannyDeclarations
-  PyObject *__pyx_t_1 = NULL;
-  PyObject *__pyx_t_2 = NULL;
-  PyObject *__pyx_t_3 = NULL;
-  PyObject *__pyx_t_4 = NULL;
-  Py_ssize_t __pyx_t_5;
-  Py_ssize_t __pyx_t_6;
-  int __pyx_t_7;
-  int __pyx_t_8;
-  PyObject *(*__pyx_t_9)(PyObject *);
-  PyObject *__pyx_t_10 = NULL;
-  int __pyx_lineno = 0;
-  const char *__pyx_filename = NULL;
-  int __pyx_clineno = 0;
-  __Pyx_RefNannySetupContext("c_tardis_count_trade_msgs_cache_file", 0);
-
-  /* "tardis_msg_counter.pyx":102
- *     """
- * 
- *     cdef list lines = []             # <<<<<<<<<<<<<<
- *     cdef str json_str
- *     cdef int num_file_msgs = 0
- */
-  __pyx_t_1 = PyList_New(0); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 102, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_1);
-  __pyx_v_lines = ((PyObject*)__pyx_t_1);
-  __pyx_t_1 = 0;
-
-  /* "tardis_msg_counter.pyx":104
- *     cdef list lines = []
- *     cdef str json_str
- *     cdef int num_file_msgs = 0             # <<<<<<<<<<<<<<
- * 
- *     # read the gzip file
- */
-  __pyx_v_num_file_msgs = 0;
-
-  /* "tardis_msg_counter.pyx":107
- * 
- *     # read the gzip file
- *     json_bytes = read_gzip_file(str(file_path))             # <<<<<<<<<<<<<<
- *     json_str = json_bytes.decode('utf-8')
- *     lines = json_str.split('\n')
- */
-  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_read_gzip_file); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 107, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_2);
-  __pyx_t_3 = __Pyx_PyObject_CallOneArg(((PyObject *)(&PyString_Type)), __pyx_v_file_path); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 107, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_3);
-  __pyx_t_4 = NULL;
-  if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_2))) {
-    __pyx_t_4 = PyMethod_GET_SELF(__pyx_t_2);
-    if (likely(__pyx_t_4)) {
-      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_2);
-      __Pyx_INCREF(__pyx_t_4);
-      __Pyx_INCREF(function);
-      __Pyx_DECREF_SET(__pyx_t_2, function);
-    }
+static void __pyx_tp_dealloc_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs(PyObject *o) {
+  struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs *p = (struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs *)o;
+  PyObject_GC_UnTrack(o);
+  Py_CLEAR(p->__pyx_v_count);
+  Py_CLEAR(p->__pyx_v_exch);
+  Py_CLEAR(p->__pyx_v_extractor);
+  Py_CLEAR(p->__pyx_v_local_timestamp);
+  Py_CLEAR(p->__pyx_v_log);
+  Py_CLEAR(p->__pyx_v_message);
+  Py_CLEAR(p->__pyx_v_msg_gen);
+  Py_CLEAR(p->__pyx_v_t1);
+  Py_CLEAR(p->__pyx_v_t2);
+  Py_CLEAR(p->__pyx_t_0);
+  if (CYTHON_COMPILING_IN_CPYTHON && ((__pyx_freecount_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs < 8) & (Py_TYPE(o)->tp_basicsize == sizeof(struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs)))) {
+    __pyx_freelist_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs[__pyx_freecount_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs++] = ((struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs *)o);
+  } else {
+    (*Py_TYPE(o)->tp_free)(o);
   }
-  __pyx_t_1 = (__pyx_t_4) ? __Pyx_PyObject_Call2Args(__pyx_t_2, __pyx_t_4, __pyx_t_3) : __Pyx_PyObject_CallOneArg(__pyx_t_2, __pyx_t_3);
-  __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
-  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 107, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_1);
-  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-  __pyx_v_json_bytes = __pyx_t_1;
-  __pyx_t_1 = 0;
+}
 
-  /* "tardis_msg_counter.pyx":108
- *     # read the gzip file
- *     json_bytes = read_gzip_file(str(file_path))
- *     json_str = json_bytes.decode('utf-8')             # <<<<<<<<<<<<<<
- *     lines = json_str.split('\n')
- * 
- */
-  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(__pyx_v_json_bytes, __pyx_n_s_decode); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 108, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_2);
-  __pyx_t_3 = NULL;
-  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_2))) {
-    __pyx_t_3 = PyMethod_GET_SELF(__pyx_t_2);
-    if (likely(__pyx_t_3)) {
-      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_2);
-      __Pyx_INCREF(__pyx_t_3);
-      __Pyx_INCREF(function);
-      __Pyx_DECREF_SET(__pyx_t_2, function);
-    }
+static int __pyx_tp_traverse_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs(PyObject *o, visitproc v, void *a) {
+  int e;
+  struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs *p = (struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs *)o;
+  if (p->__pyx_v_count) {
+    e = (*v)(p->__pyx_v_count, a); if (e) return e;
   }
-  __pyx_t_1 = (__pyx_t_3) ? __Pyx_PyObject_Call2Args(__pyx_t_2, __pyx_t_3, __pyx_kp_s_utf_8) : __Pyx_PyObject_CallOneArg(__pyx_t_2, __pyx_kp_s_utf_8);
-  __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
-  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 108, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_1);
-  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-  if (!(likely(PyString_CheckExact(__pyx_t_1))||((__pyx_t_1) == Py_None)||(PyErr_Format(PyExc_TypeError, "Expected %.16s, got %.200s", "str", Py_TYPE(__pyx_t_1)->tp_name), 0))) __PYX_ERR(0, 108, __pyx_L1_error)
-  __pyx_v_json_str = ((PyObject*)__pyx_t_1);
-  __pyx_t_1 = 0;
-
-  /* "tardis_msg_counter.pyx":109
- *     json_bytes = read_gzip_file(str(file_path))
- *     json_str = json_bytes.decode('utf-8')
- *     lines = json_str.split('\n')             # <<<<<<<<<<<<<<
- * 
- *     for l in lines:
- */
-  __pyx_t_1 = __Pyx_CallUnboundCMethod1(&__pyx_umethod_PyString_Type_split, __pyx_v_json_str, __pyx_kp_s__4); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 109, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_1);
-  if (!(likely(PyList_CheckExact(__pyx_t_1))||((__pyx_t_1) == Py_None)||(PyErr_Format(PyExc_TypeError, "Expected %.16s, got %.200s", "list", Py_TYPE(__pyx_t_1)->tp_name), 0))) __PYX_ERR(0, 109, __pyx_L1_error)
-  __Pyx_DECREF_SET(__pyx_v_lines, ((PyObject*)__pyx_t_1));
-  __pyx_t_1 = 0;
-
-  /* "tardis_msg_counter.pyx":111
- *     lines = json_str.split('\n')
- * 
- *     for l in lines:             # <<<<<<<<<<<<<<
- * 
- *         if len(l)==0:
- */
-  if (unlikely(__pyx_v_lines == Py_None)) {
-    PyErr_SetString(PyExc_TypeError, "'NoneType' object is not iterable");
-    __PYX_ERR(0, 111, __pyx_L1_error)
+  if (p->__pyx_v_exch) {
+    e = (*v)(p->__pyx_v_exch, a); if (e) return e;
   }
-  __pyx_t_1 = __pyx_v_lines; __Pyx_INCREF(__pyx_t_1); __pyx_t_5 = 0;
-  for (;;) {
-    if (__pyx_t_5 >= PyList_GET_SIZE(__pyx_t_1)) break;
-    #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-    __pyx_t_2 = PyList_GET_ITEM(__pyx_t_1, __pyx_t_5); __Pyx_INCREF(__pyx_t_2); __pyx_t_5++; if (unlikely(0 < 0)) __PYX_ERR(0, 111, __pyx_L1_error)
-    #else
-    __pyx_t_2 = PySequence_ITEM(__pyx_t_1, __pyx_t_5); __pyx_t_5++; if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 111, __pyx_L1_error)
-    __Pyx_GOTREF(__pyx_t_2);
-    #endif
-    __Pyx_XDECREF_SET(__pyx_v_l, __pyx_t_2);
-    __pyx_t_2 = 0;
-
-    /* "tardis_msg_counter.pyx":113
- *     for l in lines:
- * 
- *         if len(l)==0:             # <<<<<<<<<<<<<<
- *             continue
- * 
- */
-    __pyx_t_6 = PyObject_Length(__pyx_v_l); if (unlikely(__pyx_t_6 == ((Py_ssize_t)-1))) __PYX_ERR(0, 113, __pyx_L1_error)
-    __pyx_t_7 = ((__pyx_t_6 == 0) != 0);
-    if (__pyx_t_7) {
-
-      /* "tardis_msg_counter.pyx":114
- * 
- *         if len(l)==0:
- *             continue             # <<<<<<<<<<<<<<
- * 
- *         line_data = {}
- */
-      goto __pyx_L3_continue;
-
-      /* "tardis_msg_counter.pyx":113
- *     for l in lines:
- * 
- *         if len(l)==0:             # <<<<<<<<<<<<<<
- *             continue
- * 
- */
-    }
-
-    /* "tardis_msg_counter.pyx":116
- *             continue
- * 
- *         line_data = {}             # <<<<<<<<<<<<<<
- *         loaded_line = parse_msg_line(l)
- * 
- */
-    __pyx_t_2 = __Pyx_PyDict_NewPresized(0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 116, __pyx_L1_error)
-    __Pyx_GOTREF(__pyx_t_2);
-    __Pyx_XDECREF_SET(__pyx_v_line_data, __pyx_t_2);
-    __pyx_t_2 = 0;
-
-    /* "tardis_msg_counter.pyx":117
- * 
- *         line_data = {}
- *         loaded_line = parse_msg_line(l)             # <<<<<<<<<<<<<<
- * 
- *         # Generic
- */
-    __Pyx_GetModuleGlobalName(__pyx_t_3, __pyx_n_s_parse_msg_line); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 117, __pyx_L1_error)
-    __Pyx_GOTREF(__pyx_t_3);
-    __pyx_t_4 = NULL;
-    if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_3))) {
-      __pyx_t_4 = PyMethod_GET_SELF(__pyx_t_3);
-      if (likely(__pyx_t_4)) {
-        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_3);
-        __Pyx_INCREF(__pyx_t_4);
-        __Pyx_INCREF(function);
-        __Pyx_DECREF_SET(__pyx_t_3, function);
-      }
-    }
-    __pyx_t_2 = (__pyx_t_4) ? __Pyx_PyObject_Call2Args(__pyx_t_3, __pyx_t_4, __pyx_v_l) : __Pyx_PyObject_CallOneArg(__pyx_t_3, __pyx_v_l);
-    __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
-    if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 117, __pyx_L1_error)
-    __Pyx_GOTREF(__pyx_t_2);
-    __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-    __Pyx_XDECREF_SET(__pyx_v_loaded_line, __pyx_t_2);
-    __pyx_t_2 = 0;
-
-    /* "tardis_msg_counter.pyx":120
- * 
- *         # Generic
- *         if 'data' in loaded_line:             # <<<<<<<<<<<<<<
- *             line_data = loaded_line['data']
- *         # For Houbi Data
- */
-    __pyx_t_7 = (__Pyx_PySequence_ContainsTF(__pyx_n_s_data, __pyx_v_loaded_line, Py_EQ)); if (unlikely(__pyx_t_7 < 0)) __PYX_ERR(0, 120, __pyx_L1_error)
-    __pyx_t_8 = (__pyx_t_7 != 0);
-    if (__pyx_t_8) {
-
-      /* "tardis_msg_counter.pyx":121
- *         # Generic
- *         if 'data' in loaded_line:
- *             line_data = loaded_line['data']             # <<<<<<<<<<<<<<
- *         # For Houbi Data
- *         elif 'tick' in loaded_line:
- */
-      __pyx_t_2 = __Pyx_PyObject_Dict_GetItem(__pyx_v_loaded_line, __pyx_n_s_data); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 121, __pyx_L1_error)
-      __Pyx_GOTREF(__pyx_t_2);
-      __Pyx_DECREF_SET(__pyx_v_line_data, __pyx_t_2);
-      __pyx_t_2 = 0;
-
-      /* "tardis_msg_counter.pyx":120
- * 
- *         # Generic
- *         if 'data' in loaded_line:             # <<<<<<<<<<<<<<
- *             line_data = loaded_line['data']
- *         # For Houbi Data
- */
-      goto __pyx_L6;
-    }
-
-    /* "tardis_msg_counter.pyx":123
- *             line_data = loaded_line['data']
- *         # For Houbi Data
- *         elif 'tick' in loaded_line:             # <<<<<<<<<<<<<<
- *             if 'data' in loaded_line['tick']:
- *                 line_data = loaded_line['tick']['data']
- */
-    __pyx_t_8 = (__Pyx_PySequence_ContainsTF(__pyx_n_s_tick, __pyx_v_loaded_line, Py_EQ)); if (unlikely(__pyx_t_8 < 0)) __PYX_ERR(0, 123, __pyx_L1_error)
-    __pyx_t_7 = (__pyx_t_8 != 0);
-    if (__pyx_t_7) {
-
-      /* "tardis_msg_counter.pyx":124
- *         # For Houbi Data
- *         elif 'tick' in loaded_line:
- *             if 'data' in loaded_line['tick']:             # <<<<<<<<<<<<<<
- *                 line_data = loaded_line['tick']['data']
- *         # For Deribit Data
- */
-      __pyx_t_2 = __Pyx_PyObject_Dict_GetItem(__pyx_v_loaded_line, __pyx_n_s_tick); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 124, __pyx_L1_error)
-      __Pyx_GOTREF(__pyx_t_2);
-      __pyx_t_7 = (__Pyx_PySequence_ContainsTF(__pyx_n_s_data, __pyx_t_2, Py_EQ)); if (unlikely(__pyx_t_7 < 0)) __PYX_ERR(0, 124, __pyx_L1_error)
-      __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-      __pyx_t_8 = (__pyx_t_7 != 0);
-      if (__pyx_t_8) {
-
-        /* "tardis_msg_counter.pyx":125
- *         elif 'tick' in loaded_line:
- *             if 'data' in loaded_line['tick']:
- *                 line_data = loaded_line['tick']['data']             # <<<<<<<<<<<<<<
- *         # For Deribit Data
- *         elif 'params' in loaded_line:
- */
-        __pyx_t_2 = __Pyx_PyObject_Dict_GetItem(__pyx_v_loaded_line, __pyx_n_s_tick); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 125, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_2);
-        __pyx_t_3 = __Pyx_PyObject_Dict_GetItem(__pyx_t_2, __pyx_n_s_data); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 125, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_3);
-        __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-        __Pyx_DECREF_SET(__pyx_v_line_data, __pyx_t_3);
-        __pyx_t_3 = 0;
-
-        /* "tardis_msg_counter.pyx":124
- *         # For Houbi Data
- *         elif 'tick' in loaded_line:
- *             if 'data' in loaded_line['tick']:             # <<<<<<<<<<<<<<
- *                 line_data = loaded_line['tick']['data']
- *         # For Deribit Data
- */
-      }
-
-      /* "tardis_msg_counter.pyx":123
- *             line_data = loaded_line['data']
- *         # For Houbi Data
- *         elif 'tick' in loaded_line:             # <<<<<<<<<<<<<<
- *             if 'data' in loaded_line['tick']:
- *                 line_data = loaded_line['tick']['data']
- */
-      goto __pyx_L6;
-    }
-
-    /* "tardis_msg_counter.pyx":127
- *                 line_data = loaded_line['tick']['data']
- *         # For Deribit Data
- *         elif 'params' in loaded_line:             # <<<<<<<<<<<<<<
- *             if 'data' in loaded_line['params']:
- *                 line_data = loaded_line['params']['data']
- */
-    __pyx_t_8 = (__Pyx_PySequence_ContainsTF(__pyx_n_s_params, __pyx_v_loaded_line, Py_EQ)); if (unlikely(__pyx_t_8 < 0)) __PYX_ERR(0, 127, __pyx_L1_error)
-    __pyx_t_7 = (__pyx_t_8 != 0);
-    if (__pyx_t_7) {
-
-      /* "tardis_msg_counter.pyx":128
- *         # For Deribit Data
- *         elif 'params' in loaded_line:
- *             if 'data' in loaded_line['params']:             # <<<<<<<<<<<<<<
- *                 line_data = loaded_line['params']['data']
- *         # For Coinbase & Bitstamp data
- */
-      __pyx_t_3 = __Pyx_PyObject_Dict_GetItem(__pyx_v_loaded_line, __pyx_n_s_params); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 128, __pyx_L1_error)
-      __Pyx_GOTREF(__pyx_t_3);
-      __pyx_t_7 = (__Pyx_PySequence_ContainsTF(__pyx_n_s_data, __pyx_t_3, Py_EQ)); if (unlikely(__pyx_t_7 < 0)) __PYX_ERR(0, 128, __pyx_L1_error)
-      __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-      __pyx_t_8 = (__pyx_t_7 != 0);
-      if (__pyx_t_8) {
-
-        /* "tardis_msg_counter.pyx":129
- *         elif 'params' in loaded_line:
- *             if 'data' in loaded_line['params']:
- *                 line_data = loaded_line['params']['data']             # <<<<<<<<<<<<<<
- *         # For Coinbase & Bitstamp data
- *         elif type(loaded_line) is dict:
- */
-        __pyx_t_3 = __Pyx_PyObject_Dict_GetItem(__pyx_v_loaded_line, __pyx_n_s_params); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 129, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_3);
-        __pyx_t_2 = __Pyx_PyObject_Dict_GetItem(__pyx_t_3, __pyx_n_s_data); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 129, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_2);
-        __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-        __Pyx_DECREF_SET(__pyx_v_line_data, __pyx_t_2);
-        __pyx_t_2 = 0;
-
-        /* "tardis_msg_counter.pyx":128
- *         # For Deribit Data
- *         elif 'params' in loaded_line:
- *             if 'data' in loaded_line['params']:             # <<<<<<<<<<<<<<
- *                 line_data = loaded_line['params']['data']
- *         # For Coinbase & Bitstamp data
- */
-      }
-
-      /* "tardis_msg_counter.pyx":127
- *                 line_data = loaded_line['tick']['data']
- *         # For Deribit Data
- *         elif 'params' in loaded_line:             # <<<<<<<<<<<<<<
- *             if 'data' in loaded_line['params']:
- *                 line_data = loaded_line['params']['data']
- */
-      goto __pyx_L6;
-    }
-
-    /* "tardis_msg_counter.pyx":131
- *                 line_data = loaded_line['params']['data']
- *         # For Coinbase & Bitstamp data
- *         elif type(loaded_line) is dict:             # <<<<<<<<<<<<<<
- *             if 'type' in loaded_line:
- *                 if loaded_line['type']=='match':
- */
-    __pyx_t_8 = (((PyObject *)Py_TYPE(__pyx_v_loaded_line)) == ((PyObject *)(&PyDict_Type)));
-    __pyx_t_7 = (__pyx_t_8 != 0);
-    if (__pyx_t_7) {
-
-      /* "tardis_msg_counter.pyx":132
- *         # For Coinbase & Bitstamp data
- *         elif type(loaded_line) is dict:
- *             if 'type' in loaded_line:             # <<<<<<<<<<<<<<
- *                 if loaded_line['type']=='match':
- *                     line_data = loaded_line
- */
-      __pyx_t_7 = (__Pyx_PySequence_ContainsTF(__pyx_n_s_type, __pyx_v_loaded_line, Py_EQ)); if (unlikely(__pyx_t_7 < 0)) __PYX_ERR(0, 132, __pyx_L1_error)
-      __pyx_t_8 = (__pyx_t_7 != 0);
-      if (__pyx_t_8) {
-
-        /* "tardis_msg_counter.pyx":133
- *         elif type(loaded_line) is dict:
- *             if 'type' in loaded_line:
- *                 if loaded_line['type']=='match':             # <<<<<<<<<<<<<<
- *                     line_data = loaded_line
- *         # For Kraken data
- */
-        __pyx_t_2 = __Pyx_PyObject_Dict_GetItem(__pyx_v_loaded_line, __pyx_n_s_type); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 133, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_2);
-        __pyx_t_8 = (__Pyx_PyString_Equals(__pyx_t_2, __pyx_n_s_match, Py_EQ)); if (unlikely(__pyx_t_8 < 0)) __PYX_ERR(0, 133, __pyx_L1_error)
-        __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-        if (__pyx_t_8) {
-
-          /* "tardis_msg_counter.pyx":134
- *             if 'type' in loaded_line:
- *                 if loaded_line['type']=='match':
- *                     line_data = loaded_line             # <<<<<<<<<<<<<<
- *         # For Kraken data
- *         elif type(loaded_line) is list:
- */
-          __Pyx_INCREF(__pyx_v_loaded_line);
-          __Pyx_DECREF_SET(__pyx_v_line_data, __pyx_v_loaded_line);
-
-          /* "tardis_msg_counter.pyx":133
- *         elif type(loaded_line) is dict:
- *             if 'type' in loaded_line:
- *                 if loaded_line['type']=='match':             # <<<<<<<<<<<<<<
- *                     line_data = loaded_line
- *         # For Kraken data
- */
-        }
-
-        /* "tardis_msg_counter.pyx":132
- *         # For Coinbase & Bitstamp data
- *         elif type(loaded_line) is dict:
- *             if 'type' in loaded_line:             # <<<<<<<<<<<<<<
- *                 if loaded_line['type']=='match':
- *                     line_data = loaded_line
- */
-      }
-
-      /* "tardis_msg_counter.pyx":131
- *                 line_data = loaded_line['params']['data']
- *         # For Coinbase & Bitstamp data
- *         elif type(loaded_line) is dict:             # <<<<<<<<<<<<<<
- *             if 'type' in loaded_line:
- *                 if loaded_line['type']=='match':
- */
-      goto __pyx_L6;
-    }
-
-    /* "tardis_msg_counter.pyx":136
- *                     line_data = loaded_line
- *         # For Kraken data
- *         elif type(loaded_line) is list:             # <<<<<<<<<<<<<<
- *             if len(loaded_line)>=3:
- *                 if loaded_line[2]=='trade':
- */
-    __pyx_t_8 = (((PyObject *)Py_TYPE(__pyx_v_loaded_line)) == ((PyObject *)(&PyList_Type)));
-    __pyx_t_7 = (__pyx_t_8 != 0);
-    if (__pyx_t_7) {
-
-      /* "tardis_msg_counter.pyx":137
- *         # For Kraken data
- *         elif type(loaded_line) is list:
- *             if len(loaded_line)>=3:             # <<<<<<<<<<<<<<
- *                 if loaded_line[2]=='trade':
- *                     line_data = [{'price': sub_line[0],
- */
-      __pyx_t_6 = PyObject_Length(__pyx_v_loaded_line); if (unlikely(__pyx_t_6 == ((Py_ssize_t)-1))) __PYX_ERR(0, 137, __pyx_L1_error)
-      __pyx_t_7 = ((__pyx_t_6 >= 3) != 0);
-      if (__pyx_t_7) {
-
-        /* "tardis_msg_counter.pyx":138
- *         elif type(loaded_line) is list:
- *             if len(loaded_line)>=3:
- *                 if loaded_line[2]=='trade':             # <<<<<<<<<<<<<<
- *                     line_data = [{'price': sub_line[0],
- *                                   'volume': sub_line[1],
- */
-        __pyx_t_2 = __Pyx_GetItemInt(__pyx_v_loaded_line, 2, long, 1, __Pyx_PyInt_From_long, 0, 0, 1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 138, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_2);
-        __pyx_t_7 = (__Pyx_PyString_Equals(__pyx_t_2, __pyx_n_s_trade, Py_EQ)); if (unlikely(__pyx_t_7 < 0)) __PYX_ERR(0, 138, __pyx_L1_error)
-        __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-        if (__pyx_t_7) {
-
-          /* "tardis_msg_counter.pyx":139
- *             if len(loaded_line)>=3:
- *                 if loaded_line[2]=='trade':
- *                     line_data = [{'price': sub_line[0],             # <<<<<<<<<<<<<<
- *                                   'volume': sub_line[1],
- *                                   'time': sub_line[2],
- */
-          __pyx_t_2 = PyList_New(0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 139, __pyx_L1_error)
-          __Pyx_GOTREF(__pyx_t_2);
-
-          /* "tardis_msg_counter.pyx":146
- *                                   'misc': sub_line[5],
- *                                   'symbol': loaded_line[3]}
- *                                  for sub_line in loaded_line[1]]             # <<<<<<<<<<<<<<
- * 
- *         if len(line_data)==0:
- */
-          __pyx_t_3 = __Pyx_GetItemInt(__pyx_v_loaded_line, 1, long, 1, __Pyx_PyInt_From_long, 0, 0, 1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 146, __pyx_L1_error)
-          __Pyx_GOTREF(__pyx_t_3);
-          if (likely(PyList_CheckExact(__pyx_t_3)) || PyTuple_CheckExact(__pyx_t_3)) {
-            __pyx_t_4 = __pyx_t_3; __Pyx_INCREF(__pyx_t_4); __pyx_t_6 = 0;
-            __pyx_t_9 = NULL;
-          } else {
-            __pyx_t_6 = -1; __pyx_t_4 = PyObject_GetIter(__pyx_t_3); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 146, __pyx_L1_error)
-            __Pyx_GOTREF(__pyx_t_4);
-            __pyx_t_9 = Py_TYPE(__pyx_t_4)->tp_iternext; if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 146, __pyx_L1_error)
-          }
-          __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-          for (;;) {
-            if (likely(!__pyx_t_9)) {
-              if (likely(PyList_CheckExact(__pyx_t_4))) {
-                if (__pyx_t_6 >= PyList_GET_SIZE(__pyx_t_4)) break;
-                #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-                __pyx_t_3 = PyList_GET_ITEM(__pyx_t_4, __pyx_t_6); __Pyx_INCREF(__pyx_t_3); __pyx_t_6++; if (unlikely(0 < 0)) __PYX_ERR(0, 146, __pyx_L1_error)
-                #else
-                __pyx_t_3 = PySequence_ITEM(__pyx_t_4, __pyx_t_6); __pyx_t_6++; if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 146, __pyx_L1_error)
-                __Pyx_GOTREF(__pyx_t_3);
-                #endif
-              } else {
-                if (__pyx_t_6 >= PyTuple_GET_SIZE(__pyx_t_4)) break;
-                #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-                __pyx_t_3 = PyTuple_GET_ITEM(__pyx_t_4, __pyx_t_6); __Pyx_INCREF(__pyx_t_3); __pyx_t_6++; if (unlikely(0 < 0)) __PYX_ERR(0, 146, __pyx_L1_error)
-                #else
-                __pyx_t_3 = PySequence_ITEM(__pyx_t_4, __pyx_t_6); __pyx_t_6++; if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 146, __pyx_L1_error)
-                __Pyx_GOTREF(__pyx_t_3);
-                #endif
-              }
-            } else {
-              __pyx_t_3 = __pyx_t_9(__pyx_t_4);
-              if (unlikely(!__pyx_t_3)) {
-                PyObject* exc_type = PyErr_Occurred();
-                if (exc_type) {
-                  if (likely(__Pyx_PyErr_GivenExceptionMatches(exc_type, PyExc_StopIteration))) PyErr_Clear();
-                  else __PYX_ERR(0, 146, __pyx_L1_error)
-                }
-                break;
-              }
-              __Pyx_GOTREF(__pyx_t_3);
-            }
-            __Pyx_XDECREF_SET(__pyx_v_sub_line, __pyx_t_3);
-            __pyx_t_3 = 0;
-
-            /* "tardis_msg_counter.pyx":139
- *             if len(loaded_line)>=3:
- *                 if loaded_line[2]=='trade':
- *                     line_data = [{'price': sub_line[0],             # <<<<<<<<<<<<<<
- *                                   'volume': sub_line[1],
- *                                   'time': sub_line[2],
- */
-            __pyx_t_3 = __Pyx_PyDict_NewPresized(7); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 139, __pyx_L1_error)
-            __Pyx_GOTREF(__pyx_t_3);
-            __pyx_t_10 = __Pyx_GetItemInt(__pyx_v_sub_line, 0, long, 1, __Pyx_PyInt_From_long, 0, 0, 1); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 139, __pyx_L1_error)
-            __Pyx_GOTREF(__pyx_t_10);
-            if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_price, __pyx_t_10) < 0) __PYX_ERR(0, 139, __pyx_L1_error)
-            __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
-
-            /* "tardis_msg_counter.pyx":140
- *                 if loaded_line[2]=='trade':
- *                     line_data = [{'price': sub_line[0],
- *                                   'volume': sub_line[1],             # <<<<<<<<<<<<<<
- *                                   'time': sub_line[2],
- *                                   'side': sub_line[3],
- */
-            __pyx_t_10 = __Pyx_GetItemInt(__pyx_v_sub_line, 1, long, 1, __Pyx_PyInt_From_long, 0, 0, 1); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 140, __pyx_L1_error)
-            __Pyx_GOTREF(__pyx_t_10);
-            if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_volume, __pyx_t_10) < 0) __PYX_ERR(0, 139, __pyx_L1_error)
-            __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
-
-            /* "tardis_msg_counter.pyx":141
- *                     line_data = [{'price': sub_line[0],
- *                                   'volume': sub_line[1],
- *                                   'time': sub_line[2],             # <<<<<<<<<<<<<<
- *                                   'side': sub_line[3],
- *                                   'orderType': sub_line[4],
- */
-            __pyx_t_10 = __Pyx_GetItemInt(__pyx_v_sub_line, 2, long, 1, __Pyx_PyInt_From_long, 0, 0, 1); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 141, __pyx_L1_error)
-            __Pyx_GOTREF(__pyx_t_10);
-            if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_time, __pyx_t_10) < 0) __PYX_ERR(0, 139, __pyx_L1_error)
-            __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
-
-            /* "tardis_msg_counter.pyx":142
- *                                   'volume': sub_line[1],
- *                                   'time': sub_line[2],
- *                                   'side': sub_line[3],             # <<<<<<<<<<<<<<
- *                                   'orderType': sub_line[4],
- *                                   'misc': sub_line[5],
- */
-            __pyx_t_10 = __Pyx_GetItemInt(__pyx_v_sub_line, 3, long, 1, __Pyx_PyInt_From_long, 0, 0, 1); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 142, __pyx_L1_error)
-            __Pyx_GOTREF(__pyx_t_10);
-            if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_side, __pyx_t_10) < 0) __PYX_ERR(0, 139, __pyx_L1_error)
-            __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
-
-            /* "tardis_msg_counter.pyx":143
- *                                   'time': sub_line[2],
- *                                   'side': sub_line[3],
- *                                   'orderType': sub_line[4],             # <<<<<<<<<<<<<<
- *                                   'misc': sub_line[5],
- *                                   'symbol': loaded_line[3]}
- */
-            __pyx_t_10 = __Pyx_GetItemInt(__pyx_v_sub_line, 4, long, 1, __Pyx_PyInt_From_long, 0, 0, 1); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 143, __pyx_L1_error)
-            __Pyx_GOTREF(__pyx_t_10);
-            if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_orderType, __pyx_t_10) < 0) __PYX_ERR(0, 139, __pyx_L1_error)
-            __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
-
-            /* "tardis_msg_counter.pyx":144
- *                                   'side': sub_line[3],
- *                                   'orderType': sub_line[4],
- *                                   'misc': sub_line[5],             # <<<<<<<<<<<<<<
- *                                   'symbol': loaded_line[3]}
- *                                  for sub_line in loaded_line[1]]
- */
-            __pyx_t_10 = __Pyx_GetItemInt(__pyx_v_sub_line, 5, long, 1, __Pyx_PyInt_From_long, 0, 0, 1); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 144, __pyx_L1_error)
-            __Pyx_GOTREF(__pyx_t_10);
-            if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_misc, __pyx_t_10) < 0) __PYX_ERR(0, 139, __pyx_L1_error)
-            __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
-
-            /* "tardis_msg_counter.pyx":145
- *                                   'orderType': sub_line[4],
- *                                   'misc': sub_line[5],
- *                                   'symbol': loaded_line[3]}             # <<<<<<<<<<<<<<
- *                                  for sub_line in loaded_line[1]]
- * 
- */
-            __pyx_t_10 = __Pyx_GetItemInt(__pyx_v_loaded_line, 3, long, 1, __Pyx_PyInt_From_long, 0, 0, 1); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 145, __pyx_L1_error)
-            __Pyx_GOTREF(__pyx_t_10);
-            if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_symbol, __pyx_t_10) < 0) __PYX_ERR(0, 139, __pyx_L1_error)
-            __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
-            if (unlikely(__Pyx_ListComp_Append(__pyx_t_2, (PyObject*)__pyx_t_3))) __PYX_ERR(0, 139, __pyx_L1_error)
-            __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-
-            /* "tardis_msg_counter.pyx":146
- *                                   'misc': sub_line[5],
- *                                   'symbol': loaded_line[3]}
- *                                  for sub_line in loaded_line[1]]             # <<<<<<<<<<<<<<
- * 
- *         if len(line_data)==0:
- */
-          }
-          __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-          __Pyx_DECREF_SET(__pyx_v_line_data, __pyx_t_2);
-          __pyx_t_2 = 0;
-
-          /* "tardis_msg_counter.pyx":138
- *         elif type(loaded_line) is list:
- *             if len(loaded_line)>=3:
- *                 if loaded_line[2]=='trade':             # <<<<<<<<<<<<<<
- *                     line_data = [{'price': sub_line[0],
- *                                   'volume': sub_line[1],
- */
-        }
-
-        /* "tardis_msg_counter.pyx":137
- *         # For Kraken data
- *         elif type(loaded_line) is list:
- *             if len(loaded_line)>=3:             # <<<<<<<<<<<<<<
- *                 if loaded_line[2]=='trade':
- *                     line_data = [{'price': sub_line[0],
- */
-      }
-
-      /* "tardis_msg_counter.pyx":136
- *                     line_data = loaded_line
- *         # For Kraken data
- *         elif type(loaded_line) is list:             # <<<<<<<<<<<<<<
- *             if len(loaded_line)>=3:
- *                 if loaded_line[2]=='trade':
- */
-    }
-    __pyx_L6:;
-
-    /* "tardis_msg_counter.pyx":148
- *                                  for sub_line in loaded_line[1]]
- * 
- *         if len(line_data)==0:             # <<<<<<<<<<<<<<
- *             continue
- * 
- */
-    __pyx_t_6 = PyObject_Length(__pyx_v_line_data); if (unlikely(__pyx_t_6 == ((Py_ssize_t)-1))) __PYX_ERR(0, 148, __pyx_L1_error)
-    __pyx_t_7 = ((__pyx_t_6 == 0) != 0);
-    if (__pyx_t_7) {
-
-      /* "tardis_msg_counter.pyx":149
- * 
- *         if len(line_data)==0:
- *             continue             # <<<<<<<<<<<<<<
- * 
- *         if type(line_data) is dict:
- */
-      goto __pyx_L3_continue;
-
-      /* "tardis_msg_counter.pyx":148
- *                                  for sub_line in loaded_line[1]]
- * 
- *         if len(line_data)==0:             # <<<<<<<<<<<<<<
- *             continue
- * 
- */
-    }
-
-    /* "tardis_msg_counter.pyx":151
- *             continue
- * 
- *         if type(line_data) is dict:             # <<<<<<<<<<<<<<
- *             num_file_msgs += 1
- * 
- */
-    __pyx_t_7 = (((PyObject *)Py_TYPE(__pyx_v_line_data)) == ((PyObject *)(&PyDict_Type)));
-    __pyx_t_8 = (__pyx_t_7 != 0);
-    if (__pyx_t_8) {
-
-      /* "tardis_msg_counter.pyx":152
- * 
- *         if type(line_data) is dict:
- *             num_file_msgs += 1             # <<<<<<<<<<<<<<
- * 
- *         elif type(line_data) is list:
- */
-      __pyx_v_num_file_msgs = (__pyx_v_num_file_msgs + 1);
-
-      /* "tardis_msg_counter.pyx":151
- *             continue
- * 
- *         if type(line_data) is dict:             # <<<<<<<<<<<<<<
- *             num_file_msgs += 1
- * 
- */
-      goto __pyx_L16;
-    }
-
-    /* "tardis_msg_counter.pyx":154
- *             num_file_msgs += 1
- * 
- *         elif type(line_data) is list:             # <<<<<<<<<<<<<<
- *             for sub_data in line_data:
- *                 num_file_msgs += 1
- */
-    __pyx_t_8 = (((PyObject *)Py_TYPE(__pyx_v_line_data)) == ((PyObject *)(&PyList_Type)));
-    __pyx_t_7 = (__pyx_t_8 != 0);
-    if (__pyx_t_7) {
-
-      /* "tardis_msg_counter.pyx":155
- * 
- *         elif type(line_data) is list:
- *             for sub_data in line_data:             # <<<<<<<<<<<<<<
- *                 num_file_msgs += 1
- * 
- */
-      if (likely(PyList_CheckExact(__pyx_v_line_data)) || PyTuple_CheckExact(__pyx_v_line_data)) {
-        __pyx_t_2 = __pyx_v_line_data; __Pyx_INCREF(__pyx_t_2); __pyx_t_6 = 0;
-        __pyx_t_9 = NULL;
-      } else {
-        __pyx_t_6 = -1; __pyx_t_2 = PyObject_GetIter(__pyx_v_line_data); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 155, __pyx_L1_error)
-        __Pyx_GOTREF(__pyx_t_2);
-        __pyx_t_9 = Py_TYPE(__pyx_t_2)->tp_iternext; if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 155, __pyx_L1_error)
-      }
-      for (;;) {
-        if (likely(!__pyx_t_9)) {
-          if (likely(PyList_CheckExact(__pyx_t_2))) {
-            if (__pyx_t_6 >= PyList_GET_SIZE(__pyx_t_2)) break;
-            #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-            __pyx_t_4 = PyList_GET_ITEM(__pyx_t_2, __pyx_t_6); __Pyx_INCREF(__pyx_t_4); __pyx_t_6++; if (unlikely(0 < 0)) __PYX_ERR(0, 155, __pyx_L1_error)
-            #else
-            __pyx_t_4 = PySequence_ITEM(__pyx_t_2, __pyx_t_6); __pyx_t_6++; if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 155, __pyx_L1_error)
-            __Pyx_GOTREF(__pyx_t_4);
-            #endif
-          } else {
-            if (__pyx_t_6 >= PyTuple_GET_SIZE(__pyx_t_2)) break;
-            #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-            __pyx_t_4 = PyTuple_GET_ITEM(__pyx_t_2, __pyx_t_6); __Pyx_INCREF(__pyx_t_4); __pyx_t_6++; if (unlikely(0 < 0)) __PYX_ERR(0, 155, __pyx_L1_error)
-            #else
-            __pyx_t_4 = PySequence_ITEM(__pyx_t_2, __pyx_t_6); __pyx_t_6++; if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 155, __pyx_L1_error)
-            __Pyx_GOTREF(__pyx_t_4);
-            #endif
-          }
-        } else {
-          __pyx_t_4 = __pyx_t_9(__pyx_t_2);
-          if (unlikely(!__pyx_t_4)) {
-            PyObject* exc_type = PyErr_Occurred();
-            if (exc_type) {
-              if (likely(__Pyx_PyErr_GivenExceptionMatches(exc_type, PyExc_StopIteration))) PyErr_Clear();
-              else __PYX_ERR(0, 155, __pyx_L1_error)
-            }
-            break;
-          }
-          __Pyx_GOTREF(__pyx_t_4);
-        }
-        __Pyx_XDECREF_SET(__pyx_v_sub_data, __pyx_t_4);
-        __pyx_t_4 = 0;
-
-        /* "tardis_msg_counter.pyx":156
- *         elif type(line_data) is list:
- *             for sub_data in line_data:
- *                 num_file_msgs += 1             # <<<<<<<<<<<<<<
- * 
- *     return num_file_msgs
- */
-        __pyx_v_num_file_msgs = (__pyx_v_num_file_msgs + 1);
-
-        /* "tardis_msg_counter.pyx":155
- * 
- *         elif type(line_data) is list:
- *             for sub_data in line_data:             # <<<<<<<<<<<<<<
- *                 num_file_msgs += 1
- * 
- */
-      }
-      __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-
-      /* "tardis_msg_counter.pyx":154
- *             num_file_msgs += 1
- * 
- *         elif type(line_data) is list:             # <<<<<<<<<<<<<<
- *             for sub_data in line_data:
- *                 num_file_msgs += 1
- */
-    }
-    __pyx_L16:;
-
-    /* "tardis_msg_counter.pyx":111
- *     lines = json_str.split('\n')
- * 
- *     for l in lines:             # <<<<<<<<<<<<<<
- * 
- *         if len(l)==0:
- */
-    __pyx_L3_continue:;
-  }
-  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-
-  /* "tardis_msg_counter.pyx":158
- *                 num_file_msgs += 1
- * 
- *     return num_file_msgs             # <<<<<<<<<<<<<<
- * 
- * 
- */
-  __Pyx_XDECREF(__pyx_r);
-  __pyx_t_1 = __Pyx_PyInt_From_int(__pyx_v_num_file_msgs); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 158, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_1);
-  __pyx_r = __pyx_t_1;
-  __pyx_t_1 = 0;
-  goto __pyx_L0;
-
-  /* "tardis_msg_counter.pyx":97
- * 
- * 
- * def c_tardis_count_trade_msgs_cache_file(file_path):             # <<<<<<<<<<<<<<
- *     """
- *     Return number of Tardis trade messages in a .gz file
- */
-
-  /* function exit code */
-  __pyx_L1_error:;
-  __Pyx_XDECREF(__pyx_t_1);
-  __Pyx_XDECREF(__pyx_t_2);
-  __Pyx_XDECREF(__pyx_t_3);
-  __Pyx_XDECREF(__pyx_t_4);
-  __Pyx_XDECREF(__pyx_t_10);
-  __Pyx_AddTraceback("tardis_msg_counter.c_tardis_count_trade_msgs_cache_file", __pyx_clineno, __pyx_lineno, __pyx_filename);
-  __pyx_r = NULL;
-  __pyx_L0:;
-  __Pyx_XDECREF(__pyx_v_lines);
-  __Pyx_XDECREF(__pyx_v_json_str);
-  __Pyx_XDECREF(__pyx_v_json_bytes);
-  __Pyx_XDECREF(__pyx_v_l);
-  __Pyx_XDECREF(__pyx_v_line_data);
-  __Pyx_XDECREF(__pyx_v_loaded_line);
-  __Pyx_XDECREF(__pyx_v_sub_data);
-  __Pyx_XDECREF(__pyx_v_sub_line);
-  __Pyx_XGIVEREF(__pyx_r);
-  __Pyx_RefNannyFinishContext();
-  return __pyx_r;
-}
-
-/* "tardis_msg_counter.pyx":161
- * 
- * 
- * def c_tardis_count_trade_msgs_cache_dir(dir_path):             # <<<<<<<<<<<<<<
- *     """
- *     Return number of Tardis trade messages in a directory
- */
-
-/* Python wrapper */
-static PyObject *__pyx_pw_18tardis_msg_counter_12c_tardis_count_trade_msgs_cache_dir(PyObject *__pyx_self, PyObject *__pyx_v_dir_path); /*proto*/
-static char __pyx_doc_18tardis_msg_counter_11c_tardis_count_trade_msgs_cache_dir[] = "\n    Return number of Tardis trade messages in a directory \n    which contains Tardis cached .gz files \n    ";
-static PyMethodDef __pyx_mdef_18tardis_msg_counter_12c_tardis_count_trade_msgs_cache_dir = {"c_tardis_count_trade_msgs_cache_dir", (PyCFunction)__pyx_pw_18tardis_msg_counter_12c_tardis_count_trade_msgs_cache_dir, METH_O, __pyx_doc_18tardis_msg_counter_11c_tardis_count_trade_msgs_cache_dir};
-static PyObject *__pyx_pw_18tardis_msg_counter_12c_tardis_count_trade_msgs_cache_dir(PyObject *__pyx_self, PyObject *__pyx_v_dir_path) {
-  PyObject *__pyx_r = 0;
-  __Pyx_RefNannyDeclarations
-  __Pyx_RefNannySetupContext("c_tardis_count_trade_msgs_cache_dir (wrapper)", 0);
-  __pyx_r = __pyx_pf_18tardis_msg_counter_11c_tardis_count_trade_msgs_cache_dir(__pyx_self, ((PyObject *)__pyx_v_dir_path));
-
-  /* function exit code */
-  __Pyx_RefNannyFinishContext();
-  return __pyx_r;
-}
-
-static PyObject *__pyx_pf_18tardis_msg_counter_11c_tardis_count_trade_msgs_cache_dir(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_dir_path) {
-  int __pyx_v_num_dir_msgs;
-  int __pyx_v_num_file_msgs;
-  PyObject *__pyx_v_file_paths = 0;
-  PyObject *__pyx_v_file_path = NULL;
-  PyObject *__pyx_r = NULL;
-  __Pyx_RefNannyDeclarations
-  PyObject *__pyx_t_1 = NULL;
-  PyObject *__pyx_t_2 = NULL;
-  PyObject *__pyx_t_3 = NULL;
-  Py_ssize_t __pyx_t_4;
-  PyObject *__pyx_t_5 = NULL;
-  int __pyx_t_6;
-  int __pyx_t_7;
-  int __pyx_t_8;
-  int __pyx_lineno = 0;
-  const char *__pyx_filename = NULL;
-  int __pyx_clineno = 0;
-  __Pyx_RefNannySetupContext("c_tardis_count_trade_msgs_cache_dir", 0);
-
-  /* "tardis_msg_counter.pyx":167
- *     """
- * 
- *     cdef int num_dir_msgs = 0             # <<<<<<<<<<<<<<
- *     cdef int num_file_msgs = 0
- *     cdef list file_paths = []
- */
-  __pyx_v_num_dir_msgs = 0;
-
-  /* "tardis_msg_counter.pyx":168
- * 
- *     cdef int num_dir_msgs = 0
- *     cdef int num_file_msgs = 0             # <<<<<<<<<<<<<<
- *     cdef list file_paths = []
- * 
- */
-  __pyx_v_num_file_msgs = 0;
-
-  /* "tardis_msg_counter.pyx":169
- *     cdef int num_dir_msgs = 0
- *     cdef int num_file_msgs = 0
- *     cdef list file_paths = []             # <<<<<<<<<<<<<<
- * 
- *     file_paths = ret_all_subdir_file_paths(dir_path)
- */
-  __pyx_t_1 = PyList_New(0); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 169, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_1);
-  __pyx_v_file_paths = ((PyObject*)__pyx_t_1);
-  __pyx_t_1 = 0;
-
-  /* "tardis_msg_counter.pyx":171
- *     cdef list file_paths = []
- * 
- *     file_paths = ret_all_subdir_file_paths(dir_path)             # <<<<<<<<<<<<<<
- * 
- *     for file_path in file_paths:
- */
-  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_ret_all_subdir_file_paths); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 171, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_2);
-  __pyx_t_3 = NULL;
-  if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_2))) {
-    __pyx_t_3 = PyMethod_GET_SELF(__pyx_t_2);
-    if (likely(__pyx_t_3)) {
-      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_2);
-      __Pyx_INCREF(__pyx_t_3);
-      __Pyx_INCREF(function);
-      __Pyx_DECREF_SET(__pyx_t_2, function);
-    }
-  }
-  __pyx_t_1 = (__pyx_t_3) ? __Pyx_PyObject_Call2Args(__pyx_t_2, __pyx_t_3, __pyx_v_dir_path) : __Pyx_PyObject_CallOneArg(__pyx_t_2, __pyx_v_dir_path);
-  __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
-  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 171, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_1);
-  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-  if (!(likely(PyList_CheckExact(__pyx_t_1))||((__pyx_t_1) == Py_None)||(PyErr_Format(PyExc_TypeError, "Expected %.16s, got %.200s", "list", Py_TYPE(__pyx_t_1)->tp_name), 0))) __PYX_ERR(0, 171, __pyx_L1_error)
-  __Pyx_DECREF_SET(__pyx_v_file_paths, ((PyObject*)__pyx_t_1));
-  __pyx_t_1 = 0;
-
-  /* "tardis_msg_counter.pyx":173
- *     file_paths = ret_all_subdir_file_paths(dir_path)
- * 
- *     for file_path in file_paths:             # <<<<<<<<<<<<<<
- *         if not(str(file_path).endswith('.json.gz')):
- *             continue
- */
-  if (unlikely(__pyx_v_file_paths == Py_None)) {
-    PyErr_SetString(PyExc_TypeError, "'NoneType' object is not iterable");
-    __PYX_ERR(0, 173, __pyx_L1_error)
-  }
-  __pyx_t_1 = __pyx_v_file_paths; __Pyx_INCREF(__pyx_t_1); __pyx_t_4 = 0;
-  for (;;) {
-    if (__pyx_t_4 >= PyList_GET_SIZE(__pyx_t_1)) break;
-    #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-    __pyx_t_2 = PyList_GET_ITEM(__pyx_t_1, __pyx_t_4); __Pyx_INCREF(__pyx_t_2); __pyx_t_4++; if (unlikely(0 < 0)) __PYX_ERR(0, 173, __pyx_L1_error)
-    #else
-    __pyx_t_2 = PySequence_ITEM(__pyx_t_1, __pyx_t_4); __pyx_t_4++; if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 173, __pyx_L1_error)
-    __Pyx_GOTREF(__pyx_t_2);
-    #endif
-    __Pyx_XDECREF_SET(__pyx_v_file_path, __pyx_t_2);
-    __pyx_t_2 = 0;
-
-    /* "tardis_msg_counter.pyx":174
- * 
- *     for file_path in file_paths:
- *         if not(str(file_path).endswith('.json.gz')):             # <<<<<<<<<<<<<<
- *             continue
- *         num_file_msgs = c_tardis_count_trade_msgs_cache_file(file_path)
- */
-    __pyx_t_3 = __Pyx_PyObject_CallOneArg(((PyObject *)(&PyString_Type)), __pyx_v_file_path); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 174, __pyx_L1_error)
-    __Pyx_GOTREF(__pyx_t_3);
-    __pyx_t_5 = __Pyx_PyObject_GetAttrStr(__pyx_t_3, __pyx_n_s_endswith); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 174, __pyx_L1_error)
-    __Pyx_GOTREF(__pyx_t_5);
-    __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-    __pyx_t_3 = NULL;
-    if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_5))) {
-      __pyx_t_3 = PyMethod_GET_SELF(__pyx_t_5);
-      if (likely(__pyx_t_3)) {
-        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_5);
-        __Pyx_INCREF(__pyx_t_3);
-        __Pyx_INCREF(function);
-        __Pyx_DECREF_SET(__pyx_t_5, function);
-      }
-    }
-    __pyx_t_2 = (__pyx_t_3) ? __Pyx_PyObject_Call2Args(__pyx_t_5, __pyx_t_3, __pyx_kp_s_json_gz) : __Pyx_PyObject_CallOneArg(__pyx_t_5, __pyx_kp_s_json_gz);
-    __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
-    if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 174, __pyx_L1_error)
-    __Pyx_GOTREF(__pyx_t_2);
-    __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
-    __pyx_t_6 = __Pyx_PyObject_IsTrue(__pyx_t_2); if (unlikely(__pyx_t_6 < 0)) __PYX_ERR(0, 174, __pyx_L1_error)
-    __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-    __pyx_t_7 = ((!__pyx_t_6) != 0);
-    if (__pyx_t_7) {
-
-      /* "tardis_msg_counter.pyx":175
- *     for file_path in file_paths:
- *         if not(str(file_path).endswith('.json.gz')):
- *             continue             # <<<<<<<<<<<<<<
- *         num_file_msgs = c_tardis_count_trade_msgs_cache_file(file_path)
- *         num_dir_msgs += num_file_msgs
- */
-      goto __pyx_L3_continue;
-
-      /* "tardis_msg_counter.pyx":174
- * 
- *     for file_path in file_paths:
- *         if not(str(file_path).endswith('.json.gz')):             # <<<<<<<<<<<<<<
- *             continue
- *         num_file_msgs = c_tardis_count_trade_msgs_cache_file(file_path)
- */
-    }
-
-    /* "tardis_msg_counter.pyx":176
- *         if not(str(file_path).endswith('.json.gz')):
- *             continue
- *         num_file_msgs = c_tardis_count_trade_msgs_cache_file(file_path)             # <<<<<<<<<<<<<<
- *         num_dir_msgs += num_file_msgs
- * 
- */
-    __Pyx_GetModuleGlobalName(__pyx_t_5, __pyx_n_s_c_tardis_count_trade_msgs_cache); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 176, __pyx_L1_error)
-    __Pyx_GOTREF(__pyx_t_5);
-    __pyx_t_3 = NULL;
-    if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_5))) {
-      __pyx_t_3 = PyMethod_GET_SELF(__pyx_t_5);
-      if (likely(__pyx_t_3)) {
-        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_5);
-        __Pyx_INCREF(__pyx_t_3);
-        __Pyx_INCREF(function);
-        __Pyx_DECREF_SET(__pyx_t_5, function);
-      }
-    }
-    __pyx_t_2 = (__pyx_t_3) ? __Pyx_PyObject_Call2Args(__pyx_t_5, __pyx_t_3, __pyx_v_file_path) : __Pyx_PyObject_CallOneArg(__pyx_t_5, __pyx_v_file_path);
-    __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
-    if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 176, __pyx_L1_error)
-    __Pyx_GOTREF(__pyx_t_2);
-    __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
-    __pyx_t_8 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_8 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 176, __pyx_L1_error)
-    __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-    __pyx_v_num_file_msgs = __pyx_t_8;
-
-    /* "tardis_msg_counter.pyx":177
- *             continue
- *         num_file_msgs = c_tardis_count_trade_msgs_cache_file(file_path)
- *         num_dir_msgs += num_file_msgs             # <<<<<<<<<<<<<<
- * 
- *     return num_dir_msgs
- */
-    __pyx_v_num_dir_msgs = (__pyx_v_num_dir_msgs + __pyx_v_num_file_msgs);
-
-    /* "tardis_msg_counter.pyx":173
- *     file_paths = ret_all_subdir_file_paths(dir_path)
- * 
- *     for file_path in file_paths:             # <<<<<<<<<<<<<<
- *         if not(str(file_path).endswith('.json.gz')):
- *             continue
- */
-    __pyx_L3_continue:;
+  if (p->__pyx_v_extractor) {
+    e = (*v)(p->__pyx_v_extractor, a); if (e) return e;
   }
-  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-
-  /* "tardis_msg_counter.pyx":179
- *         num_dir_msgs += num_file_msgs
- * 
- *     return num_dir_msgs             # <<<<<<<<<<<<<<
- */
-  __Pyx_XDECREF(__pyx_r);
-  __pyx_t_1 = __Pyx_PyInt_From_int(__pyx_v_num_dir_msgs); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 179, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_1);
-  __pyx_r = __pyx_t_1;
-  __pyx_t_1 = 0;
-  goto __pyx_L0;
-
-  /* "tardis_msg_counter.pyx":161
- * 
- * 
- * def c_tardis_count_trade_msgs_cache_dir(dir_path):             # <<<<<<<<<<<<<<
- *     """
- *     Return number of Tardis trade messages in a directory
- */
-
-  /* function exit code */
-  __pyx_L1_error:;
-  __Pyx_XDECREF(__pyx_t_1);
-  __Pyx_XDECREF(__pyx_t_2);
-  __Pyx_XDECREF(__pyx_t_3);
-  __Pyx_XDECREF(__pyx_t_5);
-  __Pyx_AddTraceback("tardis_msg_counter.c_tardis_count_trade_msgs_cache_dir", __pyx_clineno, __pyx_lineno, __pyx_filename);
-  __pyx_r = NULL;
-  __pyx_L0:;
-  __Pyx_XDECREF(__pyx_v_file_paths);
-  __Pyx_XDECREF(__pyx_v_file_path);
-  __Pyx_XGIVEREF(__pyx_r);
-  __Pyx_RefNannyFinishContext();
-  return __pyx_r;
-}
-
-static struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs *__pyx_freelist_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs[8];
-static int __pyx_freecount_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs = 0;
-
-static PyObject *__pyx_tp_new_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs(PyTypeObject *t, CYTHON_UNUSED PyObject *a, CYTHON_UNUSED PyObject *k) {
-  PyObject *o;
-  if (CYTHON_COMPILING_IN_CPYTHON && likely((__pyx_freecount_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs > 0) & (t->tp_basicsize == sizeof(struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs)))) {
-    o = (PyObject*)__pyx_freelist_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs[--__pyx_freecount_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs];
-    memset(o, 0, sizeof(struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs));
-    (void) PyObject_INIT(o, t);
-    PyObject_GC_Track(o);
-  } else {
-    o = (*t->tp_alloc)(t, 0);
-    if (unlikely(!o)) return 0;
-  }
-  return o;
-}
-
-static void __pyx_tp_dealloc_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs(PyObject *o) {
-  struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs *p = (struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs *)o;
-  PyObject_GC_UnTrack(o);
-  Py_CLEAR(p->__pyx_v_local_timestamp);
-  Py_CLEAR(p->__pyx_v_log);
-  Py_CLEAR(p->__pyx_v_message);
-  Py_CLEAR(p->__pyx_v_msg_data);
-  Py_CLEAR(p->__pyx_v_msg_gen);
-  Py_CLEAR(p->__pyx_v_sub_dict);
-  Py_CLEAR(p->__pyx_v_t1);
-  Py_CLEAR(p->__pyx_v_t2);
-  Py_CLEAR(p->__pyx_t_0);
-  if (CYTHON_COMPILING_IN_CPYTHON && ((__pyx_freecount_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs < 8) & (Py_TYPE(o)->tp_basicsize == sizeof(struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs)))) {
-    __pyx_freelist_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs[__pyx_freecount_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs++] = ((struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs *)o);
-  } else {
-    (*Py_TYPE(o)->tp_free)(o);
-  }
-}
-
-static int __pyx_tp_traverse_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs(PyObject *o, visitproc v, void *a) {
-  int e;
-  struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs *p = (struct __pyx_obj_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs *)o;
   if (p->__pyx_v_local_timestamp) {
     e = (*v)(p->__pyx_v_local_timestamp, a); if (e) return e;
   }
@@ -4788,15 +2685,9 @@ static int __pyx_tp_traverse_18tardis_msg_counter___pyx_scope_struct__c_tardis_c
   if (p->__pyx_v_message) {
     e = (*v)(p->__pyx_v_message, a); if (e) return e;
   }
-  if (p->__pyx_v_msg_data) {
-    e = (*v)(p->__pyx_v_msg_data, a); if (e) return e;
-  }
   if (p->__pyx_v_msg_gen) {
     e = (*v)(p->__pyx_v_msg_gen, a); if (e) return e;
   }
-  if (p->__pyx_v_sub_dict) {
-    e = (*v)(p->__pyx_v_sub_dict, a); if (e) return e;
-  }
   if (p->__pyx_v_t1) {
     e = (*v)(p->__pyx_v_t1, a); if (e) return e;
   }
@@ -4925,9 +2816,7 @@ static struct PyModuleDef __pyx_moduledef = {
 
 static __Pyx_StringTabEntry __pyx_string_tab[] = {
   {&__pyx_kp_s_Counting_and_Caching_All_Tardis, __pyx_k_Counting_and_Caching_All_Tardis, sizeof(__pyx_k_Counting_and_Caching_All_Tardis), 0, 0, 1, 0},
-  {&__pyx_n_s_ValueError, __pyx_k_ValueError, sizeof(__pyx_k_ValueError), 0, 0, 1, 1},
-  {&__pyx_kp_s__2, __pyx_k__2, sizeof(__pyx_k__2), 0, 0, 1, 0},
-  {&__pyx_kp_s__4, __pyx_k__4, sizeof(__pyx_k__4), 0, 0, 1, 0},
+  {&__pyx_n_s_add, __pyx_k_add, sizeof(__pyx_k_add), 0, 0, 1, 1},
   {&__pyx_n_s_aiter, __pyx_k_aiter, sizeof(__pyx_k_aiter), 0, 0, 1, 1},
   {&__pyx_n_s_all_paths, __pyx_k_all_paths, sizeof(__pyx_k_all_paths), 0, 0, 1, 1},
   {&__pyx_n_s_anext, __pyx_k_anext, sizeof(__pyx_k_anext), 0, 0, 1, 1},
@@ -4937,185 +2826,102 @@ static __Pyx_StringTabEntry __pyx_string_tab[] = {
   {&__pyx_n_s_asyncio_tasks, __pyx_k_asyncio_tasks, sizeof(__pyx_k_asyncio_tasks), 0, 0, 1, 1},
   {&__pyx_n_s_await, __pyx_k_await, sizeof(__pyx_k_await), 0, 0, 1, 1},
   {&__pyx_n_s_c_tardis_count_and_save_async_ge, __pyx_k_c_tardis_count_and_save_async_ge, sizeof(__pyx_k_c_tardis_count_and_save_async_ge), 0, 0, 1, 1},
-  {&__pyx_n_s_c_tardis_count_trade_msgs_cache, __pyx_k_c_tardis_count_trade_msgs_cache, sizeof(__pyx_k_c_tardis_count_trade_msgs_cache), 0, 0, 1, 1},
-  {&__pyx_n_s_c_tardis_count_trade_msgs_cache_2, __pyx_k_c_tardis_count_trade_msgs_cache_2, sizeof(__pyx_k_c_tardis_count_trade_msgs_cache_2), 0, 0, 1, 1},
+  {&__pyx_n_s_cache_and_count, __pyx_k_cache_and_count, sizeof(__pyx_k_cache_and_count), 0, 0, 1, 1},
   {&__pyx_n_s_cline_in_traceback, __pyx_k_cline_in_traceback, sizeof(__pyx_k_cline_in_traceback), 0, 0, 1, 1},
   {&__pyx_n_s_close, __pyx_k_close, sizeof(__pyx_k_close), 0, 0, 1, 1},
-  {&__pyx_n_s_data, __pyx_k_data, sizeof(__pyx_k_data), 0, 0, 1, 1},
-  {&__pyx_n_s_decode, __pyx_k_decode, sizeof(__pyx_k_decode), 0, 0, 1, 1},
-  {&__pyx_n_s_dir_path, __pyx_k_dir_path, sizeof(__pyx_k_dir_path), 0, 0, 1, 1},
+  {&__pyx_n_s_count, __pyx_k_count, sizeof(__pyx_k_count), 0, 0, 1, 1},
+  {&__pyx_n_s_count_skipped, __pyx_k_count_skipped, sizeof(__pyx_k_count_skipped), 0, 0, 1, 1},
   {&__pyx_n_s_dirs, __pyx_k_dirs, sizeof(__pyx_k_dirs), 0, 0, 1, 1},
   {&__pyx_n_s_end, __pyx_k_end, sizeof(__pyx_k_end), 0, 0, 1, 1},
-  {&__pyx_n_s_endswith, __pyx_k_endswith, sizeof(__pyx_k_endswith), 0, 0, 1, 1},
-  {&__pyx_n_s_enter, __pyx_k_enter, sizeof(__pyx_k_enter), 0, 0, 1, 1},
-  {&__pyx_n_s_exit, __pyx_k_exit, sizeof(__pyx_k_exit), 0, 0, 1, 1},
+  {&__pyx_n_s_exch, __pyx_k_exch, sizeof(__pyx_k_exch), 0, 0, 1, 1},
+  {&__pyx_n_s_extractor, __pyx_k_extractor, sizeof(__pyx_k_extractor), 0, 0, 1, 1},
   {&__pyx_n_s_file, __pyx_k_file, sizeof(__pyx_k_file), 0, 0, 1, 1},
-  {&__pyx_n_s_file_path, __pyx_k_file_path, sizeof(__pyx_k_file_path), 0, 0, 1, 1},
-  {&__pyx_n_s_file_paths, __pyx_k_file_paths, sizeof(__pyx_k_file_paths), 0, 0, 1, 1},
   {&__pyx_n_s_files, __pyx_k_files, sizeof(__pyx_k_files), 0, 0, 1, 1},
-  {&__pyx_n_s_find, __pyx_k_find, sizeof(__pyx_k_find), 0, 0, 1, 1},
-  {&__pyx_n_s_gzip, __pyx_k_gzip, sizeof(__pyx_k_gzip), 0, 0, 1, 1},
   {&__pyx_n_s_import, __pyx_k_import, sizeof(__pyx_k_import), 0, 0, 1, 1},
   {&__pyx_n_s_inspect, __pyx_k_inspect, sizeof(__pyx_k_inspect), 0, 0, 1, 1},
   {&__pyx_n_s_join, __pyx_k_join, sizeof(__pyx_k_join), 0, 0, 1, 1},
-  {&__pyx_n_s_json, __pyx_k_json, sizeof(__pyx_k_json), 0, 0, 1, 1},
-  {&__pyx_n_s_json_bytes, __pyx_k_json_bytes, sizeof(__pyx_k_json_bytes), 0, 0, 1, 1},
-  {&__pyx_kp_s_json_gz, __pyx_k_json_gz, sizeof(__pyx_k_json_gz), 0, 0, 1, 0},
-  {&__pyx_n_s_json_str, __pyx_k_json_str, sizeof(__pyx_k_json_str), 0, 0, 1, 1},
-  {&__pyx_n_s_l, __pyx_k_l, sizeof(__pyx_k_l), 0, 0, 1, 1},
+  {&__pyx_n_s_json_helpers, __pyx_k_json_helpers, sizeof(__pyx_k_json_helpers), 0, 0, 1, 1},
   {&__pyx_n_s_line, __pyx_k_line, sizeof(__pyx_k_line), 0, 0, 1, 1},
-  {&__pyx_n_s_line_data, __pyx_k_line_data, sizeof(__pyx_k_line_data), 0, 0, 1, 1},
-  {&__pyx_n_s_lines, __pyx_k_lines, sizeof(__pyx_k_lines), 0, 0, 1, 1},
-  {&__pyx_n_s_loaded_line, __pyx_k_loaded_line, sizeof(__pyx_k_loaded_line), 0, 0, 1, 1},
-  {&__pyx_n_s_loads, __pyx_k_loads, sizeof(__pyx_k_loads), 0, 0, 1, 1},
   {&__pyx_n_s_local_timestamp, __pyx_k_local_timestamp, sizeof(__pyx_k_local_timestamp), 0, 0, 1, 1},
   {&__pyx_n_s_log, __pyx_k_log, sizeof(__pyx_k_log), 0, 0, 1, 1},
   {&__pyx_n_s_main, __pyx_k_main, sizeof(__pyx_k_main), 0, 0, 1, 1},
-  {&__pyx_n_s_match, __pyx_k_match, sizeof(__pyx_k_match), 0, 0, 1, 1},
   {&__pyx_n_s_message, __pyx_k_message, sizeof(__pyx_k_message), 0, 0, 1, 1},
-  {&__pyx_n_s_misc, __pyx_k_misc, sizeof(__pyx_k_misc), 0, 0, 1, 1},
-  {&__pyx_n_s_msg_data, __pyx_k_msg_data, sizeof(__pyx_k_msg_data), 0, 0, 1, 1},
   {&__pyx_n_s_msg_gen, __pyx_k_msg_gen, sizeof(__pyx_k_msg_gen), 0, 0, 1, 1},
+  {&__pyx_n_s_msgs, __pyx_k_msgs, sizeof(__pyx_k_msgs), 0, 0, 1, 1},
   {&__pyx_n_s_name, __pyx_k_name, sizeof(__pyx_k_name), 0, 0, 1, 1},
   {&__pyx_n_s_np, __pyx_k_np, sizeof(__pyx_k_np), 0, 0, 1, 1},
-  {&__pyx_n_s_num_dir_msgs, __pyx_k_num_dir_msgs, sizeof(__pyx_k_num_dir_msgs), 0, 0, 1, 1},
-  {&__pyx_n_s_num_file_msgs, __pyx_k_num_file_msgs, sizeof(__pyx_k_num_file_msgs), 0, 0, 1, 1},
+  {&__pyx_n_s_num_line_msgs, __pyx_k_num_line_msgs, sizeof(__pyx_k_num_line_msgs), 0, 0, 1, 1},
+  {&__pyx_n_s_num_lines, __pyx_k_num_lines, sizeof(__pyx_k_num_lines), 0, 0, 1, 1},
   {&__pyx_n_s_num_msgs, __pyx_k_num_msgs, sizeof(__pyx_k_num_msgs), 0, 0, 1, 1},
   {&__pyx_n_s_numpy, __pyx_k_numpy, sizeof(__pyx_k_numpy), 0, 0, 1, 1},
-  {&__pyx_n_s_open, __pyx_k_open, sizeof(__pyx_k_open), 0, 0, 1, 1},
-  {&__pyx_n_s_orderType, __pyx_k_orderType, sizeof(__pyx_k_orderType), 0, 0, 1, 1},
   {&__pyx_n_s_os, __pyx_k_os, sizeof(__pyx_k_os), 0, 0, 1, 1},
-  {&__pyx_n_s_params, __pyx_k_params, sizeof(__pyx_k_params), 0, 0, 1, 1},
   {&__pyx_n_s_parse_msg_line, __pyx_k_parse_msg_line, sizeof(__pyx_k_parse_msg_line), 0, 0, 1, 1},
-  {&__pyx_n_s_parsed_line, __pyx_k_parsed_line, sizeof(__pyx_k_parsed_line), 0, 0, 1, 1},
   {&__pyx_n_s_path, __pyx_k_path, sizeof(__pyx_k_path), 0, 0, 1, 1},
-  {&__pyx_n_s_price, __pyx_k_price, sizeof(__pyx_k_price), 0, 0, 1, 1},
   {&__pyx_n_s_print, __pyx_k_print, sizeof(__pyx_k_print), 0, 0, 1, 1},
-  {&__pyx_n_s_r, __pyx_k_r, sizeof(__pyx_k_r), 0, 0, 1, 1},
-  {&__pyx_n_s_read, __pyx_k_read, sizeof(__pyx_k_read), 0, 0, 1, 1},
-  {&__pyx_n_s_read_gzip_file, __pyx_k_read_gzip_file, sizeof(__pyx_k_read_gzip_file), 0, 0, 1, 1},
   {&__pyx_n_s_ret_all_subdir_file_paths, __pyx_k_ret_all_subdir_file_paths, sizeof(__pyx_k_ret_all_subdir_file_paths), 0, 0, 1, 1},
+  {&__pyx_n_s_ret_metrics, __pyx_k_ret_metrics, sizeof(__pyx_k_ret_metrics), 0, 0, 1, 1},
+  {&__pyx_n_s_ret_trade_extractor, __pyx_k_ret_trade_extractor, sizeof(__pyx_k_ret_trade_extractor), 0, 0, 1, 1},
   {&__pyx_n_s_root_dir, __pyx_k_root_dir, sizeof(__pyx_k_root_dir), 0, 0, 1, 1},
   {&__pyx_n_s_round, __pyx_k_round, sizeof(__pyx_k_round), 0, 0, 1, 1},
+  {&__pyx_n_s_rows, __pyx_k_rows, sizeof(__pyx_k_rows), 0, 0, 1, 1},
   {&__pyx_kp_s_sec, __pyx_k_sec, sizeof(__pyx_k_sec), 0, 0, 1, 0},
   {&__pyx_n_s_send, __pyx_k_send, sizeof(__pyx_k_send), 0, 0, 1, 1},
-  {&__pyx_n_s_side, __pyx_k_side, sizeof(__pyx_k_side), 0, 0, 1, 1},
-  {&__pyx_n_s_split, __pyx_k_split, sizeof(__pyx_k_split), 0, 0, 1, 1},
-  {&__pyx_n_s_sub_data, __pyx_k_sub_data, sizeof(__pyx_k_sub_data), 0, 0, 1, 1},
-  {&__pyx_n_s_sub_dict, __pyx_k_sub_dict, sizeof(__pyx_k_sub_dict), 0, 0, 1, 1},
-  {&__pyx_n_s_sub_line, __pyx_k_sub_line, sizeof(__pyx_k_sub_line), 0, 0, 1, 1},
   {&__pyx_n_s_subdir, __pyx_k_subdir, sizeof(__pyx_k_subdir), 0, 0, 1, 1},
-  {&__pyx_n_s_symbol, __pyx_k_symbol, sizeof(__pyx_k_symbol), 0, 0, 1, 1},
   {&__pyx_n_s_t1, __pyx_k_t1, sizeof(__pyx_k_t1), 0, 0, 1, 1},
   {&__pyx_n_s_t2, __pyx_k_t2, sizeof(__pyx_k_t2), 0, 0, 1, 1},
+  {&__pyx_n_s_tardis_metrics, __pyx_k_tardis_metrics, sizeof(__pyx_k_tardis_metrics), 0, 0, 1, 1},
   {&__pyx_n_s_tardis_msg_counter, __pyx_k_tardis_msg_counter, sizeof(__pyx_k_tardis_msg_counter), 0, 0, 1, 1},
   {&__pyx_kp_s_tardis_msg_counter_pyx, __pyx_k_tardis_msg_counter_pyx, sizeof(__pyx_k_tardis_msg_counter_pyx), 0, 0, 1, 0},
+  {&__pyx_n_s_tardis_trade_extractors, __pyx_k_tardis_trade_extractors, sizeof(__pyx_k_tardis_trade_extractors), 0, 0, 1, 1},
   {&__pyx_n_s_test, __pyx_k_test, sizeof(__pyx_k_test), 0, 0, 1, 1},
   {&__pyx_n_s_throw, __pyx_k_throw, sizeof(__pyx_k_throw), 0, 0, 1, 1},
-  {&__pyx_n_s_tick, __pyx_k_tick, sizeof(__pyx_k_tick), 0, 0, 1, 1},
   {&__pyx_n_s_time, __pyx_k_time, sizeof(__pyx_k_time), 0, 0, 1, 1},
-  {&__pyx_n_s_trade, __pyx_k_trade, sizeof(__pyx_k_trade), 0, 0, 1, 1},
-  {&__pyx_n_s_type, __pyx_k_type, sizeof(__pyx_k_type), 0, 0, 1, 1},
-  {&__pyx_n_s_ujson, __pyx_k_ujson, sizeof(__pyx_k_ujson), 0, 0, 1, 1},
-  {&__pyx_kp_s_utf_8, __pyx_k_utf_8, sizeof(__pyx_k_utf_8), 0, 0, 1, 0},
-  {&__pyx_n_s_volume, __pyx_k_volume, sizeof(__pyx_k_volume), 0, 0, 1, 1},
   {&__pyx_n_s_walk, __pyx_k_walk, sizeof(__pyx_k_walk), 0, 0, 1, 1},
-  {&__pyx_n_s_z, __pyx_k_z, sizeof(__pyx_k_z), 0, 0, 1, 1},
   {0, 0, 0, 0, 0, 0, 0}
 };
 static CYTHON_SMALL_CODE int __Pyx_InitCachedBuiltins(void) {
-  __pyx_builtin_ValueError = __Pyx_GetBuiltinName(__pyx_n_s_ValueError); if (!__pyx_builtin_ValueError) __PYX_ERR(0, 17, __pyx_L1_error)
   return 0;
-  __pyx_L1_error:;
-  return -1;
 }
 
 static CYTHON_SMALL_CODE int __Pyx_InitCachedConstants(void) {
   __Pyx_RefNannyDeclarations
   __Pyx_RefNannySetupContext("__Pyx_InitCachedConstants", 0);
 
-  /* "tardis_msg_counter.pyx":10
- * 
- * def read_gzip_file(file_path):
- *     with gzip.open(file_path, "r") as z:             # <<<<<<<<<<<<<<
- *         json_bytes = z.read()
- *     return json_bytes
- */
-  __pyx_tuple_ = PyTuple_Pack(3, Py_None, Py_None, Py_None); if (unlikely(!__pyx_tuple_)) __PYX_ERR(0, 10, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple_);
-  __Pyx_GIVEREF(__pyx_tuple_);
-
-  /* "tardis_msg_counter.pyx":9
- * import time
- * 
- * def read_gzip_file(file_path):             # <<<<<<<<<<<<<<
- *     with gzip.open(file_path, "r") as z:
- *         json_bytes = z.read()
- */
-  __pyx_tuple__5 = PyTuple_Pack(3, __pyx_n_s_file_path, __pyx_n_s_z, __pyx_n_s_json_bytes); if (unlikely(!__pyx_tuple__5)) __PYX_ERR(0, 9, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__5);
-  __Pyx_GIVEREF(__pyx_tuple__5);
-  __pyx_codeobj__6 = (PyObject*)__Pyx_PyCode_New(1, 0, 3, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__5, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_tardis_msg_counter_pyx, __pyx_n_s_read_gzip_file, 9, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__6)) __PYX_ERR(0, 9, __pyx_L1_error)
-
-  /* "tardis_msg_counter.pyx":14
- *     return json_bytes
+  /* "tardis_msg_counter.pyx":13
+ * from tardis_metrics import ret_metrics
  * 
  * def parse_msg_line(line):             # <<<<<<<<<<<<<<
- *     try:
- *         parsed_line = ujson.loads(line[line.find(' ')+1:])
+ *     return json_helpers.parse_msg_line(line)
+ * 
  */
-  __pyx_tuple__7 = PyTuple_Pack(2, __pyx_n_s_line, __pyx_n_s_parsed_line); if (unlikely(!__pyx_tuple__7)) __PYX_ERR(0, 14, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__7);
-  __Pyx_GIVEREF(__pyx_tuple__7);
-  __pyx_codeobj__8 = (PyObject*)__Pyx_PyCode_New(1, 0, 2, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__7, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_tardis_msg_counter_pyx, __pyx_n_s_parse_msg_line, 14, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__8)) __PYX_ERR(0, 14, __pyx_L1_error)
+  __pyx_tuple__2 = PyTuple_Pack(1, __pyx_n_s_line); if (unlikely(!__pyx_tuple__2)) __PYX_ERR(0, 13, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__2);
+  __Pyx_GIVEREF(__pyx_tuple__2);
+  __pyx_codeobj__3 = (PyObject*)__Pyx_PyCode_New(1, 0, 1, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__2, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_tardis_msg_counter_pyx, __pyx_n_s_parse_msg_line, 13, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__3)) __PYX_ERR(0, 13, __pyx_L1_error)
 
-  /* "tardis_msg_counter.pyx":21
- *     return parsed_line
+  /* "tardis_msg_counter.pyx":16
+ *     return json_helpers.parse_msg_line(line)
  * 
  * def ret_all_subdir_file_paths(root_dir):             # <<<<<<<<<<<<<<
  *     """
  *     Return list of full paths of all files in all sub dirs of a root dir
  */
-  __pyx_tuple__9 = PyTuple_Pack(6, __pyx_n_s_root_dir, __pyx_n_s_all_paths, __pyx_n_s_subdir, __pyx_n_s_dirs, __pyx_n_s_files, __pyx_n_s_file); if (unlikely(!__pyx_tuple__9)) __PYX_ERR(0, 21, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__9);
-  __Pyx_GIVEREF(__pyx_tuple__9);
-  __pyx_codeobj__10 = (PyObject*)__Pyx_PyCode_New(1, 0, 6, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__9, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_tardis_msg_counter_pyx, __pyx_n_s_ret_all_subdir_file_paths, 21, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__10)) __PYX_ERR(0, 21, __pyx_L1_error)
+  __pyx_tuple__4 = PyTuple_Pack(6, __pyx_n_s_root_dir, __pyx_n_s_all_paths, __pyx_n_s_subdir, __pyx_n_s_dirs, __pyx_n_s_files, __pyx_n_s_file); if (unlikely(!__pyx_tuple__4)) __PYX_ERR(0, 16, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__4);
+  __Pyx_GIVEREF(__pyx_tuple__4);
+  __pyx_codeobj__5 = (PyObject*)__Pyx_PyCode_New(1, 0, 6, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__4, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_tardis_msg_counter_pyx, __pyx_n_s_ret_all_subdir_file_paths, 16, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__5)) __PYX_ERR(0, 16, __pyx_L1_error)
 
-  /* "tardis_msg_counter.pyx":31
+  /* "tardis_msg_counter.pyx":26
  *     return all_paths
  * 
- * async def c_tardis_count_and_save_async_gen_msgs(msg_gen, log=True):             # <<<<<<<<<<<<<<
+ * async def c_tardis_count_and_save_async_gen_msgs(msg_gen, exch, log=True):             # <<<<<<<<<<<<<<
  *     """
  *     Tardis Python API returns an async_generator.
  */
-  __pyx_tuple__11 = PyTuple_Pack(9, __pyx_n_s_msg_gen, __pyx_n_s_log, __pyx_n_s_t1, __pyx_n_s_num_msgs, __pyx_n_s_local_timestamp, __pyx_n_s_message, __pyx_n_s_msg_data, __pyx_n_s_sub_dict, __pyx_n_s_t2); if (unlikely(!__pyx_tuple__11)) __PYX_ERR(0, 31, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__11);
-  __Pyx_GIVEREF(__pyx_tuple__11);
-  __pyx_codeobj__3 = (PyObject*)__Pyx_PyCode_New(2, 0, 9, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__11, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_tardis_msg_counter_pyx, __pyx_n_s_c_tardis_count_and_save_async_ge, 31, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__3)) __PYX_ERR(0, 31, __pyx_L1_error)
-
-  /* "tardis_msg_counter.pyx":97
- * 
- * 
- * def c_tardis_count_trade_msgs_cache_file(file_path):             # <<<<<<<<<<<<<<
- *     """
- *     Return number of Tardis trade messages in a .gz file
- */
-  __pyx_tuple__12 = PyTuple_Pack(10, __pyx_n_s_file_path, __pyx_n_s_lines, __pyx_n_s_json_str, __pyx_n_s_num_file_msgs, __pyx_n_s_json_bytes, __pyx_n_s_l, __pyx_n_s_line_data, __pyx_n_s_loaded_line, __pyx_n_s_sub_data, __pyx_n_s_sub_line); if (unlikely(!__pyx_tuple__12)) __PYX_ERR(0, 97, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__12);
-  __Pyx_GIVEREF(__pyx_tuple__12);
-  __pyx_codeobj__13 = (PyObject*)__Pyx_PyCode_New(1, 0, 10, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__12, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_tardis_msg_counter_pyx, __pyx_n_s_c_tardis_count_trade_msgs_cache, 97, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__13)) __PYX_ERR(0, 97, __pyx_L1_error)
-
-  /* "tardis_msg_counter.pyx":161
- * 
- * 
- * def c_tardis_count_trade_msgs_cache_dir(dir_path):             # <<<<<<<<<<<<<<
- *     """
- *     Return number of Tardis trade messages in a directory
- */
-  __pyx_tuple__14 = PyTuple_Pack(5, __pyx_n_s_dir_path, __pyx_n_s_num_dir_msgs, __pyx_n_s_num_file_msgs, __pyx_n_s_file_paths, __pyx_n_s_file_path); if (unlikely(!__pyx_tuple__14)) __PYX_ERR(0, 161, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__14);
-  __Pyx_GIVEREF(__pyx_tuple__14);
-  __pyx_codeobj__15 = (PyObject*)__Pyx_PyCode_New(1, 0, 5, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__14, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_tardis_msg_counter_pyx, __pyx_n_s_c_tardis_count_trade_msgs_cache_2, 161, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__15)) __PYX_ERR(0, 161, __pyx_L1_error)
+  __pyx_tuple__6 = PyTuple_Pack(12, __pyx_n_s_msg_gen, __pyx_n_s_exch, __pyx_n_s_log, __pyx_n_s_t1, __pyx_n_s_num_msgs, __pyx_n_s_num_lines, __pyx_n_s_num_line_msgs, __pyx_n_s_extractor, __pyx_n_s_count, __pyx_n_s_local_timestamp, __pyx_n_s_message, __pyx_n_s_t2); if (unlikely(!__pyx_tuple__6)) __PYX_ERR(0, 26, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__6);
+  __Pyx_GIVEREF(__pyx_tuple__6);
+  __pyx_codeobj_ = (PyObject*)__Pyx_PyCode_New(3, 0, 12, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__6, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_tardis_msg_counter_pyx, __pyx_n_s_c_tardis_count_and_save_async_ge, 26, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj_)) __PYX_ERR(0, 26, __pyx_L1_error)
   __Pyx_RefNannyFinishContext();
   return 0;
   __pyx_L1_error:;
@@ -5124,9 +2930,7 @@ static CYTHON_SMALL_CODE int __Pyx_InitCachedConstants(void) {
 }
 
 static CYTHON_SMALL_CODE int __Pyx_InitGlobals(void) {
-  __pyx_umethod_PyString_Type_split.type = (PyObject*)&PyString_Type;
   if (__Pyx_InitStrings(__pyx_string_tab) < 0) __PYX_ERR(0, 1, __pyx_L1_error);
-  __pyx_int_1 = PyInt_FromLong(1); if (unlikely(!__pyx_int_1)) __PYX_ERR(0, 1, __pyx_L1_error)
   __pyx_int_3 = PyInt_FromLong(3); if (unlikely(!__pyx_int_3)) __PYX_ERR(0, 1, __pyx_L1_error)
   return 0;
   __pyx_L1_error:;
@@ -5172,7 +2976,7 @@ static int __Pyx_modinit_type_init_code(void) {
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("__Pyx_modinit_type_init_code", 0);
   /*--- Type init code ---*/
-  if (PyType_Ready(&__pyx_type_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs) < 0) __PYX_ERR(0, 31, __pyx_L1_error)
+  if (PyType_Ready(&__pyx_type_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs) < 0) __PYX_ERR(0, 26, __pyx_L1_error)
   #if PY_VERSION_HEX < 0x030800B1
   __pyx_type_18tardis_msg_counter___pyx_scope_struct__c_tardis_count_and_save_async_gen_msgs.tp_print = 0;
   #endif
@@ -5306,6 +3110,7 @@ static CYTHON_SMALL_CODE int __pyx_pymod_exec_tardis_msg_counter(PyObject *__pyx
 #endif
 {
   PyObject *__pyx_t_1 = NULL;
+  PyObject *__pyx_t_2 = NULL;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
@@ -5425,7 +3230,7 @@ if (!__Pyx_RefNanny) {
  * import numpy as np
  * import asyncio             # <<<<<<<<<<<<<<
  * import os
- * import json
+ * import time
  */
   __pyx_t_1 = __Pyx_patch_asyncio(__Pyx_Import(__pyx_n_s_asyncio, 0, -1)); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 2, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
@@ -5436,8 +3241,8 @@ if (!__Pyx_RefNanny) {
  * import numpy as np
  * import asyncio
  * import os             # <<<<<<<<<<<<<<
- * import json
- * import ujson
+ * import time
+ * 
  */
   __pyx_t_1 = __Pyx_Import(__pyx_n_s_os, 0, -1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 3, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
@@ -5447,121 +3252,103 @@ if (!__Pyx_RefNanny) {
   /* "tardis_msg_counter.pyx":4
  * import asyncio
  * import os
- * import json             # <<<<<<<<<<<<<<
- * import ujson
- * import gzip
+ * import time             # <<<<<<<<<<<<<<
+ * 
+ * # shared (pluggable) JSON decoder
  */
-  __pyx_t_1 = __Pyx_Import(__pyx_n_s_json, 0, -1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 4, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_Import(__pyx_n_s_time, 0, -1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 4, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_json, __pyx_t_1) < 0) __PYX_ERR(0, 4, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_time, __pyx_t_1) < 0) __PYX_ERR(0, 4, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
-  /* "tardis_msg_counter.pyx":5
- * import os
- * import json
- * import ujson             # <<<<<<<<<<<<<<
- * import gzip
- * import time
+  /* "tardis_msg_counter.pyx":7
+ * 
+ * # shared (pluggable) JSON decoder
+ * import json_helpers             # <<<<<<<<<<<<<<
+ * # per-exchange trade message shapes
+ * from tardis_trade_extractors import ret_trade_extractor
  */
-  __pyx_t_1 = __Pyx_Import(__pyx_n_s_ujson, 0, -1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 5, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_Import(__pyx_n_s_json_helpers, 0, -1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 7, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_ujson, __pyx_t_1) < 0) __PYX_ERR(0, 5, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_json_helpers, __pyx_t_1) < 0) __PYX_ERR(0, 7, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
-  /* "tardis_msg_counter.pyx":6
- * import json
- * import ujson
- * import gzip             # <<<<<<<<<<<<<<
- * import time
- * 
+  /* "tardis_msg_counter.pyx":9
+ * import json_helpers
+ * # per-exchange trade message shapes
+ * from tardis_trade_extractors import ret_trade_extractor             # <<<<<<<<<<<<<<
+ * # run metrics (stage timings, skipped messages)
+ * from tardis_metrics import ret_metrics
  */
-  __pyx_t_1 = __Pyx_Import(__pyx_n_s_gzip, 0, -1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 6, __pyx_L1_error)
+  __pyx_t_1 = PyList_New(1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 9, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_gzip, __pyx_t_1) < 0) __PYX_ERR(0, 6, __pyx_L1_error)
+  __Pyx_INCREF(__pyx_n_s_ret_trade_extractor);
+  __Pyx_GIVEREF(__pyx_n_s_ret_trade_extractor);
+  PyList_SET_ITEM(__pyx_t_1, 0, __pyx_n_s_ret_trade_extractor);
+  __pyx_t_2 = __Pyx_Import(__pyx_n_s_tardis_trade_extractors, __pyx_t_1, -1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 9, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-
-  /* "tardis_msg_counter.pyx":7
- * import ujson
- * import gzip
- * import time             # <<<<<<<<<<<<<<
- * 
- * def read_gzip_file(file_path):
- */
-  __pyx_t_1 = __Pyx_Import(__pyx_n_s_time, 0, -1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 7, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_ImportFrom(__pyx_t_2, __pyx_n_s_ret_trade_extractor); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 9, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_time, __pyx_t_1) < 0) __PYX_ERR(0, 7, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_ret_trade_extractor, __pyx_t_1) < 0) __PYX_ERR(0, 9, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
 
-  /* "tardis_msg_counter.pyx":9
- * import time
+  /* "tardis_msg_counter.pyx":11
+ * from tardis_trade_extractors import ret_trade_extractor
+ * # run metrics (stage timings, skipped messages)
+ * from tardis_metrics import ret_metrics             # <<<<<<<<<<<<<<
  * 
- * def read_gzip_file(file_path):             # <<<<<<<<<<<<<<
- *     with gzip.open(file_path, "r") as z:
- *         json_bytes = z.read()
+ * def parse_msg_line(line):
  */
-  __pyx_t_1 = PyCFunction_NewEx(&__pyx_mdef_18tardis_msg_counter_1read_gzip_file, NULL, __pyx_n_s_tardis_msg_counter); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 9, __pyx_L1_error)
+  __pyx_t_2 = PyList_New(1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 11, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __Pyx_INCREF(__pyx_n_s_ret_metrics);
+  __Pyx_GIVEREF(__pyx_n_s_ret_metrics);
+  PyList_SET_ITEM(__pyx_t_2, 0, __pyx_n_s_ret_metrics);
+  __pyx_t_1 = __Pyx_Import(__pyx_n_s_tardis_metrics, __pyx_t_2, -1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 11, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_read_gzip_file, __pyx_t_1) < 0) __PYX_ERR(0, 9, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_t_2 = __Pyx_ImportFrom(__pyx_t_1, __pyx_n_s_ret_metrics); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 11, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_ret_metrics, __pyx_t_2) < 0) __PYX_ERR(0, 11, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
-  /* "tardis_msg_counter.pyx":14
- *     return json_bytes
+  /* "tardis_msg_counter.pyx":13
+ * from tardis_metrics import ret_metrics
  * 
  * def parse_msg_line(line):             # <<<<<<<<<<<<<<
- *     try:
- *         parsed_line = ujson.loads(line[line.find(' ')+1:])
+ *     return json_helpers.parse_msg_line(line)
+ * 
  */
-  __pyx_t_1 = PyCFunction_NewEx(&__pyx_mdef_18tardis_msg_counter_3parse_msg_line, NULL, __pyx_n_s_tardis_msg_counter); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 14, __pyx_L1_error)
+  __pyx_t_1 = PyCFunction_NewEx(&__pyx_mdef_18tardis_msg_counter_1parse_msg_line, NULL, __pyx_n_s_tardis_msg_counter); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 13, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_parse_msg_line, __pyx_t_1) < 0) __PYX_ERR(0, 14, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_parse_msg_line, __pyx_t_1) < 0) __PYX_ERR(0, 13, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
-  /* "tardis_msg_counter.pyx":21
- *     return parsed_line
+  /* "tardis_msg_counter.pyx":16
+ *     return json_helpers.parse_msg_line(line)
  * 
  * def ret_all_subdir_file_paths(root_dir):             # <<<<<<<<<<<<<<
  *     """
  *     Return list of full paths of all files in all sub dirs of a root dir
  */
-  __pyx_t_1 = PyCFunction_NewEx(&__pyx_mdef_18tardis_msg_counter_5ret_all_subdir_file_paths, NULL, __pyx_n_s_tardis_msg_counter); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 21, __pyx_L1_error)
+  __pyx_t_1 = PyCFunction_NewEx(&__pyx_mdef_18tardis_msg_counter_3ret_all_subdir_file_paths, NULL, __pyx_n_s_tardis_msg_counter); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 16, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_ret_all_subdir_file_paths, __pyx_t_1) < 0) __PYX_ERR(0, 21, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_ret_all_subdir_file_paths, __pyx_t_1) < 0) __PYX_ERR(0, 16, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
-  /* "tardis_msg_counter.pyx":31
+  /* "tardis_msg_counter.pyx":26
  *     return all_paths
  * 
- * async def c_tardis_count_and_save_async_gen_msgs(msg_gen, log=True):             # <<<<<<<<<<<<<<
+ * async def c_tardis_count_and_save_async_gen_msgs(msg_gen, exch, log=True):             # <<<<<<<<<<<<<<
  *     """
  *     Tardis Python API returns an async_generator.
  */
-  __pyx_t_1 = PyCFunction_NewEx(&__pyx_mdef_18tardis_msg_counter_7c_tardis_count_and_save_async_gen_msgs, NULL, __pyx_n_s_tardis_msg_counter); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 31, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_1);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_c_tardis_count_and_save_async_ge, __pyx_t_1) < 0) __PYX_ERR(0, 31, __pyx_L1_error)
-  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-
-  /* "tardis_msg_counter.pyx":97
- * 
- * 
- * def c_tardis_count_trade_msgs_cache_file(file_path):             # <<<<<<<<<<<<<<
- *     """
- *     Return number of Tardis trade messages in a .gz file
- */
-  __pyx_t_1 = PyCFunction_NewEx(&__pyx_mdef_18tardis_msg_counter_10c_tardis_count_trade_msgs_cache_file, NULL, __pyx_n_s_tardis_msg_counter); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 97, __pyx_L1_error)
+  __pyx_t_1 = PyCFunction_NewEx(&__pyx_mdef_18tardis_msg_counter_5c_tardis_count_and_save_async_gen_msgs, NULL, __pyx_n_s_tardis_msg_counter); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 26, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_c_tardis_count_trade_msgs_cache, __pyx_t_1) < 0) __PYX_ERR(0, 97, __pyx_L1_error)
-  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-
-  /* "tardis_msg_counter.pyx":161
- * 
- * 
- * def c_tardis_count_trade_msgs_cache_dir(dir_path):             # <<<<<<<<<<<<<<
- *     """
- *     Return number of Tardis trade messages in a directory
- */
-  __pyx_t_1 = PyCFunction_NewEx(&__pyx_mdef_18tardis_msg_counter_12c_tardis_count_trade_msgs_cache_dir, NULL, __pyx_n_s_tardis_msg_counter); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 161, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_1);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_c_tardis_count_trade_msgs_cache_2, __pyx_t_1) < 0) __PYX_ERR(0, 161, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_c_tardis_count_and_save_async_ge, __pyx_t_1) < 0) __PYX_ERR(0, 26, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
   /* "tardis_msg_counter.pyx":1
@@ -5579,6 +3366,7 @@ if (!__Pyx_RefNanny) {
   goto __pyx_L0;
   __pyx_L1_error:;
   __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_XDECREF(__pyx_t_2);
   if (__pyx_m) {
     if (__pyx_d) {
       __Pyx_AddTraceback("init tardis_msg_counter", __pyx_clineno, __pyx_lineno, __pyx_filename);
@@ -5700,10 +3488,33 @@ static CYTHON_INLINE PyObject *__Pyx__GetModuleGlobalName(PyObject *name)
     if (likely(result)) {
         return __Pyx_NewRef(result);
     }
-    PyErr_Clear();
-#endif
-    return __Pyx_GetBuiltinName(name);
+    PyErr_Clear();
+#endif
+    return __Pyx_GetBuiltinName(name);
+}
+
+/* PyCFunctionFastCall */
+#if CYTHON_FAST_PYCCALL
+static CYTHON_INLINE PyObject * __Pyx_PyCFunction_FastCall(PyObject *func_obj, PyObject **args, Py_ssize_t nargs) {
+    PyCFunctionObject *func = (PyCFunctionObject*)func_obj;
+    PyCFunction meth = PyCFunction_GET_FUNCTION(func);
+    PyObject *self = PyCFunction_GET_SELF(func);
+    int flags = PyCFunction_GET_FLAGS(func);
+    assert(PyCFunction_Check(func));
+    assert(METH_FASTCALL == (flags & ~(METH_CLASS | METH_STATIC | METH_COEXIST | METH_KEYWORDS | METH_STACKLESS)));
+    assert(nargs >= 0);
+    assert(nargs == 0 || args != NULL);
+    /* _PyCFunction_FastCallDict() must not be called with an exception set,
+       because it may clear it (directly or indirectly) and so the
+       caller loses its exception */
+    assert(!PyErr_Occurred());
+    if ((PY_VERSION_HEX < 0x030700A0) || unlikely(flags & METH_KEYWORDS)) {
+        return (*((__Pyx_PyCFunctionFastWithKeywords)(void*)meth)) (self, args, nargs, NULL);
+    } else {
+        return (*((__Pyx_PyCFunctionFast)(void*)meth)) (self, args, nargs);
+    }
 }
+#endif
 
 /* PyFunctionFastCall */
 #if CYTHON_FAST_PYCALL
@@ -5781,454 +3592,66 @@ static PyObject *__Pyx_PyFunction_FastCallDict(PyObject *func, PyObject **args,
             goto done;
         }
         k = &PyTuple_GET_ITEM(kwtuple, 0);
-        pos = i = 0;
-        while (PyDict_Next(kwargs, &pos, &k[i], &k[i+1])) {
-            Py_INCREF(k[i]);
-            Py_INCREF(k[i+1]);
-            i += 2;
-        }
-        nk = i / 2;
-    }
-    else {
-        kwtuple = NULL;
-        k = NULL;
-    }
-    closure = PyFunction_GET_CLOSURE(func);
-#if PY_MAJOR_VERSION >= 3
-    kwdefs = PyFunction_GET_KW_DEFAULTS(func);
-#endif
-    if (argdefs != NULL) {
-        d = &PyTuple_GET_ITEM(argdefs, 0);
-        nd = Py_SIZE(argdefs);
-    }
-    else {
-        d = NULL;
-        nd = 0;
-    }
-#if PY_MAJOR_VERSION >= 3
-    result = PyEval_EvalCodeEx((PyObject*)co, globals, (PyObject *)NULL,
-                               args, (int)nargs,
-                               k, (int)nk,
-                               d, (int)nd, kwdefs, closure);
-#else
-    result = PyEval_EvalCodeEx(co, globals, (PyObject *)NULL,
-                               args, (int)nargs,
-                               k, (int)nk,
-                               d, (int)nd, closure);
-#endif
-    Py_XDECREF(kwtuple);
-done:
-    Py_LeaveRecursiveCall();
-    return result;
-}
-#endif
-#endif
-
-/* PyCFunctionFastCall */
-#if CYTHON_FAST_PYCCALL
-static CYTHON_INLINE PyObject * __Pyx_PyCFunction_FastCall(PyObject *func_obj, PyObject **args, Py_ssize_t nargs) {
-    PyCFunctionObject *func = (PyCFunctionObject*)func_obj;
-    PyCFunction meth = PyCFunction_GET_FUNCTION(func);
-    PyObject *self = PyCFunction_GET_SELF(func);
-    int flags = PyCFunction_GET_FLAGS(func);
-    assert(PyCFunction_Check(func));
-    assert(METH_FASTCALL == (flags & ~(METH_CLASS | METH_STATIC | METH_COEXIST | METH_KEYWORDS | METH_STACKLESS)));
-    assert(nargs >= 0);
-    assert(nargs == 0 || args != NULL);
-    /* _PyCFunction_FastCallDict() must not be called with an exception set,
-       because it may clear it (directly or indirectly) and so the
-       caller loses its exception */
-    assert(!PyErr_Occurred());
-    if ((PY_VERSION_HEX < 0x030700A0) || unlikely(flags & METH_KEYWORDS)) {
-        return (*((__Pyx_PyCFunctionFastWithKeywords)(void*)meth)) (self, args, nargs, NULL);
-    } else {
-        return (*((__Pyx_PyCFunctionFast)(void*)meth)) (self, args, nargs);
-    }
-}
-#endif
-
-/* PyObjectCall */
-#if CYTHON_COMPILING_IN_CPYTHON
-static CYTHON_INLINE PyObject* __Pyx_PyObject_Call(PyObject *func, PyObject *arg, PyObject *kw) {
-    PyObject *result;
-    ternaryfunc call = Py_TYPE(func)->tp_call;
-    if (unlikely(!call))
-        return PyObject_Call(func, arg, kw);
-    if (unlikely(Py_EnterRecursiveCall((char*)" while calling a Python object")))
-        return NULL;
-    result = (*call)(func, arg, kw);
-    Py_LeaveRecursiveCall();
-    if (unlikely(!result) && unlikely(!PyErr_Occurred())) {
-        PyErr_SetString(
-            PyExc_SystemError,
-            "NULL result without error in PyObject_Call");
-    }
-    return result;
-}
-#endif
-
-/* PyObjectCallMethO */
-#if CYTHON_COMPILING_IN_CPYTHON
-static CYTHON_INLINE PyObject* __Pyx_PyObject_CallMethO(PyObject *func, PyObject *arg) {
-    PyObject *self, *result;
-    PyCFunction cfunc;
-    cfunc = PyCFunction_GET_FUNCTION(func);
-    self = PyCFunction_GET_SELF(func);
-    if (unlikely(Py_EnterRecursiveCall((char*)" while calling a Python object")))
-        return NULL;
-    result = cfunc(self, arg);
-    Py_LeaveRecursiveCall();
-    if (unlikely(!result) && unlikely(!PyErr_Occurred())) {
-        PyErr_SetString(
-            PyExc_SystemError,
-            "NULL result without error in PyObject_Call");
-    }
-    return result;
-}
-#endif
-
-/* PyObjectCallNoArg */
-#if CYTHON_COMPILING_IN_CPYTHON
-static CYTHON_INLINE PyObject* __Pyx_PyObject_CallNoArg(PyObject *func) {
-#if CYTHON_FAST_PYCALL
-    if (PyFunction_Check(func)) {
-        return __Pyx_PyFunction_FastCall(func, NULL, 0);
-    }
-#endif
-#ifdef __Pyx_CyFunction_USED
-    if (likely(PyCFunction_Check(func) || __Pyx_CyFunction_Check(func)))
-#else
-    if (likely(PyCFunction_Check(func)))
-#endif
-    {
-        if (likely(PyCFunction_GET_FLAGS(func) & METH_NOARGS)) {
-            return __Pyx_PyObject_CallMethO(func, NULL);
-        }
-    }
-    return __Pyx_PyObject_Call(func, __pyx_empty_tuple, NULL);
-}
-#endif
-
-/* PyObjectCallOneArg */
-#if CYTHON_COMPILING_IN_CPYTHON
-static PyObject* __Pyx__PyObject_CallOneArg(PyObject *func, PyObject *arg) {
-    PyObject *result;
-    PyObject *args = PyTuple_New(1);
-    if (unlikely(!args)) return NULL;
-    Py_INCREF(arg);
-    PyTuple_SET_ITEM(args, 0, arg);
-    result = __Pyx_PyObject_Call(func, args, NULL);
-    Py_DECREF(args);
-    return result;
-}
-static CYTHON_INLINE PyObject* __Pyx_PyObject_CallOneArg(PyObject *func, PyObject *arg) {
-#if CYTHON_FAST_PYCALL
-    if (PyFunction_Check(func)) {
-        return __Pyx_PyFunction_FastCall(func, &arg, 1);
-    }
-#endif
-    if (likely(PyCFunction_Check(func))) {
-        if (likely(PyCFunction_GET_FLAGS(func) & METH_O)) {
-            return __Pyx_PyObject_CallMethO(func, arg);
-#if CYTHON_FAST_PYCCALL
-        } else if (__Pyx_PyFastCFunction_Check(func)) {
-            return __Pyx_PyCFunction_FastCall(func, &arg, 1);
-#endif
-        }
-    }
-    return __Pyx__PyObject_CallOneArg(func, arg);
-}
-#else
-static CYTHON_INLINE PyObject* __Pyx_PyObject_CallOneArg(PyObject *func, PyObject *arg) {
-    PyObject *result;
-    PyObject *args = PyTuple_Pack(1, arg);
-    if (unlikely(!args)) return NULL;
-    result = __Pyx_PyObject_Call(func, args, NULL);
-    Py_DECREF(args);
-    return result;
-}
-#endif
-
-/* GetTopmostException */
-#if CYTHON_USE_EXC_INFO_STACK
-static _PyErr_StackItem *
-__Pyx_PyErr_GetTopmostException(PyThreadState *tstate)
-{
-    _PyErr_StackItem *exc_info = tstate->exc_info;
-    while ((exc_info->exc_type == NULL || exc_info->exc_type == Py_None) &&
-           exc_info->previous_item != NULL)
-    {
-        exc_info = exc_info->previous_item;
-    }
-    return exc_info;
-}
-#endif
-
-/* SaveResetException */
-#if CYTHON_FAST_THREAD_STATE
-static CYTHON_INLINE void __Pyx__ExceptionSave(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb) {
-    #if CYTHON_USE_EXC_INFO_STACK
-    _PyErr_StackItem *exc_info = __Pyx_PyErr_GetTopmostException(tstate);
-    *type = exc_info->exc_type;
-    *value = exc_info->exc_value;
-    *tb = exc_info->exc_traceback;
-    #else
-    *type = tstate->exc_type;
-    *value = tstate->exc_value;
-    *tb = tstate->exc_traceback;
-    #endif
-    Py_XINCREF(*type);
-    Py_XINCREF(*value);
-    Py_XINCREF(*tb);
-}
-static CYTHON_INLINE void __Pyx__ExceptionReset(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb) {
-    PyObject *tmp_type, *tmp_value, *tmp_tb;
-    #if CYTHON_USE_EXC_INFO_STACK
-    _PyErr_StackItem *exc_info = tstate->exc_info;
-    tmp_type = exc_info->exc_type;
-    tmp_value = exc_info->exc_value;
-    tmp_tb = exc_info->exc_traceback;
-    exc_info->exc_type = type;
-    exc_info->exc_value = value;
-    exc_info->exc_traceback = tb;
-    #else
-    tmp_type = tstate->exc_type;
-    tmp_value = tstate->exc_value;
-    tmp_tb = tstate->exc_traceback;
-    tstate->exc_type = type;
-    tstate->exc_value = value;
-    tstate->exc_traceback = tb;
-    #endif
-    Py_XDECREF(tmp_type);
-    Py_XDECREF(tmp_value);
-    Py_XDECREF(tmp_tb);
-}
-#endif
-
-/* GetException */
-#if CYTHON_FAST_THREAD_STATE
-static int __Pyx__GetException(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb)
-#else
-static int __Pyx_GetException(PyObject **type, PyObject **value, PyObject **tb)
-#endif
-{
-    PyObject *local_type, *local_value, *local_tb;
-#if CYTHON_FAST_THREAD_STATE
-    PyObject *tmp_type, *tmp_value, *tmp_tb;
-    local_type = tstate->curexc_type;
-    local_value = tstate->curexc_value;
-    local_tb = tstate->curexc_traceback;
-    tstate->curexc_type = 0;
-    tstate->curexc_value = 0;
-    tstate->curexc_traceback = 0;
-#else
-    PyErr_Fetch(&local_type, &local_value, &local_tb);
-#endif
-    PyErr_NormalizeException(&local_type, &local_value, &local_tb);
-#if CYTHON_FAST_THREAD_STATE
-    if (unlikely(tstate->curexc_type))
-#else
-    if (unlikely(PyErr_Occurred()))
+        pos = i = 0;
+        while (PyDict_Next(kwargs, &pos, &k[i], &k[i+1])) {
+            Py_INCREF(k[i]);
+            Py_INCREF(k[i+1]);
+            i += 2;
+        }
+        nk = i / 2;
+    }
+    else {
+        kwtuple = NULL;
+        k = NULL;
+    }
+    closure = PyFunction_GET_CLOSURE(func);
+#if PY_MAJOR_VERSION >= 3
+    kwdefs = PyFunction_GET_KW_DEFAULTS(func);
 #endif
-        goto bad;
-    #if PY_MAJOR_VERSION >= 3
-    if (local_tb) {
-        if (unlikely(PyException_SetTraceback(local_value, local_tb) < 0))
-            goto bad;
+    if (argdefs != NULL) {
+        d = &PyTuple_GET_ITEM(argdefs, 0);
+        nd = Py_SIZE(argdefs);
     }
-    #endif
-    Py_XINCREF(local_tb);
-    Py_XINCREF(local_type);
-    Py_XINCREF(local_value);
-    *type = local_type;
-    *value = local_value;
-    *tb = local_tb;
-#if CYTHON_FAST_THREAD_STATE
-    #if CYTHON_USE_EXC_INFO_STACK
-    {
-        _PyErr_StackItem *exc_info = tstate->exc_info;
-        tmp_type = exc_info->exc_type;
-        tmp_value = exc_info->exc_value;
-        tmp_tb = exc_info->exc_traceback;
-        exc_info->exc_type = local_type;
-        exc_info->exc_value = local_value;
-        exc_info->exc_traceback = local_tb;
+    else {
+        d = NULL;
+        nd = 0;
     }
-    #else
-    tmp_type = tstate->exc_type;
-    tmp_value = tstate->exc_value;
-    tmp_tb = tstate->exc_traceback;
-    tstate->exc_type = local_type;
-    tstate->exc_value = local_value;
-    tstate->exc_traceback = local_tb;
-    #endif
-    Py_XDECREF(tmp_type);
-    Py_XDECREF(tmp_value);
-    Py_XDECREF(tmp_tb);
+#if PY_MAJOR_VERSION >= 3
+    result = PyEval_EvalCodeEx((PyObject*)co, globals, (PyObject *)NULL,
+                               args, (int)nargs,
+                               k, (int)nk,
+                               d, (int)nd, kwdefs, closure);
 #else
-    PyErr_SetExcInfo(local_type, local_value, local_tb);
-#endif
-    return 0;
-bad:
-    *type = 0;
-    *value = 0;
-    *tb = 0;
-    Py_XDECREF(local_type);
-    Py_XDECREF(local_value);
-    Py_XDECREF(local_tb);
-    return -1;
-}
-
-/* PyErrFetchRestore */
-#if CYTHON_FAST_THREAD_STATE
-static CYTHON_INLINE void __Pyx_ErrRestoreInState(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb) {
-    PyObject *tmp_type, *tmp_value, *tmp_tb;
-    tmp_type = tstate->curexc_type;
-    tmp_value = tstate->curexc_value;
-    tmp_tb = tstate->curexc_traceback;
-    tstate->curexc_type = type;
-    tstate->curexc_value = value;
-    tstate->curexc_traceback = tb;
-    Py_XDECREF(tmp_type);
-    Py_XDECREF(tmp_value);
-    Py_XDECREF(tmp_tb);
-}
-static CYTHON_INLINE void __Pyx_ErrFetchInState(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb) {
-    *type = tstate->curexc_type;
-    *value = tstate->curexc_value;
-    *tb = tstate->curexc_traceback;
-    tstate->curexc_type = 0;
-    tstate->curexc_value = 0;
-    tstate->curexc_traceback = 0;
-}
+    result = PyEval_EvalCodeEx(co, globals, (PyObject *)NULL,
+                               args, (int)nargs,
+                               k, (int)nk,
+                               d, (int)nd, closure);
 #endif
-
-/* None */
-static CYTHON_INLINE void __Pyx_RaiseUnboundLocalError(const char *varname) {
-    PyErr_Format(PyExc_UnboundLocalError, "local variable '%s' referenced before assignment", varname);
+    Py_XDECREF(kwtuple);
+done:
+    Py_LeaveRecursiveCall();
+    return result;
 }
-
-/* PyIntBinop */
-#if !CYTHON_COMPILING_IN_PYPY
-static PyObject* __Pyx_PyInt_AddObjC(PyObject *op1, PyObject *op2, CYTHON_UNUSED long intval, int inplace, int zerodivision_check) {
-    (void)inplace;
-    (void)zerodivision_check;
-    #if PY_MAJOR_VERSION < 3
-    if (likely(PyInt_CheckExact(op1))) {
-        const long b = intval;
-        long x;
-        long a = PyInt_AS_LONG(op1);
-            x = (long)((unsigned long)a + b);
-            if (likely((x^a) >= 0 || (x^b) >= 0))
-                return PyInt_FromLong(x);
-            return PyLong_Type.tp_as_number->nb_add(op1, op2);
-    }
-    #endif
-    #if CYTHON_USE_PYLONG_INTERNALS
-    if (likely(PyLong_CheckExact(op1))) {
-        const long b = intval;
-        long a, x;
-#ifdef HAVE_LONG_LONG
-        const PY_LONG_LONG llb = intval;
-        PY_LONG_LONG lla, llx;
-#endif
-        const digit* digits = ((PyLongObject*)op1)->ob_digit;
-        const Py_ssize_t size = Py_SIZE(op1);
-        if (likely(__Pyx_sst_abs(size) <= 1)) {
-            a = likely(size) ? digits[0] : 0;
-            if (size == -1) a = -a;
-        } else {
-            switch (size) {
-                case -2:
-                    if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
-                        a = -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
-                        break;
-#ifdef HAVE_LONG_LONG
-                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 2 * PyLong_SHIFT) {
-                        lla = -(PY_LONG_LONG) (((((unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
-                        goto long_long;
-#endif
-                    }
-                    CYTHON_FALLTHROUGH;
-                case 2:
-                    if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
-                        a = (long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
-                        break;
-#ifdef HAVE_LONG_LONG
-                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 2 * PyLong_SHIFT) {
-                        lla = (PY_LONG_LONG) (((((unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
-                        goto long_long;
-#endif
-                    }
-                    CYTHON_FALLTHROUGH;
-                case -3:
-                    if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
-                        a = -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
-                        break;
-#ifdef HAVE_LONG_LONG
-                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 3 * PyLong_SHIFT) {
-                        lla = -(PY_LONG_LONG) (((((((unsigned PY_LONG_LONG)digits[2]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
-                        goto long_long;
-#endif
-                    }
-                    CYTHON_FALLTHROUGH;
-                case 3:
-                    if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
-                        a = (long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
-                        break;
-#ifdef HAVE_LONG_LONG
-                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 3 * PyLong_SHIFT) {
-                        lla = (PY_LONG_LONG) (((((((unsigned PY_LONG_LONG)digits[2]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
-                        goto long_long;
-#endif
-                    }
-                    CYTHON_FALLTHROUGH;
-                case -4:
-                    if (8 * sizeof(long) - 1 > 4 * PyLong_SHIFT) {
-                        a = -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
-                        break;
-#ifdef HAVE_LONG_LONG
-                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 4 * PyLong_SHIFT) {
-                        lla = -(PY_LONG_LONG) (((((((((unsigned PY_LONG_LONG)digits[3]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[2]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
-                        goto long_long;
 #endif
-                    }
-                    CYTHON_FALLTHROUGH;
-                case 4:
-                    if (8 * sizeof(long) - 1 > 4 * PyLong_SHIFT) {
-                        a = (long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
-                        break;
-#ifdef HAVE_LONG_LONG
-                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 4 * PyLong_SHIFT) {
-                        lla = (PY_LONG_LONG) (((((((((unsigned PY_LONG_LONG)digits[3]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[2]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
-                        goto long_long;
-#endif
-                    }
-                    CYTHON_FALLTHROUGH;
-                default: return PyLong_Type.tp_as_number->nb_add(op1, op2);
-            }
-        }
-                x = a + b;
-            return PyLong_FromLong(x);
-#ifdef HAVE_LONG_LONG
-        long_long:
-                llx = lla + llb;
-            return PyLong_FromLongLong(llx);
 #endif
-        
-        
-    }
-    #endif
-    if (PyFloat_CheckExact(op1)) {
-        const long b = intval;
-        double a = PyFloat_AS_DOUBLE(op1);
-            double result;
-            PyFPE_START_PROTECT("add", return NULL)
-            result = ((double)a) + (double)b;
-            PyFPE_END_PROTECT(result)
-            return PyFloat_FromDouble(result);
+
+/* PyObjectCall */
+#if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_PyObject_Call(PyObject *func, PyObject *arg, PyObject *kw) {
+    PyObject *result;
+    ternaryfunc call = Py_TYPE(func)->tp_call;
+    if (unlikely(!call))
+        return PyObject_Call(func, arg, kw);
+    if (unlikely(Py_EnterRecursiveCall((char*)" while calling a Python object")))
+        return NULL;
+    result = (*call)(func, arg, kw);
+    Py_LeaveRecursiveCall();
+    if (unlikely(!result) && unlikely(!PyErr_Occurred())) {
+        PyErr_SetString(
+            PyExc_SystemError,
+            "NULL result without error in PyObject_Call");
     }
-    return (inplace ? PyNumber_InPlaceAdd : PyNumber_Add)(op1, op2);
+    return result;
 }
 #endif
 
@@ -6261,125 +3684,63 @@ done:
     return result;
 }
 
-/* SliceObject */
-static CYTHON_INLINE PyObject* __Pyx_PyObject_GetSlice(PyObject* obj,
-        Py_ssize_t cstart, Py_ssize_t cstop,
-        PyObject** _py_start, PyObject** _py_stop, PyObject** _py_slice,
-        int has_cstart, int has_cstop, CYTHON_UNUSED int wraparound) {
-#if CYTHON_USE_TYPE_SLOTS
-    PyMappingMethods* mp;
-#if PY_MAJOR_VERSION < 3
-    PySequenceMethods* ms = Py_TYPE(obj)->tp_as_sequence;
-    if (likely(ms && ms->sq_slice)) {
-        if (!has_cstart) {
-            if (_py_start && (*_py_start != Py_None)) {
-                cstart = __Pyx_PyIndex_AsSsize_t(*_py_start);
-                if ((cstart == (Py_ssize_t)-1) && PyErr_Occurred()) goto bad;
-            } else
-                cstart = 0;
-        }
-        if (!has_cstop) {
-            if (_py_stop && (*_py_stop != Py_None)) {
-                cstop = __Pyx_PyIndex_AsSsize_t(*_py_stop);
-                if ((cstop == (Py_ssize_t)-1) && PyErr_Occurred()) goto bad;
-            } else
-                cstop = PY_SSIZE_T_MAX;
-        }
-        if (wraparound && unlikely((cstart < 0) | (cstop < 0)) && likely(ms->sq_length)) {
-            Py_ssize_t l = ms->sq_length(obj);
-            if (likely(l >= 0)) {
-                if (cstop < 0) {
-                    cstop += l;
-                    if (cstop < 0) cstop = 0;
-                }
-                if (cstart < 0) {
-                    cstart += l;
-                    if (cstart < 0) cstart = 0;
-                }
-            } else {
-                if (!PyErr_ExceptionMatches(PyExc_OverflowError))
-                    goto bad;
-                PyErr_Clear();
-            }
-        }
-        return ms->sq_slice(obj, cstart, cstop);
-    }
-#endif
-    mp = Py_TYPE(obj)->tp_as_mapping;
-    if (likely(mp && mp->mp_subscript))
-#endif
-    {
-        PyObject* result;
-        PyObject *py_slice, *py_start, *py_stop;
-        if (_py_slice) {
-            py_slice = *_py_slice;
-        } else {
-            PyObject* owned_start = NULL;
-            PyObject* owned_stop = NULL;
-            if (_py_start) {
-                py_start = *_py_start;
-            } else {
-                if (has_cstart) {
-                    owned_start = py_start = PyInt_FromSsize_t(cstart);
-                    if (unlikely(!py_start)) goto bad;
-                } else
-                    py_start = Py_None;
-            }
-            if (_py_stop) {
-                py_stop = *_py_stop;
-            } else {
-                if (has_cstop) {
-                    owned_stop = py_stop = PyInt_FromSsize_t(cstop);
-                    if (unlikely(!py_stop)) {
-                        Py_XDECREF(owned_start);
-                        goto bad;
-                    }
-                } else
-                    py_stop = Py_None;
-            }
-            py_slice = PySlice_New(py_start, py_stop, Py_None);
-            Py_XDECREF(owned_start);
-            Py_XDECREF(owned_stop);
-            if (unlikely(!py_slice)) goto bad;
-        }
-#if CYTHON_USE_TYPE_SLOTS
-        result = mp->mp_subscript(obj, py_slice);
-#else
-        result = PyObject_GetItem(obj, py_slice);
-#endif
-        if (!_py_slice) {
-            Py_DECREF(py_slice);
-        }
-        return result;
+/* PyObjectCallMethO */
+#if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallMethO(PyObject *func, PyObject *arg) {
+    PyObject *self, *result;
+    PyCFunction cfunc;
+    cfunc = PyCFunction_GET_FUNCTION(func);
+    self = PyCFunction_GET_SELF(func);
+    if (unlikely(Py_EnterRecursiveCall((char*)" while calling a Python object")))
+        return NULL;
+    result = cfunc(self, arg);
+    Py_LeaveRecursiveCall();
+    if (unlikely(!result) && unlikely(!PyErr_Occurred())) {
+        PyErr_SetString(
+            PyExc_SystemError,
+            "NULL result without error in PyObject_Call");
     }
-    PyErr_Format(PyExc_TypeError,
-        "'%.200s' object is unsliceable", Py_TYPE(obj)->tp_name);
-bad:
-    return NULL;
+    return result;
 }
+#endif
 
-/* PyErrExceptionMatches */
-#if CYTHON_FAST_THREAD_STATE
-static int __Pyx_PyErr_ExceptionMatchesTuple(PyObject *exc_type, PyObject *tuple) {
-    Py_ssize_t i, n;
-    n = PyTuple_GET_SIZE(tuple);
-#if PY_MAJOR_VERSION >= 3
-    for (i=0; i<n; i++) {
-        if (exc_type == PyTuple_GET_ITEM(tuple, i)) return 1;
+/* PyObjectCallOneArg */
+#if CYTHON_COMPILING_IN_CPYTHON
+static PyObject* __Pyx__PyObject_CallOneArg(PyObject *func, PyObject *arg) {
+    PyObject *result;
+    PyObject *args = PyTuple_New(1);
+    if (unlikely(!args)) return NULL;
+    Py_INCREF(arg);
+    PyTuple_SET_ITEM(args, 0, arg);
+    result = __Pyx_PyObject_Call(func, args, NULL);
+    Py_DECREF(args);
+    return result;
+}
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallOneArg(PyObject *func, PyObject *arg) {
+#if CYTHON_FAST_PYCALL
+    if (PyFunction_Check(func)) {
+        return __Pyx_PyFunction_FastCall(func, &arg, 1);
     }
 #endif
-    for (i=0; i<n; i++) {
-        if (__Pyx_PyErr_GivenExceptionMatches(exc_type, PyTuple_GET_ITEM(tuple, i))) return 1;
+    if (likely(PyCFunction_Check(func))) {
+        if (likely(PyCFunction_GET_FLAGS(func) & METH_O)) {
+            return __Pyx_PyObject_CallMethO(func, arg);
+#if CYTHON_FAST_PYCCALL
+        } else if (__Pyx_PyFastCFunction_Check(func)) {
+            return __Pyx_PyCFunction_FastCall(func, &arg, 1);
+#endif
+        }
     }
-    return 0;
+    return __Pyx__PyObject_CallOneArg(func, arg);
 }
-static CYTHON_INLINE int __Pyx_PyErr_ExceptionMatchesInState(PyThreadState* tstate, PyObject* err) {
-    PyObject *exc_type = tstate->curexc_type;
-    if (exc_type == err) return 1;
-    if (unlikely(!exc_type)) return 0;
-    if (unlikely(PyTuple_Check(err)))
-        return __Pyx_PyErr_ExceptionMatchesTuple(exc_type, err);
-    return __Pyx_PyErr_GivenExceptionMatches(exc_type, err);
+#else
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallOneArg(PyObject *func, PyObject *arg) {
+    PyObject *result;
+    PyObject *args = PyTuple_Pack(1, arg);
+    if (unlikely(!args)) return NULL;
+    result = __Pyx_PyObject_Call(func, args, NULL);
+    Py_DECREF(args);
+    return result;
 }
 #endif
 
@@ -6443,6 +3804,32 @@ static int __Pyx_IternextUnpackEndCheck(PyObject *retval, Py_ssize_t expected) {
     return 0;
 }
 
+/* RaiseArgTupleInvalid */
+static void __Pyx_RaiseArgtupleInvalid(
+    const char* func_name,
+    int exact,
+    Py_ssize_t num_min,
+    Py_ssize_t num_max,
+    Py_ssize_t num_found)
+{
+    Py_ssize_t num_expected;
+    const char *more_or_less;
+    if (num_found < num_min) {
+        num_expected = num_min;
+        more_or_less = "at least";
+    } else {
+        num_expected = num_max;
+        more_or_less = "at most";
+    }
+    if (exact) {
+        more_or_less = "exactly";
+    }
+    PyErr_Format(PyExc_TypeError,
+                 "%.200s() takes %.8s %" CYTHON_FORMAT_SSIZE_T "d positional argument%.1s (%" CYTHON_FORMAT_SSIZE_T "d given)",
+                 func_name, more_or_less, num_expected,
+                 (num_expected == 1) ? "" : "s", num_found);
+}
+
 /* RaiseDoubleKeywords */
 static void __Pyx_RaiseDoubleKeywordsError(
     const char* func_name,
@@ -6559,31 +3946,27 @@ bad:
     return -1;
 }
 
-/* RaiseArgTupleInvalid */
-static void __Pyx_RaiseArgtupleInvalid(
-    const char* func_name,
-    int exact,
-    Py_ssize_t num_min,
-    Py_ssize_t num_max,
-    Py_ssize_t num_found)
-{
-    Py_ssize_t num_expected;
-    const char *more_or_less;
-    if (num_found < num_min) {
-        num_expected = num_min;
-        more_or_less = "at least";
-    } else {
-        num_expected = num_max;
-        more_or_less = "at most";
+/* PyObjectCallNoArg */
+#if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallNoArg(PyObject *func) {
+#if CYTHON_FAST_PYCALL
+    if (PyFunction_Check(func)) {
+        return __Pyx_PyFunction_FastCall(func, NULL, 0);
     }
-    if (exact) {
-        more_or_less = "exactly";
+#endif
+#ifdef __Pyx_CyFunction_USED
+    if (likely(PyCFunction_Check(func) || __Pyx_CyFunction_Check(func)))
+#else
+    if (likely(PyCFunction_Check(func)))
+#endif
+    {
+        if (likely(PyCFunction_GET_FLAGS(func) & METH_NOARGS)) {
+            return __Pyx_PyObject_CallMethO(func, NULL);
+        }
     }
-    PyErr_Format(PyExc_TypeError,
-                 "%.200s() takes %.8s %" CYTHON_FORMAT_SSIZE_T "d positional argument%.1s (%" CYTHON_FORMAT_SSIZE_T "d given)",
-                 func_name, more_or_less, num_expected,
-                 (num_expected == 1) ? "" : "s", num_found);
+    return __Pyx_PyObject_Call(func, __pyx_empty_tuple, NULL);
 }
+#endif
 
 /* PyObjectGetMethod */
 static int __Pyx_PyObject_GetMethod(PyObject *obj, PyObject *name, PyObject **method) {
@@ -6904,6 +4287,30 @@ bad:
     goto done;
 }
 
+/* PyErrFetchRestore */
+#if CYTHON_FAST_THREAD_STATE
+static CYTHON_INLINE void __Pyx_ErrRestoreInState(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb) {
+    PyObject *tmp_type, *tmp_value, *tmp_tb;
+    tmp_type = tstate->curexc_type;
+    tmp_value = tstate->curexc_value;
+    tmp_tb = tstate->curexc_traceback;
+    tstate->curexc_type = type;
+    tstate->curexc_value = value;
+    tstate->curexc_traceback = tb;
+    Py_XDECREF(tmp_type);
+    Py_XDECREF(tmp_value);
+    Py_XDECREF(tmp_tb);
+}
+static CYTHON_INLINE void __Pyx_ErrFetchInState(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb) {
+    *type = tstate->curexc_type;
+    *value = tstate->curexc_value;
+    *tb = tstate->curexc_traceback;
+    tstate->curexc_type = 0;
+    tstate->curexc_value = 0;
+    tstate->curexc_traceback = 0;
+}
+#endif
+
 /* RaiseException */
 #if PY_MAJOR_VERSION < 3
 static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb,
@@ -7063,6 +4470,62 @@ bad:
 }
 #endif
 
+/* GetTopmostException */
+#if CYTHON_USE_EXC_INFO_STACK
+static _PyErr_StackItem *
+__Pyx_PyErr_GetTopmostException(PyThreadState *tstate)
+{
+    _PyErr_StackItem *exc_info = tstate->exc_info;
+    while ((exc_info->exc_type == NULL || exc_info->exc_type == Py_None) &&
+           exc_info->previous_item != NULL)
+    {
+        exc_info = exc_info->previous_item;
+    }
+    return exc_info;
+}
+#endif
+
+/* SaveResetException */
+#if CYTHON_FAST_THREAD_STATE
+static CYTHON_INLINE void __Pyx__ExceptionSave(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb) {
+    #if CYTHON_USE_EXC_INFO_STACK
+    _PyErr_StackItem *exc_info = __Pyx_PyErr_GetTopmostException(tstate);
+    *type = exc_info->exc_type;
+    *value = exc_info->exc_value;
+    *tb = exc_info->exc_traceback;
+    #else
+    *type = tstate->exc_type;
+    *value = tstate->exc_value;
+    *tb = tstate->exc_traceback;
+    #endif
+    Py_XINCREF(*type);
+    Py_XINCREF(*value);
+    Py_XINCREF(*tb);
+}
+static CYTHON_INLINE void __Pyx__ExceptionReset(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb) {
+    PyObject *tmp_type, *tmp_value, *tmp_tb;
+    #if CYTHON_USE_EXC_INFO_STACK
+    _PyErr_StackItem *exc_info = tstate->exc_info;
+    tmp_type = exc_info->exc_type;
+    tmp_value = exc_info->exc_value;
+    tmp_tb = exc_info->exc_traceback;
+    exc_info->exc_type = type;
+    exc_info->exc_value = value;
+    exc_info->exc_traceback = tb;
+    #else
+    tmp_type = tstate->exc_type;
+    tmp_value = tstate->exc_value;
+    tmp_tb = tstate->exc_traceback;
+    tstate->exc_type = type;
+    tstate->exc_value = value;
+    tstate->exc_traceback = tb;
+    #endif
+    Py_XDECREF(tmp_type);
+    Py_XDECREF(tmp_value);
+    Py_XDECREF(tmp_tb);
+}
+#endif
+
 /* SwapException */
 #if CYTHON_FAST_THREAD_STATE
 static CYTHON_INLINE void __Pyx__ExceptionSwap(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb) {
@@ -8433,266 +5896,6 @@ static int __pyx_StopAsyncIteration_init(void) {
     return 0;
 }
 
-/* DictGetItem */
-#if PY_MAJOR_VERSION >= 3 && !CYTHON_COMPILING_IN_PYPY
-static PyObject *__Pyx_PyDict_GetItem(PyObject *d, PyObject* key) {
-    PyObject *value;
-    value = PyDict_GetItemWithError(d, key);
-    if (unlikely(!value)) {
-        if (!PyErr_Occurred()) {
-            if (unlikely(PyTuple_Check(key))) {
-                PyObject* args = PyTuple_Pack(1, key);
-                if (likely(args)) {
-                    PyErr_SetObject(PyExc_KeyError, args);
-                    Py_DECREF(args);
-                }
-            } else {
-                PyErr_SetObject(PyExc_KeyError, key);
-            }
-        }
-        return NULL;
-    }
-    Py_INCREF(value);
-    return value;
-}
-#endif
-
-/* BytesEquals */
-static CYTHON_INLINE int __Pyx_PyBytes_Equals(PyObject* s1, PyObject* s2, int equals) {
-#if CYTHON_COMPILING_IN_PYPY
-    return PyObject_RichCompareBool(s1, s2, equals);
-#else
-    if (s1 == s2) {
-        return (equals == Py_EQ);
-    } else if (PyBytes_CheckExact(s1) & PyBytes_CheckExact(s2)) {
-        const char *ps1, *ps2;
-        Py_ssize_t length = PyBytes_GET_SIZE(s1);
-        if (length != PyBytes_GET_SIZE(s2))
-            return (equals == Py_NE);
-        ps1 = PyBytes_AS_STRING(s1);
-        ps2 = PyBytes_AS_STRING(s2);
-        if (ps1[0] != ps2[0]) {
-            return (equals == Py_NE);
-        } else if (length == 1) {
-            return (equals == Py_EQ);
-        } else {
-            int result;
-#if CYTHON_USE_UNICODE_INTERNALS
-            Py_hash_t hash1, hash2;
-            hash1 = ((PyBytesObject*)s1)->ob_shash;
-            hash2 = ((PyBytesObject*)s2)->ob_shash;
-            if (hash1 != hash2 && hash1 != -1 && hash2 != -1) {
-                return (equals == Py_NE);
-            }
-#endif
-            result = memcmp(ps1, ps2, (size_t)length);
-            return (equals == Py_EQ) ? (result == 0) : (result != 0);
-        }
-    } else if ((s1 == Py_None) & PyBytes_CheckExact(s2)) {
-        return (equals == Py_NE);
-    } else if ((s2 == Py_None) & PyBytes_CheckExact(s1)) {
-        return (equals == Py_NE);
-    } else {
-        int result;
-        PyObject* py_result = PyObject_RichCompare(s1, s2, equals);
-        if (!py_result)
-            return -1;
-        result = __Pyx_PyObject_IsTrue(py_result);
-        Py_DECREF(py_result);
-        return result;
-    }
-#endif
-}
-
-/* UnicodeEquals */
-static CYTHON_INLINE int __Pyx_PyUnicode_Equals(PyObject* s1, PyObject* s2, int equals) {
-#if CYTHON_COMPILING_IN_PYPY
-    return PyObject_RichCompareBool(s1, s2, equals);
-#else
-#if PY_MAJOR_VERSION < 3
-    PyObject* owned_ref = NULL;
-#endif
-    int s1_is_unicode, s2_is_unicode;
-    if (s1 == s2) {
-        goto return_eq;
-    }
-    s1_is_unicode = PyUnicode_CheckExact(s1);
-    s2_is_unicode = PyUnicode_CheckExact(s2);
-#if PY_MAJOR_VERSION < 3
-    if ((s1_is_unicode & (!s2_is_unicode)) && PyString_CheckExact(s2)) {
-        owned_ref = PyUnicode_FromObject(s2);
-        if (unlikely(!owned_ref))
-            return -1;
-        s2 = owned_ref;
-        s2_is_unicode = 1;
-    } else if ((s2_is_unicode & (!s1_is_unicode)) && PyString_CheckExact(s1)) {
-        owned_ref = PyUnicode_FromObject(s1);
-        if (unlikely(!owned_ref))
-            return -1;
-        s1 = owned_ref;
-        s1_is_unicode = 1;
-    } else if (((!s2_is_unicode) & (!s1_is_unicode))) {
-        return __Pyx_PyBytes_Equals(s1, s2, equals);
-    }
-#endif
-    if (s1_is_unicode & s2_is_unicode) {
-        Py_ssize_t length;
-        int kind;
-        void *data1, *data2;
-        if (unlikely(__Pyx_PyUnicode_READY(s1) < 0) || unlikely(__Pyx_PyUnicode_READY(s2) < 0))
-            return -1;
-        length = __Pyx_PyUnicode_GET_LENGTH(s1);
-        if (length != __Pyx_PyUnicode_GET_LENGTH(s2)) {
-            goto return_ne;
-        }
-#if CYTHON_USE_UNICODE_INTERNALS
-        {
-            Py_hash_t hash1, hash2;
-        #if CYTHON_PEP393_ENABLED
-            hash1 = ((PyASCIIObject*)s1)->hash;
-            hash2 = ((PyASCIIObject*)s2)->hash;
-        #else
-            hash1 = ((PyUnicodeObject*)s1)->hash;
-            hash2 = ((PyUnicodeObject*)s2)->hash;
-        #endif
-            if (hash1 != hash2 && hash1 != -1 && hash2 != -1) {
-                goto return_ne;
-            }
-        }
-#endif
-        kind = __Pyx_PyUnicode_KIND(s1);
-        if (kind != __Pyx_PyUnicode_KIND(s2)) {
-            goto return_ne;
-        }
-        data1 = __Pyx_PyUnicode_DATA(s1);
-        data2 = __Pyx_PyUnicode_DATA(s2);
-        if (__Pyx_PyUnicode_READ(kind, data1, 0) != __Pyx_PyUnicode_READ(kind, data2, 0)) {
-            goto return_ne;
-        } else if (length == 1) {
-            goto return_eq;
-        } else {
-            int result = memcmp(data1, data2, (size_t)(length * kind));
-            #if PY_MAJOR_VERSION < 3
-            Py_XDECREF(owned_ref);
-            #endif
-            return (equals == Py_EQ) ? (result == 0) : (result != 0);
-        }
-    } else if ((s1 == Py_None) & s2_is_unicode) {
-        goto return_ne;
-    } else if ((s2 == Py_None) & s1_is_unicode) {
-        goto return_ne;
-    } else {
-        int result;
-        PyObject* py_result = PyObject_RichCompare(s1, s2, equals);
-        #if PY_MAJOR_VERSION < 3
-        Py_XDECREF(owned_ref);
-        #endif
-        if (!py_result)
-            return -1;
-        result = __Pyx_PyObject_IsTrue(py_result);
-        Py_DECREF(py_result);
-        return result;
-    }
-return_eq:
-    #if PY_MAJOR_VERSION < 3
-    Py_XDECREF(owned_ref);
-    #endif
-    return (equals == Py_EQ);
-return_ne:
-    #if PY_MAJOR_VERSION < 3
-    Py_XDECREF(owned_ref);
-    #endif
-    return (equals == Py_NE);
-#endif
-}
-
-/* GetItemInt */
-static PyObject *__Pyx_GetItemInt_Generic(PyObject *o, PyObject* j) {
-    PyObject *r;
-    if (!j) return NULL;
-    r = PyObject_GetItem(o, j);
-    Py_DECREF(j);
-    return r;
-}
-static CYTHON_INLINE PyObject *__Pyx_GetItemInt_List_Fast(PyObject *o, Py_ssize_t i,
-                                                              CYTHON_NCP_UNUSED int wraparound,
-                                                              CYTHON_NCP_UNUSED int boundscheck) {
-#if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-    Py_ssize_t wrapped_i = i;
-    if (wraparound & unlikely(i < 0)) {
-        wrapped_i += PyList_GET_SIZE(o);
-    }
-    if ((!boundscheck) || likely(__Pyx_is_valid_index(wrapped_i, PyList_GET_SIZE(o)))) {
-        PyObject *r = PyList_GET_ITEM(o, wrapped_i);
-        Py_INCREF(r);
-        return r;
-    }
-    return __Pyx_GetItemInt_Generic(o, PyInt_FromSsize_t(i));
-#else
-    return PySequence_GetItem(o, i);
-#endif
-}
-static CYTHON_INLINE PyObject *__Pyx_GetItemInt_Tuple_Fast(PyObject *o, Py_ssize_t i,
-                                                              CYTHON_NCP_UNUSED int wraparound,
-                                                              CYTHON_NCP_UNUSED int boundscheck) {
-#if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-    Py_ssize_t wrapped_i = i;
-    if (wraparound & unlikely(i < 0)) {
-        wrapped_i += PyTuple_GET_SIZE(o);
-    }
-    if ((!boundscheck) || likely(__Pyx_is_valid_index(wrapped_i, PyTuple_GET_SIZE(o)))) {
-        PyObject *r = PyTuple_GET_ITEM(o, wrapped_i);
-        Py_INCREF(r);
-        return r;
-    }
-    return __Pyx_GetItemInt_Generic(o, PyInt_FromSsize_t(i));
-#else
-    return PySequence_GetItem(o, i);
-#endif
-}
-static CYTHON_INLINE PyObject *__Pyx_GetItemInt_Fast(PyObject *o, Py_ssize_t i, int is_list,
-                                                     CYTHON_NCP_UNUSED int wraparound,
-                                                     CYTHON_NCP_UNUSED int boundscheck) {
-#if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS && CYTHON_USE_TYPE_SLOTS
-    if (is_list || PyList_CheckExact(o)) {
-        Py_ssize_t n = ((!wraparound) | likely(i >= 0)) ? i : i + PyList_GET_SIZE(o);
-        if ((!boundscheck) || (likely(__Pyx_is_valid_index(n, PyList_GET_SIZE(o))))) {
-            PyObject *r = PyList_GET_ITEM(o, n);
-            Py_INCREF(r);
-            return r;
-        }
-    }
-    else if (PyTuple_CheckExact(o)) {
-        Py_ssize_t n = ((!wraparound) | likely(i >= 0)) ? i : i + PyTuple_GET_SIZE(o);
-        if ((!boundscheck) || likely(__Pyx_is_valid_index(n, PyTuple_GET_SIZE(o)))) {
-            PyObject *r = PyTuple_GET_ITEM(o, n);
-            Py_INCREF(r);
-            return r;
-        }
-    } else {
-        PySequenceMethods *m = Py_TYPE(o)->tp_as_sequence;
-        if (likely(m && m->sq_item)) {
-            if (wraparound && unlikely(i < 0) && likely(m->sq_length)) {
-                Py_ssize_t l = m->sq_length(o);
-                if (likely(l >= 0)) {
-                    i += l;
-                } else {
-                    if (!PyErr_ExceptionMatches(PyExc_OverflowError))
-                        return NULL;
-                    PyErr_Clear();
-                }
-            }
-            return m->sq_item(o, i);
-        }
-    }
-#else
-    if (is_list || PySequence_Check(o)) {
-        return PySequence_GetItem(o, i);
-    }
-#endif
-    return __Pyx_GetItemInt_Generic(o, PyInt_FromSsize_t(i));
-}
-
 /* ReturnWithStopIteration */
 static void __Pyx__ReturnWithStopIteration(PyObject* value) {
     PyObject *exc, *args;
@@ -8735,78 +5938,6 @@ static void __Pyx__ReturnWithStopIteration(PyObject* value) {
     Py_DECREF(exc);
 }
 
-/* UnpackUnboundCMethod */
-static int __Pyx_TryUnpackUnboundCMethod(__Pyx_CachedCFunction* target) {
-    PyObject *method;
-    method = __Pyx_PyObject_GetAttrStr(target->type, *target->method_name);
-    if (unlikely(!method))
-        return -1;
-    target->method = method;
-#if CYTHON_COMPILING_IN_CPYTHON
-    #if PY_MAJOR_VERSION >= 3
-    if (likely(__Pyx_TypeCheck(method, &PyMethodDescr_Type)))
-    #endif
-    {
-        PyMethodDescrObject *descr = (PyMethodDescrObject*) method;
-        target->func = descr->d_method->ml_meth;
-        target->flag = descr->d_method->ml_flags & ~(METH_CLASS | METH_STATIC | METH_COEXIST | METH_STACKLESS);
-    }
-#endif
-    return 0;
-}
-
-/* CallUnboundCMethod1 */
-#if CYTHON_COMPILING_IN_CPYTHON
-static CYTHON_INLINE PyObject* __Pyx_CallUnboundCMethod1(__Pyx_CachedCFunction* cfunc, PyObject* self, PyObject* arg) {
-    if (likely(cfunc->func)) {
-        int flag = cfunc->flag;
-        if (flag == METH_O) {
-            return (*(cfunc->func))(self, arg);
-        } else if (PY_VERSION_HEX >= 0x030600B1 && flag == METH_FASTCALL) {
-            if (PY_VERSION_HEX >= 0x030700A0) {
-                return (*(__Pyx_PyCFunctionFast)(void*)(PyCFunction)cfunc->func)(self, &arg, 1);
-            } else {
-                return (*(__Pyx_PyCFunctionFastWithKeywords)(void*)(PyCFunction)cfunc->func)(self, &arg, 1, NULL);
-            }
-        } else if (PY_VERSION_HEX >= 0x030700A0 && flag == (METH_FASTCALL | METH_KEYWORDS)) {
-            return (*(__Pyx_PyCFunctionFastWithKeywords)(void*)(PyCFunction)cfunc->func)(self, &arg, 1, NULL);
-        }
-    }
-    return __Pyx__CallUnboundCMethod1(cfunc, self, arg);
-}
-#endif
-static PyObject* __Pyx__CallUnboundCMethod1(__Pyx_CachedCFunction* cfunc, PyObject* self, PyObject* arg){
-    PyObject *args, *result = NULL;
-    if (unlikely(!cfunc->func && !cfunc->method) && unlikely(__Pyx_TryUnpackUnboundCMethod(cfunc) < 0)) return NULL;
-#if CYTHON_COMPILING_IN_CPYTHON
-    if (cfunc->func && (cfunc->flag & METH_VARARGS)) {
-        args = PyTuple_New(1);
-        if (unlikely(!args)) goto bad;
-        Py_INCREF(arg);
-        PyTuple_SET_ITEM(args, 0, arg);
-        if (cfunc->flag & METH_KEYWORDS)
-            result = (*(PyCFunctionWithKeywords)(void*)(PyCFunction)cfunc->func)(self, args, NULL);
-        else
-            result = (*cfunc->func)(self, args);
-    } else {
-        args = PyTuple_New(2);
-        if (unlikely(!args)) goto bad;
-        Py_INCREF(self);
-        PyTuple_SET_ITEM(args, 0, self);
-        Py_INCREF(arg);
-        PyTuple_SET_ITEM(args, 1, arg);
-        result = __Pyx_PyObject_Call(cfunc->method, args, NULL);
-    }
-#else
-    args = PyTuple_Pack(2, self, arg);
-    if (unlikely(!args)) goto bad;
-    result = __Pyx_PyObject_Call(cfunc->method, args, NULL);
-#endif
-bad:
-    Py_XDECREF(args);
-    return result;
-}
-
 /* Import */
 static PyObject *__Pyx_Import(PyObject *name, PyObject *from_list, int level) {
     PyObject *empty_list = 0;
@@ -8980,6 +6111,20 @@ ignore:
     return module;
 }
 
+/* ImportFrom */
+static PyObject* __Pyx_ImportFrom(PyObject* module, PyObject* name) {
+    PyObject* value = __Pyx_PyObject_GetAttrStr(module, name);
+    if (unlikely(!value) && PyErr_ExceptionMatches(PyExc_AttributeError)) {
+        PyErr_Format(PyExc_ImportError,
+        #if PY_MAJOR_VERSION < 3
+            "cannot import name %.230s", PyString_AS_STRING(name));
+        #else
+            "cannot import name %S", name);
+        #endif
+    }
+    return value;
+}
+
 /* CLineInTraceback */
 #ifndef CYTHON_CLINE_IN_TRACEBACK
 static int __Pyx_CLineForTraceback(CYTHON_NCP_UNUSED PyThreadState *tstate, int c_line) {
@@ -9187,6 +6332,28 @@ bad:
     Py_XDECREF(py_frame);
 }
 
+/* CIntFromPyVerify */
+#define __PYX_VERIFY_RETURN_INT(target_type, func_type, func_value)\
+    __PYX__VERIFY_RETURN_INT(target_type, func_type, func_value, 0)
+#define __PYX_VERIFY_RETURN_INT_EXC(target_type, func_type, func_value)\
+    __PYX__VERIFY_RETURN_INT(target_type, func_type, func_value, 1)
+#define __PYX__VERIFY_RETURN_INT(target_type, func_type, func_value, exc)\
+    {\
+        func_type value = func_value;\
+        if (sizeof(target_type) < sizeof(func_type)) {\
+            if (unlikely(value != (func_type) (target_type) value)) {\
+                func_type zero = 0;\
+                if (exc && unlikely(value == (func_type)-1 && PyErr_Occurred()))\
+                    return (target_type) -1;\
+                if (is_unsigned && unlikely(value < zero))\
+                    goto raise_neg_overflow;\
+                else\
+                    goto raise_overflow;\
+            }\
+        }\
+        return (target_type) value;\
+    }
+
 /* Print */
 #if !CYTHON_COMPILING_IN_PYPY && PY_MAJOR_VERSION < 3
 static PyObject *__Pyx_GetStdout(void) {
@@ -9293,141 +6460,6 @@ bad:
 }
 #endif
 
-/* CIntFromPyVerify */
-#define __PYX_VERIFY_RETURN_INT(target_type, func_type, func_value)\
-    __PYX__VERIFY_RETURN_INT(target_type, func_type, func_value, 0)
-#define __PYX_VERIFY_RETURN_INT_EXC(target_type, func_type, func_value)\
-    __PYX__VERIFY_RETURN_INT(target_type, func_type, func_value, 1)
-#define __PYX__VERIFY_RETURN_INT(target_type, func_type, func_value, exc)\
-    {\
-        func_type value = func_value;\
-        if (sizeof(target_type) < sizeof(func_type)) {\
-            if (unlikely(value != (func_type) (target_type) value)) {\
-                func_type zero = 0;\
-                if (exc && unlikely(value == (func_type)-1 && PyErr_Occurred()))\
-                    return (target_type) -1;\
-                if (is_unsigned && unlikely(value < zero))\
-                    goto raise_neg_overflow;\
-                else\
-                    goto raise_overflow;\
-            }\
-        }\
-        return (target_type) value;\
-    }
-
-/* CIntToPy */
-static CYTHON_INLINE PyObject* __Pyx_PyInt_From_long(long value) {
-#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
-#pragma GCC diagnostic push
-#pragma GCC diagnostic ignored "-Wconversion"
-#endif
-    const long neg_one = (long) -1, const_zero = (long) 0;
-#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
-#pragma GCC diagnostic pop
-#endif
-    const int is_unsigned = neg_one > const_zero;
-    if (is_unsigned) {
-        if (sizeof(long) < sizeof(long)) {
-            return PyInt_FromLong((long) value);
-        } else if (sizeof(long) <= sizeof(unsigned long)) {
-            return PyLong_FromUnsignedLong((unsigned long) value);
-#ifdef HAVE_LONG_LONG
-        } else if (sizeof(long) <= sizeof(unsigned PY_LONG_LONG)) {
-            return PyLong_FromUnsignedLongLong((unsigned PY_LONG_LONG) value);
-#endif
-        }
-    } else {
-        if (sizeof(long) <= sizeof(long)) {
-            return PyInt_FromLong((long) value);
-#ifdef HAVE_LONG_LONG
-        } else if (sizeof(long) <= sizeof(PY_LONG_LONG)) {
-            return PyLong_FromLongLong((PY_LONG_LONG) value);
-#endif
-        }
-    }
-    {
-        int one = 1; int little = (int)*(unsigned char *)&one;
-        unsigned char *bytes = (unsigned char *)&value;
-        return _PyLong_FromByteArray(bytes, sizeof(long),
-                                     little, !is_unsigned);
-    }
-}
-
-/* PrintOne */
-#if !CYTHON_COMPILING_IN_PYPY && PY_MAJOR_VERSION < 3
-static int __Pyx_PrintOne(PyObject* f, PyObject *o) {
-    if (!f) {
-        if (!(f = __Pyx_GetStdout()))
-            return -1;
-    }
-    Py_INCREF(f);
-    if (PyFile_SoftSpace(f, 0)) {
-        if (PyFile_WriteString(" ", f) < 0)
-            goto error;
-    }
-    if (PyFile_WriteObject(o, f, Py_PRINT_RAW) < 0)
-        goto error;
-    if (PyFile_WriteString("\n", f) < 0)
-        goto error;
-    Py_DECREF(f);
-    return 0;
-error:
-    Py_DECREF(f);
-    return -1;
-    /* the line below is just to avoid C compiler
-     * warnings about unused functions */
-    return __Pyx_Print(f, NULL, 0);
-}
-#else
-static int __Pyx_PrintOne(PyObject* stream, PyObject *o) {
-    int res;
-    PyObject* arg_tuple = PyTuple_Pack(1, o);
-    if (unlikely(!arg_tuple))
-        return -1;
-    res = __Pyx_Print(stream, arg_tuple, 1);
-    Py_DECREF(arg_tuple);
-    return res;
-}
-#endif
-
-/* CIntToPy */
-static CYTHON_INLINE PyObject* __Pyx_PyInt_From_int(int value) {
-#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
-#pragma GCC diagnostic push
-#pragma GCC diagnostic ignored "-Wconversion"
-#endif
-    const int neg_one = (int) -1, const_zero = (int) 0;
-#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
-#pragma GCC diagnostic pop
-#endif
-    const int is_unsigned = neg_one > const_zero;
-    if (is_unsigned) {
-        if (sizeof(int) < sizeof(long)) {
-            return PyInt_FromLong((long) value);
-        } else if (sizeof(int) <= sizeof(unsigned long)) {
-            return PyLong_FromUnsignedLong((unsigned long) value);
-#ifdef HAVE_LONG_LONG
-        } else if (sizeof(int) <= sizeof(unsigned PY_LONG_LONG)) {
-            return PyLong_FromUnsignedLongLong((unsigned PY_LONG_LONG) value);
-#endif
-        }
-    } else {
-        if (sizeof(int) <= sizeof(long)) {
-            return PyInt_FromLong((long) value);
-#ifdef HAVE_LONG_LONG
-        } else if (sizeof(int) <= sizeof(PY_LONG_LONG)) {
-            return PyLong_FromLongLong((PY_LONG_LONG) value);
-#endif
-        }
-    }
-    {
-        int one = 1; int little = (int)*(unsigned char *)&one;
-        unsigned char *bytes = (unsigned char *)&value;
-        return _PyLong_FromByteArray(bytes, sizeof(int),
-                                     little, !is_unsigned);
-    }
-}
-
 /* CIntFromPy */
 static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *x) {
 #ifdef __Pyx_HAS_GCC_DIAGNOSTIC
@@ -9624,6 +6656,119 @@ raise_neg_overflow:
     return (int) -1;
 }
 
+/* CIntToPy */
+static CYTHON_INLINE PyObject* __Pyx_PyInt_From_int(int value) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const int neg_one = (int) -1, const_zero = (int) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
+    const int is_unsigned = neg_one > const_zero;
+    if (is_unsigned) {
+        if (sizeof(int) < sizeof(long)) {
+            return PyInt_FromLong((long) value);
+        } else if (sizeof(int) <= sizeof(unsigned long)) {
+            return PyLong_FromUnsignedLong((unsigned long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(int) <= sizeof(unsigned PY_LONG_LONG)) {
+            return PyLong_FromUnsignedLongLong((unsigned PY_LONG_LONG) value);
+#endif
+        }
+    } else {
+        if (sizeof(int) <= sizeof(long)) {
+            return PyInt_FromLong((long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(int) <= sizeof(PY_LONG_LONG)) {
+            return PyLong_FromLongLong((PY_LONG_LONG) value);
+#endif
+        }
+    }
+    {
+        int one = 1; int little = (int)*(unsigned char *)&one;
+        unsigned char *bytes = (unsigned char *)&value;
+        return _PyLong_FromByteArray(bytes, sizeof(int),
+                                     little, !is_unsigned);
+    }
+}
+
+/* PrintOne */
+#if !CYTHON_COMPILING_IN_PYPY && PY_MAJOR_VERSION < 3
+static int __Pyx_PrintOne(PyObject* f, PyObject *o) {
+    if (!f) {
+        if (!(f = __Pyx_GetStdout()))
+            return -1;
+    }
+    Py_INCREF(f);
+    if (PyFile_SoftSpace(f, 0)) {
+        if (PyFile_WriteString(" ", f) < 0)
+            goto error;
+    }
+    if (PyFile_WriteObject(o, f, Py_PRINT_RAW) < 0)
+        goto error;
+    if (PyFile_WriteString("\n", f) < 0)
+        goto error;
+    Py_DECREF(f);
+    return 0;
+error:
+    Py_DECREF(f);
+    return -1;
+    /* the line below is just to avoid C compiler
+     * warnings about unused functions */
+    return __Pyx_Print(f, NULL, 0);
+}
+#else
+static int __Pyx_PrintOne(PyObject* stream, PyObject *o) {
+    int res;
+    PyObject* arg_tuple = PyTuple_Pack(1, o);
+    if (unlikely(!arg_tuple))
+        return -1;
+    res = __Pyx_Print(stream, arg_tuple, 1);
+    Py_DECREF(arg_tuple);
+    return res;
+}
+#endif
+
+/* CIntToPy */
+static CYTHON_INLINE PyObject* __Pyx_PyInt_From_long(long value) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const long neg_one = (long) -1, const_zero = (long) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
+    const int is_unsigned = neg_one > const_zero;
+    if (is_unsigned) {
+        if (sizeof(long) < sizeof(long)) {
+            return PyInt_FromLong((long) value);
+        } else if (sizeof(long) <= sizeof(unsigned long)) {
+            return PyLong_FromUnsignedLong((unsigned long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(long) <= sizeof(unsigned PY_LONG_LONG)) {
+            return PyLong_FromUnsignedLongLong((unsigned PY_LONG_LONG) value);
+#endif
+        }
+    } else {
+        if (sizeof(long) <= sizeof(long)) {
+            return PyInt_FromLong((long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(long) <= sizeof(PY_LONG_LONG)) {
+            return PyLong_FromLongLong((PY_LONG_LONG) value);
+#endif
+        }
+    }
+    {
+        int one = 1; int little = (int)*(unsigned char *)&one;
+        unsigned char *bytes = (unsigned char *)&value;
+        return _PyLong_FromByteArray(bytes, sizeof(long),
+                                     little, !is_unsigned);
+    }
+}
+
 /* CIntFromPy */
 static CYTHON_INLINE long __Pyx_PyInt_As_long(PyObject *x) {
 #ifdef __Pyx_HAS_GCC_DIAGNOSTIC
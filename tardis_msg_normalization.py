@@ -1,5 +1,6 @@
 import numpy as np
-import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
 trades_norm_dict = {
     'bitmex':{
@@ -153,21 +154,202 @@ examples_dict = {
     'deribit':{'dl_dtype':'trades', 'dl_symbols':['ETH-PERPETUAL']}
 }
 
-def normalize_df_timestamps(df, exch):
-    
-    if exch in ['bitmex', 'ftx', 'coinbase', 'okex-swap', 'okex-futures']:
-        if 'trd_time' in df.columns:
-            df['trd_time'] = pd.to_datetime(df['trd_time'])
-   
-    elif exch in ['binance-delivery', 'binance', 'binance-futures',
-                    'huobi-dm', 'huobi-dm-swap', 'huobi', 'deribit']:
-        if 'trd_time' in df.columns:
-            df['trd_time'] = pd.to_datetime(df['trd_time'].astype(np.int64),origin='unix',unit='ms')
-        if 'evt_time' in df.columns:
-            df['evt_time'] = pd.to_datetime(df['evt_time'].astype(np.int64),origin='unix',unit='ms')
-
-    elif exch in ['kraken']:
-        if 'trd_time' in df.columns:
-            df['trd_time'] = pd.to_datetime(df['trd_time'].astype(np.float64),origin='unix',unit='s')
-        
-    return 0
\ No newline at end of file
+# Order book channels of each exchange (comma separated when the snapshots have their own channel)
+# parsed into top-N book samples by tardis_book
+book_examples_dict = {
+    'bitmex': {'dl_dtype': 'orderBookL2', 'dl_symbols': ['XBTUSD']},
+    'binance': {'dl_dtype': 'depth,depthSnapshot', 'dl_symbols': ['btcusdt']},
+    'binance-futures': {'dl_dtype': 'depth,depthSnapshot', 'dl_symbols': ['ethusdt']},
+    'binance-delivery': {'dl_dtype': 'depth,depthSnapshot', 'dl_symbols': ['btcusd_200925']},
+    'okex-swap': {'dl_dtype': 'swap/depth_l2_tbt', 'dl_symbols': ['BTC-USD-SWAP']},
+    'okex-futures': {'dl_dtype': 'futures/depth_l2_tbt', 'dl_symbols': ['BTC-USD-200103']},
+    'huobi-dm': {'dl_dtype': 'depth', 'dl_symbols': ['BTC_CW']},
+    'huobi-dm-swap': {'dl_dtype': 'depth', 'dl_symbols': ['BTC-USD']},
+    'huobi': {'dl_dtype': 'depth', 'dl_symbols': ['btcusdt']},
+    'ftx': {'dl_dtype': 'orderbook', 'dl_symbols': ['BTC-PERP']},
+    'coinbase': {'dl_dtype': 'snapshot,l2update', 'dl_symbols': ['BTC-USD']},
+    'kraken': {'dl_dtype': 'book', 'dl_symbols': ['XBT/USD']},
+    'deribit': {'dl_dtype': 'book', 'dl_symbols': ['ETH-PERPETUAL']}
+}
+
+def format_houbi_ch_field(ch_field_str):
+    if ch_field_str.startswith('market.') & ch_field_str.endswith('.trade.detail'):
+        ch_field_str = ch_field_str.replace('market.','')
+        ch_field_str = ch_field_str.replace('.trade.detail','')
+    return ch_field_str
+
+# Where the trade(s) sit in each exchange's Tardis message:
+# 'match': [(key or index, value)] the message must hold to be a trade message
+# 'path': keys / indexes leading from the message to a trade or a list of trades
+# 'row_fields': trades are lists (not dicts): trades_norm_dict field of each position
+# 'msg_fields': {trades_norm_dict field: (key or index in the message, transform)}
+#               fields missing from the trade itself, filled from the enclosing message
+# Adding an exchange = one entry here + one in trades_norm_dict (see tardis_trade_extractors)
+huobi_shape = {'path': ['tick', 'data'], 'msg_fields': {'ch': ('ch', format_houbi_ch_field)}}
+
+trade_msgs_shape_dict = {
+    'bitmex': {'path': ['data']},
+    'binance': {'path': ['data']},
+    'binance-futures': {'path': ['data']},
+    'binance-delivery': {'path': ['data']},
+    'okex-swap': {'path': ['data']},
+    'okex-futures': {'path': ['data']},
+    'huobi': huobi_shape,
+    'huobi-dm': huobi_shape,
+    'huobi-dm-swap': huobi_shape,
+    'ftx': {'path': ['data'], 'msg_fields': {'symbol': ('market', None)}},
+    'coinbase': {'match': [('type', 'match')], 'path': []},
+    'deribit': {'path': ['params', 'data']},
+    'kraken': {'match': [(2, 'trade')], 'path': [1],
+               'row_fields': ['price', 'volume', 'time', 'side', 'orderType', 'misc'],
+               'msg_fields': {'symbol': (3, None)}}
+}
+
+# Low cardinality string columns: kept as int32 codes + a small dictionary from parsing
+# to the output (Arrow dictionary / pandas category), never as full string columns.
+# Id columns stay plain strings (as many distinct values as rows)
+dictionary_cols = ['symbol', 'evt_type', 'msg_type', 'trd_side', 'trd_dir', 'trd_aggr_dir', 'mkt_mkr_dir',
+                   'trd_ntnl', 'tick_dir', 'trig_ord_type', 'cur_order_status']
+dictionary_type = pa.dictionary(pa.int32(), pa.string())
+
+# Trade id column of each exchange (dedupe key with symbol) and whether the ids
+# are a contiguous sequence per symbol (so missing ids = gaps in the data)
+# Kraken trades have no id: they are only put in time order
+trade_ids_dict = {
+    'bitmex': ('trd_match_id', False),
+    'binance': ('trd_id', True),
+    'binance-futures': ('trd_id', True),
+    'binance-delivery': ('trd_id', True),
+    'okex-swap': ('trd_id', False),
+    'okex-futures': ('trd_id', False),
+    'huobi': ('trd_id', False),
+    'huobi-dm': ('trd_id', False),
+    'huobi-dm-swap': ('trd_id', False),
+    'ftx': ('trd_id', False),
+    'coinbase': ('trd_id', True),
+    'deribit': ('trd_seq', True),
+    'kraken': (None, False)
+}
+
+# Column telling the side of the aggressor (taker) of a trade, and its values meaning the taker bought
+# (Binance flags buyer = maker, Coinbase gives the maker order's side)
+aggressor_buy_dict = {
+    'bitmex': ('trd_side', ['Buy']),
+    'binance': ('is_buyer_mkt_mkr?', [False]),
+    'binance-futures': ('is_buyer_mkt_mkr?', [False]),
+    'binance-delivery': ('is_buyer_mkt_mkr?', [False]),
+    'okex-swap': ('trd_side', ['buy']),
+    'okex-futures': ('trd_side', ['buy']),
+    'huobi': ('trd_aggr_dir', ['buy']),
+    'huobi-dm': ('trd_aggr_dir', ['buy']),
+    'huobi-dm-swap': ('trd_aggr_dir', ['buy']),
+    'ftx': ('trd_aggr_dir', ['buy']),
+    'coinbase': ('mkt_mkr_dir', ['sell']),
+    'deribit': ('trd_ntnl', ['buy']),
+    'kraken': ('trd_dir', ['b'])
+}
+
+# How each exchange encodes its time columns:
+# 'iso' = ISO-8601 string, 'ms' / 'us' = integer epoch milli / micro seconds,
+# 'sec_str' = epoch seconds string with a decimal fraction
+timestamps_norm_dict = {
+    'bitmex': {'trd_time': 'iso'},
+    'binance': {'evt_time': 'ms', 'trd_time': 'ms'},
+    'binance-futures': {'evt_time': 'ms', 'trd_time': 'ms'},
+    'binance-delivery': {'evt_time': 'ms', 'trd_time': 'ms'},
+    'okex-swap': {'trd_time': 'iso'},
+    'okex-futures': {'trd_time': 'iso'},
+    'huobi': {'trd_time': 'ms'},
+    'huobi-dm': {'trd_time': 'ms'},
+    'huobi-dm-swap': {'trd_time': 'ms'},
+    'ftx': {'trd_time': 'iso'},
+    'coinbase': {'trd_time': 'iso'},
+    'deribit': {'trd_time': 'ms'},
+    'kraken': {'trd_time': 'sec_str'}
+}
+
+# Tardis local (receive) timestamp at the start of every cached line, always 28 chars
+# e.g. 2019-08-01T08:52:00.0324272Z
+local_timestamp_col = 'local_timestamp'
+# optional side column: JSON of the trade fields not in trades_norm_dict (None if there are none)
+extras_col = 'extras'
+local_timestamp_width = 28
+timestamp_ns_utc = pa.timestamp('ns', tz='UTC')
+
+### Vectorised Timestamp Normalization
+# Every time column becomes int64 nanoseconds since epoch (timestamp[ns, UTC]):
+# integer epochs are scaled exactly (no float round trip), ISO strings go through
+# Arrow's ISO-8601 parser and Tardis local timestamps through a fixed-width digit parser
+
+def parse_tardis_local_timestamps(buf, num_rows):
+    """
+    Fixed-width parse of num_rows concatenated 28 byte Tardis local timestamps
+    (YYYY-MM-DDTHH:MM:SS.fffffffZ) into int64 ns since epoch
+    """
+    digits = np.frombuffer(buf, dtype=np.uint8, count=num_rows*local_timestamp_width)
+    digits = digits.reshape(num_rows, local_timestamp_width).astype(np.int64) - ord('0')
+
+    def to_int(first_col, end_col):
+        out = np.zeros(num_rows, dtype=np.int64)
+        for c in range(first_col, end_col):
+            out = out*10 + digits[:, c]
+        return out
+
+    months = (to_int(0, 4) - 1970)*12 + to_int(5, 7) - 1
+    days = months.astype('datetime64[M]').astype('datetime64[D]').astype(np.int64) + to_int(8, 10) - 1
+    secs = ((days*24 + to_int(11, 13))*60 + to_int(14, 16))*60 + to_int(17, 19)
+    return secs*1000000000 + to_int(20, 27)*100
+
+
+def local_timestamp_bytes(local_timestamp):
+    """
+    Tardis local timestamp as its 28 byte line prefix
+    (TardisClient.replay yields datetimes when decoding, the raw prefix otherwise)
+    """
+    if type(local_timestamp) is bytes:
+        return local_timestamp
+    return (local_timestamp.strftime('%Y-%m-%dT%H:%M:%S.%f')+'0Z').encode('ascii')
+
+
+def parse_iso_timestamps(arr):
+    try:
+        return pc.cast(arr, timestamp_ns_utc)
+    except pa.ArrowInvalid:
+        # no zone designator: UTC
+        return pc.cast(pc.cast(pc.cast(arr, pa.timestamp('ns')), pa.int64()), timestamp_ns_utc)
+
+
+def parse_epoch_timestamps(arr, unit):
+    scale = {'ms': 1000000, 'us': 1000}[unit]
+    return pc.cast(pc.multiply(pc.cast(arr, pa.int64()), scale), timestamp_ns_utc)
+
+
+def parse_sec_str_timestamps(arr):
+    """
+    '1628553600.123456' -> exact int64 ns (seconds and fraction parsed as separate integers)
+    """
+    parts = pc.extract_regex(pc.cast(arr, pa.string()), r'(?P<s>\d+)(?:\.(?P<f>\d{0,9}))?')
+    secs = pc.cast(pc.struct_field(parts, 's'), pa.int64())
+    frac = pc.cast(pc.utf8_rpad(pc.struct_field(parts, 'f'), 9, '0'), pa.int64())
+    return pc.cast(pc.add(pc.multiply(secs, 1000000000), frac), timestamp_ns_utc)
+
+
+def normalize_table_timestamps(table, exch):
+    """
+    Convert the time columns of an exchange's trades table (see timestamps_norm_dict)
+    to timestamp[ns, UTC]: returns a new table
+    """
+
+    for col_name, kind in timestamps_norm_dict.get(exch, {}).items():
+        if col_name not in table.column_names:
+            continue
+        col = table[col_name]
+        if kind == 'iso':
+            new_col = parse_iso_timestamps(col)
+        elif kind in ['ms', 'us']:
+            new_col = parse_epoch_timestamps(col, kind)
+        elif kind == 'sec_str':
+            new_col = parse_sec_str_timestamps(col)
+        table = table.set_column(table.column_names.index(col_name), col_name, new_col)
+
+    return table
@@ -0,0 +1,197 @@
+import json
+import os
+
+from gzip_helpers import compress_gzip_member, read_gzip_member, iter_gzip_lines
+from json_helpers import parse_msg_line
+from tardis_msg_normalization import local_timestamp_bytes
+from tardis_trade_extractors import ret_trade_extractor
+
+### Raw Cache Index
+# Optional sidecars next to a cached Tardis .json.gz file, for random access
+# (the TardisClient file itself is never modified, so cache checksums stay valid):
+# -> <file>.idx.gz: a copy of its lines as a series of independent gzip members, one per
+#    block of about index_block_bytes of lines (a valid gzip file holding the same lines)
+# -> <file>.idx: per block: member offset & size in the .idx.gz, offset & size of
+#    its lines in the decompressed file, first line # and # of lines, first & last
+#    Tardis local timestamp, symbols of the trades it holds
+# A query for "symbol X between t0 and t1" only reads and decompresses the matching blocks
+
+index_suffix = '.idx'
+blocks_suffix = '.idx.gz'
+index_version = 2
+index_block_bytes = 1 << 18
+index_block_cols = ['gz_offset', 'gz_size', 'raw_offset', 'raw_size', 'first_line', 'num_lines',
+                    'first_local_timestamp', 'last_local_timestamp', 'symbols']
+
+
+def ret_index_path(file_path):
+    return str(file_path) + index_suffix
+
+
+def ret_blocks_path(file_path):
+    return str(file_path) + blocks_suffix
+
+
+def read_raw_index(file_path):
+    """
+    Sidecar index of a cached .json.gz file as a dict (blocks as dicts of index_block_cols),
+    None if there is none or it does not describe the current file
+    """
+    index_path = ret_index_path(file_path)
+    if not os.path.isfile(index_path):
+        return None
+    try:
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+    except ValueError:
+        return None
+    blocks_path = ret_blocks_path(file_path)
+    if index.get('version') != index_version or index.get('source_size') != os.path.getsize(file_path) \
+            or not os.path.isfile(blocks_path) or index.get('gz_size') != os.path.getsize(blocks_path):
+        return None
+    index['blocks'] = [dict(zip(index_block_cols, block)) for block in index['blocks']]
+    return index
+
+
+def has_raw_index(dir_path):
+    """
+    True if every cached .json.gz file of a directory has an up to date sidecar index
+    """
+    return all(read_raw_index(os.path.join(dir_path, f)) is not None
+               for f in os.listdir(dir_path) if f.endswith('.json.gz'))
+
+
+class RawIndexWriter:
+    """
+    Copy one cached .json.gz file as indexed gzip members (<file>.idx.gz), one line at a time:
+    add_line(line, symbols) for every line (in order), then close()
+    (the sidecars only appear on close, abort() removes the partial copy)
+    """
+
+    def __init__(self, file_path, block_bytes=index_block_bytes):
+        self.file_path = str(file_path)
+        self.tmp_path = ret_blocks_path(self.file_path) + '.tmp'
+        self.block_bytes = block_bytes
+        self.out = open(self.tmp_path, 'wb')
+        self.blocks = []
+        self.gz_offset = 0
+        self.raw_offset = 0
+        self.num_lines = 0
+        self._new_block()
+
+    def _new_block(self):
+        self.block_lines = []
+        self.block_size = 0
+        self.block_symbols = set()
+        self.block_first_line = self.num_lines
+
+    def add_line(self, line, symbols=()):
+        self.block_lines.append(line)
+        self.block_size += len(line) + 1
+        self.block_symbols.update(str(symbol) for symbol in symbols if symbol is not None)
+        self.num_lines += 1
+        if self.block_size >= self.block_bytes:
+            self._flush_block()
+
+    def _flush_block(self):
+        if len(self.block_lines) == 0:
+            return
+        member = compress_gzip_member(b'\n'.join(self.block_lines) + b'\n')
+        self.out.write(member)
+        self.blocks.append([self.gz_offset, len(member), self.raw_offset, self.block_size,
+                            self.block_first_line, len(self.block_lines),
+                            self.block_lines[0][:self.block_lines[0].find(b' ')].decode('ascii'),
+                            self.block_lines[-1][:self.block_lines[-1].find(b' ')].decode('ascii'),
+                            sorted(self.block_symbols)])
+        self.gz_offset += len(member)
+        self.raw_offset += self.block_size
+        self._new_block()
+
+    def close(self):
+        self._flush_block()
+        self.out.close()
+        os.replace(self.tmp_path, ret_blocks_path(self.file_path))
+        index = {'version': index_version, 'source_size': os.path.getsize(self.file_path),
+                 'gz_size': self.gz_offset, 'num_lines': self.num_lines,
+                 'block_cols': index_block_cols, 'blocks': self.blocks}
+        index_path = ret_index_path(self.file_path)
+        with open(index_path + '.tmp', 'w') as f:
+            json.dump(index, f)
+        os.replace(index_path + '.tmp', index_path)
+
+    def abort(self):
+        self.out.close()
+        os.remove(self.tmp_path)
+
+
+def ret_row_symbols(rows, extractor):
+    if extractor.symbol_slot is None:
+        return ()
+    return [row[extractor.symbol_slot] for row in rows]
+
+
+def build_raw_index(file_path, exch, block_bytes=index_block_bytes):
+    """
+    Write the sidecar index of one cached .json.gz file (standalone pass over the file,
+    tardis_get_trades --index builds it while parsing instead)
+    """
+    extractor = ret_trade_extractor(exch)
+    writer = RawIndexWriter(file_path, block_bytes)
+    try:
+        for l in iter_gzip_lines(file_path):
+            writer.add_line(l, ret_row_symbols(extractor(parse_msg_line(l)), extractor))
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+
+
+def build_raw_index_dir(dir_path, exch, block_bytes=index_block_bytes):
+    """
+    Index every cached .json.gz file under dir_path that has no up to date sidecar
+    Returns # of files indexed
+    """
+    num_files = 0
+    for subdir, dirs, files in os.walk(dir_path):
+        for f in sorted(files):
+            file_path = os.path.join(subdir, f)
+            if f.endswith('.json.gz') and read_raw_index(file_path) is None:
+                build_raw_index(file_path, exch, block_bytes)
+                num_files += 1
+    return num_files
+
+
+def ret_local_timestamp_str(t):
+    if t is None or type(t) is str:
+        return t
+    return local_timestamp_bytes(t).decode('ascii')
+
+
+def iter_indexed_lines(file_paths, symbol=None, start=None, end=None):
+    """
+    Yield the raw lines (bytes) of indexed cached files with a Tardis local timestamp in [start, end),
+    reading only the blocks that overlap the time range and hold trades of symbol
+    start / end: datetimes or local timestamp strings (e.g. 2019-08-01T08:52:00.0324272Z)
+    Lines of a matching block are not filtered by symbol (blocks can mix symbols)
+    Files without an up to date index raise a ValueError
+    """
+    start = ret_local_timestamp_str(start)
+    end = ret_local_timestamp_str(end)
+
+    for file_path in file_paths:
+        index = read_raw_index(file_path)
+        if index is None:
+            raise ValueError('No up to date index for '+str(file_path)+' (see build_raw_index)')
+        for block in index['blocks']:
+            if symbol is not None and str(symbol) not in block['symbols']:
+                continue
+            if start is not None and block['last_local_timestamp'] < start:
+                continue
+            if end is not None and block['first_local_timestamp'] >= end:
+                continue
+            for l in read_gzip_member(ret_blocks_path(file_path), block['gz_offset'], block['gz_size']).split(b'\n'):
+                if len(l) == 0:
+                    continue
+                local_timestamp = l[:l.find(b' ')].decode('ascii')
+                if (start is None or local_timestamp >= start) and (end is None or local_timestamp < end):
+                    yield l
@@ -0,0 +1,159 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from feather_helpers import table_to_frame, ret_feather_part_paths
+from tardis_cache import request_cache_key
+from tardis_request import DownloadRequest
+from tardis_msg_normalization import examples_dict, timestamp_ns_utc
+
+### Memory-Mapped Multi-Day Reader
+# Opens the trd_YYYYMMDD outputs of a date range (or any Feather / Arrow IPC files of the
+# package: bars_..., book...) as memory-mapped Arrow tables, in date order:
+# -> a day appended window by window (--append) is its trd_YYYYMMDD file then its .part<n> files
+# -> files written with --compression uncompressed are read zero-copy: columns point into the
+#    mapped pages (loaded on first access, shared with other processes through the page cache),
+#    lz4 / zstd files are decompressed into memory as they are read
+# -> the days are one view: record batches of all files in order (iter_batches), or one table
+#    whose chunks are the files' batches (read_table, no concatenation copy)
+# -> symbols / [start, end) time filters are applied batch by batch: batches kept whole are not
+#    copied, batches outside the time range are skipped, only partly kept batches are filtered
+# Files are opened one at a time while iterating, so months of days cost only their mappings
+
+default_time_col = 'trd_time'
+
+
+def ret_trade_output_paths(cache_root, exchange, symbols, start_date, end_date, msg_type=None):
+    """
+    trd_YYYYMMDD output paths (with their appended .part<n> files) of the requests of every date
+    in [start_date, end_date] (same exchange / symbols / channel), skipping the dates not processed
+    """
+    if isinstance(symbols, str):
+        symbols = symbols.split(',')
+    msg_type = msg_type if msg_type is not None else examples_dict[exchange]['dl_dtype']
+    paths = []
+    for date in pd.date_range(start_date, end_date, freq='D'):
+        request = DownloadRequest(date.strftime('%Y-%m-%d'), exchange, msg_type, list(symbols), cache_root, None)
+        path = os.path.join(cache_root, request_cache_key(request), 'trd_'+date.strftime('%Y%m%d'))
+        paths.extend(ret_feather_part_paths(path))
+    return paths
+
+
+def read_mmap_table(path, columns=None):
+    """
+    Feather (v2) / Arrow IPC file as a memory-mapped table (zero-copy if written uncompressed)
+    """
+    reader = pa.ipc.open_file(pa.memory_map(str(path), 'r'))
+    table = reader.read_all()
+    return table.select(columns) if columns is not None else table
+
+
+def ret_time_scalar(t):
+    """
+    Time (anything pd.Timestamp takes, UTC if naive) -> timestamp[ns, UTC] scalar
+    """
+    t = pd.Timestamp(t)
+    return pa.scalar((t.tz_localize('UTC') if t.tzinfo is None else t).value, timestamp_ns_utc)
+
+
+class TradeFilesReader:
+    """
+    Lazily concatenated view of output files (in order), with optional filters:
+    symbols (list), start / end times (anything pd.Timestamp takes, UTC if naive: start <= time < end),
+    columns (subset read, the filter columns are read anyway)
+    """
+
+    def __init__(self, paths, symbols=None, start=None, end=None, columns=None, time_col=default_time_col):
+        self.paths = [str(path) for path in paths]
+        self.symbols = list(symbols) if symbols is not None else None
+        self.start = start
+        self.end = end
+        self.columns = columns
+        self.time_col = time_col
+
+    def _filter_batch(self, batch):
+        """
+        Rows of batch passing the filters: the batch itself if all do, None if none do
+        """
+        mask = None
+        if self.symbols is not None:
+            symbol = batch.column(batch.schema.get_field_index('symbol'))
+            if pa.types.is_dictionary(symbol.type):
+                # compare the (small) dictionary, not every row
+                keep = pc.is_in(symbol.dictionary, value_set=pa.array(self.symbols, symbol.type.value_type))
+                mask = pc.take(keep, symbol.indices)
+            else:
+                mask = pc.is_in(symbol, value_set=pa.array(self.symbols, symbol.type))
+        if self.start is not None or self.end is not None:
+            times = batch.column(batch.schema.get_field_index(self.time_col))
+            min_max = pc.min_max(times)
+            if not min_max['min'].is_valid:
+                return None
+            in_range = None
+            if self.start is not None:
+                start = ret_time_scalar(self.start)
+                if pc.less(min_max['max'], start).as_py():
+                    return None
+                in_range = pc.greater_equal(times, start)
+            if self.end is not None:
+                end = ret_time_scalar(self.end)
+                if pc.greater_equal(min_max['min'], end).as_py():
+                    return None
+                before_end = pc.less(times, end)
+                in_range = before_end if in_range is None else pc.and_(in_range, before_end)
+            mask = in_range if mask is None else pc.and_(mask, in_range)
+        if mask is None:
+            return batch
+        mask = pc.fill_null(mask, False)
+        num_kept = pc.sum(mask).as_py() or 0
+        if num_kept == 0:
+            return None
+        if num_kept == len(batch):
+            return batch
+        return batch.filter(mask)
+
+    def iter_batches(self):
+        """
+        Yields the record batches (filtered) of every file, in order
+        """
+        for path in self.paths:
+            reader = pa.ipc.open_file(pa.memory_map(path, 'r'))
+            for i in range(reader.num_record_batches):
+                batch = self._filter_batch(reader.get_batch(i))
+                if batch is None or len(batch) == 0:
+                    continue
+                if self.columns is not None:
+                    batch = batch.select(self.columns)
+                yield batch
+
+    def read_table(self):
+        """
+        All the (filtered) batches as one table (chunked, not copied)
+        Dictionary columns keep one dictionary per file (unify_dictionaries() if needed)
+        """
+        batches = list(self.iter_batches())
+        if len(batches) == 0:
+            return self.empty_table()
+        return pa.Table.from_batches(batches)
+
+    def empty_table(self):
+        if len(self.paths) == 0:
+            return pa.table({self.time_col: pa.array([], timestamp_ns_utc)})
+        schema = pa.ipc.open_file(pa.memory_map(self.paths[0], 'r')).schema
+        table = schema.empty_table()
+        return table.select(self.columns) if self.columns is not None else table
+
+    def read_frame(self):
+        return table_to_frame(self.read_table())
+
+
+def read_trade_range(cache_root, exchange, symbols, start_date, end_date, start=None, end=None, columns=None,
+                     filter_symbols=None):
+    """
+    The trades of [start_date, end_date] of a request (exchange / downloaded symbols) as one
+    memory-mapped table, optionally filtered (filter_symbols, [start, end) trade times)
+    """
+    paths = ret_trade_output_paths(cache_root, exchange, symbols, start_date, end_date)
+    return TradeFilesReader(paths, filter_symbols, start, end, columns).read_table()
@@ -8,34 +8,48 @@ from pathlib import Path
 from tardis_client import TardisClient, Channel
 import pandas as pd
 
+from tardis_cache import request_cache_key
+from tardis_metrics import iter_timed_async_msgs
+
 @dataclass(frozen=True)
 class DownloadRequest:
     date : str
     exchange : str
-    msg_type : str
+    msg_type : str  # Tardis channel (or channels, comma separated)
     symbols : List[str]
     cache_root_path : str
     api_key : str
     
 
+def ret_request_cache_path(request : DownloadRequest):
+    """
+    Cache dir of a request (created if needed): same request => same dir
+    """
+    path = Path(request.cache_root_path) / request_cache_key(request)
+    makedirs(path, exist_ok=True)
+    return path
+
+
 class TardisGenerator:
-    def __init__(self, request : DownloadRequest):
+    # decode_response=False yields raw (timestamp, message) bytes: enough to force the download
+    # from_date / to_date (ISO, UTC, minute precision): a window of the day instead of the whole day
+    # (same cache dir: the minute slices of every window are cached together)
+    def __init__(self, request : DownloadRequest, decode_response : bool = True, from_date : str = None,
+                 to_date : str = None):
         self._build_cache_path(request)
 
         client = TardisClient(api_key=request.api_key,cache_dir=self.path)
-        self.messages = client.replay(
+        # waits for each message (download + decode) go to the 'download' stage of the run metrics
+        self.messages = iter_timed_async_msgs(client.replay(
             exchange = request.exchange,
-            from_date = self._today_str(request.date),
-            to_date = self._tomorrow_str(request.date),
-            filters = [Channel(name=request.msg_type, symbols=request.symbols)]) 
+            from_date = from_date if from_date is not None else self._today_str(request.date),
+            to_date = to_date if to_date is not None else self._tomorrow_str(request.date),
+            filters = [Channel(name=name, symbols=request.symbols) for name in request.msg_type.split(',')],
+            decode_response = decode_response))
 
-    # This could probably be simplified a bit
+    # Same request => same cache dir, so earlier downloads and parsed output are reused
     def _build_cache_path(self, request : DownloadRequest):
-         now = pd.Timestamp.now().strftime('%Y%m%d%H%M%S')
-         date_str = pd.Timestamp(request.date).strftime('%Y%m%d') 
-         new_cache_dir_lbl = request.exchange + date_str + '_' + now
-         self.path = Path(request.cache_root_path) / new_cache_dir_lbl
-         makedirs(self.path)
+         self.path = ret_request_cache_path(request)
     
     def _today_str(self, date : str):
         return pd.Timestamp(date).strftime('%Y-%m-%d')
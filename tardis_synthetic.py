@@ -0,0 +1,167 @@
+import json
+import os
+import random
+import time
+
+import pandas as pd
+
+from gzip_helpers import gzip_impl
+from tardis_msg_normalization import examples_dict
+
+### Synthetic Tardis Caches
+# Offline stand-in for the Tardis download: <root>/feeds/<exch>/synthetic/YYYY/MM/DD/HH/MM.json.gz
+# minute files in the cached line format (<28 char local timestamp> <json message>), with
+# trade messages shaped like each exchange's feed (see trade_msgs_shape_dict):
+# -> prices random walk from base_prices, sizes / sides / trades per message are random
+# -> ids are sequential per exchange, trade times trail the local timestamps by a few ms
+# -> about non_trade_ratio of the lines are messages without trades (heartbeats)
+# Same arguments => same files (seeded), so benchmark runs are comparable
+
+base_prices = {'bitmex': 45000.5, 'binance': 45000.0, 'binance-futures': 3000.0, 'binance-delivery': 45000.0,
+               'okex-swap': 45000.0, 'okex-futures': 45000.0, 'huobi': 45000.0, 'huobi-dm': 45000.0,
+               'huobi-dm-swap': 45000.0, 'ftx': 45000.0, 'coinbase': 45000.0, 'kraken': 45000.0,
+               'deribit': 3000.0}
+max_trades_per_msg = 3
+default_non_trade_ratio = 0.01
+default_date = '2021-08-10'
+
+
+def ret_iso_str(t, decimals=3, suffix='Z'):
+    """
+    Epoch ns -> ISO-8601 string with decimals digits of fraction
+    """
+    return time.strftime('%Y-%m-%dT%H:%M:%S.', time.gmtime(t // 10**9)) + ('%09d' % (t % 10**9))[:decimals] + suffix
+
+
+def ret_local_timestamp_str(t):
+    return ret_iso_str(t, 7)
+
+
+class SyntheticTradeMsgs:
+    """
+    Callable: (local time as epoch ns, rng) -> one synthetic trade message (as a JSON-able object) of an exchange
+    """
+
+    def __init__(self, exch, symbol=None):
+        self.exch = exch
+        self.symbol = symbol if symbol is not None else examples_dict[exch]['dl_symbols'][0]
+        self.px = base_prices[exch]
+        self.trd_id = 0
+
+    def _trades(self, t, rng, max_trades):
+        trades = []
+        for _ in range(rng.randint(1, max_trades)):
+            self.px = round(max(self.px + rng.choice([-0.5, 0.0, 0.0, 0.5]), 0.5), 1)
+            self.trd_id += 1
+            trades.append((t - rng.randint(0, 5)*1000000, self.trd_id, self.px,
+                           rng.choice(['buy', 'sell']), round(rng.uniform(0.001, 2.0), 3)))
+        return trades
+
+    def __call__(self, t, rng):
+        exch = self.exch
+        symbol = self.symbol
+        ms = lambda trd_time: trd_time // 1000000
+
+        if exch.startswith('binance'):
+            trd_time, trd_id, px, side, qty = self._trades(t, rng, 1)[0]
+            data = {'e': 'trade', 'E': ms(t), 'T': ms(trd_time), 's': symbol.upper(), 't': trd_id,
+                    'p': '%.2f' % px, 'q': '%.3f' % qty, 'm': side == 'sell'}
+            if exch == 'binance':
+                data.update({'b': 2*trd_id, 'a': 2*trd_id + 1, 'M': True})
+            else:
+                data['X'] = 'MARKET'
+            return {'stream': symbol.lower()+'@trade', 'data': data}
+
+        # Coinbase match messages hold one trade each
+        trades = self._trades(t, rng, 1 if exch == 'coinbase' else max_trades_per_msg)
+        if exch == 'bitmex':
+            return {'table': 'trade', 'action': 'insert',
+                    'data': [{'timestamp': ret_iso_str(trd_time), 'symbol': symbol, 'side': side.capitalize(),
+                              'size': int(qty*1000), 'price': px, 'tickDirection': 'ZeroPlusTick',
+                              'trdMatchID': '%032x' % trd_id, 'grossValue': int(qty*1000/px*1e8),
+                              'homeNotional': qty/px, 'foreignNotional': int(qty*1000)}
+                             for trd_time, trd_id, px, side, qty in trades]}
+        if exch.startswith('okex'):
+            qty_key = 'size' if exch == 'okex-swap' else 'qty'
+            return {'table': examples_dict[exch]['dl_dtype'],
+                    'data': [{'side': side, 'trade_id': str(trd_id), 'price': '%.1f' % px, qty_key: str(int(qty*100)),
+                              'instrument_id': symbol, 'timestamp': ret_iso_str(trd_time)}
+                             for trd_time, trd_id, px, side, qty in trades]}
+        if exch == 'huobi':
+            return {'ch': 'market.'+symbol+'.trade.detail', 'ts': ms(t),
+                    'tick': {'id': trades[0][1], 'ts': ms(t),
+                             'data': [{'id': trd_id*10000, 'ts': ms(trd_time), 'tradeId': trd_id, 'amount': qty,
+                                       'price': px, 'direction': side}
+                                      for trd_time, trd_id, px, side, qty in trades]}}
+        if exch.startswith('huobi-dm'):
+            return {'ch': 'market.'+symbol+'.trade.detail', 'ts': ms(t),
+                    'tick': {'id': trades[0][1], 'ts': ms(t),
+                             'data': [{'amount': int(qty*100), 'quantity': qty*100/px, 'ts': ms(trd_time),
+                                       'id': trd_id*10000, 'price': px, 'direction': side}
+                                      for trd_time, trd_id, px, side, qty in trades]}}
+        if exch == 'ftx':
+            return {'channel': 'trades', 'market': symbol, 'type': 'update',
+                    'data': [{'id': trd_id, 'price': px, 'size': qty, 'side': side, 'liquidation': False,
+                              'time': ret_iso_str(trd_time, 6, '+00:00')}
+                             for trd_time, trd_id, px, side, qty in trades]}
+        if exch == 'coinbase':
+            trd_time, trd_id, px, side, qty = trades[0]
+            return {'type': 'match', 'trade_id': trd_id, 'maker_order_id': '%032x' % (2*trd_id),
+                    'taker_order_id': '%032x' % (2*trd_id + 1), 'side': side, 'size': '%.8f' % qty,
+                    'price': '%.2f' % px, 'product_id': symbol, 'sequence': 1000000 + trd_id,
+                    'time': ret_iso_str(trd_time, 6)}
+        if exch == 'deribit':
+            return {'jsonrpc': '2.0', 'method': 'subscription',
+                    'params': {'channel': 'trades.'+symbol+'.raw',
+                               'data': [{'trade_seq': trd_id, 'trade_id': 'ETH-'+str(trd_id), 'timestamp': ms(trd_time),
+                                         'tick_direction': trd_id % 4, 'price': px, 'mark_price': px + 0.05,
+                                         'instrument_name': symbol, 'index_price': px - 0.1, 'direction': side,
+                                         'amount': float(int(qty*10) + 1)}
+                                        for trd_time, trd_id, px, side, qty in trades]}}
+        if exch == 'kraken':
+            return [321, [['%.5f' % px, '%.8f' % qty, '%d.%06d' % (trd_time // 10**9, trd_time // 1000 % 10**6),
+                           side[0], rng.choice(['m', 'l']), '']
+                          for trd_time, trd_id, px, side, qty in trades], 'trade', symbol]
+        raise ValueError('No synthetic messages for exchange: '+exch)
+
+
+def ret_synthetic_cache_dir(root, exch, date):
+    return os.path.join(root, 'feeds', exch, 'synthetic', pd.Timestamp(date).strftime('%Y/%m/%d'))
+
+
+def write_synthetic_cache(root, exch, date, num_msgs, hours=1, seed=0, non_trade_ratio=default_non_trade_ratio):
+    """
+    Write num_msgs cached lines of exch, spread evenly over the first hours of date,
+    into hourly sub-directories of minute .json.gz files under root (see ret_synthetic_cache_dir)
+    Returns list of the files written
+    """
+    rng = random.Random(seed)
+    msgs = SyntheticTradeMsgs(exch)
+    start = pd.Timestamp(date, tz='UTC').value
+    step_ns = hours*3600*10**9 // max(num_msgs, 1)
+    dir_path = ret_synthetic_cache_dir(root, exch, date)
+
+    file_paths = []
+    f = None
+    file_minute = None
+    try:
+        for i in range(num_msgs):
+            t = start + i*step_ns + rng.randint(0, 99)
+            minute = (t - start) // (60*10**9)
+            if minute != file_minute:
+                if f is not None:
+                    f.close()
+                hour_dir = os.path.join(dir_path, '%02d' % (minute // 60))
+                os.makedirs(hour_dir, exist_ok=True)
+                file_paths.append(os.path.join(hour_dir, '%02d.json.gz' % (minute % 60)))
+                f = gzip_impl.open(file_paths[-1], 'wb')
+                file_minute = minute
+            if rng.random() < non_trade_ratio:
+                message = {'type': 'heartbeat', 'time': ret_iso_str(t, 6)}
+            else:
+                message = msgs(t, rng)
+            f.write((ret_local_timestamp_str(t)+' '+json.dumps(message, separators=(',', ':'))+'\n').encode())
+    finally:
+        if f is not None:
+            f.close()
+    return file_paths
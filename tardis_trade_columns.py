@@ -0,0 +1,237 @@
+from array import array
+from decimal import Decimal
+
+import numpy as np
+import pyarrow as pa
+
+from tardis_trade_extractors import ret_trade_extractor
+from tardis_metrics import ret_metrics
+from tardis_msg_normalization import trades_norm_dict, local_timestamp_col, local_timestamp_width, extras_col, \
+    parse_tardis_local_timestamps, timestamp_ns_utc, dictionary_cols, dictionary_type
+
+### Growable Column Buffers
+# Each trade is appended straight into typed per-column buffers, so a cached
+# .json.gz file only has to be decompressed and parsed once (no pre-count).
+# Values are converted once, to the type declared in trades_norm_dict,
+# and the finished buffers become typed Arrow columns (no object arrays);
+# strings are interned while parsing, dictionary_cols stay dictionary encoded
+
+array_typecodes = {float: 'd', int: 'q', bool: 'b'}
+numpy_dtypes = {float: np.float64, int: np.int64, bool: np.bool_}
+arrow_types = {float: pa.float64(), int: pa.int64(), bool: pa.bool_(), str: pa.string()}
+
+
+def to_bool(value):
+    if type(value) is str:
+        return value.lower() in ('true', '1')
+    return bool(value)
+
+
+def to_int(value):
+    """
+    Exact int of an int, an integral float or a numeric string ('5', '5.0', '1e3')
+    ValueError if the value is not integral (never truncated)
+    """
+    if type(value) is int:
+        return value
+    if type(value) is str:
+        try:
+            return int(value)
+        except ValueError:
+            value = Decimal(value)
+    integral = int(value)
+    if integral != value:
+        raise ValueError('Not an integer: '+str(value))
+    return integral
+
+converters = {float: float, int: to_int, bool: to_bool}
+
+
+class NumericColumnBuffer:
+    """
+    Growable float64 / int64 / bool column backed by an array.array
+    Ints are kept exact (never go through float64): numeric strings are
+    parsed as integers, or as decimals if they are written like '1e3' / '5.0'
+    Missing ints / bools are stored as 0 / False and their row numbers kept in
+    null_rows (they become nulls of the Arrow column, through its validity
+    bitmap, so every batch of an exchange has the same schema)
+    Missing floats are NaN
+    Values that do not convert exactly (non-integral or out of int64 range ints,
+    non numeric strings) are stored as missing and counted in the run metrics
+    (skipped_values/<type>)
+    """
+
+    def __init__(self, py_type):
+        self.py_type = py_type
+        self.convert = converters[py_type]
+        self.values = array(array_typecodes[py_type])
+        self.null_rows = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def append_null(self):
+        if self.py_type is float:
+            self.values.append(np.nan)
+        else:
+            self.null_rows.append(len(self.values))
+            self.values.append(0)
+
+    def append(self, value):
+        if value is None:
+            self.append_null()
+            return
+        try:
+            self.values.append(self.convert(value))
+        except (ValueError, TypeError, ArithmeticError):
+            # ArithmeticError: out of int64 range (OverflowError), invalid decimal strings
+            ret_metrics().count('skipped_values/'+self.py_type.__name__)
+            self.append_null()
+
+    def to_arrow(self):
+        arr = np.frombuffer(self.values, dtype=numpy_dtypes[self.py_type]).copy()
+        mask = None
+        if len(self.null_rows) > 0:
+            mask = np.zeros(len(arr), dtype=np.bool_)
+            mask[self.null_rows] = True
+        return pa.array(arr, mask=mask, type=arrow_types[self.py_type])
+
+
+class StringColumnBuffer:
+    """
+    Growable dictionary encoded string column:
+    int32 codes (-1 = missing) plus the list of distinct strings
+    With dictionary=True, to_arrow keeps the encoding (Arrow dictionary array),
+    otherwise it returns a plain string array
+    """
+
+    def __init__(self, dictionary=False):
+        self.dictionary = dictionary
+        self.codes = array('i')
+        self.categories = []
+        self.lookup = {}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def append(self, value):
+        if value is None:
+            self.codes.append(-1)
+            return
+        value = str(value)
+        code = self.lookup.get(value)
+        if code is None:
+            code = len(self.categories)
+            self.lookup[value] = code
+            self.categories.append(value)
+        self.codes.append(code)
+
+    def to_arrow(self):
+        codes = np.frombuffer(self.codes, dtype=np.int32)
+        dict_arr = pa.DictionaryArray.from_arrays(pa.array(codes, mask=(codes < 0), type=pa.int32()),
+                                                  pa.array(self.categories, type=pa.string()))
+        if self.dictionary:
+            return dict_arr
+        return dict_arr.dictionary_decode()
+
+
+class LocalTimestampBuffer:
+    """
+    Growable column of raw 28 byte Tardis local timestamps (one line prefix per trade),
+    parsed to timestamp[ns, UTC] in one vectorised pass by to_arrow
+    """
+
+    def __init__(self):
+        self.buf = bytearray()
+        self.null_rows = []
+
+    def __len__(self):
+        return len(self.buf) // local_timestamp_width
+
+    def append(self, value):
+        if value is None or len(value) != local_timestamp_width:
+            self.null_rows.append(len(self))
+            self.buf += bytes(local_timestamp_width)
+        else:
+            self.buf += value
+
+    def to_arrow(self):
+        num_rows = len(self)
+        ns = parse_tardis_local_timestamps(self.buf, num_rows) if num_rows > 0 else np.zeros(0, dtype=np.int64)
+        mask = None
+        if len(self.null_rows) > 0:
+            mask = np.zeros(num_rows, dtype=np.bool_)
+            mask[self.null_rows] = True
+        return pa.array(ns, mask=mask, type=pa.int64()).cast(timestamp_ns_utc)
+
+
+class TradeColumnBuffers:
+    """
+    One growable column per field of trades_norm_dict[exch], filled straight from
+    a Tardis message by the exchange's TradeExtractor (append_msg / append_rows),
+    plus the Tardis local timestamp of the line each trade came from
+    Missing fields become nulls and (with keep_extras) fields no column exists for
+    are kept as JSON in the extras column (see TradeExtractor)
+    """
+
+    def __init__(self, exch, keep_extras=False):
+        self.exch = exch
+        self.keep_extras = keep_extras
+        self.fields = list(trades_norm_dict[exch].keys())
+        self.extractor = ret_trade_extractor(exch, keep_extras)
+        self.schema = pa.schema([(col_name, dictionary_type if col_type is str and col_name in dictionary_cols
+                                  else arrow_types[col_type])
+                                 for col_name, col_type in trades_norm_dict[exch].values()]
+                                + [(local_timestamp_col, timestamp_ns_utc)]
+                                + ([(extras_col, pa.string())] if keep_extras else []))
+        self.reset()
+
+    def reset(self):
+        self.columns = {}
+        for field, (col_name, col_type) in trades_norm_dict[self.exch].items():
+            if col_type is str:
+                self.columns[field] = StringColumnBuffer(col_name in dictionary_cols)
+            else:
+                self.columns[field] = NumericColumnBuffer(col_type)
+        if self.keep_extras:
+            self.columns[extras_col] = StringColumnBuffer()
+        self._row_appenders = [self.columns[field].append for field in self.extractor.row_fields]
+        self.local_timestamps = LocalTimestampBuffer()
+        self.num_rows = 0
+
+    def __len__(self):
+        return self.num_rows
+
+    def append_msg(self, message, local_timestamp=None):
+        """
+        Append all trades of one decoded Tardis message
+        Returns number of trades appended
+        """
+        return self.append_rows(self.extractor(message), local_timestamp)
+
+    def append_rows(self, rows, local_timestamp=None):
+        """
+        Append trade rows built by self.extractor (values in extractor.row_fields order)
+        Returns number of trades appended
+        """
+        for row in rows:
+            for append, value in zip(self._row_appenders, row):
+                append(value)
+            self.local_timestamps.append(local_timestamp)
+        self.num_rows += len(rows)
+        return len(rows)
+
+    def to_table(self):
+        return pa.Table.from_arrays([self.columns[field].to_arrow() for field in self.fields]
+                                    + [self.local_timestamps.to_arrow()]
+                                    + ([self.columns[extras_col].to_arrow()] if self.keep_extras else []),
+                                    schema=self.schema)
+
+    def flush(self):
+        """
+        Return the buffered rows as a table and start over with empty buffers
+        (keeps memory bounded when streaming)
+        """
+        table = self.to_table()
+        self.reset()
+        return table
@@ -0,0 +1,168 @@
+import json
+
+from tardis_msg_normalization import trades_norm_dict, trade_msgs_shape_dict, extras_col
+from tardis_metrics import ret_metrics
+
+### Per-Exchange Trade Extractors
+# Built once per exchange from trade_msgs_shape_dict + trades_norm_dict:
+# -> no if-chain guessing the message shape on every line
+# -> trade values are read straight into row slots (no copy / mutation of the
+#    decoded dicts, no re-keying of Kraken's list trades)
+# Rows hold the values in extractor.row_fields order: the trade's own fields
+# first, then the ones filled from the enclosing message, then never-present ones
+# (and with keep_extras, the JSON of the unknown fields last)
+
+missing_keys = (KeyError, IndexError, TypeError)
+
+
+class TradeExtractor:
+    """
+    Callable: decoded Tardis message -> list of trade rows (lists of raw values)
+    count(message) -> # of trades, without building the rows
+    With keep_extras, each row ends with the JSON of the trade's fields missing
+    from trades_norm_dict (None if it has none)
+    """
+
+    def __init__(self, exch, keep_extras=False):
+        shape = trade_msgs_shape_dict[exch]
+        fields = list(trades_norm_dict[exch].keys())
+
+        self.exch = exch
+        self.keep_extras = keep_extras
+        self.match = shape.get('match', [])
+        self.path = shape.get('path', [])
+        self.msg_fields = [(field, key, transform) for field, (key, transform) in shape.get('msg_fields', {}).items()
+                           if field in fields]
+
+        msg_field_names = [field for field, key, transform in self.msg_fields]
+        self.list_trades = 'row_fields' in shape
+        if self.list_trades:
+            self.trade_keys = [i for i, field in enumerate(shape['row_fields']) if field in fields]
+            trade_field_names = [shape['row_fields'][i] for i in self.trade_keys]
+        else:
+            trade_field_names = [field for field in fields if field not in msg_field_names]
+            self.trade_keys = trade_field_names
+        self.trade_fields_slice = len(self.trade_keys) == len(shape.get('row_fields', [])) \
+            and self.trade_keys == list(range(len(self.trade_keys)))
+
+        known = trade_field_names + msg_field_names
+        self.num_missing = len([field for field in fields if field not in known])
+        self.row_fields = known + [field for field in fields if field not in known]
+        self.known_keys = set(self.trade_keys)
+        self.row_len = len(shape.get('row_fields', []))
+        if keep_extras:
+            self.row_fields.append(extras_col)
+        # slot of the symbol column in the rows (None if the exchange has none)
+        symbol_fields = [field for field in self.row_fields
+                         if field in trades_norm_dict[exch] and trades_norm_dict[exch][field][0] == 'symbol']
+        self.symbol_slot = self.row_fields.index(symbol_fields[0]) if len(symbol_fields) > 0 else None
+
+    def ret_trades(self, message):
+        """
+        The trade container of a message (dict or list), None if it holds no trades
+        """
+        try:
+            for key, value in self.match:
+                if message[key] != value:
+                    return None
+            for key in self.path:
+                message = message[key]
+        except missing_keys:
+            return None
+        return message
+
+    def ret_skip_reason(self, message):
+        """
+        Why a message holds no trades: 'match' (not a trade message), 'path' (no trade container),
+        'shape' (container is not a dict / list), 'empty' (no trades in it), None if it holds some
+        """
+        try:
+            for key, value in self.match:
+                if message[key] != value:
+                    return 'match'
+        except missing_keys:
+            return 'match'
+        try:
+            for key in self.path:
+                message = message[key]
+        except missing_keys:
+            return 'path'
+        if type(message) not in (dict, list):
+            return 'shape'
+        return 'empty' if len(message) == 0 else None
+
+    def count_skipped(self, message):
+        """
+        Count a message without trades in the run metrics (skipped_msgs/<exch>/<reason>)
+        """
+        ret_metrics().count('skipped_msgs/'+self.exch+'/'+str(self.ret_skip_reason(message)))
+
+    def count(self, message):
+        trades = self.ret_trades(message)
+        if type(trades) is dict:
+            return 1 if len(trades) > 0 else 0
+        if type(trades) is list:
+            return len(trades)
+        return 0
+
+    def ret_msg_values(self, message):
+        values = []
+        for field, key, transform in self.msg_fields:
+            try:
+                value = message[key]
+            except missing_keys:
+                value = None
+            else:
+                if transform is not None:
+                    value = transform(value)
+            values.append(value)
+        return values + [None]*self.num_missing
+
+    def ret_extras(self, trade):
+        """
+        JSON of the trade fields no column exists for (None if there are none)
+        """
+        if self.list_trades:
+            if len(trade) <= self.row_len:
+                return None
+            return json.dumps(trade[self.row_len:])
+        if trade.keys() <= self.known_keys:
+            return None
+        return json.dumps({key: value for key, value in trade.items() if key not in self.known_keys})
+
+    def __call__(self, message):
+        trades = self.ret_trades(message)
+        if type(trades) is dict:
+            if len(trades) == 0:
+                return []
+            trades = [trades]
+        elif type(trades) is not list or len(trades) == 0:
+            return []
+
+        msg_values = self.ret_msg_values(message)
+        if self.keep_extras:
+            return [row + [self.ret_extras(trade)] for row, trade in zip(self.ret_rows(trades, msg_values), trades)]
+        return self.ret_rows(trades, msg_values)
+
+    def ret_rows(self, trades, msg_values):
+        if self.list_trades:
+            if self.trade_fields_slice:
+                n = len(self.trade_keys)
+                return [(trade[:n] if len(trade) >= n else trade + [None]*(n-len(trade))) + msg_values
+                        for trade in trades]
+            return [[trade[i] for i in self.trade_keys] + msg_values for trade in trades]
+        keys = self.trade_keys
+        return [list(map(trade.get, keys)) + msg_values for trade in trades]
+
+
+trade_extractors = {}
+
+
+def ret_trade_extractor(exch, keep_extras=False):
+    """
+    The (cached) TradeExtractor of an exchange
+    """
+    extractor = trade_extractors.get((exch, keep_extras))
+    if extractor is None:
+        extractor = trade_extractors[(exch, keep_extras)] = TradeExtractor(exch, keep_extras)
+    return extractor
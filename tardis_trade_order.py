@@ -0,0 +1,159 @@
+from dataclasses import dataclass, field
+from typing import List
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from tardis_msg_normalization import trade_ids_dict
+
+### Trade Ordering, Deduplication & Gap Detection
+# Post-parse stage over the (hourly) tables of one day, in streaming form:
+# -> each table is merged with the rows carried over from the previous one, sorted by
+#    (trd_time, symbol, trade id) with Arrow's stable sort, and rows repeating the
+#    (symbol, trade id) of the previous row are dropped
+# -> rows older than the newest trd_time - carry_sec go out, the others are carried into
+#    the next table (replays overlap at hour boundaries)
+# -> exchanges with sequential trade ids (trade_ids_dict) get per-symbol gap reports
+# Only one table + the carried rows are in memory at a time
+
+default_carry_sec = 60
+max_reported_gaps = 100
+
+
+@dataclass
+class TradeOrderReport:
+    rows_in : int = 0
+    rows_out : int = 0
+    duplicates : int = 0
+    late_rows : int = 0
+    num_gaps : int = 0
+    missing_ids : int = 0
+    gaps : List[tuple] = field(default_factory=list)
+
+    def add_gap(self, symbol, last_id, next_id):
+        self.num_gaps += 1
+        self.missing_ids += next_id - last_id - 1
+        if len(self.gaps) < max_reported_gaps:
+            self.gaps.append((symbol, last_id, next_id))
+
+    def report(self):
+        msg = 'trades in: '+str(self.rows_in)+' | out: '+str(self.rows_out)
+        msg += ' | duplicates dropped: '+str(self.duplicates)
+        msg += ' | late (out of order by more than the carry window): '+str(self.late_rows)
+        msg += ' | id gaps: '+str(self.num_gaps)+' ('+str(self.missing_ids)+' missing ids)'
+        for symbol, last_id, next_id in self.gaps:
+            msg += '\n-> '+str(symbol)+': '+str(last_id)+' -> '+str(next_id)
+        if self.num_gaps > len(self.gaps):
+            msg += '\n-> ...'
+        return msg
+
+
+def ret_symbol_codes(table):
+    """
+    Symbol column as int32 codes to sort / compare on (table dictionaries must be unified)
+    """
+    if 'symbol' not in table.column_names:
+        return pa.array(np.zeros(len(table), dtype=np.int32))
+    symbols = table['symbol'].combine_chunks()
+    if pa.types.is_dictionary(symbols.type):
+        return symbols.indices
+    return pc.dictionary_encode(symbols).indices
+
+
+def sort_and_dedupe(table, id_col, report):
+    """
+    Sort by (trd_time, symbol, id_col) and drop the rows repeating the previous row's (symbol, id_col)
+    """
+    table = table.unify_dictionaries().combine_chunks()
+    keys = pa.table({'time': table['trd_time'], 'symbol': ret_symbol_codes(table)})
+    if id_col is not None:
+        keys = keys.append_column('id', table[id_col])
+    indices = pc.sort_indices(keys, sort_keys=[(name, 'ascending') for name in keys.column_names])
+    table = table.take(indices)
+    if id_col is None or len(table) < 2:
+        return table
+
+    keys = keys.take(indices)
+    n = len(table)
+    same = pc.and_(pc.equal(keys['symbol'].slice(1), keys['symbol'].slice(0, n-1)),
+                   pc.equal(keys['id'].slice(1), keys['id'].slice(0, n-1)))
+    duplicate = np.concatenate([[False], pc.fill_null(same, False).to_numpy(zero_copy_only=False)])
+    report.duplicates += int(duplicate.sum())
+    return table.filter(pa.array(~duplicate))
+
+
+def check_id_gaps(table, id_col, last_ids, report):
+    """
+    Report the ids missing from each symbol's sequence in table (sorted per symbol),
+    and between the previous tables (last_ids: {symbol: highest id so far}) and this one
+    """
+    ids = table[id_col].combine_chunks()
+    valid = pc.is_valid(ids).to_numpy(zero_copy_only=False)
+    symbols = table['symbol'].combine_chunks() if 'symbol' in table.column_names else None
+    codes = ret_symbol_codes(table).to_numpy(zero_copy_only=False)[valid]
+    ids = pc.fill_null(ids, 0).to_numpy(zero_copy_only=False)[valid]
+    if len(ids) == 0:
+        return
+
+    order = np.lexsort((ids, codes))
+    codes = codes[order]
+    ids = ids[order]
+    first = np.concatenate([[True], codes[1:] != codes[:-1]])
+    last = np.concatenate([codes[1:] != codes[:-1], [True]])
+
+    def symbol_of(code):
+        if symbols is None:
+            return None
+        return (symbols.dictionary if pa.types.is_dictionary(symbols.type) else pc.unique(symbols))[int(code)].as_py()
+
+    for pos in np.nonzero(first)[0]:
+        symbol = symbol_of(codes[pos])
+        if symbol in last_ids and ids[pos] > last_ids[symbol] + 1:
+            report.add_gap(symbol, int(last_ids[symbol]), int(ids[pos]))
+    for pos in np.nonzero(~first & (np.diff(ids, prepend=0) > 1))[0]:
+        report.add_gap(symbol_of(codes[pos]), int(ids[pos-1]), int(ids[pos]))
+    for pos in np.nonzero(last)[0]:
+        symbol = symbol_of(codes[pos])
+        last_ids[symbol] = max(last_ids.get(symbol, ids[pos]), ids[pos])
+
+
+def iter_ordered_tables(items, exch, report, carry_sec=default_carry_sec):
+    """
+    Sort, dedupe and gap-check a stream of (label, table) of one exchange, in time order
+    Yields (label of the last table consumed, table ready to be written)
+    """
+    id_col, sequential = trade_ids_dict.get(exch, (None, False))
+    check_gaps = sequential and id_col is not None
+    carry = None
+    watermark = None
+    last_ids = {}
+    label = None
+
+    for label, table in items:
+        report.rows_in += len(table)
+        if watermark is not None:
+            report.late_rows += pc.sum(pc.less(table['trd_time'], watermark)).as_py() or 0
+        if carry is not None:
+            table = pa.concat_tables([carry, table])
+        table = sort_and_dedupe(table, id_col, report)
+
+        max_time = pc.max(table['trd_time'])
+        if not max_time.is_valid:
+            carry = table
+            continue
+        watermark = pa.scalar(max_time.value - int(carry_sec*1e9), table.schema.field('trd_time').type)
+        num_out = pc.sum(pc.less(table['trd_time'], watermark)).as_py() or 0
+        out = table.slice(0, num_out)
+        carry = table.slice(num_out)
+
+        if check_gaps and len(out) > 0:
+            check_id_gaps(out, id_col, last_ids, report)
+        report.rows_out += len(out)
+        yield label, out
+
+    if carry is not None:
+        if check_gaps and len(carry) > 0:
+            check_id_gaps(carry, id_col, last_ids, report)
+        report.rows_out += len(carry)
+        yield label, carry
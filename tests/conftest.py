@@ -0,0 +1,36 @@
+import os
+import sys
+
+import pytest
+
+# the package is flat top-level modules: tests import them from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gzip_helpers import iter_gzip_lines
+from json_helpers import parse_msg_line
+from tardis_msg_normalization import normalize_table_timestamps
+from tardis_synthetic import write_synthetic_cache, default_date
+from tardis_trade_columns import TradeColumnBuffers
+
+
+def ret_synthetic_lines(root, exch, num_msgs, hours=1, seed=0):
+    """
+    Cached lines of a synthetic cache written under root (see tardis_synthetic)
+    """
+    file_paths = write_synthetic_cache(str(root), exch, default_date, num_msgs, hours, seed)
+    return [l for f in file_paths for l in iter_gzip_lines(f)]
+
+
+def ret_synthetic_trades(root, exch, num_msgs, hours=1, seed=0):
+    """
+    Normalized trade table of a synthetic cache (parsed in process, without the Cython counter)
+    """
+    col_buffers = TradeColumnBuffers(exch)
+    for l in ret_synthetic_lines(root, exch, num_msgs, hours, seed):
+        col_buffers.append_msg(parse_msg_line(l), l[:l.find(b' ')])
+    return normalize_table_timestamps(col_buffers.to_table(), exch)
+
+
+@pytest.fixture
+def binance_trades(tmp_path):
+    return ret_synthetic_trades(tmp_path, 'binance', 2000)
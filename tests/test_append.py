@@ -0,0 +1,132 @@
+import json
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('tardis_msg_counter', reason='Cython module not built (python setup.py build_ext --inplace)')
+
+import tardis_get_trades
+from feather_helpers import read_feather_table, ret_feather_part_paths
+from tardis_cache import file_sha256
+from tardis_get_trades import ret_append_window, append_safe_lag
+from tardis_request import ret_request_cache_path
+
+from conftest import ret_synthetic_lines
+
+
+def test_window_from_midnight_to_the_end_of_a_past_day():
+    assert ret_append_window('2021-08-10') == ('2021-08-10T00:00:00', '2021-08-11T00:00:00')
+    assert ret_append_window('2021-08-10', until='2021-08-12') == ('2021-08-10T00:00:00', '2021-08-11T00:00:00')
+
+
+def test_window_ends_on_a_full_minute():
+    assert ret_append_window('2021-08-10', '2021-08-10T00:30:00', '2021-08-10T00:30:40') is None
+    assert ret_append_window('2021-08-10', '2021-08-10T00:30:00', '2021-08-10T01:45:30') == \
+        ('2021-08-10T00:30:00', '2021-08-10T01:45:00')
+    # until with a time zone is converted to UTC
+    assert ret_append_window('2021-08-10', None, '2021-08-10T03:00+02:00') == \
+        ('2021-08-10T00:00:00', '2021-08-10T01:00:00')
+    assert ret_append_window('2021-08-10', '2021-08-11T00:00:00') is None
+
+
+def test_window_of_today_stops_before_the_unpublished_minutes():
+    now = pd.Timestamp.now(tz='UTC').tz_localize(None)
+    window = ret_append_window(now.strftime('%Y-%m-%d'), until=now + pd.Timedelta(hours=1))
+    if window is not None:
+        assert pd.Timestamp(window[1]) <= now - append_safe_lag
+
+
+@pytest.fixture
+def fake_tardis(tmp_path, monkeypatch):
+    """
+    TardisGenerator replaying a synthetic day (3 hours of binance trades) window by window
+    Returns the list of the windows requested
+    """
+    lines = ret_synthetic_lines(tmp_path / 'src', 'binance', 6000, hours=3)
+    windows = []
+
+    class FakeGenerator:
+        def __init__(self, request, decode_response=True, from_date=None, to_date=None):
+            self.path = ret_request_cache_path(request)
+            if from_date is not None:
+                windows.append((from_date, to_date))
+            lo = pd.Timestamp(from_date or request.date)
+            hi = pd.Timestamp(to_date) if to_date is not None else lo + pd.Timedelta(days=1)
+
+            async def messages():
+                for l in lines:
+                    local_timestamp = datetime.strptime(l[:26].decode(), '%Y-%m-%dT%H:%M:%S.%f')
+                    if lo <= local_timestamp < hi:
+                        yield local_timestamp, json.loads(l[29:])
+            self.messages = messages()
+
+    monkeypatch.setattr(tardis_get_trades, 'TardisGenerator', FakeGenerator)
+    return windows
+
+
+def run_get_trades(cache_dir, monkeypatch, *args):
+    monkeypatch.setattr(sys, 'argv', ['tardis_get_trades.py', 'binance', '2021-08-10', 'btcusdt',
+                                      '--cache_dir', str(cache_dir), '--api_key', 'key'] + list(args))
+    tardis_get_trades.main()
+
+
+def ret_trade_output_path(cache_dir):
+    request_dir = [d for d in os.listdir(cache_dir) if d.startswith('binance_20210810')][0]
+    return os.path.join(cache_dir, request_dir, 'trd_20210810')
+
+
+def read_trade_output(cache_dir):
+    return read_feather_table(ret_trade_output_path(cache_dir))
+
+
+def test_appended_windows_add_up_to_the_full_day(tmp_path, monkeypatch, fake_tardis):
+    # the fake replay caches no raw files: the whole day is parsed while streamed
+    run_get_trades(tmp_path / 'full', monkeypatch, '--stream')
+    full = read_trade_output(tmp_path / 'full')
+
+    run_get_trades(tmp_path / 'append', monkeypatch, '--append', '--until', '2021-08-10T00:30')
+    day_path = ret_trade_output_path(tmp_path / 'append')
+    day_sha256 = file_sha256(day_path)
+    for until in ['2021-08-10T00:30:40', '2021-08-10T01:45', '2021-08-11T05:00']:
+        run_get_trades(tmp_path / 'append', monkeypatch, '--append', '--until', until)
+    appended = read_trade_output(tmp_path / 'append')
+
+    # the first window's file is left as it is, the next windows are files of their own
+    assert file_sha256(day_path) == day_sha256
+    assert ret_feather_part_paths(day_path) == [day_path, day_path+'.part1', day_path+'.part2']
+
+    assert fake_tardis == [('2021-08-10T00:00:00', '2021-08-10T00:30:00'),
+                           ('2021-08-10T00:30:00', '2021-08-10T01:45:00'),
+                           ('2021-08-10T01:45:00', '2021-08-11T00:00:00')]
+    assert appended['trd_id'].to_pylist() == full['trd_id'].to_pylist()
+    assert appended.num_rows == full.num_rows > 0
+
+    # the day is complete: nothing is fetched again
+    run_get_trades(tmp_path / 'append', monkeypatch, '--append')
+    assert len(fake_tardis) == 3
+
+
+def test_full_run_removes_the_appended_windows(tmp_path, monkeypatch, fake_tardis):
+    for until in ['2021-08-10T00:30', '2021-08-10T01:45']:
+        run_get_trades(tmp_path, monkeypatch, '--append', '--until', until)
+    day_path = ret_trade_output_path(tmp_path)
+    assert ret_feather_part_paths(day_path) == [day_path, day_path+'.part1']
+
+    run_get_trades(tmp_path, monkeypatch, '--stream')
+    assert ret_feather_part_paths(day_path) == [day_path]
+    full = read_trade_output(tmp_path)
+    assert full['trd_time'].to_pandas().max() >= pd.Timestamp('2021-08-10T02:00', tz='UTC')
+    # the rewritten day is complete: no window is appended to it
+    run_get_trades(tmp_path, monkeypatch, '--append')
+    assert len(fake_tardis) == 2
+    assert ret_feather_part_paths(day_path) == [day_path]
+
+
+@pytest.mark.parametrize('option', ['--stream', '--index', '--order'])
+def test_append_rejects_whole_day_options(tmp_path, monkeypatch, fake_tardis, option):
+    with pytest.raises(SystemExit):
+        run_get_trades(tmp_path, monkeypatch, '--append', option)
+    assert fake_tardis == []
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from tardis_bars import BarAggregator, merge_bars, ret_trade_bars, ret_bar_interval_ns
+
+from conftest import ret_synthetic_trades
+
+
+def ret_reference_bars(table, interval):
+    """
+    Bars of a trade table computed with a pandas groupby
+    """
+    df = table.to_pandas()
+    df = df[df.px.notna() & df.qty.notna() & df.trd_time.notna()].sort_values('trd_time', kind='stable')
+    keys = [df.symbol.astype(str), df.trd_time.dt.floor(pd.Timedelta(ret_bar_interval_ns(interval)))]
+    grouped = df.groupby(keys)
+    return pd.DataFrame({'open': grouped.px.first(), 'high': grouped.px.max(), 'low': grouped.px.min(),
+                         'close': grouped.px.last(), 'volume': grouped.qty.sum(), 'num_trades': grouped.px.count(),
+                         'vwap': (df.px*df.qty).groupby(keys).sum() / grouped.qty.sum()})
+
+
+@pytest.mark.parametrize('exch', ['binance', 'bitmex', 'deribit', 'coinbase'])
+@pytest.mark.parametrize('interval', ['1s', '1m'])
+def test_bars_of_chunked_tables_match_pandas(tmp_path, exch, interval):
+    table = ret_synthetic_trades(tmp_path, exch, 3000, hours=1)
+    aggregator = BarAggregator(exch, interval)
+    # uneven chunks: bars cut at chunk boundaries have to be merged
+    for start, end in [(0, 7), (7, 1000), (1000, 1001), (1001, len(table))]:
+        aggregator.add(table.slice(start, end - start))
+    bars = aggregator.to_table().to_pandas()
+    bars = bars.set_index([bars.symbol.astype(str), 'bar_time'])
+    ref = ret_reference_bars(table, interval)
+
+    assert len(bars) == len(ref)
+    for col in ref.columns:
+        assert np.allclose(bars[col].values, ref[col].values), col
+    assert np.allclose(bars.buy_volume + bars.sell_volume, bars.volume)
+
+
+def test_merge_bars_keeps_first_open_and_last_close(tmp_path):
+    table = ret_synthetic_trades(tmp_path, 'binance', 200)
+    interval_ns = ret_bar_interval_ns('1h')
+    # the same trades in two tables given in reverse order
+    bars = merge_bars(pa.concat_tables([ret_trade_bars(table.slice(100), 'binance', interval_ns),
+                                        ret_trade_bars(table.slice(0, 100), 'binance', interval_ns)]))
+
+    assert bars.equals(merge_bars(ret_trade_bars(table, 'binance', interval_ns)))
+    last = bars.to_pandas().iloc[-1]
+    px = table['px'].to_pylist()
+    assert last.close == px[-1]
+    assert last.num_trades == sum(t.value >= last.bar_time for t in table['trd_time'])
+
+
+def test_empty_aggregator_has_the_bar_schema():
+    bars = BarAggregator('binance', '1m').to_table()
+    assert len(bars) == 0
+    assert 'vwap' in bars.column_names and 'bar_time' in bars.column_names
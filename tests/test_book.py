@@ -0,0 +1,174 @@
+import json
+import random
+
+import numpy as np
+import pytest
+
+from tardis_book import BookSampler, BitmexBookParser
+from tardis_synthetic import ret_local_timestamp_str
+
+start_ns = 1628553600*10**9
+symbols = ['S0', 'S1']
+
+
+def ret_book_msgs(exch, changes, snapshot):
+    """
+    Book messages of exch for one update of a symbol: changes {'b' / 'a': [(px, qty)]}, qty 0 = level removed
+    (bitmex: one message per change, book is the symbol's book before the update)
+    """
+    symbol, bids, asks = changes['symbol'], changes['b'], changes['a']
+    str_levels = lambda levels: [[str(px), str(qty)] for px, qty in levels]
+    if exch == 'binance':
+        if snapshot:
+            return [{'stream': symbol.lower()+'@depthSnapshot', 'generated': True,
+                     'data': {'lastUpdateId': changes['seq'], 'bids': str_levels(bids), 'asks': str_levels(asks)}}]
+        return [{'stream': symbol.lower()+'@depth',
+                 'data': {'e': 'depthUpdate', 'E': 0, 's': symbol, 'U': changes['seq'], 'u': changes['seq'],
+                          'b': str_levels(bids), 'a': str_levels(asks)}}]
+    if exch == 'deribit':
+        levels = lambda side: [['delete' if qty == 0 else 'change', px, qty] for px, qty in side]
+        return [{'params': {'channel': 'book.'+symbol+'.raw',
+                            'data': {'type': 'snapshot' if snapshot else 'change', 'instrument_name': symbol,
+                                     'change_id': changes['seq'], 'bids': levels(bids), 'asks': levels(asks)}}}]
+    if exch == 'huobi-dm':
+        ch = 'market.'+symbol+'.depth.size_150.high_freq'
+        return [{'ch': ch, 'ts': 0,
+                 'tick': {'event': 'snapshot' if snapshot else 'update', 'ch': ch, 'version': changes['seq'],
+                          'bids': [list(level) for level in bids], 'asks': [list(level) for level in asks]}}]
+    if exch == 'coinbase':
+        if snapshot:
+            return [{'type': 'snapshot', 'product_id': symbol, 'bids': str_levels(bids), 'asks': str_levels(asks)}]
+        return [{'type': 'l2update', 'product_id': symbol,
+                 'changes': [['buy', str(px), str(qty)] for px, qty in bids]
+                            + [['sell', str(px), str(qty)] for px, qty in asks]}]
+    if exch == 'bitmex':
+        level_id = lambda px: int(px*10) + symbols.index(symbol)*100000
+        if snapshot:
+            return [{'table': 'orderBookL2', 'action': 'partial',
+                     'data': [{'symbol': symbol, 'id': level_id(px), 'side': side, 'size': qty, 'price': px}
+                              for side, levels in (('Buy', bids), ('Sell', asks)) for px, qty in levels]}]
+        msgs = []
+        for side, key, levels in (('Buy', 'b', bids), ('Sell', 'a', asks)):
+            book = dict(changes['book'][key])
+            for px, qty in levels:
+                if qty == 0:
+                    if px in book:
+                        msgs.append({'table': 'orderBookL2', 'action': 'delete',
+                                     'data': [{'symbol': symbol, 'id': level_id(px), 'side': side}]})
+                        del book[px]
+                elif px in book:
+                    # bitmex updates carry the level id only, not its price
+                    msgs.append({'table': 'orderBookL2', 'action': 'update',
+                                 'data': [{'symbol': symbol, 'id': level_id(px), 'side': side, 'size': qty}]})
+                    book[px] = qty
+                else:
+                    msgs.append({'table': 'orderBookL2', 'action': 'insert',
+                                 'data': [{'symbol': symbol, 'id': level_id(px), 'side': side, 'size': qty,
+                                           'price': px}]})
+                    book[px] = qty
+        return msgs
+    raise ValueError(exch)
+
+
+def ret_book_lines(exch, num_updates=2000, seed=1):
+    """
+    (cached lines, [(local time ns, {symbol: {'b': {px: qty}, 'a': {px: qty}}} after the line)])
+    of random updates of the books of two symbols
+    """
+    rng = random.Random(seed)
+    books = {}
+    lines = []
+    states = []
+    for i in range(num_updates):
+        t = start_ns + i*37000000
+        symbol = symbols[i % 2]
+        snapshot = symbol not in books
+        if snapshot:
+            bids = [(round(100 - k*0.5, 1), float(rng.randint(1, 9))) for k in range(20)]
+            asks = [(round(100.5 + k*0.5, 1), float(rng.randint(1, 9))) for k in range(20)]
+            books[symbol] = {'b': {}, 'a': {}}
+        else:
+            bids = [(round(100 - rng.randint(0, 25)*0.5, 1), float(rng.choice([0, 0, 1, 2, 3])))
+                    for _ in range(rng.randint(0, 3))]
+            asks = [(round(100.5 + rng.randint(0, 25)*0.5, 1), float(rng.choice([0, 1, 2, 3])))
+                    for _ in range(rng.randint(0, 3))]
+        changes = {'symbol': symbol, 'seq': i, 'b': bids, 'a': asks,
+                   'book': {key: dict(levels) for key, levels in books[symbol].items()}}
+        for message in ret_book_msgs(exch, changes, snapshot):
+            lines.append((ret_local_timestamp_str(t)+' '+json.dumps(message)).encode())
+        for key, levels in (('b', bids), ('a', asks)):
+            for px, qty in levels:
+                if qty == 0:
+                    books[symbol][key].pop(px, None)
+                else:
+                    books[symbol][key][px] = qty
+        states.append((t, {symbol: {key: dict(levels) for key, levels in book.items()}
+                           for symbol, book in books.items()}))
+    return lines, states
+
+
+def ret_top_levels(book, depth):
+    """
+    [bid (px, qty) ...], [ask (px, qty) ...] of the top depth levels of a reference book
+    """
+    return sorted(book['b'].items(), reverse=True)[:depth], sorted(book['a'].items())[:depth]
+
+
+def ret_row_levels(row, depth, num_bids, num_asks):
+    return ([(row['bid_px_'+str(i)], row['bid_qty_'+str(i)]) for i in range(1, num_bids+1)],
+            [(row['ask_px_'+str(i)], row['ask_qty_'+str(i)]) for i in range(1, num_asks+1)])
+
+
+@pytest.mark.parametrize('exch', ['binance', 'deribit', 'huobi-dm', 'coinbase', 'bitmex'])
+def test_last_samples_match_the_reference_books(exch):
+    depth = 5
+    lines, states = ret_book_lines(exch)
+    sampler = BookSampler(exch, depth, None)
+    sampler.add_lines(lines)
+    samples = sampler.flush().to_pandas()
+
+    for symbol in symbols:
+        bids, asks = ret_top_levels(states[-1][1][symbol], depth)
+        row = samples[samples.symbol == symbol].iloc[-1]
+        assert ret_row_levels(row, depth, len(bids), len(asks)) == (bids, asks)
+
+
+@pytest.mark.parametrize('exch', ['binance', 'huobi-dm', 'bitmex'])
+def test_interval_samples_hold_the_book_before_the_sample_time(exch):
+    depth = 3
+    lines, states = ret_book_lines(exch)
+    sampler = BookSampler(exch, depth, '1s')
+    # fed in uneven pieces, as file by file
+    for piece in np.array_split(np.arange(len(lines)), 7):
+        sampler.add_lines([lines[i] for i in piece])
+    samples = sampler.flush().to_pandas()
+
+    times = np.array([t for t, state in states])
+    assert len(samples) > 0
+    assert (samples.sample_time.astype('int64') % 10**9 == 0).all()
+    for _, row in samples.iterrows():
+        state = states[np.searchsorted(times, row.sample_time.value, side='left') - 1][1]
+        bids, asks = ret_top_levels(state[row.symbol], depth)
+        assert ret_row_levels(row, depth, len(bids), len(asks)) == (bids, asks)
+
+
+def test_bitmex_updates_and_deletes_find_their_prices_by_id():
+    parser = BitmexBookParser()
+    partial = {'table': 'orderBookL2', 'action': 'partial',
+               'data': [{'symbol': 'XBTUSD', 'id': 10, 'side': 'Buy', 'size': 5, 'price': 99.5},
+                        {'symbol': 'XBTUSD', 'id': 20, 'side': 'Sell', 'size': 7, 'price': 100.5}]}
+    parser(partial)
+    parser({'table': 'orderBookL2', 'action': 'insert',
+            'data': [{'symbol': 'XBTUSD', 'id': 15, 'side': 'Buy', 'size': 1, 'price': 99.0}]})
+    symbol, snapshot, bids, asks, seq, max_depth = parser(
+        {'table': 'orderBookL2', 'action': 'update',
+         'data': [{'symbol': 'XBTUSD', 'id': 15, 'side': 'Buy', 'size': 3},
+                  {'symbol': 'XBTUSD', 'id': 20, 'side': 'Sell', 'size': 2}]})[0]
+    assert not snapshot
+    assert bids.tolist() == [[99.0, 3.0]]
+    assert asks.tolist() == [[100.5, 2.0]]
+
+    symbol, snapshot, bids, asks, seq, max_depth = parser(
+        {'table': 'orderBookL2', 'action': 'delete', 'data': [{'symbol': 'XBTUSD', 'id': 10, 'side': 'Buy'}]})[0]
+    assert bids.tolist() == [[99.5, 0.0]]
+    assert len(asks) == 0
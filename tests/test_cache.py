@@ -0,0 +1,88 @@
+import gzip
+import json
+import os
+
+from tardis_cache import CacheManifest, evict_lru_cache_dirs, request_cache_key, manifest_file_name, dir_size
+from tardis_request import DownloadRequest, ret_request_cache_path
+from tardis_synthetic import write_synthetic_cache, default_date
+
+from conftest import ret_synthetic_trades
+
+
+def ret_request(root, date=default_date, symbols=('btcusdt',)):
+    return DownloadRequest(date, 'binance', 'trade', list(symbols), str(root), 'key')
+
+
+def test_cache_key_is_the_same_for_any_date_format(tmp_path):
+    key = request_cache_key(ret_request(tmp_path, '2021-08-10'))
+    assert request_cache_key(ret_request(tmp_path, '20210810')) == key
+    assert request_cache_key(ret_request(tmp_path, '2021-08-10T00:00:00')) == key
+    assert request_cache_key(ret_request(tmp_path, '2021-08-10', ['ethusdt'])) != key
+
+
+def test_parsed_hours_are_checked_against_their_raw_files(tmp_path):
+    request = ret_request(tmp_path)
+    cache_dir = ret_request_cache_path(request)
+    file_paths = write_synthetic_cache(str(cache_dir), 'binance', default_date, 500, hours=2)
+    hour_dirs = sorted(set(os.path.dirname(f) for f in file_paths))
+    table = ret_synthetic_trades(tmp_path / 'src', 'binance', 500)
+
+    manifest = CacheManifest(cache_dir, request)
+    for hour_dir in hour_dirs:
+        assert not manifest.has_parsed(hour_dir)
+        manifest.save_parsed(hour_dir, table)
+
+    manifest = CacheManifest(cache_dir, request)
+    assert all(manifest.has_parsed(hour_dir) for hour_dir in hour_dirs)
+    assert manifest.load_parsed(hour_dirs[0]).equals(table)
+
+    # a raw file changed -> only its hour is parsed again
+    with gzip.open(file_paths[-1], 'ab') as f:
+        f.write(b'2021-08-10T01:59:59.0000000Z {}\n')
+    assert [manifest.has_parsed(hour_dir) for hour_dir in hour_dirs] == [True, False]
+
+    # other parsing options -> everything is parsed again
+    assert not CacheManifest(cache_dir, request, options={'keep_extras': True}).has_parsed(hour_dirs[0])
+
+
+def test_output_is_complete_until_changed(tmp_path):
+    request = ret_request(tmp_path)
+    cache_dir = ret_request_cache_path(request)
+    output_path = cache_dir / 'trd_20210810'
+    output_path.write_bytes(b'trades')
+
+    manifest = CacheManifest(cache_dir, request)
+    assert not manifest.is_complete()
+    manifest.save_output(output_path, 10)
+    assert CacheManifest(cache_dir, request).is_complete(output_path)
+    assert not CacheManifest(cache_dir, request).is_complete(cache_dir / 'other')
+    assert not CacheManifest(cache_dir, request, output_options={'order': True}).is_complete(output_path)
+
+    output_path.write_bytes(b'changed')
+    assert not CacheManifest(cache_dir, request).is_complete(output_path)
+
+
+def test_lru_eviction_deletes_the_oldest_dirs_first(tmp_path):
+    cache_dirs = []
+    for i, date in enumerate(['2021-08-10', '2021-08-11', '2021-08-12', '2021-08-13']):
+        request = ret_request(tmp_path / 'root', date)
+        cache_dir = ret_request_cache_path(request)
+        (cache_dir / 'raw').write_bytes(b'x' * 1000)
+        manifest = CacheManifest(cache_dir, request)
+        manifest.data['last_used'] = 1000 + i
+        manifest.save()
+        cache_dirs.append(cache_dir)
+    os.makedirs(tmp_path / 'root' / 'not_a_request_dir')
+    dir_bytes = dir_size(cache_dirs[0])
+
+    # the oldest one is in use: the next oldest go instead
+    deleted = evict_lru_cache_dirs(tmp_path / 'root', 2.5*dir_bytes, keep=[cache_dirs[0]])
+    assert deleted == cache_dirs[1:3]
+    assert sorted(os.listdir(tmp_path / 'root')) == sorted([cache_dirs[0].name, cache_dirs[3].name, 'not_a_request_dir'])
+    assert evict_lru_cache_dirs(tmp_path / 'root', 2.5*dir_bytes) == []
+
+    # used again -> the most recent one
+    CacheManifest(cache_dirs[0], ret_request(tmp_path / 'root', '2021-08-10'))
+    assert evict_lru_cache_dirs(tmp_path / 'root', 1.5*dir_bytes) == [cache_dirs[3]]
+    with open(cache_dirs[0] / manifest_file_name) as f:
+        assert json.load(f)['last_used'] > 1003
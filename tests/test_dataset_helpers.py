@@ -0,0 +1,50 @@
+import os
+
+import pyarrow as pa
+
+from dataset_helpers import DatasetInfo, DatasetStreamWriter, read_trades_dataset, ret_symbol_partition_name
+from tardis_cache import CacheManifest
+from tardis_request import DownloadRequest, ret_request_cache_path
+from tardis_synthetic import default_date
+
+from conftest import ret_synthetic_trades
+
+
+def test_rewritten_symbols_replace_their_partitions(tmp_path):
+    # Kraken's XBT/USD is written as the URI-encoded symbol=XBT%2FUSD directory
+    table = ret_synthetic_trades(tmp_path / 'src', 'kraken', 300)
+    info = DatasetInfo(str(tmp_path / 'dataset'), 'parquet')
+    for _ in range(3):
+        with DatasetStreamWriter(info, 'kraken', default_date) as writer:
+            writer.write(table.slice(0, 100))
+            writer.write(table.slice(100))
+
+    assert writer.parts == [ret_symbol_partition_name('XBT/USD')] == ['symbol=XBT%2FUSD']
+    assert os.listdir(writer.path) == writer.parts
+    assert read_trades_dataset(info.root).num_rows == len(table)
+    assert read_trades_dataset(info.root, symbols=['XBT/USD']).num_rows == len(table)
+
+
+def test_dataset_output_only_hashes_its_own_partitions(tmp_path):
+    request = DownloadRequest(default_date, 'binance', 'trade', ['btcusdt'], str(tmp_path), 'key')
+    cache_dir = ret_request_cache_path(request)
+    table = ret_synthetic_trades(tmp_path / 'src', 'binance', 200)
+    info = DatasetInfo(str(tmp_path / 'dataset'), 'parquet')
+    with DatasetStreamWriter(info, 'binance', default_date) as writer:
+        writer.write(table)
+    manifest = CacheManifest(cache_dir, request)
+    manifest.save_output(writer.path, len(table), writer.parts)
+    assert writer.parts == ['symbol=BTCUSDT']
+
+    # another request writing another symbol of the same exchange / date
+    other = table.set_column(table.schema.get_field_index('symbol'), 'symbol',
+                             pa.array(['ETHUSDT']*len(table)).dictionary_encode())
+    with DatasetStreamWriter(info, 'binance', default_date) as other_writer:
+        other_writer.write(other)
+    assert CacheManifest(cache_dir, request).is_complete(writer.path)
+
+    # rewriting: only this request's partitions are removed
+    removed = CacheManifest(cache_dir, request).remove_output_parts(writer.path)
+    assert [path.name for path in removed] == ['symbol=BTCUSDT']
+    assert sorted(os.listdir(writer.path)) == ['symbol=ETHUSDT']
+    assert not CacheManifest(cache_dir, request).is_complete(writer.path)
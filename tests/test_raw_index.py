@@ -0,0 +1,30 @@
+import os
+
+from gzip_helpers import iter_gzip_lines
+from tardis_cache import file_sha256
+from tardis_raw_index import build_raw_index_dir, iter_indexed_lines, read_raw_index, ret_blocks_path
+from tardis_synthetic import write_synthetic_cache, default_date
+
+
+def test_index_leaves_the_cached_files_unchanged(tmp_path):
+    file_paths = write_synthetic_cache(str(tmp_path), 'binance', default_date, 3000)
+    hashes = [file_sha256(f) for f in file_paths]
+
+    assert build_raw_index_dir(str(tmp_path), 'binance', block_bytes=4096) == len(file_paths)
+    assert build_raw_index_dir(str(tmp_path), 'binance', block_bytes=4096) == 0
+    # TardisClient finds its cached slices as they were written
+    assert [file_sha256(f) for f in file_paths] == hashes
+    assert all(os.path.isfile(ret_blocks_path(f)) for f in file_paths)
+
+
+def test_indexed_lines_of_a_time_range(tmp_path):
+    file_paths = write_synthetic_cache(str(tmp_path), 'binance', default_date, 3000)
+    build_raw_index_dir(str(tmp_path), 'binance', block_bytes=4096)
+    lines = [l for f in file_paths for l in iter_gzip_lines(f)]
+    assert len(read_raw_index(file_paths[0])['blocks']) > 1
+
+    assert list(iter_indexed_lines(file_paths)) == lines
+    start, end = '2021-08-10T00:10:00.0000000Z', '2021-08-10T00:20:30.0000000Z'
+    assert list(iter_indexed_lines(file_paths, start=start, end=end)) == \
+        [l for l in lines if start.encode() <= l[:28] < end.encode()]
+    assert list(iter_indexed_lines(file_paths, symbol='ETHUSDT')) == []
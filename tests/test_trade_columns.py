@@ -0,0 +1,26 @@
+import pytest
+
+from tardis_metrics import reset_metrics
+from tardis_trade_columns import NumericColumnBuffer, to_int
+
+
+@pytest.mark.parametrize('value, expected', [(5, 5), ('5', 5), ('5.0', 5), ('1e3', 1000), (7.0, 7),
+                                             ('9007199254740993', 9007199254740993)])
+def test_to_int_is_exact(value, expected):
+    assert to_int(value) == expected
+
+
+@pytest.mark.parametrize('value', [1.5, '1.5', 'abc'])
+def test_to_int_never_truncates(value):
+    with pytest.raises((ValueError, ArithmeticError)):
+        to_int(value)
+
+
+def test_values_not_converting_exactly_are_nulls_and_counted():
+    metrics = reset_metrics()
+    column = NumericColumnBuffer(int)
+    for value in [1, '2', 2.5, 2**70, None, 'x', '9223372036854775807']:
+        column.append(value)
+
+    assert column.to_arrow().to_pylist() == [1, 2, None, None, None, None, 2**63 - 1]
+    assert metrics.counters == {'skipped_values/int': 3}
@@ -0,0 +1,70 @@
+import json
+import math
+
+from tardis_msg_normalization import extras_col
+from tardis_trade_columns import TradeColumnBuffers
+from tardis_trade_extractors import TradeExtractor
+
+
+def ftx_msg(trades, market='BTC-PERP'):
+    message = {'channel': 'trades', 'type': 'update', 'data': trades}
+    if market is not None:
+        message['market'] = market
+    return message
+
+
+first_trade = {'id': 1, 'price': 45000.5, 'size': 0.1, 'side': 'buy', 'liquidation': False,
+               'time': '2021-08-10T00:00:00.123456+00:00'}
+
+
+def ret_ftx_table(messages, keep_extras=False):
+    col_buffers = TradeColumnBuffers('ftx', keep_extras)
+    for message in messages:
+        col_buffers.append_msg(message, b'2021-08-10T00:00:00.2000000Z')
+    return col_buffers.to_table()
+
+
+def test_fields_are_mapped_by_name_whatever_the_key_order():
+    reordered = {'time': '2021-08-10T00:00:01.000000+00:00', 'side': 'sell', 'liquidation': True,
+                 'size': 2.5, 'price': 45001.0, 'id': 2}
+    table = ret_ftx_table([ftx_msg([first_trade]), ftx_msg([reordered], 'ETH-PERP')])
+
+    assert table['trd_id'].to_pylist() == [1, 2]
+    assert table['px'].to_pylist() == [45000.5, 45001.0]
+    assert table['qty'].to_pylist() == [0.1, 2.5]
+    assert table['trd_aggr_dir'].to_pylist() == ['buy', 'sell']
+    assert table['is_liq?'].to_pylist() == [False, True]
+    assert table['symbol'].to_pylist() == ['BTC-PERP', 'ETH-PERP']
+
+
+def test_missing_fields_are_nulls():
+    partial = {key: value for key, value in first_trade.items() if key not in ('id', 'size')}
+    table = ret_ftx_table([ftx_msg([first_trade]), ftx_msg([partial], market=None)])
+
+    assert table['trd_id'].to_pylist() == [1, None]
+    # missing floats are NaN
+    assert math.isnan(table['qty'][1].as_py())
+    # a missing message-level field (FTX market) is a null, not an empty symbol
+    assert table['symbol'].to_pylist() == ['BTC-PERP', None]
+    assert table['symbol'].combine_chunks().dictionary.to_pylist() == ['BTC-PERP']
+
+
+def test_unknown_fields_go_to_the_extras_column():
+    extra = dict(first_trade, id=2, fee=0.01)
+    messages = [ftx_msg([first_trade]), ftx_msg([extra])]
+
+    assert extras_col not in ret_ftx_table(messages).column_names
+    table = ret_ftx_table(messages, keep_extras=True)
+    assert table[extras_col].to_pylist() == [None, json.dumps({'fee': 0.01})]
+    assert table['trd_id'].to_pylist() == [1, 2]
+
+
+def test_list_trades_are_mapped_by_position():
+    extractor = TradeExtractor('kraken', keep_extras=True)
+    message = [321, [['45000.1', '0.5', '1628553600.123456', 'b', 'l', '', 'extra']], 'trade', 'XBT/USD']
+    rows = extractor(message)
+
+    assert [dict(zip(extractor.row_fields, row)) for row in rows] == \
+        [{'price': '45000.1', 'volume': '0.5', 'time': '1628553600.123456', 'side': 'b', 'orderType': 'l',
+          'misc': '', 'symbol': 'XBT/USD', extras_col: json.dumps(['extra'])}]
+    assert extractor([321, [['45000.1', '0.5', '1628553600.123456', 'b', 'l', '']], 'trade'])[0][-2] is None
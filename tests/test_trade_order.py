@@ -0,0 +1,56 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from tardis_trade_order import TradeOrderReport, iter_ordered_tables
+
+
+def ret_ordered(tables, exch='binance', carry_sec=60):
+    report = TradeOrderReport()
+    out = [table for label, table in iter_ordered_tables(enumerate(tables), exch, report, carry_sec)]
+    return pa.concat_tables(out).unify_dictionaries().combine_chunks(), report
+
+
+def test_overlapping_replays_are_deduped(binance_trades):
+    n = len(binance_trades)
+    # hourly replays overlap a little at their boundaries
+    tables = [binance_trades.slice(0, n//2 + 20), binance_trades.slice(n//2), binance_trades.slice(n - 10)]
+    out, report = ret_ordered(tables)
+
+    assert report.duplicates == 30
+    assert report.rows_in == n + 30
+    assert report.rows_out == n == len(out)
+    assert out['trd_id'].to_pylist() == binance_trades['trd_id'].to_pylist()
+    assert report.num_gaps == 0
+
+
+def test_shuffled_rows_come_out_sorted(binance_trades):
+    shuffled = binance_trades.take(pa.array(np.random.default_rng(0).permutation(len(binance_trades))))
+    out, report = ret_ordered([shuffled.slice(0, 1000), shuffled.slice(1000)], carry_sec=2*3600)
+
+    times = out['trd_time'].to_numpy()
+    assert len(out) == len(binance_trades)
+    assert (np.diff(times.astype(np.int64)) >= 0).all()
+    assert report.duplicates == 0
+
+
+def test_id_gaps_are_reported(binance_trades):
+    ids = binance_trades['trd_id'].to_numpy()
+    first_missing = int(ids[700])
+    missing = pc.is_in(binance_trades['trd_id'], value_set=pa.array(ids[700:705]))
+    tables = [binance_trades.filter(pc.invert(missing))]
+    # ... and across tables: the first id of the next table is checked against the last one
+    tables = [tables[0].slice(0, 1200), tables[0].slice(1203)]
+    out, report = ret_ordered(tables)
+
+    assert report.num_gaps == 2
+    assert report.missing_ids == 5 + 3
+    assert report.gaps[0] == ('BTCUSDT', first_missing - 1, first_missing + 5)
+    assert len(out) == len(binance_trades) - 8
+
+
+def test_exchange_without_sequential_ids_is_not_gap_checked(binance_trades):
+    out, report = ret_ordered([binance_trades.slice(0, 500), binance_trades.slice(600)], exch='ftx')
+
+    assert report.num_gaps == 0
+    assert len(out) == len(binance_trades) - 100